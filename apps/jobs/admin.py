@@ -0,0 +1,11 @@
+from django.contrib import admin
+from apps.jobs.models.jobs import Jobs
+
+
+@admin.register(Jobs)
+class JobsAdmin(admin.ModelAdmin):
+    list_display = ('nome', 'fila', 'status', 'tentativas', 'executar_apos', 'criado_em', 'finalizado_em')
+    list_filter = ('status', 'fila')
+    search_fields = ('nome', 'erro')
+    ordering = ('-criado_em',)
+    list_per_page = 20
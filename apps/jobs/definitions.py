@@ -0,0 +1,157 @@
+"""
+Definição de tarefas em segundo plano, no estilo da API de tasks do Django.
+
+Exemplo:
+    from apps.jobs.definitions import task
+
+    @task(queue_name='emails', max_attempts=5)
+    def enviar_boas_vindas(user_id):
+        ...
+
+    enviar_boas_vindas.enqueue(user.id)
+"""
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def get_jobs_setting(name):
+    """Retorna uma configuração de settings.JOBS, com os valores padrão do app."""
+    defaults = {
+        'IMMEDIATE': False,
+        'POLL_INTERVAL': 1.0,
+        'STALE_AFTER': 600,
+        'REQUEUE_INTERVAL': 60,
+        'BACKOFF_BASE': 5,
+        'BACKOFF_MAX': 3600,
+        'QUEUES': {'default': {'concurrency': 4}},
+    }
+    return getattr(settings, 'JOBS', {}).get(name, defaults[name])
+
+
+@dataclass(frozen=True)
+class Task:
+    """
+    Função registrada para execução em segundo plano.
+
+    O nome do job é o caminho de importação da função, usado pelo worker
+    para localizá-la novamente.
+    """
+    func: object
+    queue_name: str = 'default'
+    priority: int = 0
+    max_attempts: int = 3
+    run_after: object = None
+
+    @property
+    def name(self):
+        return f"{self.func.__module__}.{self.func.__qualname__}"
+
+    def using(self, *, queue_name=None, priority=None, run_after=None):
+        """Retorna uma cópia da tarefa com opções de enfileiramento alteradas."""
+        changes = {}
+        if queue_name is not None:
+            changes['queue_name'] = queue_name
+        if priority is not None:
+            changes['priority'] = priority
+        if run_after is not None:
+            changes['run_after'] = run_after
+        return replace(self, **changes)
+
+    def _resolve_run_after(self):
+        """Converte run_after (datetime, timedelta ou None) em um datetime."""
+        if isinstance(self.run_after, timedelta):
+            return timezone.now() + self.run_after
+        if isinstance(self.run_after, datetime):
+            return self.run_after
+        return timezone.now()
+
+    def enqueue(self, *args, **kwargs):
+        """
+        Registra a execução da tarefa na fila.
+
+        A linha é gravada na conexão corrente: dentro de transaction.atomic()
+        o job só fica visível para os workers depois do commit (e some com o
+        rollback); fora dela, como nas views (sem ATOMIC_REQUESTS), ele é
+        confirmado na hora e pode executar antes de a requisição terminar.
+        Para enfileirar só depois das escritas da requisição, use
+        transaction.on_commit(lambda: tarefa.enqueue(...)).
+
+        Returns:
+            Jobs: Registro do job enfileirado
+        """
+        from apps.jobs.models.jobs import Jobs
+
+        run_after = self._resolve_run_after()
+        job = Jobs.objects.create(
+            nome=self.name,
+            fila=self.queue_name,
+            args=list(args),
+            kwargs=kwargs,
+            prioridade=self.priority,
+            max_tentativas=self.max_attempts,
+            executar_apos=run_after,
+        )
+
+        if get_jobs_setting('IMMEDIATE'):
+            from apps.jobs.worker import Worker
+            Worker(queues=[self.queue_name]).execute(job)
+            job.refresh_from_db()
+
+        return job
+
+    def enqueue_many(self, calls):
+        """
+        Enfileira várias execuções com um único INSERT em lote.
+
+        Args:
+            calls: Iterável de tuplas (args, kwargs)
+
+        Returns:
+            int: Quantidade de jobs enfileirados
+        """
+        from apps.jobs.models.jobs import Jobs
+
+        run_after = self._resolve_run_after()
+        jobs = [
+            Jobs(
+                nome=self.name,
+                fila=self.queue_name,
+                args=list(args),
+                kwargs=kwargs,
+                prioridade=self.priority,
+                max_tentativas=self.max_attempts,
+                executar_apos=run_after,
+            )
+            for args, kwargs in calls
+        ]
+        Jobs.objects.bulk_create(jobs)
+        return len(jobs)
+
+    def call(self, *args, **kwargs):
+        """Executa a tarefa de forma síncrona, sem passar pela fila."""
+        return self.func(*args, **kwargs)
+
+    def __call__(self, *args, **kwargs):
+        return self.call(*args, **kwargs)
+
+
+def task(function=None, *, queue_name='default', priority=0, max_attempts=3):
+    """
+    Decorador que transforma uma função em uma tarefa enfileirável.
+
+    Pode ser usado com ou sem argumentos: @task ou @task(queue_name='emails').
+    """
+    def decorator(func):
+        return Task(
+            func=func,
+            queue_name=queue_name,
+            priority=priority,
+            max_attempts=max_attempts,
+        )
+
+    if function is not None:
+        return decorator(function)
+    return decorator
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:49
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Jobs',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=200, verbose_name='Nome')),
+                ('fila', models.CharField(default='default', max_length=50, verbose_name='Fila')),
+                ('args', models.JSONField(blank=True, default=list, verbose_name='Argumentos')),
+                ('kwargs', models.JSONField(blank=True, default=dict, verbose_name='Argumentos nomeados')),
+                ('status', models.CharField(choices=[('N', 'Na fila'), ('E', 'Executando'), ('S', 'Sucesso'), ('F', 'Falhou')], default='N', max_length=1, verbose_name='Status')),
+                ('prioridade', models.SmallIntegerField(default=0, verbose_name='Prioridade')),
+                ('tentativas', models.PositiveSmallIntegerField(default=0, verbose_name='Tentativas')),
+                ('max_tentativas', models.PositiveSmallIntegerField(default=3, verbose_name='Máximo de tentativas')),
+                ('executar_apos', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Executar após')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('erro', models.TextField(blank=True, verbose_name='Último erro')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('iniciado_em', models.DateTimeField(blank=True, null=True, verbose_name='Iniciado em')),
+                ('finalizado_em', models.DateTimeField(blank=True, null=True, verbose_name='Finalizado em')),
+            ],
+            options={
+                'verbose_name': 'Job',
+                'verbose_name_plural': 'Jobs',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'fila', 'executar_apos'], name='jobs_jobs_status_6143f0_idx')],
+            },
+        ),
+    ]
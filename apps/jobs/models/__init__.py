@@ -0,0 +1,3 @@
+from .jobs import Jobs
+
+__all__ = ["Jobs"]
@@ -0,0 +1,43 @@
+from django.db import models
+from django.utils import timezone
+
+STATUS = [
+    ("N", "Na fila"),
+    ("E", "Executando"),
+    ("S", "Sucesso"),
+    ("F", "Falhou")
+]
+
+
+class Jobs(models.Model):
+    nome = models.CharField(max_length=200, verbose_name="Nome")
+    fila = models.CharField(max_length=50, default="default", verbose_name="Fila")
+    args = models.JSONField(default=list, blank=True, verbose_name="Argumentos")
+    kwargs = models.JSONField(default=dict, blank=True, verbose_name="Argumentos nomeados")
+    status = models.CharField(
+        choices=STATUS, default="N", verbose_name="Status", max_length=1)
+    prioridade = models.SmallIntegerField(default=0, verbose_name="Prioridade")
+    tentativas = models.PositiveSmallIntegerField(default=0, verbose_name="Tentativas")
+    max_tentativas = models.PositiveSmallIntegerField(
+        default=3, verbose_name="Máximo de tentativas")
+    executar_apos = models.DateTimeField(
+        default=timezone.now, verbose_name="Executar após")
+    worker = models.CharField(max_length=100, blank=True, verbose_name="Worker")
+    erro = models.TextField(blank=True, verbose_name="Último erro")
+    criado_em = models.DateTimeField(
+        auto_now_add=True, verbose_name="Criado em")
+    iniciado_em = models.DateTimeField(
+        null=True, blank=True, verbose_name="Iniciado em")
+    finalizado_em = models.DateTimeField(
+        null=True, blank=True, verbose_name="Finalizado em")
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Job'
+        verbose_name_plural = 'Jobs'
+        indexes = [
+            models.Index(fields=['status', 'fila', 'executar_apos']),
+        ]
+
+    def __str__(self):
+        return f"{self.nome} #{self.pk}"
@@ -0,0 +1,67 @@
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from apps.jobs.definitions import Task, task
+from apps.jobs.models.jobs import Jobs
+
+
+@task(queue_name='emails', priority=5, max_attempts=4)
+def soma(a, b):
+    return a + b
+
+
+@pytest.mark.django_db
+def test_task_decorator_returns_task_with_options():
+    """Testa se o decorador cria uma tarefa com as opções informadas."""
+    # Assert
+    assert isinstance(soma, Task)
+    assert soma.queue_name == 'emails'
+    assert soma.priority == 5
+    assert soma.name == 'apps.jobs.tests.definitions.test_definitions.soma'
+
+
+@pytest.mark.django_db
+def test_enqueue_creates_queued_job():
+    """Testa se enqueue grava o job na fila com os argumentos."""
+    # Act
+    job = soma.enqueue(1, b=2)
+
+    # Assert
+    assert job.status == 'N'
+    assert job.fila == 'emails'
+    assert job.args == [1]
+    assert job.kwargs == {'b': 2}
+    assert job.max_tentativas == 4
+    assert Jobs.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_using_overrides_options_without_changing_original():
+    """Testa se using retorna uma cópia com opções de enfileiramento alteradas."""
+    # Act
+    job = soma.using(queue_name='default', run_after=timedelta(minutes=5)).enqueue(1, 2)
+
+    # Assert
+    assert job.fila == 'default'
+    assert job.executar_apos > timezone.now() + timedelta(minutes=4)
+    assert soma.queue_name == 'emails'
+
+
+def test_call_runs_synchronously():
+    """Testa se a tarefa pode ser chamada diretamente, sem fila."""
+    # Act & Assert
+    assert soma(2, 3) == 5
+
+
+@pytest.mark.django_db
+def test_enqueue_immediate_mode_runs_job(settings):
+    """Testa se no modo imediato o job é executado no enfileiramento."""
+    # Arrange
+    settings.JOBS = {**settings.JOBS, 'IMMEDIATE': True}
+
+    # Act
+    job = soma.enqueue(1, 2)
+
+    # Assert
+    assert job.status == 'S'
+    assert job.tentativas == 1
@@ -0,0 +1,155 @@
+import pytest
+from datetime import timedelta
+from django.utils import timezone
+from apps.jobs.definitions import task
+from apps.jobs.models.jobs import Jobs
+from apps.jobs.worker import Worker, backoff_delay
+
+CHAMADAS = []
+
+
+@task
+def registra(valor):
+    CHAMADAS.append(valor)
+
+
+@task(max_attempts=2)
+def falha():
+    raise RuntimeError("erro proposital")
+
+
+@pytest.fixture(autouse=True)
+def limpa_chamadas():
+    """Fixture para limpar as chamadas registradas entre os testes."""
+    CHAMADAS.clear()
+
+
+@pytest.mark.django_db
+def test_run_once_executes_ready_jobs():
+    """Testa se o worker executa os jobs prontos e marca como sucesso."""
+    # Arrange
+    job = registra.enqueue('a')
+
+    # Act
+    processed = Worker(queues=['default']).run_once()
+
+    # Assert
+    job.refresh_from_db()
+    assert processed == 1
+    assert CHAMADAS == ['a']
+    assert job.status == 'S'
+    assert job.finalizado_em is not None
+
+
+@pytest.mark.django_db
+def test_run_once_skips_jobs_scheduled_for_later():
+    """Testa se jobs agendados para o futuro não são executados."""
+    # Arrange
+    registra.using(run_after=timedelta(hours=1)).enqueue('depois')
+
+    # Act
+    processed = Worker(queues=['default']).run_once()
+
+    # Assert
+    assert processed == 0
+    assert CHAMADAS == []
+
+
+@pytest.mark.django_db
+def test_failed_job_is_retried_with_backoff():
+    """Testa se um job que falha volta para a fila com atraso."""
+    # Arrange
+    job = falha.enqueue()
+
+    # Act
+    Worker(queues=['default']).run_once()
+
+    # Assert
+    job.refresh_from_db()
+    assert job.status == 'N'
+    assert job.tentativas == 1
+    assert job.executar_apos > timezone.now()
+    assert 'erro proposital' in job.erro
+
+
+@pytest.mark.django_db
+def test_job_fails_after_max_attempts():
+    """Testa se o job é marcado como falho ao esgotar as tentativas."""
+    # Arrange
+    job = falha.enqueue()
+    worker = Worker(queues=['default'])
+
+    # Act
+    worker.run_once()
+    Jobs.objects.filter(pk=job.pk).update(executar_apos=timezone.now())
+    worker.run_once()
+
+    # Assert
+    job.refresh_from_db()
+    assert job.status == 'F'
+    assert job.tentativas == 2
+
+
+@pytest.mark.django_db
+def test_claim_respects_queue_concurrency_limit(settings):
+    """Testa se o limite de concorrência da fila considera jobs já em execução."""
+    # Arrange
+    settings.JOBS = {**settings.JOBS, 'QUEUES': {'default': {'concurrency': 2}}}
+    for valor in range(4):
+        registra.enqueue(valor)
+    Jobs.objects.filter(pk=Jobs.objects.first().pk).update(status='E', iniciado_em=timezone.now())
+
+    # Act
+    claimed = Worker(queues=['default']).claim(10)
+
+    # Assert
+    assert len(claimed) == 1
+
+
+@pytest.mark.django_db
+def test_requeue_stale_returns_stuck_jobs_to_queue():
+    """Testa se jobs presos em execução voltam para a fila."""
+    # Arrange
+    job = registra.enqueue('preso')
+    Jobs.objects.filter(pk=job.pk).update(
+        status='E', iniciado_em=timezone.now() - timedelta(hours=1))
+
+    # Act
+    requeued = Worker(queues=['default']).requeue_stale()
+
+    # Assert
+    job.refresh_from_db()
+    assert requeued == 1
+    assert job.status == 'N'
+
+
+@pytest.mark.django_db
+def test_requeue_stale_runs_periodically(settings):
+    """Testa se o laço do worker devolve jobs presos à fila a cada REQUEUE_INTERVAL, não só ao iniciar."""
+    # Arrange
+    settings.JOBS = {**settings.JOBS, 'REQUEUE_INTERVAL': 60}
+    worker = Worker(queues=['default'])
+    first = worker.requeue_stale_if_due()
+    job = registra.enqueue('preso')
+    Jobs.objects.filter(pk=job.pk).update(status='E', iniciado_em=timezone.now() - timedelta(hours=1))
+
+    # Act
+    too_soon = worker.requeue_stale_if_due()
+    worker._next_requeue = 0
+    due = worker.requeue_stale_if_due()
+
+    # Assert
+    assert (first, too_soon, due) == (0, None, 1)
+    job.refresh_from_db()
+    assert job.status == 'N'
+
+
+def test_backoff_delay_grows_exponentially(settings):
+    """Testa se o atraso entre tentativas cresce exponencialmente até o limite."""
+    # Arrange
+    settings.JOBS = {**settings.JOBS, 'BACKOFF_BASE': 10, 'BACKOFF_MAX': 60}
+
+    # Act & Assert
+    assert timedelta(seconds=5) <= backoff_delay(1) <= timedelta(seconds=10)
+    assert timedelta(seconds=20) <= backoff_delay(3) <= timedelta(seconds=40)
+    assert backoff_delay(10) <= timedelta(seconds=60)
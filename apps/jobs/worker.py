@@ -0,0 +1,207 @@
+"""
+Worker que consome a fila de jobs gravada no banco de dados.
+
+Não depende de broker externo: os jobs são reivindicados com um UPDATE
+condicional (status 'N' -> 'E'), então vários workers podem rodar em paralelo
+sem processar o mesmo job duas vezes.
+"""
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.jobs.definitions import Task, get_jobs_setting
+from apps.jobs.models.jobs import Jobs
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt):
+    """
+    Calcula o atraso antes da próxima tentativa (backoff exponencial com jitter).
+
+    Args:
+        attempt: Número da tentativa que acabou de falhar (começa em 1)
+
+    Returns:
+        timedelta: Tempo de espera até a próxima execução
+    """
+    base = get_jobs_setting('BACKOFF_BASE')
+    limit = get_jobs_setting('BACKOFF_MAX')
+    delay = min(base * (2 ** (attempt - 1)), limit)
+    # Jitter evita que jobs que falharam juntos voltem todos ao mesmo tempo
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+class Worker:
+    """
+    Consome jobs das filas informadas respeitando os limites de concorrência.
+
+    Args:
+        queues: Filas a consumir (padrão: todas as filas em settings.JOBS)
+        concurrency: Número máximo de jobs executando neste processo
+    """
+
+    def __init__(self, queues=None, concurrency=None):
+        configured = get_jobs_setting('QUEUES')
+        self.queues = list(queues or configured.keys())
+        self.limits = {
+            queue: configured.get(queue, {}).get('concurrency')
+            for queue in self.queues
+        }
+        self.concurrency = concurrency or sum(limit or 1 for limit in self.limits.values())
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._running = {queue: 0 for queue in self.queues}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._next_requeue = 0.0
+
+    def stop(self):
+        self._stop.set()
+
+    def requeue_stale(self):
+        """Devolve à fila jobs presos em execução por um worker que morreu."""
+        limit = timezone.now() - timedelta(seconds=get_jobs_setting('STALE_AFTER'))
+        return Jobs.objects.filter(
+            status="E", fila__in=self.queues, iniciado_em__lt=limit,
+        ).update(status="N", worker="")
+
+    def requeue_stale_if_due(self):
+        """
+        Chama requeue_stale a cada REQUEUE_INTERVAL segundos (usado no laço
+        principal), para que jobs de um worker que morreu voltem à fila
+        também enquanto os demais workers continuam rodando.
+
+        Returns:
+            int | None: Jobs devolvidos à fila, ou None se ainda não era a hora
+        """
+        now = time.monotonic()
+        if now < self._next_requeue:
+            return None
+        self._next_requeue = now + get_jobs_setting('REQUEUE_INTERVAL')
+        return self.requeue_stale()
+
+    def _available_slots(self, queue):
+        """Vagas livres na fila considerando todos os workers ativos."""
+        limit = self.limits.get(queue)
+        if limit is None:
+            return self.concurrency
+        running = Jobs.objects.filter(status="E", fila=queue).count()
+        return max(limit - running, 0)
+
+    def claim(self, limit):
+        """
+        Reivindica até `limit` jobs prontos para execução.
+
+        Returns:
+            list[Jobs]: Jobs reivindicados por este worker
+        """
+        claimed = []
+        now = timezone.now()
+
+        for queue in self.queues:
+            slots = min(limit - len(claimed), self._available_slots(queue))
+            if slots <= 0:
+                continue
+
+            candidates = Jobs.objects.filter(
+                status="N", fila=queue, executar_apos__lte=now,
+            ).order_by('-prioridade', 'executar_apos', 'id').values_list('id', flat=True)[:slots]
+
+            for job_id in candidates:
+                # UPDATE condicional: só um worker consegue mudar o status
+                updated = Jobs.objects.filter(pk=job_id, status="N").update(
+                    status="E",
+                    worker=self.name,
+                    iniciado_em=now,
+                    tentativas=F('tentativas') + 1,
+                )
+                if updated:
+                    claimed.append(Jobs.objects.get(pk=job_id))
+
+        return claimed
+
+    def execute(self, job):
+        """Executa um job e registra sucesso, nova tentativa ou falha definitiva."""
+        if job.status == "N":
+            # Execução direta (modo imediato): marca a tentativa aqui
+            Jobs.objects.filter(pk=job.pk).update(
+                status="E", worker=self.name, iniciado_em=timezone.now(),
+                tentativas=F('tentativas') + 1,
+            )
+            job.refresh_from_db()
+
+        try:
+            task = import_string(job.nome)
+            func = task.func if isinstance(task, Task) else task
+            func(*job.args, **job.kwargs)
+        except Exception:
+            error = traceback.format_exc()
+            logger.exception("Job %s falhou (tentativa %s)", job, job.tentativas)
+
+            if job.tentativas < job.max_tentativas:
+                Jobs.objects.filter(pk=job.pk).update(
+                    status="N",
+                    worker="",
+                    erro=error,
+                    executar_apos=timezone.now() + backoff_delay(job.tentativas),
+                )
+            else:
+                Jobs.objects.filter(pk=job.pk).update(
+                    status="F", erro=error, finalizado_em=timezone.now(),
+                )
+            return False
+
+        Jobs.objects.filter(pk=job.pk).update(
+            status="S", erro="", finalizado_em=timezone.now(),
+        )
+        return True
+
+    def _run_job(self, job):
+        try:
+            self.execute(job)
+        finally:
+            with self._lock:
+                self._running[job.fila] -= 1
+            close_old_connections()
+
+    def run_once(self):
+        """Executa, de forma síncrona, todos os jobs prontos no momento."""
+        processed = 0
+        while True:
+            jobs = self.claim(self.concurrency)
+            if not jobs:
+                return processed
+            for job in jobs:
+                self.execute(job)
+                processed += 1
+
+    def run(self):
+        """Laço principal: reivindica jobs e os executa em um pool de threads."""
+        poll_interval = get_jobs_setting('POLL_INTERVAL')
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while not self._stop.is_set():
+                self.requeue_stale_if_due()
+                with self._lock:
+                    free = self.concurrency - sum(self._running.values())
+
+                jobs = self.claim(free) if free > 0 else []
+                for job in jobs:
+                    with self._lock:
+                        self._running[job.fila] += 1
+                    pool.submit(self._run_job, job)
+
+                close_old_connections()
+                if not jobs:
+                    self._stop.wait(poll_interval)
@@ -1,5 +1,8 @@
 from django.contrib import admin
 from apps.tasks.models.tasks import Tasks
+from apps.tasks.models.archived import ArchivedTasks
+from apps.tasks.services.sync_service import delete_tasks
+from apps.tasks.services.tree_service import subtree_filter
 
 
 @admin.register(Tasks)
@@ -9,4 +12,26 @@ class TasksAdmin(admin.ModelAdmin):
     search_fields = ('titulo', 'descricao')
     ordering = ('-criado_em',)
     list_per_page = 20
-    list_editable = ('status',)
\ No newline at end of file
+    list_editable = ('status',)
+
+    # Exclusões pelo admin também são informadas à sincronização dos clientes
+    # e, como na API, levam junto as subtarefas
+    def delete_model(self, request, obj):
+        delete_tasks(Tasks.objects.filter(subtree_filter(obj)))
+
+    def delete_queryset(self, request, queryset):
+        delete_tasks(queryset)
+
+@admin.register(ArchivedTasks)
+class ArchivedTasksAdmin(admin.ModelAdmin):
+    list_display = ('usuario', 'titulo', 'prioridade', 'concluido_em', 'arquivado_em')
+    list_filter = ('prioridade',)
+    search_fields = ('titulo', 'descricao')
+    list_per_page = 20
+
+    # O arquivo é gravado apenas pelo comando archive_tasks
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
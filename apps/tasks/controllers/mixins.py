@@ -0,0 +1,73 @@
+import functools
+
+from django.http.request import RawPostDataException
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from apps.tasks.services import idempotency_service
+
+
+def idempotent(handler):
+    """
+    Decorator para as ações POST de views com IdempotencyMixin: com o
+    cabeçalho Idempotency-Key, a ação passa pela chave (ver
+    IdempotencyMixin.idempotent_response). Outros métodos passam direto.
+    """
+    @functools.wraps(handler)
+    def wrapper(self, request, *args, **kwargs):
+        key = self.idempotency_key(request)
+        if key is None:
+            return handler(self, request, *args, **kwargs)
+        return self.idempotent_response(key, lambda: handler(self, request, *args, **kwargs))
+    return wrapper
+
+
+class IdempotencyMixin:
+    """
+    Mixin para views do DRF: um POST com o cabeçalho Idempotency-Key é
+    executado uma única vez; repetições com a mesma chave (do mesmo usuário,
+    no mesmo caminho) recebem a resposta guardada, com o cabeçalho
+    Idempotent-Replayed, sem repetir a escrita (ver idempotency_service).
+
+    Vale para o create() e para as ações marcadas com @idempotent, que
+    executam depois da autenticação, então a chave é por usuário também com
+    JWT. Sem o cabeçalho, nada muda.
+    """
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    def idempotency_key(self, request):
+        """A Idempotency-Key do POST, ou None se ela não foi enviada."""
+        key = request.headers.get(idempotency_service.HEADER)
+        if key is None or request.method != 'POST':
+            return None
+        if not key or len(key) > idempotency_service.KEY_MAX_LENGTH:
+            raise ValidationError({idempotency_service.HEADER: (
+                f"Use uma chave de 1 a {idempotency_service.KEY_MAX_LENGTH} caracteres.")})
+        return key
+
+    def idempotent_response(self, key, call):
+        request = self.request
+        try:
+            body = request.body
+        except RawPostDataException:
+            body = repr(request.data).encode()
+
+        try:
+            response, stored = idempotency_service.execute(
+                idempotency_service.scoped_key(request.user.pk, request.method, request.path, key),
+                idempotency_service.fingerprint(body), call)
+        except idempotency_service.KeyMismatch:
+            return Response({'detail': "Esta Idempotency-Key já foi usada com outro conteúdo."},
+                            status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        except idempotency_service.KeyInUse:
+            return Response({'detail': "Uma requisição com esta Idempotency-Key ainda está em andamento."},
+                            status=status.HTTP_409_CONFLICT)
+
+        if stored is None:
+            return response
+        return Response(stored['dados'], status=stored['status'],
+                        headers={**stored['cabecalhos'], 'Idempotent-Replayed': 'true'})
@@ -0,0 +1,103 @@
+from django.http import Http404
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.viewsets import ModelViewSet
+from apps.tasks.controllers.mixins import IdempotencyMixin, idempotent
+from apps.tasks.models.lists import ListMembers, TaskLists
+from apps.tasks.schemas.task_list_schema import ListMemberSerializer, TaskListSerializer
+from apps.tasks.services.lists_service import add_member, create_list, delete_list, list_roles, remove_member
+
+
+class TaskListsViewSet(IdempotencyMixin, ModelViewSet):
+    """
+    Listas compartilhadas do usuário e os seus membros.
+
+    Qualquer membro vê a lista e os membros; renomear, excluir e alterar os
+    membros exige o papel de administrador. Um membro pode sair da lista, mas
+    o dono não pode ser removido nem deixar de ser administrador.
+    """
+    queryset = TaskLists.objects.all()
+    serializer_class = TaskListSerializer
+    permission_classes = [IsAuthenticated]
+    http_method_names = ['get', 'post', 'patch', 'delete', 'head', 'options']
+
+    def get_list_roles(self):
+        if not hasattr(self, '_list_roles'):
+            self._list_roles = list_roles(self.request.user.pk)
+        return self._list_roles
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return self.queryset.none()
+
+        # As listas vêm dos papéis em cache, sem JOIN com os membros
+        return TaskLists.objects.filter(pk__in=list(self.get_list_roles())).select_related('dono')
+
+    def check_admin(self, task_list):
+        if self.get_list_roles().get(task_list.pk) != 'A':
+            raise PermissionDenied("Apenas administradores da lista podem fazer esta alteração.")
+
+    def perform_create(self, serializer):
+        serializer.instance = create_list(self.request.user, serializer.validated_data['nome'])
+        # A lista nova ainda não está nos papéis carregados para a requisição
+        self._list_roles = {**self.get_list_roles(), serializer.instance.pk: 'A'}
+
+    def perform_update(self, serializer):
+        self.check_admin(serializer.instance)
+        serializer.save()
+
+    def perform_destroy(self, instance):
+        self.check_admin(instance)
+        delete_list(instance)
+
+    @action(detail=True, methods=['get', 'post'], url_path='membros')
+    @idempotent
+    def membros(self, request, pk=None):
+        """
+        GET: membros da lista e seus papéis.
+        POST: adiciona um membro (ou altera o papel de quem já é membro).
+        """
+        task_list = self.get_object()
+        if request.method == 'GET':
+            members = task_list.membros.select_related('usuario')
+            return Response(ListMemberSerializer(members, many=True).data)
+
+        self.check_admin(task_list)
+        serializer = ListMemberSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.validated_data['usuario']
+        if user.pk == task_list.dono_id:
+            raise ValidationError({'usuario': "O dono da lista é sempre administrador."})
+
+        member = add_member(task_list, user, serializer.validated_data['papel'])
+        return Response(ListMemberSerializer(member).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['patch', 'delete'], url_path=r'membros/(?P<usuario_id>\d+)')
+    def membro(self, request, pk=None, usuario_id=None):
+        """
+        PATCH: altera o papel do membro.
+        DELETE: remove o membro; qualquer membro pode remover a si mesmo.
+        """
+        task_list = self.get_object()
+        usuario_id = int(usuario_id)
+        if usuario_id == task_list.dono_id:
+            raise ValidationError({'usuario': "O dono da lista não pode ser removido nem alterado."})
+        if usuario_id != request.user.pk or request.method != 'DELETE':
+            self.check_admin(task_list)
+
+        if request.method == 'DELETE':
+            if not remove_member(task_list, usuario_id):
+                raise Http404
+            return Response(status=status.HTTP_204_NO_CONTENT)
+
+        try:
+            member = task_list.membros.select_related('usuario').get(usuario_id=usuario_id)
+        except ListMembers.DoesNotExist:
+            raise Http404
+        serializer = ListMemberSerializer(member, data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        member = add_member(task_list, member.usuario, serializer.validated_data.get('papel', member.papel))
+        return Response(ListMemberSerializer(member).data)
@@ -1,27 +1,396 @@
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import BigIntegerField, Count, Q, Value
+from django.http import Http404, StreamingHttpResponse
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError as DRFValidationError
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from apps.tasks.schemas.task_schema import TaskSerializer
+from apps.tasks.controllers.mixins import IdempotencyMixin, idempotent
+from apps.tasks.schemas.task_schema import (
+    BulkCompleteSerializer, ExportQuerySerializer, HistoryQuerySerializer, MoveTaskSerializer, PositionSerializer, SyncQuerySerializer, TagFilterSerializer,
+    TaskSerializer,
+)
+from apps.tasks.schemas.task_read_schema import READ_FIELDS, serialize_task_rows
 from apps.tasks.models.tasks import Tasks
-from common.permissions.is_owner import IsOwner
+from apps.tasks.models.archived import ArchivedTasks
+from apps.tasks.models.tombstones import TaskTombstones
+from apps.tasks.jobs import export_tasks_csv, notify_task_completed, notify_tasks_completed
+from apps.tasks.services import event_service, history_service
+from apps.tasks.services.export_service import iter_csv
+from apps.tasks.services.lists_service import (
+    hidden_from_members, list_roles, union_all, visible_branches, visible_filter,
+)
+from apps.tasks.services.rank_service import InvalidPosition, move_task
+from apps.tasks.services.sync_service import changes_since, delete_task_rows, record_tombstones
+from apps.tasks.services.tags_service import filter_by_tags, tag_counts
+from apps.tasks.services.tree_service import InvalidMove, descendants_filter, move_subtree, progress, subtree_filter
+from common.permissions.is_list_member import IsOwnerOrListMember
+from common.views.compact_formats import CompactFormatsMixin
+from common.views.read_replica import ReadReplicaMixin
 from django.utils import timezone
 
 
-class TasksViewSet(ModelViewSet):
+def _read_fields_only(rows, fields):
+    """Tira das linhas os campos lidos depois de READ_FIELDS só para a ordenação."""
+    if len(fields) == len(READ_FIELDS):
+        return rows
+    return [row[:len(READ_FIELDS)] for row in rows]
+
+
+def _complete_tasks(queryset, now):
+    """
+    Conclui as tarefas do queryset e devolve os valores de antes da alteração.
+
+    No PostgreSQL é um único UPDATE ... FROM (SELECT ... FOR UPDATE) ... RETURNING,
+    que lê e trava as linhas na mesma instrução. O RETURNING do SQLite não
+    enxerga as tabelas do FROM, então nos demais bancos as linhas são lidas e
+    atualizadas na mesma transação.
+
+    Returns:
+        list[tuple]: (id, usuario_id, lista_id, status, concluido_em) anteriores de cada tarefa concluída
+    """
+    with transaction.atomic():
+        old = queryset.order_by().select_for_update(of=('self',)).values_list(
+            'id', 'usuario_id', 'lista_id', 'status', 'concluido_em')
+
+        if connection.vendor != 'postgresql':
+            rows = list(old)
+            if rows:
+                Tasks.objects.filter(pk__in=[row[0] for row in rows]).update(
+                    status='C', concluido_em=now, atualizado_em=now)
+            return rows
+
+        qn = connection.ops.quote_name
+        table = qn(Tasks._meta.db_table)
+        subquery, params = old.query.sql_with_params()
+        # usuario_id na junção mantém o UPDATE na partição de cada tarefa
+        sql = (f'UPDATE {table} SET {qn("status")} = %s, {qn("concluido_em")} = %s, {qn("atualizado_em")} = %s '
+               f'FROM ({subquery}) AS {qn("old")} '
+               f'WHERE {table}.{qn("id")} = {qn("old")}.{qn("id")} '
+               f'AND {table}.{qn("usuario_id")} = {qn("old")}.{qn("usuario_id")} '
+               f'RETURNING {qn("old")}.{qn("id")}, {qn("old")}.{qn("usuario_id")}, {qn("old")}.{qn("lista_id")}, '
+               f'{qn("old")}.{qn("status")}, {qn("old")}.{qn("concluido_em")}')
+        value = connection.ops.adapt_datetimefield_value(now)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, ('C', value, value, *params))
+            return [tuple(row) for row in cursor.fetchall()]
+
+
+class TasksViewSet(CompactFormatsMixin, IdempotencyMixin, ReadReplicaMixin, ModelViewSet):
     queryset = Tasks.objects.all()
     serializer_class = TaskSerializer
-    permission_classes = [IsOwner]
+    permission_classes = [IsOwnerOrListMember]
+    # MessagePack e JSON colunar na listagem e na exportação
+    compact_format_actions = ('list', 'export')
+    columnar_dictionary_fields = ('status_display', 'prioridade_display')
+
+    def get_list_roles(self):
+        """Papéis do usuário nas listas compartilhadas, carregados uma vez por requisição."""
+        if not hasattr(self, '_list_roles'):
+            self._list_roles = list_roles(self.request.user.pk)
+        return self._list_roles
 
-    def get_queryset(self):
+    def get_queryset(self, writable=False):
         if getattr(self, 'swagger_fake_view', False):
             return self.queryset.none()
-            
-        # Filtra as tarefas pelo usuário autenticado
-        queryset = Tasks.objects.filter(usuario=self.request.user)
-        return queryset
-    
+
+        # Tarefas do usuário e das listas de que ele participa (só as editáveis
+        # com writable=True), em um único filtro indexado
+        return Tasks.objects.filter(visible_filter(self.request.user.pk, self.get_list_roles(), writable))
+
+    def get_visible_branches(self, queryset):
+        """
+        As tarefas visíveis do queryset em consultas separadas, para leituras
+        de várias linhas: sem o OR do get_queryset(), a parte do usuário
+        acessa só a partição dele (ver lists_service.visible_branches).
+        """
+        return visible_branches(queryset, self.request.user.pk, self.get_list_roles())
+
+    def visible_rows(self, queryset, fields=READ_FIELDS, ordering=('id',)):
+        """values_list das tarefas visíveis do queryset, em uma consulta (UNION ALL)."""
+        branches = self.get_visible_branches(queryset)
+        return union_all([branch.values_list(*fields) for branch in branches]).order_by(*ordering)
+
+    def list(self, request, *args, **kwargs):
+        # ?tags=a,b (qualquer uma) e ?tags_todas=a,b (todas), pelo índice de etiquetas
+        filters = TagFilterSerializer(data=request.query_params)
+        filters.is_valid(raise_exception=True)
+        queryset = self.filter_queryset(Tasks.objects.all())
+        if filters.validated_data:
+            queryset = filter_by_tags(
+                queryset, request.user.pk, self.get_list_roles(),
+                any_of=filters.validated_data.get('tags', ()),
+                all_of=filters.validated_data.get('tags_todas', ()),
+            )
+        branches = self.get_visible_branches(queryset)
+        fields, ordering = READ_FIELDS, ('id',)
+
+        # ?incluir_arquivadas=true junta as tarefas movidas pelo archive_tasks (as
+        # arquivadas não estão no índice de etiquetas e não entram nesses filtros)
+        include_archived = request.query_params.get('incluir_arquivadas', '').lower() in ('true', '1')
+        if include_archived and not filters.validated_data:
+            # O arquivo guarda só as tarefas do próprio usuário, sem lista nem pai
+            branches.append(ArchivedTasks.objects.filter(usuario=request.user)
+                            .annotate(lista=Value(None, output_field=BigIntegerField()),
+                                      pai=Value(None, output_field=BigIntegerField())))
+        elif request.query_params.get('ordering') == 'posicao':
+            # ?ordering=posicao: ordem manual do dono, pelo índice (usuario, posicao);
+            # a posição é lida no fim de cada linha só para ordenar o UNION
+            fields, ordering = READ_FIELDS + ('posicao',), ('posicao', 'id')
+
+        # Caminho rápido de leitura: tuplas do banco direto para dicionários
+        rows = union_all([branch.values_list(*fields) for branch in branches]).order_by(*ordering)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serialize_task_rows(_read_fields_only(page, fields)))
+
+        return Response(serialize_task_rows(_read_fields_only(rows, fields)))
+
+    def retrieve(self, request, *args, **kwargs):
+        # As consultas já são filtradas pelo usuário, então não é preciso
+        # carregar o objeto para checar a permissão de dono. As tarefas do
+        # usuário são procuradas primeiro (só a partição dele); as das listas,
+        # só se a tarefa não for dele.
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        rows = []
+        try:
+            queryset = self.filter_queryset(Tasks.objects.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]}))
+            for branch in self.get_visible_branches(queryset):
+                rows = list(branch.values_list(*READ_FIELDS)[:1])
+                if rows:
+                    break
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        if not rows:
+            raise Http404
+
+        return Response(serialize_task_rows(rows)[0])
+
+    def perform_create(self, serializer):
+        task = serializer.save()
+        event_service.publish_task_event(event_service.CRIADA, [(task.pk, task.usuario_id, task.lista_id)])
+
     def perform_update(self, serializer):
+        instance = serializer.instance
+        atualizado_em, lista_id = instance.atualizado_em, instance.lista_id
         # Verifica se o status está sendo atualizado para 'C' (Concluído)
-        if serializer.validated_data.get('status') == 'C':
+        # Só grava a data de conclusão quando a tarefa passa a ser concluída
+        if serializer.validated_data.get('status') == 'C' and instance.status != 'C':
             # Salva a instância com a data de conclusão atual
             serializer.save(concluido_em=timezone.now())
+            # A notificação é enviada pelo worker, fora da requisição
+            notify_task_completed.enqueue(instance.pk)
+            event_service.publish_task_event(event_service.CONCLUIDA, [(instance.pk, instance.usuario_id, instance.lista_id)])
+        else:
+            serializer.save()
+            # Sem alterações, nada é gravado (atualizado_em não muda) nem publicado
+            if instance.atualizado_em != atualizado_em:
+                event_service.publish_task_event(event_service.ATUALIZADA, [(instance.pk, instance.usuario_id, instance.lista_id)])
+
+        # Tarefa tirada de uma lista: os membros dela deixam de vê-la
+        if lista_id and instance.lista_id != lista_id:
+            hidden = hidden_from_members(instance, lista_id)
+            record_tombstones((instance.pk, user_id) for user_id in hidden)
+            event_service.publish_removed(hidden, [instance.pk])
+
+    def perform_destroy(self, instance):
+        # A tarefa sai junto com as subtarefas (em qualquer nível), em uma só
+        # consulta por prefixo do caminho; as remoções ficam registradas para
+        # a sincronização incremental
+        with transaction.atomic():
+            rows = delete_task_rows(Tasks.objects.filter(subtree_filter(instance)))
+            history_service.record(history_service.REMOVIDA, (
+                (task_id, {'usuario': [usuario_id, None], 'lista': [lista_id, None]})
+                for task_id, usuario_id, lista_id in rows
+            ), self.request.user.pk)
+        event_service.publish_task_event(event_service.REMOVIDA, rows)
+
+    @action(detail=False, methods=['get'], url_path='estatisticas')
+    def estatisticas(self, request):
+        """Totais das tarefas do usuário por status e atrasadas, em uma única consulta."""
+        pendentes = ~Q(status='C')
+        return Response(self.get_queryset().aggregate(
+            total=Count('id'),
+            pendentes=Count('id', filter=Q(status='P')),
+            em_andamento=Count('id', filter=Q(status='EA')),
+            concluidas=Count('id', filter=Q(status='C')),
+            atrasadas=Count('id', filter=pendentes & Q(prazo__lt=timezone.localdate())),
+        ))
+
+    @action(detail=False, methods=['get'], url_path='tags')
+    def tags(self, request):
+        """Etiquetas das tarefas do usuário com a quantidade de tarefas de cada uma."""
+        return Response(tag_counts(request.user.pk))
+
+    @action(detail=True, methods=['get'], url_path='subtarefas')
+    def subtarefas(self, request, pk=None):
+        """Todas as subtarefas da tarefa, em qualquer nível, com uma consulta por prefixo."""
+        task = self.get_object()
+        rows = self.visible_rows(Tasks.objects.filter(descendants_filter(task)))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serialize_task_rows(page))
+
+        return Response(serialize_task_rows(rows))
+
+    @action(detail=True, methods=['get'], url_path='progresso')
+    def progresso(self, request, pk=None):
+        """Progresso da tarefa: totais das subtarefas, em qualquer nível, por status."""
+        return Response(progress(self.get_queryset(), self.get_object()))
+
+    @action(detail=True, methods=['post'], url_path='mover')
+    @idempotent
+    def mover(self, request, pk=None):
+        """Move a tarefa, com todas as subtarefas, para outro pai (ou para a raiz)."""
+        task = self.get_object()
+        serializer = MoveTaskSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        parent = None
+        if serializer.validated_data['pai'] is not None:
+            parent = self.get_queryset(writable=True).filter(pk=serializer.validated_data['pai']).first()
+            if parent is None:
+                raise DRFValidationError({'pai': "Tarefa pai não encontrada."})
+
+        previous_parent_id = task.pai_id
+        try:
+            move_subtree(task, parent)
+        except InvalidMove as e:
+            raise DRFValidationError({'pai': str(e)})
+        history_service.record(history_service.MOVIDA, [
+            (task.pk, {'pai': [previous_parent_id, task.pai_id]}),
+        ], request.user.pk)
+
+        event_service.publish_task_event(event_service.ATUALIZADA, [(task.pk, task.usuario_id, task.lista_id)])
+        rows = self.get_queryset().filter(pk=task.pk).values_list(*READ_FIELDS)
+        return Response(serialize_task_rows(rows)[0])
+
+    @action(detail=True, methods=['get'], url_path='historico')
+    def historico(self, request, pk=None):
+        """
+        Alterações da tarefa (quem, quando e quais campos), da mais recente para
+        a mais antiga. Para a próxima página, envie `proximo` em `?antes=`.
+        """
+        task = self.get_object()
+        query = HistoryQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        rows, next_cursor = history_service.task_history(
+            task.pk, query.validated_data.get('antes'), query.validated_data['limite'])
+        return Response({'historico': rows, 'proximo': next_cursor})
+
+    @action(detail=True, methods=['post'], url_path='posicao')
+    @idempotent
+    def posicao(self, request, pk=None):
+        """
+        Reposiciona a tarefa na ordem manual do dono, depois de `apos` e/ou
+        antes de `antes`. Só a própria tarefa é gravada.
+        """
+        task = self.get_object()
+        if task.usuario_id != request.user.pk:
+            raise PermissionDenied("Apenas o dono da tarefa pode alterar a ordem dela.")
+        serializer = PositionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            move_task(task, serializer.validated_data.get('apos'), serializer.validated_data.get('antes'))
+        except InvalidPosition as e:
+            raise DRFValidationError(str(e))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['get'], url_path='changes')
+    def changes(self, request):
+        """
+        Sincronização incremental: tarefas criadas ou alteradas e ids removidos
+        desde o token da chamada anterior (sem token, todas as tarefas).
+        """
+        serializer = SyncQuerySerializer(data=request.query_params, context={'user_id': request.user.pk})
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        rows, removed, token, has_more = changes_since(
+            self.get_visible_branches(Tasks.objects.all()),
+            TaskTombstones.objects.filter(usuario=request.user),
+            cursor=data.get('token'),
+            limit=data['limite'],
+        )
+        return Response({
+            'tarefas': serialize_task_rows(rows),
+            'removidas': removed,
+            'token': token,
+            'mais': has_more,
+        })
+
+    @action(detail=False, methods=['get', 'post'], url_path='export')
+    @idempotent
+    def export(self, request):
+        """
+        GET: baixa o CSV das tarefas, gerado aos poucos (streaming), ou as
+        tarefas em MessagePack/JSON colunar (Accept ou ?format=), em páginas
+        por id: para a próxima, envie `proximo` em `?apos=`.
+        POST: agenda a exportação em segundo plano; o CSV é enviado por e-mail.
+        """
+        if request.method == 'POST':
+            job = export_tasks_csv.enqueue(request.user.pk)
+            return Response({'job': job.pk, 'status': job.get_status_display()},
+                            status=status.HTTP_202_ACCEPTED)
+
+        if request.accepted_renderer.format in ('msgpack', 'colunar'):
+            query = ExportQuerySerializer(data=request.query_params)
+            query.is_valid(raise_exception=True)
+            limit = query.validated_data['limite']
+            rows = list(self.visible_rows(
+                Tasks.objects.filter(id__gt=query.validated_data.get('apos', 0)))[:limit + 1])
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            return Response({
+                'results': serialize_task_rows(rows),
+                'proximo': rows[-1][0] if has_more else None,
+            })
+
+        tasks = union_all(self.get_visible_branches(Tasks.objects.all()))
+        response = StreamingHttpResponse(iter_csv(tasks), content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="tarefas.csv"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='concluir')
+    @idempotent
+    def concluir(self, request):
+        """
+        Conclui várias tarefas com um único UPDATE, por lista de ids ou por filtro.
+        Tarefas já concluídas e de outros usuários não são afetadas.
+        """
+        serializer = BulkCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        queryset = self.get_queryset(writable=True).exclude(status='C')
+        if 'ids' in data:
+            queryset = queryset.filter(pk__in=data['ids'])
         else:
-            serializer.save()
\ No newline at end of file
+            filtro = data['filtro']
+            if 'status' in filtro:
+                queryset = queryset.filter(status=filtro['status'])
+            if 'prioridade' in filtro:
+                queryset = queryset.filter(prioridade=filtro['prioridade'])
+            if 'prazo_ate' in filtro:
+                queryset = queryset.filter(prazo__lte=filtro['prazo_ate'])
+
+        # O UPDATE direto não aplica o auto_now, então atualizado_em é definido aqui
+        now = timezone.now()
+        states = _complete_tasks(queryset, now)
+        total = len(states)
+
+        if total:
+            notify_tasks_completed.enqueue(request.user.pk, total)
+            event_service.publish_task_event(event_service.CONCLUIDA, [state[:3] for state in states])
+            history_service.record(history_service.ATUALIZADA, (
+                (task_id, {'status': [previous, 'C'], 'concluido_em': [completed_at, now]})
+                for task_id, _, _, previous, completed_at in states
+            ), request.user.pk)
+
+        return Response({'concluidas': total})
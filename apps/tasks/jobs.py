@@ -0,0 +1,90 @@
+"""
+Jobs em segundo plano do app de tarefas (executados por: python manage.py runjobs).
+"""
+from django.contrib.auth.models import User
+from django.core.mail import EmailMessage, send_mail
+from django.utils import timezone
+
+from apps.jobs.definitions import task
+from apps.tasks.models.tasks import Tasks
+from apps.tasks.services.export_service import iter_csv
+
+
+@task(queue_name='emails', max_attempts=5)
+def notify_task_completed(task_id):
+    """Envia ao dono da tarefa um e-mail avisando que ela foi concluída."""
+    tarefa = Tasks.objects.select_related('usuario').filter(pk=task_id).first()
+    if tarefa is None or not tarefa.usuario.email:
+        return
+
+    send_mail(
+        subject=f'Tarefa concluída: {tarefa.titulo}',
+        message=f'A tarefa "{tarefa.titulo}" foi marcada como concluída.',
+        from_email=None,
+        recipient_list=[tarefa.usuario.email],
+    )
+
+
+@task(queue_name='exports', max_attempts=2)
+def export_tasks_csv(user_id):
+    """Gera o CSV com todas as tarefas do usuário e o envia por e-mail."""
+    user = User.objects.filter(pk=user_id).first()
+    if user is None or not user.email:
+        return
+
+    content = ''.join(iter_csv(Tasks.objects.filter(usuario_id=user_id)))
+    filename = f'tarefas-{timezone.localdate().isoformat()}.csv'
+
+    message = EmailMessage(
+        subject='Exportação de tarefas',
+        body='Segue em anexo a exportação das suas tarefas.',
+        to=[user.email],
+    )
+    message.attach(filename, content, 'text/csv')
+    message.send()
+
+
+@task(queue_name='emails', max_attempts=5)
+def send_due_reminders(user_id, task_ids):
+    """Envia um único e-mail com as tarefas do usuário cujo prazo está próximo."""
+    user = User.objects.filter(pk=user_id).first()
+    if user is None or not user.email:
+        return
+
+    tarefas = list(
+        Tasks.objects.filter(usuario_id=user_id, pk__in=task_ids)
+        .exclude(status='C').order_by('prazo', 'id').values_list('titulo', 'prazo')
+    )
+    if not tarefas:
+        return
+
+    linhas = '\n'.join(f'- {titulo} (prazo: {prazo:%d/%m/%Y})' for titulo, prazo in tarefas)
+    send_mail(
+        subject=f'{len(tarefas)} tarefa(s) com prazo próximo',
+        message=f'As seguintes tarefas vencem em breve:\n\n{linhas}',
+        from_email=None,
+        recipient_list=[user.email],
+    )
+
+
+@task(queue_name='emails', max_attempts=5)
+def notify_tasks_completed(user_id, total):
+    """Envia um resumo por e-mail após uma conclusão de tarefas em lote."""
+    user = User.objects.filter(pk=user_id).first()
+    if user is None or not user.email:
+        return
+
+    send_mail(
+        subject=f'{total} tarefa(s) concluída(s)',
+        message=f'{total} tarefa(s) foram marcadas como concluídas de uma só vez.',
+        from_email=None,
+        recipient_list=[user.email],
+    )
+
+
+@task(queue_name='default', max_attempts=3)
+def rebalance_task_ranks(user_id):
+    """Redistribui as chaves da ordem manual do usuário quando elas ficam longas."""
+    from apps.tasks.services.rank_service import rebalance_ranks
+
+    rebalance_ranks(user_id)
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.1 on 2026-10-19 15:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderWatermarks',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=50, unique=True, verbose_name='Nome')),
+                ('prazo', models.DateField(blank=True, null=True, verbose_name='Último prazo processado')),
+                ('ultimo_id', models.BigIntegerField(default=0, verbose_name='Último id processado')),
+                ('atualizado_em', models.DateTimeField(auto_now=True, verbose_name='Atualizado em')),
+            ],
+            options={
+                'verbose_name': 'Marca de lembretes',
+                'verbose_name_plural': 'Marcas de lembretes',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='tasks',
+            index=models.Index(condition=models.Q(('status', 'C'), _negated=True), fields=['prazo', 'id'], name='tasks_prazo_pendentes_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='tasks',
+            name='tasks_tasks_prazo_c0b2f1_idx',
+        ),
+    ]
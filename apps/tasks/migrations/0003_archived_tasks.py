@@ -0,0 +1,49 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0002_reminders'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTasks',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='ID')),
+                ('titulo', models.CharField(max_length=160, verbose_name='Titulo')),
+                ('descricao', models.TextField(blank=True, verbose_name='Descrição')),
+                ('prioridade', models.CharField(choices=[('B', 'Baixa'), ('M', 'Media'), ('A', 'Alta')], max_length=1, verbose_name='Prioridade')),
+                ('prazo', models.DateField(blank=True, null=True, verbose_name='Prazo')),
+                ('status', models.CharField(choices=[('P', 'Pendente'), ('EA', 'Em Andamento'), ('C', 'Concluída')], default='C', max_length=2, verbose_name='Status')),
+                ('criado_em', models.DateTimeField(verbose_name='Criado em')),
+                ('atualizado_em', models.DateTimeField(verbose_name='Atualizado em')),
+                ('concluido_em', models.DateTimeField(blank=True, null=True, verbose_name='Concluído em')),
+                ('arquivado_em', models.DateTimeField(auto_now_add=True, verbose_name='Arquivado em')),
+            ],
+            options={
+                'verbose_name': 'Tarefa arquivada',
+                'verbose_name_plural': 'Tarefas arquivadas',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='tasks',
+            index=models.Index(condition=models.Q(('status', 'C')), fields=['concluido_em', 'id'], name='tasks_concluidas_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedtasks',
+            name='usuario',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='Usuário'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedtasks',
+            index=models.Index(fields=['usuario', 'id'], name='tasks_arquivadas_usuario_idx'),
+        ),
+    ]
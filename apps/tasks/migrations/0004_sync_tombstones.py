@@ -0,0 +1,47 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:28
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_archived_tasks'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTombstones',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tarefa_id', models.BigIntegerField(verbose_name='Tarefa')),
+                ('removido_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Removido em')),
+            ],
+            options={
+                'verbose_name': 'Tarefa removida',
+                'verbose_name_plural': 'Tarefas removidas',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='tasks',
+            index=models.Index(fields=['usuario', 'atualizado_em', 'id'], name='tasks_sincronizacao_idx'),
+        ),
+        migrations.AddField(
+            model_name='tasktombstones',
+            name='usuario',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='Usuário'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstones',
+            index=models.Index(fields=['usuario', 'id'], name='tasks_removidas_usuario_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstones',
+            index=models.Index(fields=['removido_em'], name='tasks_removidas_data_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0004_sync_tombstones'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskLists',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=120, verbose_name='Nome')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('dono', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='listas_criadas', to=settings.AUTH_USER_MODEL, verbose_name='Dono')),
+            ],
+            options={
+                'verbose_name': 'Lista de tarefas',
+                'verbose_name_plural': 'Listas de tarefas',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='tasks',
+            name='lista',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tarefas', to='tasks.tasklists', verbose_name='Lista'),
+        ),
+        migrations.CreateModel(
+            name='ListMembers',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('papel', models.CharField(choices=[('L', 'Leitor'), ('E', 'Editor'), ('A', 'Administrador')], default='L', max_length=1, verbose_name='Papel')),
+                ('criado_em', models.DateTimeField(auto_now_add=True, verbose_name='Criado em')),
+                ('usuario', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='listas', to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+                ('lista', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='membros', to='tasks.tasklists', verbose_name='Lista')),
+            ],
+            options={
+                'verbose_name': 'Membro da lista',
+                'verbose_name_plural': 'Membros das listas',
+                'ordering': ['id'],
+                'constraints': [models.UniqueConstraint(fields=('usuario', 'lista'), name='tasks_membro_unico')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0005_shared_lists'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tasks',
+            name='caminho',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=255, verbose_name='Caminho'),
+        ),
+        migrations.AddField(
+            model_name='tasks',
+            name='pai',
+            field=models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='subtarefas', to='tasks.tasks', verbose_name='Tarefa pai'),
+        ),
+    ]
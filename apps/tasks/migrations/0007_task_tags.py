@@ -0,0 +1,42 @@
+# Generated by Django 5.2.1 on 2026-10-19 16:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0006_task_hierarchy'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedtasks',
+            name='tags',
+            field=models.JSONField(blank=True, default=list, verbose_name='Etiquetas'),
+        ),
+        migrations.AddField(
+            model_name='tasks',
+            name='tags',
+            field=models.JSONField(blank=True, default=list, verbose_name='Etiquetas'),
+        ),
+        migrations.CreateModel(
+            name='TaskTags',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tarefa_id', models.BigIntegerField(verbose_name='Tarefa')),
+                ('nome', models.CharField(max_length=50, verbose_name='Etiqueta')),
+                ('usuario', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL, verbose_name='Usuário')),
+            ],
+            options={
+                'verbose_name': 'Etiqueta da tarefa',
+                'verbose_name_plural': 'Etiquetas das tarefas',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['usuario', 'nome', 'tarefa_id'], name='tasks_etiquetas_usuario_idx'), models.Index(fields=['nome', 'tarefa_id'], name='tasks_etiquetas_nome_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tarefa_id', 'nome'), name='tasks_etiqueta_unica')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_tags'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tasks',
+            name='posicao',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64, verbose_name='Posição'),
+        ),
+        migrations.AddIndex(
+            model_name='tasks',
+            index=models.Index(fields=['usuario', 'posicao'], name='tasks_posicao_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:14
+
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0008_task_rank'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tarefa_id', models.BigIntegerField(verbose_name='Tarefa')),
+                ('acao', models.CharField(choices=[('criada', 'Criada'), ('atualizada', 'Atualizada'), ('movida', 'Movida')], max_length=10, verbose_name='Ação')),
+                ('alteracoes', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, verbose_name='Alterações')),
+                ('alterado_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Alterado em')),
+                ('autor', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='Autor')),
+            ],
+            options={
+                'verbose_name': 'Histórico de tarefa',
+                'verbose_name_plural': 'Histórico de tarefas',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['tarefa_id', 'id'], name='tasks_historico_idx')],
+            },
+        ),
+    ]
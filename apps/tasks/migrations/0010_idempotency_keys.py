@@ -0,0 +1,30 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:28
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0009_task_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKeys',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chave', models.CharField(max_length=64, unique=True, verbose_name='Chave')),
+                ('impressao', models.CharField(max_length=64, verbose_name='Impressão do corpo')),
+                ('status_code', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='Status')),
+                ('resposta', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True, verbose_name='Resposta')),
+                ('cabecalhos', models.JSONField(blank=True, default=dict, verbose_name='Cabeçalhos')),
+                ('expira_em', models.DateTimeField(db_index=True, verbose_name='Expira em')),
+            ],
+            options={
+                'verbose_name': 'Chave de idempotência',
+                'verbose_name_plural': 'Chaves de idempotência',
+            },
+        ),
+    ]
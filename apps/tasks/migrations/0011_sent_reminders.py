@@ -0,0 +1,38 @@
+# Generated by Django 5.2.1 on 2026-10-19 17:42
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0010_idempotency_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SentReminders',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tarefa_id', models.BigIntegerField(verbose_name='Tarefa')),
+                ('prazo', models.DateField(verbose_name='Prazo lembrado')),
+                ('enviado_em', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Enfileirado em')),
+            ],
+            options={
+                'verbose_name': 'Lembrete enviado',
+                'verbose_name_plural': 'Lembretes enviados',
+            },
+        ),
+        migrations.DeleteModel(
+            name='ReminderWatermarks',
+        ),
+        migrations.AddIndex(
+            model_name='sentreminders',
+            index=models.Index(fields=['prazo'], name='tasks_lembretes_prazo_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='sentreminders',
+            constraint=models.UniqueConstraint(fields=('tarefa_id', 'prazo'), name='tasks_lembrete_unico'),
+        ),
+    ]
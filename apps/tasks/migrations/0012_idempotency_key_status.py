@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:11
+
+from django.db import migrations, models
+
+
+def mark_completed(apps, schema_editor):
+    # As chaves que já guardam a resposta estão concluídas
+    IdempotencyKeys = apps.get_model('tasks', 'IdempotencyKeys')
+    IdempotencyKeys.objects.filter(status_code__isnull=False).update(status='C')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0011_sent_reminders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idempotencykeys',
+            name='status',
+            field=models.CharField(choices=[('A', 'Em andamento'), ('C', 'Concluída')], default='A', max_length=1, verbose_name='Situação'),
+        ),
+        migrations.RunPython(mark_completed, migrations.RunPython.noop),
+    ]
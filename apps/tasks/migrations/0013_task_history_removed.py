@@ -0,0 +1,18 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0012_idempotency_key_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='taskhistory',
+            name='acao',
+            field=models.CharField(choices=[('criada', 'Criada'), ('atualizada', 'Atualizada'), ('movida', 'Movida'), ('removida', 'Removida')], max_length=10, verbose_name='Ação'),
+        ),
+    ]
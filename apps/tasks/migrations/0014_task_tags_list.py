@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-19 18:46
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def fill_list(apps, schema_editor):
+    # As etiquetas das tarefas que já estão em listas passam a ter a lista
+    Tasks = apps.get_model('tasks', 'Tasks')
+    TaskTags = apps.get_model('tasks', 'TaskTags')
+    in_lists = Tasks.objects.filter(lista__isnull=False)
+    TaskTags.objects.filter(tarefa_id__in=in_lists.values('id')).update(
+        lista_id=Subquery(in_lists.filter(pk=OuterRef('tarefa_id')).values('lista_id')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0013_task_history_removed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='tasktags',
+            name='tasks_etiquetas_nome_idx',
+        ),
+        migrations.AddField(
+            model_name='tasktags',
+            name='lista_id',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='Lista'),
+        ),
+        migrations.AddIndex(
+            model_name='tasktags',
+            index=models.Index(fields=['lista_id', 'nome', 'tarefa_id'], name='tasks_etiquetas_lista_idx'),
+        ),
+        migrations.RunPython(fill_list, migrations.RunPython.noop),
+    ]
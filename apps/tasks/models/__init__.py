@@ -1,3 +1,11 @@
 from .tasks import Tasks
+from .reminders import SentReminders
+from .archived import ArchivedTasks
+from .tombstones import TaskTombstones
+from .lists import TaskLists, ListMembers
+from .tags import TaskTags
+from .history import TaskHistory
+from .idempotency import IdempotencyKeys
 
-__all__ = ["Tasks"]
\ No newline at end of file
+__all__ = ["Tasks", "SentReminders", "ArchivedTasks", "TaskTombstones", "TaskLists", "ListMembers", "TaskTags",
+           "TaskHistory", "IdempotencyKeys"]
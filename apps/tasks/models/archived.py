@@ -0,0 +1,44 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+from apps.tasks.models.tasks import PRIORIDADES, STATUS
+
+
+class ArchivedTasks(models.Model):
+    """
+    Tarefas concluídas há muito tempo, movidas para fora da tabela Tasks.
+
+    Mantém o mesmo id e as mesmas colunas da tarefa original, para que a
+    listagem possa juntar as duas tabelas (?incluir_arquivadas=true) com o
+    mesmo formato de saída. Os registros são gravados pelo comando
+    archive_tasks e não são mais alterados.
+    """
+    id = models.BigIntegerField(primary_key=True, verbose_name="ID")
+    usuario = models.ForeignKey(
+        User, on_delete=models.CASCADE, verbose_name="Usuário", db_index=False)
+    titulo = models.CharField(max_length=160, verbose_name="Titulo")
+    descricao = models.TextField(verbose_name="Descrição", blank=True)
+    prioridade = models.CharField(
+        choices=PRIORIDADES, verbose_name="Prioridade", max_length=1)
+    prazo = models.DateField(verbose_name="Prazo", null=True, blank=True)
+    status = models.CharField(
+        choices=STATUS, default="C", verbose_name="Status", max_length=2)
+    criado_em = models.DateTimeField(verbose_name="Criado em")
+    atualizado_em = models.DateTimeField(verbose_name="Atualizado em")
+    concluido_em = models.DateTimeField(
+        null=True, blank=True, verbose_name="Concluído em")
+    tags = models.JSONField(default=list, blank=True, verbose_name="Etiquetas")
+    arquivado_em = models.DateTimeField(
+        auto_now_add=True, verbose_name="Arquivado em")
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Tarefa arquivada'
+        verbose_name_plural = 'Tarefas arquivadas'
+        indexes = [
+            # A leitura do arquivo é sempre por usuário, em ordem de id
+            models.Index(fields=['usuario', 'id'], name='tasks_arquivadas_usuario_idx'),
+        ]
+
+    def __str__(self):
+        return self.titulo
@@ -0,0 +1,40 @@
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+ACOES = [
+    ("criada", "Criada"),
+    ("atualizada", "Atualizada"),
+    ("movida", "Movida"),
+    ("removida", "Removida"),
+]
+
+
+class TaskHistory(models.Model):
+    """
+    Alteração de uma tarefa: quem alterou, quando e os campos alterados.
+
+    As linhas são gravadas em lote depois do commit da escrita, pelo
+    apps.tasks.services.history_service. `tarefa_id` é só o id: o histórico
+    de uma tarefa excluída continua disponível, com a ação "removida".
+    """
+    tarefa_id = models.BigIntegerField(verbose_name="Tarefa")
+    autor = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, db_index=False, verbose_name="Autor")
+    acao = models.CharField(choices=ACOES, max_length=10, verbose_name="Ação")
+    # {campo: [valor anterior, valor novo]}
+    alteracoes = models.JSONField(default=dict, encoder=DjangoJSONEncoder, verbose_name="Alterações")
+    alterado_em = models.DateTimeField(default=timezone.now, verbose_name="Alterado em")
+
+    class Meta:
+        ordering = ['-id']
+        verbose_name = 'Histórico de tarefa'
+        verbose_name_plural = 'Histórico de tarefas'
+        indexes = [
+            # O histórico de uma tarefa é lido em ordem decrescente de id (paginação por cursor)
+            models.Index(fields=['tarefa_id', 'id'], name='tasks_historico_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.tarefa_id} {self.acao} ({self.alterado_em:%Y-%m-%d %H:%M})'
@@ -0,0 +1,36 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+STATUS_CHAVE = [
+    ("A", "Em andamento"),
+    ("C", "Concluída"),
+]
+
+
+class IdempotencyKeys(models.Model):
+    """
+    Resposta guardada de um POST enviado com o cabeçalho Idempotency-Key.
+
+    A linha é gravada como em andamento antes de a requisição executar: a
+    chave é única, então ela é a trava, e só um processo executa a
+    requisição. Ao terminar, a linha passa a guardar a resposta. O cache é
+    consultado primeiro; esta tabela é o registro durável (quando o cache
+    descarta a chave ou não é compartilhado entre os processos). Linhas
+    expiradas são apagadas pelo purge_idempotency_keys (ver idempotency_service).
+    """
+    # sha256 de usuário, método, caminho e chave enviada pelo cliente
+    chave = models.CharField(max_length=64, unique=True, verbose_name="Chave")
+    # sha256 do corpo da requisição, para recusar a mesma chave com outro conteúdo
+    impressao = models.CharField(max_length=64, verbose_name="Impressão do corpo")
+    status = models.CharField(choices=STATUS_CHAVE, default="A", max_length=1, verbose_name="Situação")
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name="Status")
+    resposta = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder, verbose_name="Resposta")
+    cabecalhos = models.JSONField(default=dict, blank=True, verbose_name="Cabeçalhos")
+    expira_em = models.DateTimeField(db_index=True, verbose_name="Expira em")
+
+    class Meta:
+        verbose_name = 'Chave de idempotência'
+        verbose_name_plural = 'Chaves de idempotência'
+
+    def __str__(self):
+        return self.chave
@@ -0,0 +1,53 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+PAPEIS = [
+    ("L", "Leitor"),
+    ("E", "Editor"),
+    ("A", "Administrador")
+]
+
+# Papéis que podem alterar, concluir e excluir as tarefas da lista
+PAPEIS_EDICAO = ("E", "A")
+
+
+class TaskLists(models.Model):
+    """
+    Lista de tarefas compartilhada entre vários usuários.
+
+    Cada tarefa pertence a no máximo uma lista (Tasks.lista). Os membros, com
+    seus papéis, ficam em ListMembers; o criador entra como administrador.
+    """
+    nome = models.CharField(max_length=120, verbose_name="Nome")
+    dono = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="listas_criadas", verbose_name="Dono")
+    criado_em = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Lista de tarefas'
+        verbose_name_plural = 'Listas de tarefas'
+
+    def __str__(self):
+        return self.nome
+
+
+class ListMembers(models.Model):
+    lista = models.ForeignKey(
+        TaskLists, on_delete=models.CASCADE, related_name="membros", verbose_name="Lista")
+    usuario = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="listas", verbose_name="Usuário", db_index=False)
+    papel = models.CharField(choices=PAPEIS, default="L", max_length=1, verbose_name="Papel")
+    criado_em = models.DateTimeField(auto_now_add=True, verbose_name="Criado em")
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Membro da lista'
+        verbose_name_plural = 'Membros das listas'
+        constraints = [
+            # Também é o índice da consulta "listas do usuário" (usuario, lista)
+            models.UniqueConstraint(fields=['usuario', 'lista'], name='tasks_membro_unico'),
+        ]
+
+    def __str__(self):
+        return f'{self.usuario} em {self.lista} ({self.get_papel_display()})'
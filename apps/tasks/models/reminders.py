@@ -0,0 +1,31 @@
+from django.db import models
+from django.utils import timezone
+
+
+class SentReminders(models.Model):
+    """
+    Lembrete de prazo já enfileirado para uma tarefa.
+
+    O agendador só lembra as tarefas sem registro para o prazo atual, então
+    uma tarefa criada ou editada depois de uma execução, com prazo dentro da
+    janela, é lembrada na próxima; mudar o prazo gera um novo lembrete. A
+    restrição única (tarefa, prazo) garante que dois agendadores simultâneos
+    não enfileirem o mesmo lembrete. Os registros de prazos passados são
+    apagados pelo próprio agendador.
+    """
+    tarefa_id = models.BigIntegerField(verbose_name="Tarefa")
+    prazo = models.DateField(verbose_name="Prazo lembrado")
+    enviado_em = models.DateTimeField(default=timezone.now, verbose_name="Enfileirado em")
+
+    class Meta:
+        verbose_name = 'Lembrete enviado'
+        verbose_name_plural = 'Lembretes enviados'
+        constraints = [
+            models.UniqueConstraint(fields=['tarefa_id', 'prazo'], name='tasks_lembrete_unico'),
+        ]
+        indexes = [
+            models.Index(fields=['prazo'], name='tasks_lembretes_prazo_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tarefa_id}: {self.prazo}"
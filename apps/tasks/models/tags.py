@@ -0,0 +1,37 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class TaskTags(models.Model):
+    """
+    Índice normalizado das etiquetas das tarefas: uma linha por (tarefa, etiqueta).
+
+    A lista exibida fica em Tasks.tags; esta tabela existe para filtrar por
+    etiquetas e contá-las pelos índices compostos, nos mesmos moldes no
+    PostgreSQL e no SQLite. `usuario` é o dono da tarefa e `lista_id` a lista
+    compartilhada dela, para os filtros de quem está em listas lerem só as
+    etiquetas do próprio usuário e das listas dele. As linhas são gravadas e
+    apagadas pelo apps.tasks.services.tags_service, junto com as da tarefa.
+    """
+    usuario = models.ForeignKey(
+        User, on_delete=models.CASCADE, verbose_name="Usuário", db_index=False)
+    tarefa_id = models.BigIntegerField(verbose_name="Tarefa")
+    lista_id = models.BigIntegerField(null=True, blank=True, verbose_name="Lista")
+    nome = models.CharField(max_length=50, verbose_name="Etiqueta")
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Etiqueta da tarefa'
+        verbose_name_plural = 'Etiquetas das tarefas'
+        constraints = [
+            models.UniqueConstraint(fields=['tarefa_id', 'nome'], name='tasks_etiqueta_unica'),
+        ]
+        indexes = [
+            # Filtros e contagens das tarefas do próprio usuário: só o índice é lido
+            models.Index(fields=['usuario', 'nome', 'tarefa_id'], name='tasks_etiquetas_usuario_idx'),
+            # Filtros que incluem tarefas de listas compartilhadas (outros donos)
+            models.Index(fields=['lista_id', 'nome', 'tarefa_id'], name='tasks_etiquetas_lista_idx'),
+        ]
+
+    def __str__(self):
+        return self.nome
@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
 from django.utils import timezone
 
@@ -14,6 +16,25 @@ STATUS = [
     ("C", "Concluída")
 ]
 
+# Coluna de partição de cada estratégia de settings.TASKS_PARTITIONING
+PARTITION_KEYS = {
+    "hash": "usuario_id",
+    "range": "criado_em",
+}
+
+
+class TasksQuerySet(models.QuerySet):
+    def for_task(self, task, partition=None):
+        """
+        A linha da tarefa, filtrada pela chave primária e pela chave de partição.
+
+        Args:
+            task: Tarefa já gravada
+            partition: partition_filter() lido antes de alterar a instância
+                (padrão: o da instância como está)
+        """
+        return self.filter(pk=task.pk, **(task.partition_filter() if partition is None else partition))
+
 
 class Tasks(models.Model):
     usuario = models.ForeignKey(
@@ -31,13 +52,94 @@ class Tasks(models.Model):
         auto_now=True, verbose_name="Atualizado em")
     concluido_em = models.DateTimeField(
         null=True, blank=True, verbose_name="Concluído em")
-        
+    # Etiquetas da tarefa, lidas junto com a linha; os filtros usam o índice
+    # normalizado em TaskTags, mantido pelo tags_service
+    tags = models.JSONField(default=list, blank=True, verbose_name="Etiquetas")
+    # Lista compartilhada: os membros dela também veem a tarefa
+    lista = models.ForeignKey(
+        "tasks.TaskLists", on_delete=models.SET_NULL, null=True, blank=True,
+        related_name="tarefas", verbose_name="Lista")
+    # Hierarquia (projetos e subtarefas): caminho materializado com os ids dos
+    # ancestrais, da raiz ao pai ("12/40/"), para ler, contar e mover uma
+    # subárvore com um número fixo de consultas (ver tree_service). Sem FK no
+    # banco, para a tabela continuar podendo ser particionada.
+    pai = models.ForeignKey(
+        "self", on_delete=models.DO_NOTHING, db_constraint=False, null=True, blank=True,
+        related_name="subtarefas", verbose_name="Tarefa pai")
+    caminho = models.CharField(
+        max_length=255, default="", blank=True, editable=False, db_index=True, verbose_name="Caminho")
+    # Ordem manual do dono (arrastar e soltar): chave de índice fracionário em
+    # base 36, comparada como texto; mover uma tarefa só altera a própria linha
+    # (ver rank_service)
+    posicao = models.CharField(
+        max_length=64, default="", blank=True, editable=False, verbose_name="Posição")
+
+    objects = TasksQuerySet.as_manager()
+
+    def partition_filter(self):
+        """
+        Filtro pela chave de partição da tarefa.
+
+        Com a tabela particionada (settings.TASKS_PARTITIONING), incluir a
+        chave no WHERE faz o PostgreSQL acessar só a partição da tarefa, em vez
+        de procurar o id em todas elas. Se a chave vai mudar, leia o filtro
+        antes de alterar a instância.
+
+        Returns:
+            dict: {coluna: valor}, vazio quando a tabela não é particionada
+        """
+        key = PARTITION_KEYS.get(settings.TASKS_PARTITIONING)
+        if not key:
+            return {}
+        return {key: getattr(self, key)}
+
+    def save_changes(self, fields, partition=None):
+        """
+        Grava só os campos informados (e atualizado_em) com um UPDATE pela
+        chave primária e pela chave de partição.
+
+        Args:
+            fields: Nomes dos campos alterados
+            partition: partition_filter() lido antes de alterar a instância
+                (padrão: o da instância como está)
+        """
+        # update() não aplica o auto_now, então atualizado_em é definido aqui
+        self.atualizado_em = timezone.now()
+        values = {name: getattr(self, name) for name in fields}
+        Tasks.objects.for_task(self, partition).update(atualizado_em=self.atualizado_em, **values)
+
+    def apply_changes(self, values):
+        """
+        Aplica os valores na instância e retorna apenas os campos que mudaram.
+
+        Args:
+            values: Dicionário {campo: novo valor}, como o validated_data do serializer
+
+        Returns:
+            list[str]: Nomes dos campos alterados, prontos para save(update_fields=...)
+        """
+        changed = []
+        for name, value in values.items():
+            field = self._meta.get_field(name)
+            if field.is_relation:
+                # Compara pela chave (usuario_id) para não carregar o objeto relacionado
+                current = getattr(self, field.attname)
+                new = value.pk if isinstance(value, models.Model) else value
+            else:
+                current = getattr(self, name)
+                new = value
+
+            if current != new:
+                setattr(self, name, value)
+                changed.append(name)
+        return changed
 
     def concluir(self):
         if self.status != "C":
             self.status = "C"
             self.concluido_em = timezone.now()
-            self.save()
+            # Grava apenas as colunas alteradas
+            self.save_changes(["status", "concluido_em"])
 
     class Meta:
         ordering = ['id']
@@ -45,7 +147,16 @@ class Tasks(models.Model):
         verbose_name_plural = 'Tarefas'
         indexes = [
             models.Index(fields=['usuario', 'status']),
-            models.Index(fields=['prazo']),
+            # Índice parcial: só tarefas não concluídas, usado pelos lembretes de prazo
+            models.Index(fields=['prazo', 'id'], condition=~Q(status='C'),
+                         name='tasks_prazo_pendentes_idx'),
+            # Índice parcial: só tarefas concluídas, usado pelo arquivamento (archive_tasks)
+            models.Index(fields=['concluido_em', 'id'], condition=Q(status='C'),
+                         name='tasks_concluidas_idx'),
+            # Sincronização incremental: alterações do usuário em ordem de (atualizado_em, id)
+            models.Index(fields=['usuario', 'atualizado_em', 'id'], name='tasks_sincronizacao_idx'),
+            # Ordem manual: ?ordering=posicao e a chave seguinte/anterior ao mover
+            models.Index(fields=['usuario', 'posicao'], name='tasks_posicao_idx'),
         ]
 
     def __str__(self):
@@ -0,0 +1,31 @@
+from django.db import models
+from django.contrib.auth.models import User
+from django.utils import timezone
+
+
+class TaskTombstones(models.Model):
+    """
+    Registro de uma tarefa que saiu da lista do usuário (excluída ou arquivada).
+
+    Usado pela sincronização incremental (GET /tasks/changes/): o cliente
+    recebe os ids removidos desde o último token e os apaga da sua cópia
+    local. Os registros são gravados por apps.tasks.services.sync_service e
+    removidos após settings.SYNC_TOMBSTONE_DAYS dias (purge_tombstones).
+    """
+    usuario = models.ForeignKey(
+        User, on_delete=models.CASCADE, verbose_name="Usuário", db_index=False)
+    tarefa_id = models.BigIntegerField(verbose_name="Tarefa")
+    removido_em = models.DateTimeField(default=timezone.now, verbose_name="Removido em")
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'Tarefa removida'
+        verbose_name_plural = 'Tarefas removidas'
+        indexes = [
+            # A sincronização lê as remoções do usuário em ordem de id
+            models.Index(fields=['usuario', 'id'], name='tasks_removidas_usuario_idx'),
+            models.Index(fields=['removido_em'], name='tasks_removidas_data_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.tarefa_id} ({self.removido_em:%Y-%m-%d})'
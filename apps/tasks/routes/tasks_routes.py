@@ -1,10 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from apps.tasks.controllers.tasks_controller import TasksViewSet
+from apps.tasks.controllers.task_lists_controller import TaskListsViewSet
 
 router = DefaultRouter()
+# Registrado antes das tarefas, para que 'listas/' não seja lido como um id
+router.register('listas', TaskListsViewSet)
 router.register('', TasksViewSet)
 
 urlpatterns = [
     path('', include(router.urls))
-]
\ No newline at end of file
+]
@@ -0,0 +1,30 @@
+from rest_framework import serializers
+from apps.tasks.models.lists import PAPEIS, ListMembers, TaskLists
+from django.contrib.auth.models import User
+
+
+class TaskListSerializer(serializers.ModelSerializer):
+    dono = serializers.SlugRelatedField(slug_field='username', read_only=True)
+    # Papel do usuário autenticado na lista
+    papel = serializers.SerializerMethodField()
+
+    def get_papel(self, obj):
+        view = self.context.get('view')
+        if view is None or not hasattr(view, 'get_list_roles'):
+            return None
+        return view.get_list_roles().get(obj.pk)
+
+    class Meta:
+        model = TaskLists
+        fields = ['id', 'nome', 'dono', 'papel', 'criado_em']
+
+
+class ListMemberSerializer(serializers.ModelSerializer):
+    usuario = serializers.SlugRelatedField(queryset=User.objects.all(), slug_field='username')
+    papel = serializers.ChoiceField(choices=PAPEIS, default="L")
+    papel_display = serializers.CharField(source='get_papel_display', read_only=True)
+
+    class Meta:
+        model = ListMembers
+        fields = ['usuario', 'papel', 'papel_display', 'criado_em']
+        read_only_fields = ['criado_em']
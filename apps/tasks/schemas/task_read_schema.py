@@ -0,0 +1,64 @@
+"""
+Caminho rápido de leitura para tarefas (list e retrieve).
+
+Gera exatamente o mesmo formato do TaskSerializer, mas a partir de tuplas
+vindas de `values_list()`: sem instanciar modelos nem campos do serializer
+por linha, e com os rótulos de status e prioridade em tabelas pré-calculadas.
+"""
+from django.utils import timezone
+
+from apps.tasks.models.tasks import PRIORIDADES, STATUS
+
+# Colunas lidas do banco, na ordem esperada por serialize_task_rows
+READ_FIELDS = (
+    'id', 'status', 'prioridade', 'titulo', 'descricao', 'prazo',
+    'criado_em', 'atualizado_em', 'concluido_em', 'tags', 'lista', 'pai',
+)
+
+STATUS_LABELS = dict(STATUS)
+PRIORIDADE_LABELS = dict(PRIORIDADES)
+
+
+def _format_datetime(value, tz):
+    """Mesmo formato do DateTimeField do DRF (ISO 8601 no fuso atual, 'Z' para UTC)."""
+    if not value:
+        return None
+    value = value.astimezone(tz).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def serialize_task_rows(rows):
+    """
+    Converte tuplas de `values_list(*READ_FIELDS)` em dicionários de resposta.
+
+    Args:
+        rows: Iterável de tuplas na ordem de READ_FIELDS
+
+    Returns:
+        list[dict]: Tarefas no mesmo formato de TaskSerializer(many=True).data
+    """
+    tz = timezone.get_current_timezone()
+    status_labels = STATUS_LABELS
+    prioridade_labels = PRIORIDADE_LABELS
+    format_datetime = _format_datetime
+
+    return [
+        {
+            'id': id_,
+            'status_display': status_labels.get(status, status),
+            'prioridade_display': prioridade_labels.get(prioridade, prioridade),
+            'titulo': titulo,
+            'descricao': descricao,
+            'prazo': prazo.isoformat() if prazo else None,
+            'criado_em': format_datetime(criado_em, tz),
+            'atualizado_em': format_datetime(atualizado_em, tz),
+            'concluido_em': format_datetime(concluido_em, tz),
+            'tags': tags,
+            'lista': lista,
+            'pai': pai,
+        }
+        for (id_, status, prioridade, titulo, descricao, prazo,
+             criado_em, atualizado_em, concluido_em, tags, lista, pai) in rows
+    ]
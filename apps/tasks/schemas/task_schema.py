@@ -1,7 +1,15 @@
 from rest_framework import serializers
 from apps.tasks.models.tasks import Tasks
 from apps.tasks.models.tasks import STATUS, PRIORIDADES
+from apps.tasks.models.lists import PAPEIS_EDICAO
+from apps.tasks.services.lists_service import list_roles
+from apps.tasks.services import history_service
+from apps.tasks.services.rank_service import last_rank
+from apps.tasks.services.tree_service import InvalidMove, check_path, child_path, descendants_filter
+from apps.tasks.services.tags_service import normalize_tags, sync_task_tags
+from apps.tasks.services.sync_service import InvalidSyncToken, decode_token
 from django.contrib.auth.models import User
+from django.db import transaction
 
 
 class TaskSerializer(serializers.ModelSerializer):
@@ -30,17 +38,204 @@ class TaskSerializer(serializers.ModelSerializer):
         except User.DoesNotExist:
             raise serializers.ValidationError("Usuário não existe")
 
+    def validate_lista(self, value):
+        # Só quem pode editar a lista coloca tarefas nela
+        request = self.context.get('request')
+        if value is None or request is None:
+            return value
+
+        view = self.context.get('view')
+        roles = view.get_list_roles() if hasattr(view, 'get_list_roles') else list_roles(request.user.pk)
+        if roles.get(value.pk) not in PAPEIS_EDICAO:
+            raise serializers.ValidationError("Você não pode adicionar tarefas a esta lista.")
+        return value
+
+    def validate_tags(self, value):
+        if not isinstance(value, list):
+            raise serializers.ValidationError("Informe uma lista de etiquetas.")
+        try:
+            return normalize_tags(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+    def validate_pai(self, value):
+        # A tarefa pai precisa ser uma que o usuário pode alterar
+        view = self.context.get('view')
+        if value is None or not hasattr(view, 'get_queryset'):
+            return value
+        if not view.get_queryset(writable=True).filter(pk=value.pk).exists():
+            raise serializers.ValidationError("Tarefa pai não encontrada.")
+        try:
+            check_path(child_path(value))
+        except InvalidMove as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
     def validate(self, data):
-        if data["status"] not in dict(STATUS):
+        # A tarefa muda de pai só pelo /mover/, que atualiza a subárvore inteira
+        if self.instance is not None and "pai" in data:
+            new = data["pai"].pk if data["pai"] else None
+            if new != self.instance.pai_id:
+                raise serializers.ValidationError({"pai": "Use /mover/ para trocar a tarefa pai."})
+
+        # Uma subárvore é sempre de um só dono (ver tree_service.descendants_filter)
+        pai, usuario = data.get("pai"), data.get("usuario")
+        if self.instance is None and pai and usuario and pai.usuario_id != usuario.pk:
+            raise serializers.ValidationError({"pai": "A tarefa pai precisa ser do mesmo dono."})
+        if (self.instance is not None and usuario and usuario.pk != self.instance.usuario_id
+                and (self.instance.pai_id or Tasks.objects.filter(descendants_filter(self.instance)).exists())):
+            raise serializers.ValidationError({"usuario": "Tarefas com tarefa pai ou subtarefas não podem ser transferidas."})
+
+        # Membros de uma lista editam a tarefa, mas não a transferem de dono
+        request = self.context.get('request')
+        if (self.instance is not None and request is not None and "usuario" in data
+                and self.instance.usuario_id != request.user.pk
+                and data["usuario"].pk != self.instance.usuario_id):
+            raise serializers.ValidationError("Você não pode transferir a tarefa para outro usuário.")
+
+        # Em atualizações parciais (PATCH) só os campos enviados são validados
+        if "status" in data and data["status"] not in dict(STATUS):
             raise serializers.ValidationError("Status inválido")
 
-        elif data["prioridade"] not in dict(PRIORIDADES):
-            raise serializers.ValidationError("Prioridade inválida")
+        elif "prioridade" in data or not self.partial:
+            if data.get("prioridade") not in dict(PRIORIDADES):
+                raise serializers.ValidationError("Prioridade inválida")
 
         return data
     
     
+    def create(self, validated_data):
+        validated_data['caminho'] = child_path(validated_data.get('pai'))
+        validated_data['posicao'] = last_rank(validated_data['usuario'].pk)
+        with transaction.atomic():
+            task = super().create(validated_data)
+            if task.tags:
+                sync_task_tags(task)
+            fields = [name for name in validated_data if name not in ('caminho', 'posicao')]
+            history_service.record(history_service.CRIADA, [
+                (task.pk, {name: [None, value] for name, value in history_service.field_values(task, fields).items()}),
+            ], self._author_id())
+        return task
+
+    def update(self, instance, validated_data):
+        """
+        Grava apenas as colunas alteradas (mais atualizado_em), em vez da linha inteira.
+        Se nada mudou, nenhuma escrita é feita.
+        """
+        previous_owner_id = instance.usuario_id
+        # A chave de partição como está no banco, antes de uma transferência de dono
+        partition = instance.partition_filter()
+        before = history_service.field_values(instance, validated_data)
+        changed = instance.apply_changes(validated_data)
+        changes = history_service.diff(before, instance, changed)
+        if 'usuario' in changed:
+            # A ordem manual é por dono: a tarefa transferida vai para o fim da ordem do novo dono
+            instance.posicao = last_rank(instance.usuario_id)
+            changed.append('posicao')
+        # A escrita e o histórico na mesma transação: o histórico só é gravado depois do commit
+        with transaction.atomic():
+            if changed:
+                instance.save_changes(changed, partition)
+            if 'tags' in changed or 'usuario' in changed or 'lista' in changed:
+                sync_task_tags(instance, previous_owner_id)
+            history_service.record(history_service.ATUALIZADA, [(instance.pk, changes)], self._author_id())
+        return instance
+
+    def _author_id(self):
+        request = self.context.get('request')
+        return request.user.pk if request is not None else None
+
     class Meta:
         model = Tasks
-        fields = '__all__'
-        extra_fields = ['status_display', 'prioridade_display']
\ No newline at end of file
+        # O caminho da hierarquia e a chave da ordem manual são internos; a API
+        # expõe o pai, ?ordering=posicao e o /posicao/
+        exclude = ['caminho', 'posicao']
+        extra_fields = ['status_display', 'prioridade_display']
+
+
+class BulkCompleteFilterSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=[s for s in STATUS if s[0] != "C"], required=False)
+    prioridade = serializers.ChoiceField(choices=PRIORIDADES, required=False)
+    prazo_ate = serializers.DateField(required=False)
+
+
+class BulkCompleteSerializer(serializers.Serializer):
+    """
+    Entrada da conclusão em lote: uma lista de ids ou um filtro, nunca os dois.
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), required=False, allow_empty=False)
+    filtro = BulkCompleteFilterSerializer(required=False)
+
+    def validate(self, data):
+        if ("ids" in data) == ("filtro" in data):
+            raise serializers.ValidationError("Informe 'ids' ou 'filtro'.")
+        return data
+
+
+class SyncQuerySerializer(serializers.Serializer):
+    """
+    Parâmetros da sincronização incremental (GET /tasks/changes/).
+
+    O token é devolvido já decodificado; um token expirado (ou emitido antes
+    de o usuário do contexto `user_id` entrar em uma lista) gera o código
+    'token_expirado', e o cliente deve sincronizar de novo sem token.
+    """
+    token = serializers.CharField(required=False)
+    limite = serializers.IntegerField(min_value=1, max_value=1000, default=500)
+
+    def validate_token(self, value):
+        try:
+            return decode_token(value, self.context.get('user_id'))
+        except InvalidSyncToken as e:
+            raise serializers.ValidationError(str(e), code='token_expirado' if e.expired else 'invalid')
+
+
+class MoveTaskSerializer(serializers.Serializer):
+    """Entrada do /mover/: o novo pai, ou null para tornar a tarefa uma raiz."""
+    pai = serializers.IntegerField(min_value=1, allow_null=True)
+
+
+class HistoryQuerySerializer(serializers.Serializer):
+    """Parâmetros do /historico/: o cursor `antes` (devolvido em `proximo`) e o tamanho da página."""
+    antes = serializers.IntegerField(min_value=1, required=False)
+    limite = serializers.IntegerField(min_value=1, max_value=200, default=50)
+
+
+class ExportQuerySerializer(serializers.Serializer):
+    """Parâmetros da exportação compacta: o cursor `apos` (devolvido em `proximo`) e o tamanho da página."""
+    apos = serializers.IntegerField(min_value=0, required=False)
+    limite = serializers.IntegerField(min_value=1, max_value=10000, default=5000)
+
+
+class PositionSerializer(serializers.Serializer):
+    """Entrada do /posicao/: a tarefa que fica antes (`apos`) e/ou a que fica depois (`antes`)."""
+    apos = serializers.IntegerField(min_value=1, required=False)
+    antes = serializers.IntegerField(min_value=1, required=False)
+
+    def validate(self, data):
+        if not data:
+            raise serializers.ValidationError("Informe 'apos' e/ou 'antes'.")
+        return data
+
+
+def _tag_list(value):
+    try:
+        return normalize_tags(value.split(','))
+    except ValueError as e:
+        raise serializers.ValidationError(str(e))
+
+
+class TagFilterSerializer(serializers.Serializer):
+    """
+    Filtros de etiquetas da listagem, separadas por vírgula:
+    `tags` (qualquer uma delas) e `tags_todas` (todas elas).
+    """
+    tags = serializers.CharField(required=False)
+    tags_todas = serializers.CharField(required=False)
+
+    def validate_tags(self, value):
+        return _tag_list(value)
+
+    def validate_tags_todas(self, value):
+        return _tag_list(value)
@@ -0,0 +1,97 @@
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.tasks.models.archived import ArchivedTasks
+from apps.tasks.models.tasks import Tasks
+from apps.tasks.services.sync_service import record_removed_tasks
+from apps.tasks.services.tags_service import delete_task_tags
+
+# Colunas copiadas da tarefa para o arquivo (o id original é mantido)
+ARCHIVE_FIELDS = (
+    'id', 'usuario_id', 'titulo', 'descricao', 'prioridade', 'prazo', 'status',
+    'criado_em', 'atualizado_em', 'concluido_em', 'tags',
+)
+
+
+def archivable_tasks(cutoff):
+    """
+    Tarefas concluídas antes de `cutoff` que não têm subtarefas na tabela.
+
+    O filtro `status='C'` corresponde à condição do índice parcial
+    tasks_concluidas_idx (concluido_em, id), que atende também a ordenação.
+
+    O arquivo não guarda a hierarquia, então uma tarefa com subtarefas fica
+    até todas elas terem sido arquivadas: a árvore sai das folhas para a
+    raiz, e nenhuma subtarefa fica apontando para um pai que não existe mais.
+    Basta olhar os filhos diretos, já que um filho com subtarefas também não
+    é arquivado.
+    """
+    children = Tasks.objects.filter(usuario_id=OuterRef('usuario_id'), pai_id=OuterRef('pk'))
+    return Tasks.objects.filter(status='C', concluido_em__lt=cutoff).filter(~Exists(children))
+
+
+def archive_completed_tasks(days=180, batch_size=1000, max_batches=None, pause=0):
+    """
+    Move para ArchivedTasks as tarefas concluídas há mais de `days` dias.
+
+    Percorre as candidatas em lotes paginados por (concluido_em, id). Cada lote
+    é copiado e apagado da tabela principal na mesma transação, então uma
+    interrupção não perde nem duplica tarefas, e a próxima execução continua
+    a partir das que restaram. Tarefas com subtarefas são puladas até as
+    subtarefas saírem (ver archivable_tasks). As linhas são bloqueadas com SKIP LOCKED
+    (no PostgreSQL) para não esperar por tarefas sendo editadas.
+
+    Args:
+        days: Idade mínima (em dias desde a conclusão) para arquivar
+        batch_size: Tarefas por lote/transação
+        max_batches: Limite de lotes nesta execução (None = até acabar)
+        pause: Segundos de espera entre lotes (alivia réplicas e o autovacuum)
+
+    Returns:
+        tuple[int, int]: Quantidade de tarefas arquivadas e de lotes processados
+    """
+    cutoff = timezone.now() - timedelta(days=days)
+    queryset = archivable_tasks(cutoff).order_by('concluido_em', 'id')
+    last_concluido, last_id = None, 0
+    archived = batches = 0
+
+    while max_batches is None or batches < max_batches:
+        batch_queryset = queryset
+        if last_concluido is not None:
+            batch_queryset = queryset.filter(
+                Q(concluido_em__gt=last_concluido) | Q(concluido_em=last_concluido, id__gt=last_id)
+            )
+
+        with transaction.atomic():
+            rows = list(
+                batch_queryset.select_for_update(skip_locked=True).values(*ARCHIVE_FIELDS, 'lista_id')[:batch_size]
+            )
+            if not rows:
+                break
+
+            # O arquivo não guarda a lista: a tarefa arquivada fica só com o dono
+            lists = [row.pop('lista_id') for row in rows]
+            ArchivedTasks.objects.bulk_create(
+                [ArchivedTasks(**row) for row in rows],
+                ignore_conflicts=True,
+            )
+            Tasks.objects.filter(pk__in=[row['id'] for row in rows]).delete()
+            # As etiquetas continuam em ArchivedTasks.tags, mas saem dos filtros e contagens
+            delete_task_tags((row['id'], row['usuario_id']) for row in rows)
+            # Para a sincronização, a tarefa arquivada saiu da lista do usuário
+            record_removed_tasks((row['id'], row['usuario_id'], lista_id) for row, lista_id in zip(rows, lists))
+
+        last_concluido, last_id = rows[-1]['concluido_em'], rows[-1]['id']
+        archived += len(rows)
+        batches += 1
+
+        if len(rows) < batch_size:
+            break
+        if pause:
+            time.sleep(pause)
+
+    return archived, batches
@@ -0,0 +1,46 @@
+from django.db import transaction
+
+from apps.tasks.services.lists_service import task_viewers
+from common.events.broker import get_broker
+
+# Tipos de evento enviados pelo stream /api/v1/tasks/events/
+CRIADA = 'criada'
+ATUALIZADA = 'atualizada'
+CONCLUIDA = 'concluida'
+REMOVIDA = 'removida'
+
+
+def publish_task_event(event_type, rows):
+    """
+    Avisa as conexões em tempo real do dono e dos membros da lista de cada
+    tarefa que as tarefas mudaram.
+
+    A publicação acontece só depois do commit, para que o cliente que reagir
+    ao evento (ex: chamando /tasks/changes/) já encontre a alteração. Uma
+    falha do backend de eventos é registrada no log e não afeta a requisição.
+
+    Args:
+        event_type: CRIADA, ATUALIZADA, CONCLUIDA ou REMOVIDA
+        rows: Iterável de (id da tarefa, usuario_id, lista_id)
+    """
+    rows = list(rows)
+
+    def publish():
+        broker = get_broker()
+        for usuario_id, ids in task_viewers(rows).items():
+            broker.publish(usuario_id, event_type, {'ids': ids})
+
+    transaction.on_commit(publish, robust=True)
+
+
+def publish_removed(user_ids, ids):
+    """Avisa usuários que deixaram de ver as tarefas (ex: tiradas de uma lista)."""
+    user_ids, ids = list(user_ids), list(ids)
+
+    def publish():
+        broker = get_broker()
+        for usuario_id in user_ids:
+            broker.publish(usuario_id, REMOVIDA, {'ids': ids})
+
+    if user_ids:
+        transaction.on_commit(publish, robust=True)
@@ -0,0 +1,56 @@
+import csv
+
+from apps.tasks.models.tasks import PRIORIDADES, STATUS
+
+EXPORT_FIELDS = [
+    'id', 'titulo', 'descricao', 'prioridade', 'prazo', 'status',
+    'criado_em', 'atualizado_em', 'concluido_em',
+]
+
+_LABELS = {
+    'prioridade': dict(PRIORIDADES),
+    'status': dict(STATUS),
+}
+
+
+class _Echo:
+    """Buffer que apenas devolve o que foi escrito, para o csv.writer gerar linhas."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(queryset, chunk_size=2000, rows_per_chunk=500):
+    """
+    Gera o CSV das tarefas aos poucos, sem carregar tudo em memória.
+
+    As linhas são agrupadas em blocos para que o streaming (e a compressão,
+    que descarrega a cada bloco) não trabalhe com pedaços minúsculos.
+
+    Args:
+        queryset: Tarefas a exportar (já filtradas pelo usuário)
+        chunk_size: Quantidade de linhas lidas do banco por vez
+        rows_per_chunk: Quantidade de linhas do CSV por bloco gerado
+
+    Yields:
+        str: Blocos do CSV, começando pelo cabeçalho
+    """
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+
+    rows = queryset.order_by('id').values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+    prioridade_index = EXPORT_FIELDS.index('prioridade')
+    status_index = EXPORT_FIELDS.index('status')
+
+    buffer = []
+    for row in rows:
+        row = list(row)
+        row[prioridade_index] = _LABELS['prioridade'].get(row[prioridade_index], row[prioridade_index])
+        row[status_index] = _LABELS['status'].get(row[status_index], row[status_index])
+        buffer.append(writer.writerow(row))
+        if len(buffer) >= rows_per_chunk:
+            yield ''.join(buffer)
+            buffer = []
+
+    if buffer:
+        yield ''.join(buffer)
@@ -0,0 +1,95 @@
+"""
+Histórico de alterações das tarefas (quem alterou o quê).
+
+As alterações de cada escrita são gravadas com um único bulk_create logo
+depois do commit da transação dela (transaction.on_commit): uma transação
+desfeita não deixa histórico, e nada fica só na memória do processo. Uma
+falha ao gravar o histórico é registrada no log e não afeta a resposta, pois
+a escrita da tarefa já foi confirmada. Por isso record() é chamado depois da
+escrita e dentro da mesma transaction.atomic(): sem ATOMIC_REQUESTS, fora de
+uma transação o on_commit executa na hora.
+"""
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.tasks.models.history import TaskHistory
+
+logger = logging.getLogger(__name__)
+
+CRIADA = 'criada'
+ATUALIZADA = 'atualizada'
+MOVIDA = 'movida'
+REMOVIDA = 'removida'
+
+
+def field_values(task, names):
+    """
+    Valores atuais dos campos da tarefa, prontos para o histórico.
+
+    Campos relacionados viram a chave (usuario -> usuario_id), para não
+    carregar o objeto relacionado.
+    """
+    values = {}
+    for name in names:
+        field = task._meta.get_field(name)
+        values[name] = getattr(task, field.attname)
+    return values
+
+
+def diff(before, task, names):
+    """{campo: [valor anterior, valor novo]} dos campos alterados."""
+    after = field_values(task, names)
+    return {name: [before[name], after[name]] for name in names}
+
+
+def record(action, changes, author_id):
+    """
+    Registra alterações de tarefas para serem gravadas depois do commit.
+
+    Args:
+        action: CRIADA, ATUALIZADA, MOVIDA ou REMOVIDA
+        changes: Iterável de (id da tarefa, {campo: [anterior, novo]})
+        author_id: Usuário que fez a alteração (None para o sistema)
+    """
+    if not settings.TASK_HISTORY_ENABLED:
+        return
+
+    now = timezone.now()
+    entries = [
+        TaskHistory(tarefa_id=task_id, autor_id=author_id, acao=action, alteracoes=fields, alterado_em=now)
+        for task_id, fields in changes if fields
+    ]
+    if entries:
+        transaction.on_commit(lambda: _save(entries))
+
+
+def _save(entries):
+    try:
+        TaskHistory.objects.bulk_create(entries)
+    except Exception:
+        logger.exception('Falha ao gravar %s alterações no histórico de tarefas', len(entries))
+
+
+def task_history(task_id, before_id=None, limit=50):
+    """
+    Uma página do histórico da tarefa, da alteração mais recente para a mais
+    antiga, por cursor (id < before_id) no índice (tarefa_id, id).
+
+    Returns:
+        tuple: (lista de dicionários, id para a próxima página ou None)
+    """
+    queryset = TaskHistory.objects.filter(tarefa_id=task_id)
+    if before_id is not None:
+        queryset = queryset.filter(id__lt=before_id)
+
+    rows = list(
+        queryset.order_by('-id').values('id', 'acao', 'alteracoes', 'alterado_em', 'autor__username')[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    for row in rows:
+        row['autor'] = row.pop('autor__username')
+    return rows, rows[-1]['id'] if has_more else None
@@ -0,0 +1,147 @@
+"""
+Execução única de POSTs enviados com o cabeçalho Idempotency-Key.
+
+Um cliente que repete a requisição (ex: app móvel em rede instável) com a
+mesma chave recebe a resposta guardada da primeira execução, por até
+IDEMPOTENCY_KEY_TTL_SECONDS, sem que a escrita aconteça de novo.
+
+A chave é gravada em IdempotencyKeys como em andamento antes de a requisição
+executar; a chave única da tabela é a trava, então só um processo a executa.
+Uma repetição que chega enquanto ela está em andamento recebe KeyInUse (409)
+na hora, sem esperar: o cliente repete mais tarde e recebe a resposta
+guardada. Uma execução abandonada (processo que morreu) libera a chave depois
+de IDEMPOTENCY_LOCK_SECONDS. A resposta fica no cache e na tabela; o cache é
+lido primeiro e a tabela é o fallback quando o cache descartou a chave ou é
+local de outro processo.
+
+Respostas 5xx e exceções liberam a chave, para a repetição tentar de novo.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.tasks.models.idempotency import IdempotencyKeys
+
+HEADER = 'Idempotency-Key'
+KEY_MAX_LENGTH = 255
+# Cabeçalhos da resposta original repetidos na resposta guardada
+REPLAYED_HEADERS = ('Location',)
+
+
+class KeyInUse(Exception):
+    """A requisição original com a mesma chave ainda está em andamento."""
+
+
+class KeyMismatch(Exception):
+    """A chave já foi usada com outro corpo de requisição."""
+
+
+def scoped_key(user_id, method, path, key):
+    """Chave guardada: a do cliente vale só para o mesmo usuário, método e caminho."""
+    return hashlib.sha256(f'{user_id}:{method}:{path}:{key}'.encode()).hexdigest()
+
+
+def fingerprint(body):
+    return hashlib.sha256(body).hexdigest()
+
+
+def _result_cache_key(key):
+    return f'idempotencia:{key}'
+
+
+def _load(key):
+    """Resposta guardada da chave na tabela (o cache não a tem), devolvida também ao cache."""
+    row = (IdempotencyKeys.objects.filter(chave=key, status='C', expira_em__gt=timezone.now())
+           .values('impressao', 'status_code', 'resposta', 'cabecalhos', 'expira_em').first())
+    if row is None:
+        return None
+    stored = {'impressao': row['impressao'], 'status': row['status_code'],
+              'dados': row['resposta'], 'cabecalhos': row['cabecalhos']}
+    remaining = (row['expira_em'] - timezone.now()).total_seconds()
+    cache.set(_result_cache_key(key), stored, max(int(remaining), 1))
+    return stored
+
+
+def _claim(key, body_fingerprint):
+    """Grava a chave como em andamento; False se ela já existe (em andamento ou concluída)."""
+    now = timezone.now()
+    # Uma resposta vencida, ou uma execução abandonada (processo que morreu)
+    # depois de IDEMPOTENCY_LOCK_SECONDS, libera a chave
+    IdempotencyKeys.objects.filter(chave=key, expira_em__lte=now).delete()
+    try:
+        with transaction.atomic():
+            IdempotencyKeys.objects.create(
+                chave=key, impressao=body_fingerprint, status='A',
+                expira_em=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS))
+    except IntegrityError:
+        return False
+    return True
+
+
+def _release(key):
+    IdempotencyKeys.objects.filter(chave=key, status='A').delete()
+
+
+def _save(key, body_fingerprint, response):
+    ttl = settings.IDEMPOTENCY_KEY_TTL_SECONDS
+    headers = {name: response[name] for name in REPLAYED_HEADERS if name in response}
+    stored = {'impressao': body_fingerprint, 'status': response.status_code,
+              'dados': response.data, 'cabecalhos': headers}
+    IdempotencyKeys.objects.filter(chave=key).update(
+        status='C', status_code=response.status_code, resposta=response.data, cabecalhos=headers,
+        expira_em=timezone.now() + timedelta(seconds=ttl))
+    cache.set(_result_cache_key(key), stored, ttl)
+
+
+def execute(key, body_fingerprint, call):
+    """
+    Executa `call` uma única vez por chave, ou devolve a resposta guardada.
+
+    Args:
+        key: Resultado de scoped_key()
+        body_fingerprint: Resultado de fingerprint() do corpo da requisição
+        call: Função que executa a requisição e retorna a Response do DRF
+
+    Returns:
+        tuple: (Response da execução ou None, resposta guardada ou None)
+
+    Raises:
+        KeyMismatch: A chave já foi usada com outro corpo
+        KeyInUse: A requisição original com a mesma chave ainda está em andamento
+    """
+    stored = cache.get(_result_cache_key(key))
+    if stored is None and not _claim(key, body_fingerprint):
+        # A chave já está na tabela: concluída (a resposta é lida dela) ou em andamento
+        stored = _load(key)
+        if stored is None:
+            raise KeyInUse
+    if stored is not None:
+        if stored['impressao'] != body_fingerprint:
+            raise KeyMismatch
+        return None, stored
+
+    try:
+        response = call()
+    except Exception:
+        _release(key)
+        raise
+    if response.status_code >= 500:
+        _release(key)
+    else:
+        _save(key, body_fingerprint, response)
+    return response, None
+
+
+def purge_expired():
+    """
+    Apaga da tabela as chaves expiradas (no cache, elas expiram sozinhas).
+
+    Returns:
+        int: Quantidade de chaves apagadas
+    """
+    deleted, _ = IdempotencyKeys.objects.filter(expira_em__lte=timezone.now()).delete()
+    return deleted
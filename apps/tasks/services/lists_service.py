@@ -0,0 +1,207 @@
+"""
+Listas compartilhadas: papéis dos membros e visibilidade das tarefas.
+
+Um usuário vê as próprias tarefas e as das listas em que é membro. Os papéis
+do usuário ({lista_id: papel}) ficam em cache e são lidos uma vez por
+requisição; com eles a visibilidade vira um único filtro indexado
+(`usuario_id = X OR lista_id IN (...)`), sem JOIN com os membros e sem
+consultas por objeto nas permissões.
+
+Com a tabela particionada por usuário, o OR impede o PostgreSQL de podar as
+partições. Por isso as leituras de várias linhas usam visible_branches: as
+tarefas do usuário (só a partição dele) e as das listas (o índice de lista
+de cada partição) em consultas separadas, unidas com UNION ALL. O filtro
+com OR fica para as escritas e agregações, que precisam de um único queryset.
+
+Toda alteração de membros passa pelas funções deste módulo, que invalidam o
+cache dos usuários afetados. Com vários processos, o cache precisa ser
+compartilhado (ex: Redis); TASK_LISTS_CACHE_SECONDS limita a defasagem.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from apps.tasks.models.lists import PAPEIS_EDICAO, ListMembers, TaskLists
+from apps.tasks.models.tags import TaskTags
+from apps.tasks.models.tasks import Tasks
+
+
+def _roles_cache_key(user_id):
+    return f'tasks:listas:{user_id}'
+
+
+def list_roles(user_id):
+    """
+    Papéis do usuário nas listas de que participa.
+
+    Returns:
+        dict[int, str]: {lista_id: papel}
+    """
+    key = _roles_cache_key(user_id)
+    roles = cache.get(key)
+    if roles is None:
+        roles = dict(ListMembers.objects.filter(usuario_id=user_id).values_list('lista_id', 'papel'))
+        cache.set(key, roles, settings.TASK_LISTS_CACHE_SECONDS)
+    return roles
+
+
+def invalidate_list_roles(user_ids):
+    cache.delete_many([_roles_cache_key(user_id) for user_id in user_ids])
+
+
+def visible_filter(user_id, roles, writable=False):
+    """
+    Filtro das tarefas que o usuário pode ver (ou alterar, com writable=True).
+
+    Args:
+        user_id: Id do usuário
+        roles: Resultado de list_roles(user_id)
+        writable: Considera só as listas em que o papel permite edição
+    """
+    lists = _visible_lists(roles, writable)
+    condition = Q(usuario_id=user_id)
+    if lists:
+        condition |= Q(lista_id__in=lists)
+    return condition
+
+
+def _visible_lists(roles, writable=False):
+    return [lista_id for lista_id, papel in roles.items() if not writable or papel in PAPEIS_EDICAO]
+
+
+def visible_branches(queryset, user_id, roles):
+    """
+    As tarefas do queryset visíveis ao usuário, sem o OR de visible_filter.
+
+    Returns:
+        list[QuerySet]: As tarefas do usuário e, se ele está em listas, as das
+        listas que são de outros donos (sem repetir as dele)
+    """
+    branches = [queryset.filter(usuario_id=user_id)]
+    lists = _visible_lists(roles)
+    if lists:
+        branches.append(queryset.filter(lista_id__in=lists).exclude(usuario_id=user_id))
+    return branches
+
+
+def union_all(querysets):
+    """
+    Une os querysets com UNION ALL (um só, quando há um).
+
+    O resultado só aceita order_by, values_list e fatias; campos do order_by
+    precisam estar no values_list.
+    """
+    querysets = [queryset.order_by() for queryset in querysets]
+    if len(querysets) == 1:
+        return querysets[0]
+    return querysets[0].union(*querysets[1:], all=True)
+
+
+def task_viewers(rows):
+    """
+    Quem vê cada tarefa: o dono e os membros da lista dela, em uma consulta.
+
+    Args:
+        rows: Iterável de (id da tarefa, usuario_id, lista_id)
+
+    Returns:
+        dict[int, list[int]]: {usuario_id: [ids das tarefas]}
+    """
+    rows = list(rows)
+    members = defaultdict(list)
+    list_ids = {lista_id for _, _, lista_id in rows if lista_id}
+    if list_ids:
+        for lista_id, usuario_id in ListMembers.objects.filter(lista_id__in=list_ids).values_list('lista_id', 'usuario_id'):
+            members[lista_id].append(usuario_id)
+
+    viewers = defaultdict(list)
+    for task_id, usuario_id, lista_id in rows:
+        for viewer in {usuario_id, *members.get(lista_id, ())}:
+            viewers[viewer].append(task_id)
+    return viewers
+
+
+def hidden_from_members(task, previous_list_id):
+    """
+    Membros da lista anterior que deixam de ver a tarefa após ela mudar de lista.
+
+    Returns:
+        list[int]: Ids dos usuários (o dono e os membros da lista nova continuam vendo)
+    """
+    keep = {task.usuario_id}
+    if task.lista_id:
+        keep.update(ListMembers.objects.filter(lista_id=task.lista_id).values_list('usuario_id', flat=True))
+    previous = ListMembers.objects.filter(lista_id=previous_list_id).values_list('usuario_id', flat=True)
+    return [user_id for user_id in previous if user_id not in keep]
+
+
+def create_list(user, nome):
+    """Cria a lista com o usuário como dono e administrador."""
+    with transaction.atomic():
+        task_list = TaskLists.objects.create(nome=nome, dono=user)
+        ListMembers.objects.create(lista=task_list, usuario=user, papel='A')
+    invalidate_list_roles([user.pk])
+    return task_list
+
+
+def add_member(task_list, user, papel):
+    """
+    Adiciona o usuário à lista ou altera o seu papel.
+
+    As tarefas da lista não mudam ao receber um membro: os tokens de
+    sincronização que ele já tinha passam a ser recusados (ver
+    sync_service.decode_token), para ele receber as tarefas da lista em uma
+    sincronização completa.
+
+    Returns:
+        ListMembers: O membro criado ou atualizado
+    """
+    member, _ = ListMembers.objects.update_or_create(lista=task_list, usuario=user, defaults={'papel': papel})
+    invalidate_list_roles([user.pk])
+    return member
+
+
+def remove_member(task_list, user_id):
+    """
+    Remove o usuário da lista.
+
+    As tarefas da lista que não são dele deixam de ser visíveis e são
+    registradas como removidas para a sincronização incremental.
+
+    Returns:
+        bool: Se o usuário era membro
+    """
+    from apps.tasks.services.sync_service import record_tombstones
+
+    with transaction.atomic():
+        deleted, _ = ListMembers.objects.filter(lista=task_list, usuario_id=user_id).delete()
+        if deleted:
+            hidden = Tasks.objects.filter(lista=task_list).exclude(usuario_id=user_id).values_list('id', flat=True)
+            record_tombstones((task_id, user_id) for task_id in hidden)
+    invalidate_list_roles([user_id])
+    return bool(deleted)
+
+
+def delete_list(task_list):
+    """
+    Exclui a lista; as tarefas dela voltam a ser visíveis só para os donos.
+    """
+    from apps.tasks.services.sync_service import record_tombstones
+
+    task_list_id = task_list.pk
+    with transaction.atomic():
+        member_ids = list(task_list.membros.values_list('usuario_id', flat=True))
+        tasks = list(Tasks.objects.filter(lista=task_list).values_list('id', 'usuario_id'))
+        record_tombstones(
+            (task_id, member_id)
+            for task_id, owner_id in tasks
+            for member_id in member_ids
+            if member_id != owner_id
+        )
+        task_list.delete()
+        # As etiquetas das tarefas saem do índice da lista junto com ela
+        TaskTags.objects.filter(lista_id=task_list_id).update(lista_id=None)
+    invalidate_list_roles(member_ids)
@@ -0,0 +1,370 @@
+"""
+Conversão online da tabela de tarefas em uma tabela particionada (PostgreSQL).
+
+A conversão é feita em etapas, sem parar a aplicação:
+
+1. prepare: cria a tabela particionada `<tabela>_part` (mesmas colunas, índices
+   e FKs, com a chave de partição na chave primária) e um trigger na tabela
+   atual que replica nela cada INSERT/UPDATE/DELETE a partir desse momento;
+2. backfill: copia as linhas existentes em lotes por faixa de id; cada lote é
+   uma transação curta, e a cópia pode ser retomada de onde parou;
+3. swap: com as escritas bloqueadas, confere as contagens e troca os nomes
+   das tabelas, índices e constraints numa única transação. A tabela antiga
+   fica como `<tabela>_old` até o drop-old.
+
+Estratégias (settings.TASKS_PARTITIONING):
+
+- hash: por usuario_id, em N partições. Todas as consultas do TasksViewSet
+  filtram pelo usuário, então cada uma acessa uma única partição;
+- range: por mês de criado_em. Ajuda a descartar meses antigos, mas as
+  consultas por usuário precisam olhar todas as partições.
+
+A chave primária da tabela particionada é (id, chave de partição), então
+nenhuma tabela pode ter FK para as tarefas: o prepare recusa a conversão
+nesse caso. Por isso as tabelas ligadas às tarefas (histórico, etiquetas,
+lembretes, remoções e o próprio `pai`) guardam só o id da tarefa, sem
+constraint no banco, e quem exclui tarefas apaga ou mantém essas linhas
+explicitamente (sync_service.delete_tasks).
+"""
+import re
+import time
+from datetime import date
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.tasks.models.tasks import PARTITION_KEYS, Tasks
+
+TABLE = Tasks._meta.db_table
+PART_TABLE = f'{TABLE}_part'
+OLD_TABLE = f'{TABLE}_old'
+SEQUENCE = f'{PART_TABLE}_id_seq'
+SYNC_FUNCTION = f'{PART_TABLE}_sync'
+
+# Sufixo dos índices/constraints da tabela nova até o swap (nomes são únicos por schema)
+NEW_SUFFIX = '_p'
+OLD_SUFFIX = '_old'
+
+STRATEGIES = tuple(PARTITION_KEYS)
+
+
+def suffixed(name, suffix):
+    """Nome com sufixo, respeitando o limite de 63 caracteres do PostgreSQL."""
+    return name[:63 - len(suffix)] + suffix
+
+
+def add_months(day, months):
+    """Primeiro dia do mês `months` meses depois do mês de `day`."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_partitions(first, last):
+    """
+    Partições mensais que cobrem de `first` até `last` (inclusive).
+
+    Returns:
+        list[tuple[str, date, date]]: (nome, início, fim exclusivo)
+    """
+    partitions = []
+    start = add_months(first, 0)
+    while start <= last:
+        end = add_months(start, 1)
+        partitions.append((f'{TABLE}_y{start.year}m{start.month:02d}', start, end))
+        start = end
+    return partitions
+
+
+def partition_sql(parent, strategy, partitions=16, first=None, last=None):
+    """CREATE TABLE das partições de `parent` (hash: N partições; range: um mês cada)."""
+    if strategy == 'hash':
+        return [
+            f'CREATE TABLE IF NOT EXISTS {TABLE}_p{remainder} PARTITION OF {parent} '
+            f'FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})'
+            for remainder in range(partitions)
+        ]
+    return [
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {parent} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        for name, start, end in month_partitions(first, last)
+    ]
+
+
+def index_sql(indexes):
+    """
+    Recria na tabela nova os índices da atual, com o sufixo NEW_SUFFIX.
+
+    Args:
+        indexes: [(nome, definição)] como retornado por pg_get_indexdef
+    """
+    statements = []
+    for name, definition in indexes:
+        statements.append(re.sub(
+            r'^(CREATE (?:UNIQUE )?INDEX )\S+( ON (?:ONLY )?)\S+',
+            lambda match: f'{match.group(1)}{suffixed(name, NEW_SUFFIX)}{match.group(2)}{PART_TABLE}',
+            definition,
+        ))
+    return statements
+
+
+def create_sql(strategy, indexes, foreign_keys, partitions=16, first=None, last=None):
+    """
+    SQL da etapa prepare: tabela particionada, partições, índices, FKs e trigger.
+
+    Args:
+        strategy: 'hash' ou 'range'
+        indexes: Índices da tabela atual, exceto a chave primária
+        foreign_keys: [(nome, definição)] das FKs da tabela atual
+        partitions: Quantidade de partições (hash)
+        first, last: Meses da primeira e da última partição (range)
+    """
+    key = PARTITION_KEYS[strategy]
+    method = 'HASH' if strategy == 'hash' else 'RANGE'
+    statements = [
+        f'CREATE SEQUENCE {SEQUENCE}',
+        # LIKE copia colunas, NOT NULL, CHECKs e defaults, mas não a identidade do id
+        f'CREATE TABLE {PART_TABLE} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY {method} ({key})',
+        f"ALTER TABLE {PART_TABLE} ALTER COLUMN id SET DEFAULT nextval('{SEQUENCE}')",
+        f'ALTER SEQUENCE {SEQUENCE} OWNED BY {PART_TABLE}.id',
+        # A chave primária de uma tabela particionada precisa conter a chave de partição
+        f'ALTER TABLE {PART_TABLE} ADD CONSTRAINT {suffixed(TABLE + "_pkey", NEW_SUFFIX)} PRIMARY KEY (id, {key})',
+        *partition_sql(PART_TABLE, strategy, partitions, first, last),
+    ]
+    if strategy == 'range':
+        # Linhas fora dos meses criados (ex.: o extend não rodou) não falham
+        statements.append(f'CREATE TABLE IF NOT EXISTS {TABLE}_default PARTITION OF {PART_TABLE} DEFAULT')
+    statements += index_sql(indexes)
+    statements += [
+        f'ALTER TABLE {PART_TABLE} ADD CONSTRAINT {suffixed(name, NEW_SUFFIX)} {definition}'
+        for name, definition in foreign_keys
+    ]
+    statements += sync_trigger_sql(strategy)
+    return statements
+
+
+def sync_trigger_sql(strategy):
+    """Trigger que replica na tabela nova as escritas feitas na atual durante a conversão."""
+    key = PARTITION_KEYS[strategy]
+    return [
+        f"""CREATE FUNCTION {SYNC_FUNCTION}() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' THEN
+        DELETE FROM {PART_TABLE} WHERE id = OLD.id AND {key} = OLD.{key};
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO {PART_TABLE} SELECT NEW.* ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END
+$$""",
+        f'CREATE TRIGGER {SYNC_FUNCTION} AFTER INSERT OR UPDATE OR DELETE ON {TABLE} '
+        f'FOR EACH ROW EXECUTE FUNCTION {SYNC_FUNCTION}()',
+    ]
+
+
+# FOR SHARE: uma edição concorrente espera o lote terminar (e o trigger então
+# regrava a linha) ou o lote espera a edição e copia a versão nova
+BACKFILL_SQL = (
+    f'INSERT INTO {PART_TABLE} SELECT * FROM {TABLE} WHERE id > %s AND id <= %s '
+    f'FOR SHARE ON CONFLICT DO NOTHING'
+)
+
+
+def swap_sql(indexes, foreign_keys):
+    """
+    SQL da etapa swap, a ser executado numa transação com a tabela bloqueada.
+
+    Args:
+        indexes: Nomes dos índices da tabela atual, incluindo a chave primária
+        foreign_keys: Nomes das FKs da tabela atual
+    """
+    statements = [
+        f'DROP TRIGGER {SYNC_FUNCTION} ON {TABLE}',
+        f'DROP FUNCTION {SYNC_FUNCTION}()',
+        f'ALTER TABLE {TABLE} RENAME TO {OLD_TABLE}',
+    ]
+    statements += [f'ALTER INDEX {name} RENAME TO {suffixed(name, OLD_SUFFIX)}' for name in indexes]
+    statements += [
+        f'ALTER TABLE {OLD_TABLE} RENAME CONSTRAINT {name} TO {suffixed(name, OLD_SUFFIX)}'
+        for name in foreign_keys
+    ]
+    statements.append(f'ALTER TABLE {PART_TABLE} RENAME TO {TABLE}')
+    statements += [f'ALTER INDEX {suffixed(name, NEW_SUFFIX)} RENAME TO {name}' for name in indexes]
+    statements += [
+        f'ALTER TABLE {TABLE} RENAME CONSTRAINT {suffixed(name, NEW_SUFFIX)} TO {name}'
+        for name in foreign_keys
+    ]
+    # Os próximos ids continuam de onde a tabela antiga parou
+    statements.append(
+        f"SELECT setval('{SEQUENCE}', (SELECT COALESCE(MAX(id), 0) + 1 FROM {OLD_TABLE}), false)"
+    )
+    return statements
+
+
+def table_indexes(cursor, table):
+    """Índices de `table` exceto a chave primária: [(nome, definição)]."""
+    cursor.execute(
+        """
+        SELECT i.relname, pg_get_indexdef(ix.indexrelid)
+        FROM pg_index ix JOIN pg_class i ON i.oid = ix.indexrelid
+        WHERE ix.indrelid = %s::regclass AND NOT ix.indisprimary
+        ORDER BY i.relname
+        """,
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def table_foreign_keys(cursor, table):
+    """FKs de `table` para outras tabelas: [(nome, definição)]."""
+    cursor.execute(
+        """
+        SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+        WHERE conrelid = %s::regclass AND contype = 'f' ORDER BY conname
+        """,
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def referencing_foreign_keys(cursor, table):
+    """FKs de outras tabelas apontando para `table`: [(tabela, nome)]."""
+    cursor.execute(
+        """
+        SELECT conrelid::regclass::text, conname FROM pg_constraint
+        WHERE confrelid = %s::regclass AND contype = 'f' ORDER BY 1, 2
+        """,
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def table_exists(cursor, table):
+    cursor.execute('SELECT to_regclass(%s) IS NOT NULL', [table])
+    return cursor.fetchone()[0]
+
+
+def prepare(strategy, partitions=16, months_ahead=3):
+    """
+    Cria a tabela particionada e o trigger de sincronização.
+
+    Raises:
+        ValueError: Se outras tabelas têm FK para a de tarefas (uma FK só pode
+            apontar para uma chave única, e a do id deixa de existir) ou se a
+            conversão já foi iniciada
+    """
+    with connection.cursor() as cursor:
+        if table_exists(cursor, PART_TABLE):
+            raise ValueError(f'{PART_TABLE} já existe: a conversão já foi iniciada')
+        referencing = referencing_foreign_keys(cursor, TABLE)
+        if referencing:
+            names = ', '.join(f'{table}.{name}' for table, name in referencing)
+            raise ValueError(f'Tabelas com FK para {TABLE} impedem o particionamento: {names}')
+
+        first = last = None
+        if strategy == 'range':
+            cursor.execute(f'SELECT MIN(criado_em) FROM {TABLE}')
+            oldest = cursor.fetchone()[0]
+            today = timezone.localdate()
+            first = oldest.date() if oldest else today
+            last = add_months(today, months_ahead)
+
+        statements = create_sql(
+            strategy,
+            table_indexes(cursor, TABLE),
+            table_foreign_keys(cursor, TABLE),
+            partitions=partitions,
+            first=first,
+            last=last,
+        )
+        with transaction.atomic():
+            for statement in statements:
+                cursor.execute(statement)
+    return len(statements)
+
+
+def backfill(batch_size=10000, start_id=0, pause=0, progress=None):
+    """
+    Copia as linhas existentes para a tabela nova, em lotes por faixa de id.
+
+    Cada lote roda em sua própria transação. Para retomar após uma
+    interrupção, passe em `start_id` o último id informado em `progress`.
+
+    Args:
+        batch_size: Largura de cada faixa de ids
+        start_id: Copia os ids maiores que este
+        pause: Segundos de espera entre lotes
+        progress: Função chamada após cada lote com (último id, linhas copiadas)
+
+    Returns:
+        int: Linhas copiadas (as já replicadas pelo trigger não contam)
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT MAX(id) FROM {TABLE}')
+        max_id = cursor.fetchone()[0] or 0
+
+        copied = 0
+        last_id = start_id
+        while last_id < max_id:
+            upper = min(last_id + batch_size, max_id)
+            with transaction.atomic():
+                cursor.execute(BACKFILL_SQL, [last_id, upper])
+                copied += cursor.rowcount
+            last_id = upper
+            if progress:
+                progress(last_id, copied)
+            if pause:
+                time.sleep(pause)
+    return copied
+
+
+def swap(lock_timeout='5s'):
+    """
+    Troca a tabela atual pela particionada.
+
+    As escritas são bloqueadas (SHARE) enquanto as contagens são conferidas;
+    as leituras só esperam pelas renomeações, que são instantâneas.
+
+    Raises:
+        ValueError: Se as duas tabelas não têm a mesma quantidade de linhas
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Não fica na fila atrás de transações longas, bloqueando todo o resto
+        cursor.execute('SELECT set_config(%s, %s, true)', ['lock_timeout', lock_timeout])
+        cursor.execute(f'LOCK TABLE {TABLE} IN SHARE MODE')
+        cursor.execute(f'SELECT (SELECT COUNT(*) FROM {TABLE}), (SELECT COUNT(*) FROM {PART_TABLE})')
+        current, partitioned = cursor.fetchone()
+        if current != partitioned:
+            raise ValueError(
+                f'{TABLE} tem {current} linhas e {PART_TABLE} tem {partitioned}: rode o backfill novamente'
+            )
+
+        cursor.execute(f'LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'p'",
+            [TABLE],
+        )
+        indexes = [row[0] for row in cursor.fetchall()]
+        indexes += [name for name, _ in table_indexes(cursor, TABLE)]
+        foreign_keys = [name for name, _ in table_foreign_keys(cursor, TABLE)]
+
+        for statement in swap_sql(indexes, foreign_keys):
+            cursor.execute(statement)
+    return current
+
+
+def extend(months_ahead=3):
+    """Cria as partições mensais dos próximos meses (estratégia range, após o swap)."""
+    today = timezone.localdate()
+    statements = partition_sql(TABLE, 'range', first=today, last=add_months(today, months_ahead))
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+    return len(statements)
+
+
+def drop_old():
+    """Remove a tabela antiga mantida pelo swap para um eventual retorno."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'DROP TABLE {OLD_TABLE}')
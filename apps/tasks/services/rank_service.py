@@ -0,0 +1,180 @@
+"""
+Ordem manual das tarefas (arrastar e soltar) com índices fracionários.
+
+A posição de cada tarefa é uma chave em base 36 ("i", "i8", "j") comparada
+como texto: para colocar uma tarefa entre outras duas basta gerar uma chave
+entre as delas, então mover é o UPDATE de uma única linha, sem renumerar as
+demais. As chaves são lidas como frações (0."i8") e nunca terminam em "0",
+para que sempre exista uma chave entre quaisquer duas.
+
+Tarefas novas vão para o fim somando um passo fixo à maior chave (com seis
+dígitos), então criar tarefas não alonga as chaves. Inserções repetidas no
+mesmo ponto, sim (cerca de um caractere a cada cinco). Quando uma chave passa de REBALANCE_LENGTH caracteres, um job em
+segundo plano redistribui as chaves do usuário de forma uniforme.
+
+As posições são por dono da tarefa (índice (usuario, posicao)).
+"""
+from django.db import connection, transaction
+from django.db.models import Max
+
+from apps.tasks.models.tasks import Tasks
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+# Tamanho a partir do qual as chaves do usuário são redistribuídas em segundo plano
+REBALANCE_LENGTH = 16
+MAX_LENGTH = Tasks._meta.get_field('posicao').max_length
+# Inclusões no fim: a maior chave, com pelo menos APPEND_WIDTH dígitos, mais APPEND_STEP
+APPEND_WIDTH = 6
+APPEND_STEP = BASE ** 2
+
+
+class InvalidPosition(ValueError):
+    """Vizinhos inexistentes, de outro dono ou fora de ordem."""
+
+
+def rank_between(before, after):
+    """
+    Chave estritamente entre `before` e `after`.
+
+    Args:
+        before: Chave anterior ('' para o início)
+        after: Chave seguinte (None para o fim)
+
+    Raises:
+        InvalidPosition: Se `before` não for menor que `after`
+    """
+    if after is not None and before >= after:
+        raise InvalidPosition("A posição anterior deve ser menor que a seguinte.")
+
+    prefix = ''
+    index = 0
+    while True:
+        low = DIGITS.index(before[index]) if index < len(before) else 0
+        high = DIGITS.index(after[index]) if after is not None and index < len(after) else BASE
+        if low == high:
+            prefix += DIGITS[low]
+            index += 1
+            continue
+        if high - low > 1:
+            return prefix + DIGITS[(low + high) // 2]
+        # Dígitos vizinhos: mantém o de `before` e continua depois dele, sem limite superior
+        return prefix + DIGITS[low] + rank_between(before[index + 1:], None)
+
+
+def _encode(value, width):
+    digits = ''
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits = DIGITS[digit] + digits
+    return digits.rstrip('0')
+
+
+def rank_after(before):
+    """Chave depois de `before`, sem alongá-la enquanto houver espaço."""
+    digits = before.ljust(APPEND_WIDTH, '0')
+    value = int(digits, BASE) + APPEND_STEP
+    if value >= BASE ** len(digits):
+        return rank_between(before, None)
+    return _encode(value, len(digits))
+
+
+def rank_sequence(count):
+    """
+    `count` chaves crescentes, com o mesmo tamanho e distribuídas uniformemente.
+
+    Returns:
+        list[str]: Chaves sem "0" no final
+    """
+    width = 1
+    while BASE ** width < 2 * (count + 1):
+        width += 1
+
+    return [_encode(position * BASE ** width // (count + 1), width) for position in range(1, count + 1)]
+
+
+def last_rank(user_id):
+    """Chave para uma tarefa nova do usuário, no fim da ordem."""
+    current = Tasks.objects.filter(usuario_id=user_id).aggregate(ultima=Max('posicao'))['ultima']
+    return rank_after(current) if current else rank_between('', None)
+
+
+def rebalance_ranks(user_id):
+    """
+    Redistribui as chaves do usuário de forma uniforme, mantendo a ordem atual.
+
+    As linhas são gravadas com um executemany de UPDATEs pela chave primária
+    (e pelo usuário, a chave de partição), bem mais rápido que o CASE gerado
+    pelo bulk_update para dezenas de milhares de tarefas.
+
+    Returns:
+        int: Quantidade de tarefas atualizadas
+    """
+    qn = connection.ops.quote_name
+    sql = (f'UPDATE {qn(Tasks._meta.db_table)} SET {qn("posicao")} = %s '
+           f'WHERE {qn("id")} = %s AND {qn("usuario_id")} = %s')
+
+    with transaction.atomic():
+        ids = list(
+            Tasks.objects.select_for_update().filter(usuario_id=user_id)
+            .order_by('posicao', 'id').values_list('id', flat=True)
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, [(key, task_id, user_id) for task_id, key in zip(ids, rank_sequence(len(ids)))])
+    return len(ids)
+
+
+def _neighbor_ranks(task, after_id, before_id):
+    """Chaves entre as quais a tarefa deve ficar, a partir dos ids dos vizinhos."""
+    owned = Tasks.objects.filter(usuario_id=task.usuario_id).exclude(pk=task.pk)
+    ranks = dict(owned.filter(pk__in=[i for i in (after_id, before_id) if i]).values_list('id', 'posicao'))
+    if any(i and i not in ranks for i in (after_id, before_id)):
+        raise InvalidPosition("Os vizinhos devem ser outras tarefas do mesmo dono.")
+
+    if after_id and before_id:
+        return ranks[after_id], ranks[before_id]
+    # Inclui chaves iguais à do vizinho para detectar empates (ex.: tarefas
+    # anteriores à ordem manual, todas com posição '')
+    if after_id:
+        following = owned.exclude(pk=after_id).filter(posicao__gte=ranks[after_id]).order_by('posicao', 'id')
+        return ranks[after_id], following.values_list('posicao', flat=True).first()
+    preceding = owned.exclude(pk=before_id).filter(posicao__lte=ranks[before_id]).order_by('-posicao', '-id')
+    return preceding.values_list('posicao', flat=True).first() or '', ranks[before_id]
+
+
+def move_task(task, after_id=None, before_id=None):
+    """
+    Coloca a tarefa depois de `after_id` e/ou antes de `before_id`.
+
+    Com os dois vizinhos informados são uma leitura e um UPDATE da própria
+    tarefa; com um só, uma leitura a mais para achar o outro. Se as chaves dos
+    vizinhos estiverem empatadas ou a nova chave ficar longa demais, as chaves
+    do usuário são redistribuídas na hora; se só passar de REBALANCE_LENGTH,
+    a redistribuição é agendada em segundo plano.
+
+    Returns:
+        str: A nova chave da tarefa
+
+    Raises:
+        InvalidPosition: Vizinhos inexistentes, de outro dono ou fora de ordem
+    """
+    from apps.tasks.jobs import rebalance_task_ranks
+
+    after, before = _neighbor_ranks(task, after_id, before_id)
+    if before is not None and after >= before:
+        if after_id and before_id and after > before:
+            raise InvalidPosition("A tarefa anterior deve vir antes da seguinte.")
+        rebalance_ranks(task.usuario_id)
+        after, before = _neighbor_ranks(task, after_id, before_id)
+
+    rank = rank_after(after) if before is None else rank_between(after, before)
+    if len(rank) > MAX_LENGTH:
+        rebalance_ranks(task.usuario_id)
+        after, before = _neighbor_ranks(task, after_id, before_id)
+        rank = rank_after(after) if before is None else rank_between(after, before)
+    elif len(rank) > REBALANCE_LENGTH:
+        rebalance_task_ranks.enqueue(task.usuario_id)
+
+    Tasks.objects.for_task(task).update(posicao=rank)
+    task.posicao = rank
+    return rank
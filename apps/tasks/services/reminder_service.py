@@ -0,0 +1,98 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from apps.tasks.jobs import send_due_reminders
+from apps.tasks.models.reminders import SentReminders
+from apps.tasks.models.tasks import Tasks
+
+
+def pending_due_tasks(start, end):
+    """
+    Tarefas não concluídas com prazo entre start e end.
+
+    O filtro `exclude(status='C')` corresponde à condição do índice parcial
+    tasks_prazo_pendentes_idx, então o banco percorre só esse índice.
+    """
+    return Tasks.objects.exclude(status='C').filter(prazo__gte=start, prazo__lte=end)
+
+
+def _claim_reminders(batch, now):
+    """
+    Registra os lembretes do lote com INSERT ... ON CONFLICT DO NOTHING RETURNING.
+
+    Returns:
+        set[int]: Ids das tarefas cujo lembrete foi gravado agora (as já
+        registradas, ex: por uma execução concorrente, ficam de fora)
+    """
+    qn = connection.ops.quote_name
+    ops = connection.ops
+    values = ', '.join(['(%s, %s, %s)'] * len(batch))
+    params = []
+    for task_id, _, prazo in batch:
+        params += [task_id, ops.adapt_datefield_value(prazo), ops.adapt_datetimefield_value(now)]
+    sql = (f'INSERT INTO {qn(SentReminders._meta.db_table)} ({qn("tarefa_id")}, {qn("prazo")}, {qn("enviado_em")}) '
+           f'VALUES {values} ON CONFLICT ({qn("tarefa_id")}, {qn("prazo")}) DO NOTHING '
+           f'RETURNING {qn("tarefa_id")}')
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {row[0] for row in cursor.fetchall()}
+
+
+def schedule_due_reminders(days=3, batch_size=1000):
+    """
+    Enfileira lembretes para tarefas com prazo nos próximos `days` dias.
+
+    Só entram as candidatas sem lembrete registrado (SentReminders) para o
+    prazo atual: tarefas criadas ou com o prazo alterado depois da última
+    execução também são lembradas, e nenhuma é lembrada duas vezes pelo mesmo
+    prazo. As candidatas são percorridas em lotes paginados por (prazo, id),
+    a ordem do índice parcial tasks_prazo_pendentes_idx. Cada lote registra os
+    lembretes primeiro e enfileira só os que foram gravados agora, na mesma
+    transação: duas execuções simultâneas não lembram a mesma tarefa, e uma
+    execução interrompida é retomada pelas linhas que faltam.
+
+    Returns:
+        tuple[int, int]: Quantidade de tarefas lembradas e de jobs enfileirados
+    """
+    today = timezone.localdate()
+    horizon = today + timedelta(days=days)
+
+    # Lembretes de prazos que já passaram não evitam mais nada
+    SentReminders.objects.filter(prazo__lt=today).delete()
+
+    sent = SentReminders.objects.filter(tarefa_id=OuterRef('pk'), prazo=OuterRef('prazo'))
+    queryset = pending_due_tasks(today, horizon).filter(~Exists(sent)).order_by('prazo', 'id')
+    after = None
+    processed = enqueued = 0
+
+    while True:
+        page = queryset
+        if after is not None:
+            # (prazo, id) > (último prazo, último id)
+            last_prazo, last_id = after
+            page = page.filter(Q(prazo__gt=last_prazo) | Q(prazo=last_prazo, id__gt=last_id))
+        batch = list(page.values_list('id', 'usuario_id', 'prazo')[:batch_size])
+        if not batch:
+            break
+
+        after = (batch[-1][2], batch[-1][0])
+
+        with transaction.atomic():
+            claimed = _claim_reminders(batch, timezone.now())
+            per_user = defaultdict(list)
+            for task_id, usuario_id, _ in batch:
+                if task_id in claimed:
+                    per_user[usuario_id].append(task_id)
+            enqueued += send_due_reminders.enqueue_many(
+                ((usuario_id, task_ids), {}) for usuario_id, task_ids in per_user.items()
+            )
+
+        processed += len(claimed)
+        if len(batch) < batch_size:
+            break
+
+    return processed, enqueued
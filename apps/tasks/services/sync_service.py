@@ -0,0 +1,214 @@
+"""
+Sincronização incremental das tarefas (GET /tasks/changes/).
+
+O cliente guarda o token recebido e o envia na próxima chamada; a resposta
+traz só as tarefas criadas ou alteradas depois dele, em ordem de
+(atualizado_em, id), e os ids das tarefas removidas (TaskTombstones). O custo
+é proporcional às alterações, não ao total de tarefas.
+
+O token é opaco para o cliente: codifica o último (atualizado_em, id)
+entregue, o id da última remoção entregue e o momento em que foi emitido.
+
+Entrar em uma lista compartilhada não altera as tarefas dela, então elas
+não apareceriam nas alterações desde o token. Os tokens emitidos antes da
+entrada são recusados como expirados, e o cliente sincroniza de novo sem
+token. A saída da lista é registrada como remoção (lists_service).
+"""
+import base64
+import json
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.tasks.models.lists import ListMembers
+from apps.tasks.models.tombstones import TaskTombstones
+from apps.tasks.schemas.task_read_schema import READ_FIELDS
+from apps.tasks.services.lists_service import task_viewers, union_all
+from apps.tasks.services.tags_service import delete_task_tags
+
+
+class InvalidSyncToken(ValueError):
+    """Token malformado ou mais antigo que a retenção das remoções."""
+
+    def __init__(self, message, expired=False):
+        super().__init__(message)
+        self.expired = expired
+
+
+def encode_token(updated_at, task_id, tombstone_id):
+    payload = json.dumps([
+        updated_at.isoformat() if updated_at else None,
+        task_id,
+        tombstone_id,
+        timezone.now().isoformat(),
+    ])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_token(token, user_id=None):
+    """
+    Args:
+        token: Token devolvido por changes_since
+        user_id: Dono do token; com ele, o token é recusado se o usuário
+            entrou em uma lista depois de o token ser emitido
+
+    Returns:
+        tuple[datetime | None, int, int]: (atualizado_em, id da tarefa, id da remoção)
+
+    Raises:
+        InvalidSyncToken: Se o token é inválido ou expirou
+    """
+    try:
+        payload = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        updated_at, task_id, tombstone_id, issued_at = json.loads(payload)
+        updated_at = datetime.fromisoformat(updated_at) if updated_at else None
+        issued_at = datetime.fromisoformat(issued_at)
+        task_id, tombstone_id = int(task_id), int(tombstone_id)
+    except (ValueError, TypeError):
+        raise InvalidSyncToken('Token de sincronização inválido')
+
+    # As remoções anteriores à retenção já foram apagadas: o cliente precisa recomeçar do zero
+    if issued_at < timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS):
+        raise InvalidSyncToken('Token de sincronização expirado; sincronize novamente sem token', expired=True)
+    if user_id is not None and joined_lists_since(user_id, issued_at):
+        raise InvalidSyncToken('Você entrou em uma lista compartilhada; sincronize novamente sem token', expired=True)
+    return updated_at, task_id, tombstone_id
+
+
+def joined_lists_since(user_id, issued_at):
+    """
+    Se o usuário entrou em alguma lista de outro dono depois de issued_at.
+
+    Usa a mesma folga de settings.SYNC_LAG_SECONDS das alterações: uma
+    entrada ainda não confirmada quando o token foi emitido também conta.
+    """
+    since = issued_at - timedelta(seconds=settings.SYNC_LAG_SECONDS)
+    return (ListMembers.objects.filter(usuario_id=user_id, criado_em__gt=since)
+            .exclude(lista__dono_id=user_id).exists())
+
+
+def record_tombstones(rows):
+    """
+    Grava as remoções de tarefas, em um único INSERT.
+
+    Args:
+        rows: Iterável de (id da tarefa, usuario_id de quem deixa de vê-la)
+    """
+    TaskTombstones.objects.bulk_create(
+        TaskTombstones(tarefa_id=task_id, usuario_id=usuario_id) for task_id, usuario_id in rows
+    )
+
+
+def record_removed_tasks(rows):
+    """
+    Registra a remoção das tarefas para o dono e os membros das listas delas.
+
+    Args:
+        rows: Iterável de (id da tarefa, usuario_id, lista_id)
+    """
+    record_tombstones(
+        (task_id, viewer)
+        for viewer, task_ids in task_viewers(rows).items()
+        for task_id in task_ids
+    )
+
+
+def delete_tasks(queryset):
+    """
+    Exclui as tarefas do queryset registrando as remoções, na mesma transação.
+
+    Todo caminho que exclui tarefas da lista de um usuário (API, admin)
+    passa por aqui, para que a sincronização informe a remoção. Exclusões em
+    cascata de um usuário não geram remoções: elas seriam apagadas junto.
+
+    Returns:
+        int: Quantidade de tarefas excluídas
+    """
+    return len(delete_task_rows(queryset))
+
+
+def delete_task_rows(queryset):
+    """
+    Igual a delete_tasks, mas devolve as tarefas excluídas (para os eventos).
+
+    Returns:
+        list[tuple]: (id, usuario_id, lista_id) de cada tarefa excluída
+    """
+    with transaction.atomic():
+        rows = list(queryset.values_list('id', 'usuario_id', 'lista_id'))
+        if rows:
+            record_removed_tasks(rows)
+            queryset.filter(pk__in=[task_id for task_id, _, _ in rows]).delete()
+            delete_task_tags((task_id, usuario_id) for task_id, usuario_id, _ in rows)
+    return rows
+
+
+def changes_since(tasks, tombstones, cursor=None, limit=500):
+    """
+    Tarefas alteradas e removidas depois do cursor de um token.
+
+    As alterações dos últimos settings.SYNC_LAG_SECONDS segundos ficam para a
+    próxima chamada: atualizado_em é definido antes do commit, então uma
+    transação ainda aberta pode gravar um valor menor que o de uma linha já
+    entregue, e seria pulada.
+
+    Args:
+        tasks: Queryset das tarefas do usuário, ou lista de querysets (ex:
+            lists_service.visible_branches) lidos em uma consulta UNION ALL
+        tombstones: Queryset das remoções do usuário
+        cursor: Token da chamada anterior já decodificado por decode_token
+            (None = sincronização completa)
+        limit: Máximo de tarefas e de remoções por resposta
+
+    Returns:
+        tuple[list[tuple], list[int], str, bool]: (tarefas como tuplas de READ_FIELDS,
+        ids removidos, novo token, há mais)
+    """
+    horizon = timezone.now() - timedelta(seconds=settings.SYNC_LAG_SECONDS)
+
+    if cursor:
+        updated_at, task_id, tombstone_id = cursor
+    else:
+        # Sincronização completa: as remoções anteriores não interessam
+        updated_at, task_id = None, 0
+        tombstone_id = tombstones.order_by('-id').values_list('id', flat=True).first() or 0
+
+    condition = Q(atualizado_em__lte=horizon)
+    if updated_at is not None:
+        condition &= Q(atualizado_em__gt=updated_at) | Q(atualizado_em=updated_at, id__gt=task_id)
+    branches = tasks if isinstance(tasks, (list, tuple)) else [tasks]
+    changed = union_all([branch.filter(condition).values_list(*READ_FIELDS) for branch in branches])
+    changed = list(changed.order_by('atualizado_em', 'id')[:limit + 1])
+
+    removed = list(
+        tombstones.filter(id__gt=tombstone_id, removido_em__lte=horizon)
+        .order_by('id').values_list('id', 'tarefa_id')[:limit + 1]
+    )
+
+    has_more = len(changed) > limit or len(removed) > limit
+    changed, removed = changed[:limit], removed[:limit]
+
+    if changed:
+        last = dict(zip(READ_FIELDS, changed[-1]))
+        updated_at, task_id = last['atualizado_em'], last['id']
+    if removed:
+        tombstone_id = removed[-1][0]
+
+    return changed, [tarefa_id for _, tarefa_id in removed], encode_token(updated_at, task_id, tombstone_id), has_more
+
+
+def purge_tombstones(days=None):
+    """
+    Apaga as remoções mais antigas que `days` (padrão: settings.SYNC_TOMBSTONE_DAYS).
+
+    Tokens anteriores a esse prazo passam a ser recusados por decode_token.
+
+    Returns:
+        int: Quantidade de registros apagados
+    """
+    days = settings.SYNC_TOMBSTONE_DAYS if days is None else days
+    deleted, _ = TaskTombstones.objects.filter(removido_em__lt=timezone.now() - timedelta(days=days)).delete()
+    return deleted
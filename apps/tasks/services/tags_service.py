@@ -0,0 +1,129 @@
+"""
+Etiquetas das tarefas: normalização, índice de filtros e contagens por usuário.
+
+Cada tarefa guarda as suas etiquetas em Tasks.tags (devolvidas na leitura sem
+consulta extra) e em TaskTags, uma linha por etiqueta, com o dono e a lista
+da tarefa, indexada por (usuario, nome, tarefa_id) e (lista_id, nome,
+tarefa_id). Os filtros viram uma subconsulta nesses índices:
+
+    - qualquer uma (`?tags=a,b`): tarefa_id IN (... WHERE nome IN (a, b))
+    - todas (`?tags_todas=a,b`): o mesmo, com GROUP BY tarefa_id HAVING COUNT = 2
+
+As contagens por etiqueta de cada usuário ficam em cache e são invalidadas
+a cada gravação de etiquetas dele.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from apps.tasks.models.tags import TaskTags
+
+TAG_MAX_LENGTH = TaskTags._meta.get_field('nome').max_length
+# Etiquetas por tarefa e por filtro
+MAX_TAGS = 20
+
+
+def normalize_tags(values):
+    """
+    Etiquetas sem espaços nas pontas, em minúsculas e sem repetição (na ordem dada).
+
+    Raises:
+        ValueError: Etiqueta vazia, longa demais ou etiquetas demais
+    """
+    tags = []
+    for value in values:
+        if not isinstance(value, str) or not value.strip():
+            raise ValueError("Etiquetas devem ser textos não vazios.")
+        tag = value.strip().lower()
+        if len(tag) > TAG_MAX_LENGTH:
+            raise ValueError(f"Etiquetas podem ter até {TAG_MAX_LENGTH} caracteres.")
+        if tag not in tags:
+            tags.append(tag)
+    if len(tags) > MAX_TAGS:
+        raise ValueError(f"Use no máximo {MAX_TAGS} etiquetas.")
+    return tags
+
+
+def _counts_cache_key(user_id):
+    return f'tasks:etiquetas:{user_id}'
+
+
+def invalidate_tag_counts(user_ids):
+    cache.delete_many([_counts_cache_key(user_id) for user_id in set(user_ids)])
+
+
+def sync_task_tags(task, previous_owner_id=None):
+    """
+    Regrava o índice de etiquetas da tarefa a partir de task.tags (também
+    quando só o dono ou a lista mudou).
+
+    Args:
+        task: Tarefa já salva
+        previous_owner_id: Dono anterior, se a tarefa mudou de dono
+    """
+    TaskTags.objects.filter(tarefa_id=task.pk).delete()
+    TaskTags.objects.bulk_create(
+        TaskTags(usuario_id=task.usuario_id, lista_id=task.lista_id, tarefa_id=task.pk, nome=nome)
+        for nome in task.tags
+    )
+    invalidate_tag_counts([task.usuario_id, previous_owner_id or task.usuario_id])
+
+
+def delete_task_tags(rows):
+    """
+    Apaga o índice de etiquetas das tarefas excluídas ou arquivadas.
+
+    Args:
+        rows: Iterável de (id da tarefa, usuario_id)
+    """
+    rows = list(rows)
+    if rows:
+        deleted, _ = TaskTags.objects.filter(tarefa_id__in=[task_id for task_id, _ in rows]).delete()
+        if deleted:
+            invalidate_tag_counts(usuario_id for _, usuario_id in rows)
+
+
+def filter_by_tags(queryset, user_id, roles, any_of=(), all_of=()):
+    """
+    Restringe as tarefas às que têm alguma das etiquetas `any_of` e todas as `all_of`.
+
+    A subconsulta lê só as etiquetas do próprio usuário, pelo índice
+    (usuario, nome, tarefa_id), e as das listas dele, pelo índice (lista_id,
+    nome, tarefa_id); a visibilidade continua garantida pelo filtro do
+    queryset (ou pelo visible_branches aplicado depois).
+
+    Args:
+        queryset: Tarefas a filtrar
+        user_id: Id do usuário
+        roles: Resultado de list_roles(user_id)
+    """
+    visible = Q(usuario_id=user_id)
+    if roles:
+        visible |= Q(lista_id__in=list(roles))
+    tags = TaskTags.objects.filter(visible)
+
+    if any_of:
+        queryset = queryset.filter(pk__in=tags.filter(nome__in=any_of).values('tarefa_id'))
+    if all_of:
+        matching = (tags.filter(nome__in=all_of).order_by().values('tarefa_id')
+                    .annotate(total=Count('id')).filter(total=len(all_of)).values('tarefa_id'))
+        queryset = queryset.filter(pk__in=matching)
+    return queryset
+
+
+def tag_counts(user_id):
+    """
+    Quantas tarefas do usuário têm cada etiqueta, da mais usada para a menos usada.
+
+    Returns:
+        list[dict]: [{'nome': ..., 'total': ...}]
+    """
+    key = _counts_cache_key(user_id)
+    counts = cache.get(key)
+    if counts is None:
+        counts = list(
+            TaskTags.objects.filter(usuario_id=user_id).order_by().values('nome')
+            .annotate(total=Count('id')).order_by('-total', 'nome')
+        )
+        cache.set(key, counts, settings.TASK_TAGS_CACHE_SECONDS)
+    return counts
@@ -0,0 +1,112 @@
+"""
+Hierarquia de tarefas (projetos e subtarefas) com caminho materializado.
+
+Cada tarefa guarda em `caminho` os ids dos ancestrais, da raiz ao pai, cada
+um seguido de '/': uma raiz tem caminho '', um filho dela '12/', um neto
+'12/40/'. Os descendentes de uma tarefa são as linhas cujo caminho começa
+com `caminho + id + '/'`, então ler, contar ou mover uma subárvore inteira é
+uma consulta por prefixo no índice de `caminho`, qualquer que seja a
+profundidade, sem percorrer a árvore nível a nível.
+
+Uma subárvore é sempre de um só dono: a tarefa pai precisa ser do mesmo
+usuário, e tarefas com pai ou subtarefas não são transferidas. Assim os
+filtros incluem usuario_id, e com a tabela particionada por usuário a
+subárvore inteira fica em uma partição.
+"""
+from django.db import transaction
+from django.db.models import CharField, Count, Max, Q, Value
+from django.db.models.functions import Concat, Length, Substr
+from django.utils import timezone
+
+from apps.tasks.models.tasks import Tasks
+
+PATH_MAX_LENGTH = Tasks._meta.get_field('caminho').max_length
+
+
+class InvalidMove(ValueError):
+    """Movimento que criaria um ciclo ou uma hierarquia profunda demais."""
+
+
+def child_path(parent):
+    """Caminho dos filhos de `parent` (None para uma raiz)."""
+    if parent is None:
+        return ''
+    return f'{parent.caminho}{parent.pk}/'
+
+
+def descendants_filter(task):
+    """Filtro de todos os descendentes da tarefa, em qualquer nível."""
+    return Q(usuario_id=task.usuario_id, caminho__startswith=child_path(task))
+
+
+def subtree_filter(task):
+    """Filtro da tarefa e de todos os seus descendentes."""
+    return Q(usuario_id=task.usuario_id) & (Q(pk=task.pk) | Q(caminho__startswith=child_path(task)))
+
+
+def check_path(path):
+    if len(path) > PATH_MAX_LENGTH:
+        raise InvalidMove("A hierarquia de subtarefas ficaria profunda demais.")
+    return path
+
+
+def progress(queryset, task):
+    """
+    Totais dos descendentes da tarefa por status, em uma única consulta.
+
+    Args:
+        queryset: Tarefas visíveis ao usuário
+        task: Raiz da subárvore (não entra na contagem)
+
+    Returns:
+        dict: total, pendentes, em_andamento, concluidas e percentual concluído
+    """
+    totals = queryset.filter(descendants_filter(task)).aggregate(
+        total=Count('id'),
+        pendentes=Count('id', filter=Q(status='P')),
+        em_andamento=Count('id', filter=Q(status='EA')),
+        concluidas=Count('id', filter=Q(status='C')),
+    )
+    totals['percentual'] = round(100 * totals['concluidas'] / totals['total'], 1) if totals['total'] else 0.0
+    return totals
+
+
+def move_subtree(task, parent):
+    """
+    Move a tarefa, com todos os descendentes, para debaixo de `parent`.
+
+    São duas consultas de escrita, qualquer que seja o tamanho da subárvore:
+    um UPDATE troca o prefixo do caminho de todos os descendentes e outro
+    atualiza o pai da própria tarefa.
+
+    Args:
+        task: Tarefa a mover
+        parent: Novo pai, ou None para tornar a tarefa uma raiz
+
+    Raises:
+        InvalidMove: Se `parent` for a própria tarefa, um descendente dela ou
+            de outro dono, ou se algum caminho ultrapassar o tamanho máximo
+    """
+    old_prefix = child_path(task)
+    if parent is not None and (parent.pk == task.pk or parent.caminho.startswith(old_prefix)):
+        raise InvalidMove("Uma tarefa não pode ser movida para dentro de si mesma.")
+    if parent is not None and parent.usuario_id != task.usuario_id:
+        raise InvalidMove("A tarefa pai precisa ser do mesmo dono.")
+
+    new_path = check_path(child_path(parent))
+    new_prefix = check_path(f'{new_path}{task.pk}/')
+    descendants = Tasks.objects.filter(descendants_filter(task))
+
+    with transaction.atomic():
+        if len(new_prefix) > len(old_prefix):
+            deepest = descendants.aggregate(tamanho=Max(Length('caminho')))['tamanho']
+            if deepest and deepest - len(old_prefix) + len(new_prefix) > PATH_MAX_LENGTH:
+                raise InvalidMove("A hierarquia de subtarefas ficaria profunda demais.")
+
+        descendants.update(caminho=Concat(
+            Value(new_prefix), Substr('caminho', len(old_prefix) + 1), output_field=CharField()))
+        # update() não aplica o auto_now, então atualizado_em é definido aqui
+        Tasks.objects.for_task(task).update(
+            pai=parent, caminho=new_path, atualizado_em=timezone.now())
+
+    task.pai, task.caminho = parent, new_path
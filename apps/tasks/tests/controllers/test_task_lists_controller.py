@@ -0,0 +1,290 @@
+import pytest
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.tasks.models.tasks import Tasks
+from apps.tasks.services.lists_service import add_member, create_list
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Fixture que isola o cache dos papéis entre os testes."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def api_client():
+    """Fixture para criar um cliente API."""
+    return APIClient()
+
+
+@pytest.fixture
+def owner():
+    """Fixture para criar o dono da lista."""
+    return User.objects.create_user(username='dono', password='senha123')
+
+
+@pytest.fixture
+def member():
+    """Fixture para criar um membro da lista."""
+    return User.objects.create_user(username='membro', password='senha123')
+
+
+@pytest.fixture
+def task_list(owner):
+    """Fixture para criar uma lista compartilhada."""
+    return create_list(owner, 'Equipe')
+
+
+@pytest.fixture
+def shared_task(owner, task_list):
+    """Fixture para criar uma tarefa do dono na lista compartilhada."""
+    return Tasks.objects.create(usuario=owner, titulo='Compartilhada', prioridade='M', lista=task_list)
+
+
+@pytest.mark.django_db
+def test_create_list_and_add_member(api_client, owner, member):
+    """Testa se o criador administra a lista e consegue adicionar membros."""
+    # Arrange
+    api_client.force_authenticate(user=owner)
+
+    # Act
+    created = api_client.post(reverse('tasklists-list'), {'nome': 'Casa'}, format='json')
+    added = api_client.post(reverse('tasklists-membros', args=[created.data['id']]),
+                            {'usuario': member.username, 'papel': 'E'}, format='json')
+
+    # Assert
+    assert created.status_code == status.HTTP_201_CREATED
+    assert created.data['papel'] == 'A'
+    assert added.status_code == status.HTTP_201_CREATED
+    assert added.data['papel_display'] == 'Editor'
+
+
+@pytest.mark.django_db
+def test_member_sees_shared_tasks(api_client, owner, member, task_list, shared_task):
+    """Testa se o membro vê as tarefas da lista na listagem e no detalhe, e quem não é membro não vê."""
+    # Arrange
+    Tasks.objects.create(usuario=owner, titulo='Privada', prioridade='M')
+    add_member(task_list, member, 'L')
+    api_client.force_authenticate(user=member)
+
+    # Act
+    listing = api_client.get(reverse('tasks-list'))
+    detail = api_client.get(reverse('tasks-detail', args=[shared_task.id]))
+    api_client.force_authenticate(user=User.objects.create_user(username='outro', password='senha123'))
+    other = api_client.get(reverse('tasks-detail', args=[shared_task.id]))
+
+    # Assert
+    assert [task['titulo'] for task in listing.data] == ['Compartilhada']
+    assert detail.data['lista'] == task_list.id
+    assert other.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_listing_resolves_visibility_in_one_query(api_client, owner, member):
+    """Testa se a listagem de um membro de várias listas faz uma única consulta às tarefas."""
+    # Arrange
+    for index in range(5):
+        task_list = create_list(owner, f'Lista {index}')
+        add_member(task_list, member, 'L')
+        Tasks.objects.create(usuario=owner, titulo=f'Tarefa {index}', prioridade='M', lista=task_list)
+    api_client.force_authenticate(user=member)
+    api_client.get(reverse('tasks-list'))
+
+    # Act
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(reverse('tasks-list'))
+
+    # Assert
+    assert len(response.data) == 5
+    # Os papéis vêm do cache; nenhuma consulta aos membros das listas
+    sql = [query['sql'] for query in queries.captured_queries]
+    assert not any('"tasks_listmembers"' in query for query in sql)
+    assert sum('"tasks_tasks"' in query for query in sql) == 1
+
+
+@pytest.mark.django_db
+def test_member_listing_in_manual_order_includes_shared_tasks(api_client, owner, member, task_list, shared_task):
+    """Testa a listagem de um membro em ?ordering=posicao, que ordena o UNION pela posição."""
+    # Arrange
+    add_member(task_list, member, 'L')
+    Tasks.objects.filter(pk=shared_task.pk).update(posicao='b')
+    own = Tasks.objects.create(usuario=member, titulo='Minha', prioridade='M', posicao='a')
+    api_client.force_authenticate(user=member)
+
+    # Act
+    response = api_client.get(reverse('tasks-list'), {'ordering': 'posicao'})
+
+    # Assert
+    assert [task['id'] for task in response.data] == [own.id, shared_task.id]
+    assert 'posicao' not in response.data[0]
+
+
+@pytest.mark.django_db
+def test_reader_cannot_change_shared_task(api_client, member, task_list, shared_task):
+    """Testa se o leitor não altera, conclui nem exclui as tarefas da lista."""
+    # Arrange
+    add_member(task_list, member, 'L')
+    api_client.force_authenticate(user=member)
+
+    # Act
+    patched = api_client.patch(reverse('tasks-detail', args=[shared_task.id]), {'titulo': 'Não'}, format='json')
+    deleted = api_client.delete(reverse('tasks-detail', args=[shared_task.id]))
+    completed = api_client.post(reverse('tasks-concluir'), {'ids': [shared_task.id]}, format='json')
+
+    # Assert
+    assert patched.status_code == status.HTTP_403_FORBIDDEN
+    assert deleted.status_code == status.HTTP_403_FORBIDDEN
+    assert completed.data['concluidas'] == 0
+
+
+@pytest.mark.django_db
+def test_editor_changes_shared_task_and_members_are_notified(
+        api_client, owner, member, task_list, shared_task, django_capture_on_commit_callbacks):
+    """Testa se o editor altera a tarefa e o evento vai para o dono e para os membros."""
+    # Arrange
+    add_member(task_list, member, 'E')
+    api_client.force_authenticate(user=member)
+
+    # Act
+    with mock.patch('apps.tasks.services.event_service.get_broker') as get_broker:
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.patch(reverse('tasks-detail', args=[shared_task.id]),
+                                        {'titulo': 'Editada'}, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    calls = sorted(c.args for c in get_broker.return_value.publish.call_args_list)
+    assert calls == [
+        (owner.id, 'atualizada', {'ids': [shared_task.id]}),
+        (member.id, 'atualizada', {'ids': [shared_task.id]}),
+    ]
+
+
+@pytest.mark.django_db
+def test_editor_cannot_transfer_task(api_client, member, task_list, shared_task):
+    """Testa se o membro não transfere a tarefa compartilhada para si."""
+    # Arrange
+    add_member(task_list, member, 'E')
+    api_client.force_authenticate(user=member)
+
+    # Act
+    response = api_client.patch(reverse('tasks-detail', args=[shared_task.id]),
+                                {'usuario': member.username}, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_subtasks_belong_to_the_parent_owner(api_client, owner, member, task_list, shared_task):
+    """Testa se o editor não cria subtarefa sua na tarefa do dono, e se quem tem subtarefas não é transferida."""
+    # Arrange
+    add_member(task_list, member, 'E')
+    api_client.force_authenticate(user=owner)
+    child = api_client.post(reverse('tasks-list'), {
+        'usuario': owner.username, 'titulo': 'Filha', 'prioridade': 'M', 'pai': shared_task.id,
+    }, format='json')
+
+    # Act
+    transfer = api_client.patch(reverse('tasks-detail', args=[shared_task.id]), {'usuario': member.username}, format='json')
+    api_client.force_authenticate(user=member)
+    foreign_child = api_client.post(reverse('tasks-list'), {
+        'usuario': member.username, 'titulo': 'Minha', 'prioridade': 'M', 'pai': shared_task.id,
+    }, format='json')
+
+    # Assert
+    assert child.status_code == status.HTTP_201_CREATED
+    assert transfer.status_code == status.HTTP_400_BAD_REQUEST
+    assert transfer.data['errors'][0]['field'] == 'usuario'
+    assert foreign_child.status_code == status.HTTP_400_BAD_REQUEST
+    assert foreign_child.data['errors'][0]['field'] == 'pai'
+
+
+@pytest.mark.django_db
+def test_task_can_only_be_added_to_writable_list(api_client, member, task_list):
+    """Testa se só quem edita a lista cria tarefas nela."""
+    # Arrange
+    add_member(task_list, member, 'L')
+    api_client.force_authenticate(user=member)
+    payload = {'usuario': member.username, 'titulo': 'Nova', 'prioridade': 'M', 'lista': task_list.id}
+
+    # Act
+    as_reader = api_client.post(reverse('tasks-list'), payload, format='json')
+    add_member(task_list, member, 'E')
+    as_editor = api_client.post(reverse('tasks-list'), payload, format='json')
+
+    # Assert
+    assert as_reader.status_code == status.HTTP_400_BAD_REQUEST
+    assert as_editor.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_only_admins_manage_members(api_client, owner, member, task_list):
+    """Testa se membros comuns não alteram os membros, mas podem sair da lista."""
+    # Arrange
+    add_member(task_list, member, 'E')
+    api_client.force_authenticate(user=member)
+
+    # Act
+    promote = api_client.patch(reverse('tasklists-membro', args=[task_list.id, member.id]),
+                               {'papel': 'A'}, format='json')
+    remove_owner = api_client.delete(reverse('tasklists-membro', args=[task_list.id, owner.id]))
+    leave = api_client.delete(reverse('tasklists-membro', args=[task_list.id, member.id]))
+    after = api_client.get(reverse('tasklists-list'))
+
+    # Assert
+    assert promote.status_code == status.HTTP_403_FORBIDDEN
+    assert remove_owner.status_code == status.HTTP_400_BAD_REQUEST
+    assert leave.status_code == status.HTTP_204_NO_CONTENT
+    assert after.data == []
+
+
+@pytest.mark.django_db
+def test_removing_task_from_list_hides_it_from_members(api_client, settings, owner, member, task_list, shared_task):
+    """Testa se tirar a tarefa da lista a esconde dos membros e registra a remoção para eles."""
+    # Arrange
+    settings.SYNC_LAG_SECONDS = 0
+    add_member(task_list, member, 'L')
+    api_client.force_authenticate(user=member)
+    full = api_client.get(reverse('tasks-changes'))
+
+    # Act
+    api_client.force_authenticate(user=owner)
+    api_client.patch(reverse('tasks-detail', args=[shared_task.id]), {'lista': None}, format='json')
+    api_client.force_authenticate(user=member)
+    changes = api_client.get(reverse('tasks-changes'), {'token': full.data['token']})
+    listing = api_client.get(reverse('tasks-list'))
+
+    # Assert
+    assert listing.data == []
+    assert changes.data['removidas'] == [shared_task.id]
+
+
+@pytest.mark.django_db
+def test_membership_changes_reach_delta_sync(api_client, settings, owner, member, task_list, shared_task):
+    """Testa se quem entra na lista com um token refaz a sincronização completa e quem sai recebe as remoções."""
+    # Arrange
+    settings.SYNC_LAG_SECONDS = 0
+    api_client.force_authenticate(user=member)
+    before_joining = api_client.get(reverse('tasks-changes')).data['token']
+
+    # Act
+    add_member(task_list, member, 'L')
+    rejected = api_client.get(reverse('tasks-changes'), {'token': before_joining})
+    full = api_client.get(reverse('tasks-changes'))
+    api_client.delete(reverse('tasklists-membro', args=[task_list.id, member.id]))
+    after_leaving = api_client.get(reverse('tasks-changes'), {'token': full.data['token']})
+
+    # Assert
+    assert rejected.status_code == status.HTTP_400_BAD_REQUEST
+    assert 'token_expirado' in str(rejected.data)
+    assert [task['id'] for task in full.data['tarefas']] == [shared_task.id]
+    assert after_leaving.data['removidas'] == [shared_task.id]
@@ -1,11 +1,23 @@
 import pytest
 import json
-from datetime import date
+import threading
+from unittest import mock
+from datetime import date, timedelta
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
 from django.urls import reverse
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from rest_framework import status
 from rest_framework.test import APIClient
+from apps.tasks.controllers.tasks_controller import TasksViewSet
 from apps.tasks.models.tasks import Tasks
+from apps.tasks.models.history import TaskHistory
+from apps.tasks.models.idempotency import IdempotencyKeys
+from apps.tasks.services.lists_service import add_member, create_list
+from apps.jobs.models.jobs import Jobs
 
 
 @pytest.fixture
@@ -245,4 +257,670 @@ def test_delete_another_users_task_returns_404(api_client, user1, task3):
     
     # Assert
     assert response.status_code == status.HTTP_404_NOT_FOUND
-    assert Tasks.objects.filter(id=task3.id).exists()
\ No newline at end of file
+    assert Tasks.objects.filter(id=task3.id).exists()
+
+@pytest.mark.django_db
+def test_update_status_to_completed_enqueues_notification(api_client, user1, task1):
+    """Testa se concluir uma tarefa agenda o e-mail de notificação."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    task_detail_url = reverse('tasks-detail', args=[task1.id])
+
+    # Act
+    response = api_client.patch(
+        task_detail_url,
+        data=json.dumps({'status': 'C'}),
+        content_type='application/json'
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    job = Jobs.objects.get()
+    assert job.nome == 'apps.tasks.jobs.notify_task_completed'
+    assert job.args == [task1.id]
+
+
+@pytest.mark.django_db
+def test_export_get_streams_csv_with_user_tasks(api_client, user1, task1, task3):
+    """Testa se a exportação via GET retorna o CSV apenas com as tarefas do usuário."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+
+    # Act
+    response = api_client.get(reverse('tasks-export'))
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    content = b''.join(response.streaming_content).decode()
+    lines = content.strip().splitlines()
+    assert lines[0].startswith('id,titulo')
+    assert len(lines) == 2
+    assert 'Tarefa 1' in lines[1]
+    assert 'Pendente' in lines[1]
+
+
+@pytest.mark.django_db
+def test_list_columnar_format_encodes_status_and_priority(api_client, user1, task1, task2, task3):
+    """Testa a listagem no JSON colunar, negociada pelo Accept, com status e prioridade por dicionário."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+
+    # Act
+    response = api_client.get(reverse('tasks-list'), HTTP_ACCEPT='application/vnd.columnar+json')
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == 'application/vnd.columnar+json'
+    body = json.loads(response.content)
+    columns, dictionaries = body['colunas'], body['dicionarios']
+    assert body['linhas'] == 2
+    assert columns['titulo'] == ['Tarefa 1', 'Tarefa 2']
+    assert [dictionaries['status_display'][i] for i in columns['status_display']] == ['Pendente', 'Em Andamento']
+    assert [dictionaries['prioridade_display'][i] for i in columns['prioridade_display']] == ['Alta', 'Media']
+
+
+@pytest.mark.django_db
+def test_export_get_messagepack_returns_all_user_tasks(api_client, user1, task1, task2, task3):
+    """Testa a exportação em MessagePack por ?format=, com o mesmo conteúdo da listagem JSON."""
+    # Arrange
+    msgpack = pytest.importorskip('msgpack')
+    api_client.force_authenticate(user=user1)
+    listed = api_client.get(reverse('tasks-list')).json()
+
+    # Act
+    response = api_client.get(reverse('tasks-export'), {'format': 'msgpack'})
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == 'application/msgpack'
+    assert msgpack.unpackb(response.content) == {
+        'results': sorted(listed, key=lambda task: task['id']), 'proximo': None}
+
+
+@pytest.mark.django_db
+def test_export_compact_formats_are_paged_by_id(api_client, user1, task1, task2, task3):
+    """Testa se a exportação compacta vem em páginas por id, com o cursor em `proximo`."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    url = reverse('tasks-export')
+
+    # Act
+    first = api_client.get(url, {'format': 'colunar', 'limite': 1}).json()
+    second = api_client.get(url, {'format': 'colunar', 'limite': 1, 'apos': first['proximo']}).json()
+    too_big = api_client.get(url, {'format': 'colunar', 'limite': 10001})
+
+    # Assert
+    assert first['results']['colunas']['id'] == [task1.id]
+    assert first['proximo'] == task1.id
+    assert second['results']['colunas']['id'] == [task2.id]
+    assert second['proximo'] is None
+    assert too_big.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_compact_formats_only_on_list_and_export(api_client, user1, task1):
+    """Testa que as demais ações continuam só com JSON."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+
+    # Act
+    response = api_client.get(reverse('tasks-detail', args=[task1.pk]), HTTP_ACCEPT='application/msgpack')
+
+    # Assert
+    assert response.status_code == status.HTTP_406_NOT_ACCEPTABLE
+
+
+@pytest.mark.django_db
+def test_export_post_enqueues_background_job(api_client, user1):
+    """Testa se a exportação via POST é agendada em segundo plano."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+
+    # Act
+    response = api_client.post(reverse('tasks-export'))
+
+    # Assert
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    job = Jobs.objects.get(pk=response.data['job'])
+    assert job.nome == 'apps.tasks.jobs.export_tasks_csv'
+    assert job.fila == 'exports'
+
+
+@pytest.mark.django_db
+def test_bulk_complete_by_ids_updates_only_own_pending_tasks(api_client, user1, task1, task2, task3):
+    """Testa se a conclusão em lote afeta apenas tarefas pendentes do usuário."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    bulk_url = reverse('tasks-concluir')
+
+    # Act
+    response = api_client.post(
+        bulk_url,
+        data=json.dumps({'ids': [task1.id, task2.id, task3.id]}),
+        content_type='application/json'
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data == {'concluidas': 2}
+    assert set(Tasks.objects.filter(usuario=user1).values_list('status', flat=True)) == {'C'}
+    assert Tasks.objects.get(id=task1.id).concluido_em is not None
+    assert Tasks.objects.get(id=task3.id).usuario == task3.usuario
+
+
+@pytest.mark.django_db
+def test_bulk_complete_by_filter_uses_single_update(api_client, user1, task1, task2, django_assert_max_num_queries):
+    """Testa se a conclusão por filtro é feita com um único UPDATE."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    bulk_url = reverse('tasks-concluir')
+
+    # Act
+    # Leitura, UPDATE e o job, mais o SAVEPOINT/RELEASE da transação (no PostgreSQL, um só UPDATE ... RETURNING)
+    with django_assert_max_num_queries(5):
+        response = api_client.post(
+            bulk_url,
+            data=json.dumps({'filtro': {'prioridade': 'A'}}),
+            content_type='application/json'
+        )
+
+    # Assert
+    assert response.data == {'concluidas': 1}
+    assert Tasks.objects.get(id=task1.id).status == 'C'
+    assert Tasks.objects.get(id=task2.id).status == 'EA'
+
+
+@pytest.mark.django_db
+def test_bulk_complete_requires_ids_or_filter(api_client, user1):
+    """Testa se a conclusão em lote exige 'ids' ou 'filtro'."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+
+    # Act
+    response = api_client.post(reverse('tasks-concluir'), data={}, format='json')
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_partial_update_writes_only_changed_columns(api_client, user1, task1):
+    """Testa se um PATCH de status grava apenas status e atualizado_em."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    task_detail_url = reverse('tasks-detail', args=[task1.id])
+
+    # Act
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.patch(
+            task_detail_url,
+            data=json.dumps({'status': 'EA'}),
+            content_type='application/json'
+        )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE')]
+    assert len(updates) == 1
+    assert '"status"' in updates[0]
+    assert '"atualizado_em"' in updates[0]
+    assert '"descricao"' not in updates[0]
+    assert '"titulo"' not in updates[0]
+
+
+@pytest.mark.django_db
+def test_update_without_changes_does_not_write(api_client, user1, task1):
+    """Testa se um PATCH com os mesmos valores não gera UPDATE."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    task_detail_url = reverse('tasks-detail', args=[task1.id])
+    atualizado_em = Tasks.objects.get(id=task1.id).atualizado_em
+
+    # Act
+    response = api_client.patch(
+        task_detail_url,
+        data=json.dumps({'titulo': task1.titulo}),
+        content_type='application/json'
+    )
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert Tasks.objects.get(id=task1.id).atualizado_em == atualizado_em
+
+
+@pytest.mark.django_db
+def test_list_tasks_runs_single_query(api_client, user1, task1, task2, django_assert_num_queries):
+    """Testa se a listagem busca as tarefas com uma única consulta."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+
+    # Act
+    with django_assert_num_queries(1):
+        response = api_client.get(reverse('tasks-list'))
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    assert [task['id'] for task in response.data] == [task1.id, task2.id]
+    assert response.data[0]['status_display'] == 'Pendente'
+    assert 'status' not in response.data[0]
+
+
+@pytest.mark.django_db
+def test_retrieve_invalid_id_returns_404(api_client, user1):
+    """Testa se um id inválido na URL retorna 404."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+
+    # Act
+    response = api_client.get('/api/v1/tasks/abc/')
+
+    # Assert
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_estatisticas_returns_totals_for_user(api_client, user1, task1, task2, task3, django_assert_num_queries):
+    """Testa se as estatísticas contam apenas as tarefas do usuário, em uma consulta."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    Tasks.objects.filter(pk=task1.pk).update(prazo=date(2000, 1, 1))
+
+    # Act
+    with django_assert_num_queries(1):
+        response = api_client.get(reverse('tasks-estatisticas'))
+
+    # Assert
+    assert response.status_code == status.HTTP_200_OK
+    expected = Tasks.objects.filter(usuario=user1)
+    assert response.data['total'] == expected.count()
+    assert response.data['pendentes'] == expected.filter(status='P').count()
+    assert response.data['concluidas'] == expected.filter(status='C').count()
+    assert response.data['atrasadas'] == 1
+
+
+@pytest.mark.django_db
+def test_list_can_include_archived_tasks(api_client, user1, user2, task1):
+    """Testa se ?incluir_arquivadas=true junta as tarefas arquivadas do usuário à listagem."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    archived = Tasks.objects.create(usuario=user1, titulo='Arquivada', prioridade='B', status='C')
+    Tasks.objects.create(usuario=user2, titulo='De outro usuário', prioridade='B', status='C')
+    Tasks.objects.filter(status='C').update(concluido_em=timezone.now() - timedelta(days=365))
+    call_command('archive_tasks', '--days', '180')
+
+    # Act
+    default = api_client.get(reverse('tasks-list'))
+    with_archived = api_client.get(reverse('tasks-list'), {'incluir_arquivadas': 'true'})
+
+    # Assert
+    assert [task['id'] for task in default.data] == [task1.id]
+    assert [task['id'] for task in with_archived.data] == [task1.id, archived.id]
+    assert with_archived.data[1]['status_display'] == 'Concluída'
+
+
+@pytest.mark.django_db
+def test_changes_returns_updates_and_deletions_since_token(api_client, user1, task1, task2, task3, settings):
+    """Testa se a sincronização incremental traz só o que mudou depois do token, incluindo exclusões."""
+    # Arrange
+    settings.SYNC_LAG_SECONDS = 0
+    api_client.force_authenticate(user=user1)
+    full = api_client.get(reverse('tasks-changes'))
+    api_client.patch(reverse('tasks-detail', args=[task1.id]), {'titulo': 'Alterada'}, format='json')
+    api_client.delete(reverse('tasks-detail', args=[task2.id]))
+
+    # Act
+    delta = api_client.get(reverse('tasks-changes'), {'token': full.data['token']})
+    again = api_client.get(reverse('tasks-changes'), {'token': delta.data['token']})
+
+    # Assert
+    assert [task['id'] for task in full.data['tarefas']] == [task1.id, task2.id]
+    assert [task['titulo'] for task in delta.data['tarefas']] == ['Alterada']
+    assert delta.data['removidas'] == [task2.id]
+    assert delta.data['mais'] is False
+    assert again.data['tarefas'] == [] and again.data['removidas'] == []
+
+
+@pytest.mark.django_db
+def test_changes_rejects_invalid_token(api_client, user1):
+    """Testa se um token inválido retorna 400."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+
+    # Act
+    response = api_client.get(reverse('tasks-changes'), {'token': 'invalido'})
+
+    # Assert
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_writes_publish_realtime_events_after_commit(api_client, user1, task1, task2, django_capture_on_commit_callbacks):
+    """Testa se criar, alterar, concluir e excluir publicam eventos para o usuário após o commit."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+
+    # Act
+    with mock.patch('apps.tasks.services.event_service.get_broker') as get_broker:
+        with django_capture_on_commit_callbacks(execute=True):
+            created = api_client.post(reverse('tasks-list'), {
+                'usuario': user1.username, 'titulo': 'Nova', 'prioridade': 'B',
+            }, format='json')
+            api_client.patch(reverse('tasks-detail', args=[task1.id]), {'titulo': 'Alterada'}, format='json')
+            api_client.patch(reverse('tasks-detail', args=[task1.id]), {'titulo': 'Alterada'}, format='json')
+            api_client.post(reverse('tasks-concluir'), {'ids': [task2.id]}, format='json')
+            api_client.delete(reverse('tasks-detail', args=[task1.id]))
+
+    # Assert
+    calls = [c.args for c in get_broker.return_value.publish.call_args_list]
+    assert calls == [
+        (user1.id, 'criada', {'ids': [created.data['id']]}),
+        # A segunda alteração não muda nada e não gera evento
+        (user1.id, 'atualizada', {'ids': [task1.id]}),
+        (user1.id, 'concluida', {'ids': [task2.id]}),
+        (user1.id, 'removida', {'ids': [task1.id]}),
+    ]
+
+
+@pytest.mark.django_db
+def test_subtasks_progress_and_delete_cover_whole_subtree(api_client, user1, user2):
+    """Testa se subtarefas, progresso e exclusão alcançam todos os níveis da hierarquia."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    url = reverse('tasks-list')
+    projeto = api_client.post(url, {'usuario': user1.username, 'titulo': 'Projeto', 'prioridade': 'A'}, format='json').data
+    fase = api_client.post(url, {'usuario': user1.username, 'titulo': 'Fase', 'prioridade': 'M',
+                                 'pai': projeto['id']}, format='json').data
+    etapa = api_client.post(url, {'usuario': user1.username, 'titulo': 'Etapa', 'prioridade': 'M',
+                                  'pai': fase['id'], 'status': 'C'}, format='json').data
+    avulsa = Tasks.objects.create(usuario=user1, titulo='Avulsa', prioridade='B')
+
+    # Act
+    subtasks = api_client.get(reverse('tasks-subtarefas', args=[projeto['id']]))
+    progress = api_client.get(reverse('tasks-progresso', args=[projeto['id']]))
+    api_client.force_authenticate(user=user2)
+    foreign = api_client.get(reverse('tasks-subtarefas', args=[projeto['id']]))
+    api_client.force_authenticate(user=user1)
+    with CaptureQueriesContext(connection) as queries:
+        deleted = api_client.delete(reverse('tasks-detail', args=[projeto['id']]))
+
+    # Assert
+    # A subárvore é lida e excluída pelo dono (a chave de partição), também nos descendentes
+    subtree = [query['sql'] for query in queries.captured_queries if '"caminho"' in query['sql']]
+    assert subtree and all(f'"usuario_id" = {user1.id}' in sql for sql in subtree)
+    assert fase['pai'] == projeto['id']
+    assert [(task['id'], task['pai']) for task in subtasks.data] == [(fase['id'], projeto['id']), (etapa['id'], fase['id'])]
+    assert progress.data == {'total': 2, 'pendentes': 1, 'em_andamento': 0, 'concluidas': 1, 'percentual': 50.0}
+    assert foreign.status_code == status.HTTP_404_NOT_FOUND
+    assert deleted.status_code == status.HTTP_204_NO_CONTENT
+    assert list(Tasks.objects.values_list('id', flat=True)) == [avulsa.id]
+
+
+@pytest.mark.django_db
+def test_move_task_with_subtasks(api_client, user1, user2, task1, task2):
+    """Testa se /mover/ troca o pai do ramo inteiro e recusa ciclos e pais de outros usuários."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    child = api_client.post(reverse('tasks-list'), {
+        'usuario': user1.username, 'titulo': 'Filha', 'prioridade': 'M', 'pai': task1.id,
+    }, format='json').data
+    foreign = Tasks.objects.create(usuario=user2, titulo='Outra', prioridade='M')
+
+    # Act
+    moved = api_client.post(reverse('tasks-mover', args=[task1.id]), {'pai': task2.id}, format='json')
+    cycle = api_client.post(reverse('tasks-mover', args=[task2.id]), {'pai': child['id']}, format='json')
+    other_user = api_client.post(reverse('tasks-mover', args=[task1.id]), {'pai': foreign.id}, format='json')
+    via_patch = api_client.patch(reverse('tasks-detail', args=[task1.id]), {'pai': None}, format='json')
+
+    # Assert
+    assert moved.status_code == status.HTTP_200_OK
+    assert moved.data['pai'] == task2.id
+    assert Tasks.objects.get(pk=child['id']).caminho == f'{task2.id}/{task1.id}/'
+    assert cycle.status_code == status.HTTP_400_BAD_REQUEST
+    assert other_user.status_code == status.HTTP_400_BAD_REQUEST
+    assert via_patch.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_tags_are_saved_filtered_and_counted(api_client, user1):
+    """Testa se as etiquetas são normalizadas, filtram a listagem e são contadas por usuário."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    url = reverse('tasks-list')
+    for titulo, tags in (('Casa', ['Casa']), ('Ambas', ['casa', 'urgente']), ('Trabalho', ['trabalho'])):
+        api_client.post(url, {'usuario': user1.username, 'titulo': titulo, 'prioridade': 'M', 'tags': tags}, format='json')
+    ambas = Tasks.objects.get(titulo='Ambas')
+
+    # Act
+    any_of = api_client.get(url, {'tags': 'casa,trabalho'})
+    all_of = api_client.get(url, {'tags_todas': 'casa,URGENTE'})
+    api_client.patch(reverse('tasks-detail', args=[ambas.id]), {'tags': ['urgente']}, format='json')
+    counts = api_client.get(reverse('tasks-tags'))
+    invalid = api_client.patch(reverse('tasks-detail', args=[ambas.id]), {'tags': 'casa'}, format='json')
+
+    # Assert
+    assert [task['titulo'] for task in any_of.data] == ['Casa', 'Ambas', 'Trabalho']
+    assert [(task['titulo'], task['tags']) for task in all_of.data] == [('Ambas', ['casa', 'urgente'])]
+    assert counts.data == [{'nome': 'casa', 'total': 1}, {'nome': 'trabalho', 'total': 1}, {'nome': 'urgente', 'total': 1}]
+    assert invalid.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_tag_filter_follows_task_moved_into_shared_list(api_client, user1, user2, task1):
+    """Testa se, ao mover a tarefa para uma lista, os membros a encontram pelo filtro de etiquetas."""
+    # Arrange
+    task_list = create_list(user1, 'Equipe')
+    add_member(task_list, user2, 'L')
+    api_client.force_authenticate(user=user1)
+    api_client.patch(reverse('tasks-detail', args=[task1.id]), {'tags': ['casa']}, format='json')
+
+    # Act
+    api_client.force_authenticate(user=user2)
+    before = api_client.get(reverse('tasks-list'), {'tags': 'casa'})
+    api_client.force_authenticate(user=user1)
+    api_client.patch(reverse('tasks-detail', args=[task1.id]), {'lista': task_list.pk}, format='json')
+    api_client.force_authenticate(user=user2)
+    after = api_client.get(reverse('tasks-list'), {'tags': 'casa'})
+
+    # Assert
+    assert before.data == []
+    assert [task['id'] for task in after.data] == [task1.id]
+
+
+@pytest.mark.django_db
+def test_manual_order_moves_single_task(api_client, user1, user2):
+    """Testa se /posicao/ reordena a tarefa na ordem manual (?ordering=posicao) e recusa outros donos."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    url = reverse('tasks-list')
+    for titulo in ('A', 'B', 'C'):
+        api_client.post(url, {'usuario': user1.username, 'titulo': titulo, 'prioridade': 'M'}, format='json')
+    a, b, c = Tasks.objects.order_by('id')
+    foreign = Tasks.objects.create(usuario=user2, titulo='Outra', prioridade='M', posicao='i')
+
+    # Act
+    moved = api_client.post(reverse('tasks-posicao', args=[c.id]), {'apos': a.id, 'antes': b.id}, format='json')
+    ordered = api_client.get(url, {'ordering': 'posicao'})
+    by_id = api_client.get(url)
+    foreign_neighbor = api_client.post(reverse('tasks-posicao', args=[a.id]), {'apos': foreign.id}, format='json')
+    empty = api_client.post(reverse('tasks-posicao', args=[a.id]), {}, format='json')
+
+    # Assert
+    assert moved.status_code == status.HTTP_204_NO_CONTENT
+    assert [task['titulo'] for task in ordered.data] == ['A', 'C', 'B']
+    assert [task['titulo'] for task in by_id.data] == ['A', 'B', 'C']
+    assert 'posicao' not in ordered.data[0]
+    assert foreign_neighbor.status_code == status.HTTP_400_BAD_REQUEST
+    assert empty.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_history_records_changes_after_commit(api_client, user1, task1, task2, django_capture_on_commit_callbacks):
+    """Testa se criar, alterar, mover e concluir em lote ficam no histórico, com autor e campos alterados."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+
+    # Act
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.patch(reverse('tasks-detail', args=[task1.id]), {'titulo': 'Nova', 'prioridade': 'A'}, format='json')
+        api_client.post(reverse('tasks-mover', args=[task1.id]), {'pai': task2.id}, format='json')
+        api_client.post(reverse('tasks-concluir'), {'ids': [task1.id]}, format='json')
+    first = api_client.get(reverse('tasks-historico', args=[task1.id]), {'limite': 2})
+    second = api_client.get(reverse('tasks-historico', args=[task1.id]), {'limite': 2, 'antes': first.data['proximo']})
+
+    # Assert
+    assert [entry['acao'] for entry in first.data['historico']] == ['atualizada', 'movida']
+    assert first.data['historico'][0]['alteracoes']['status'] == ['P', 'C']
+    assert first.data['historico'][1]['alteracoes'] == {'pai': [None, task2.id]}
+    assert second.data['historico'][0]['alteracoes'] == {'titulo': ['Tarefa 1', 'Nova']}
+    assert second.data['historico'][0]['autor'] == user1.username
+    assert second.data['proximo'] is None
+
+
+@pytest.mark.django_db
+def test_history_is_not_recorded_when_update_fails(api_client, user1, task1, django_capture_on_commit_callbacks):
+    """Testa se uma alteração que falha ao gravar a tarefa não deixa histórico."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+
+    # Act
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with mock.patch.object(Tasks, 'save_changes', side_effect=RuntimeError('falha')):
+            with pytest.raises(RuntimeError):
+                api_client.patch(reverse('tasks-detail', args=[task1.id]), {'titulo': 'Nova'}, format='json')
+
+    # Assert
+    assert callbacks == []
+    assert not TaskHistory.objects.filter(tarefa_id=task1.id).exists()
+    assert Tasks.objects.get(id=task1.id).titulo == 'Tarefa 1'
+
+
+@pytest.mark.django_db
+def test_history_records_deletion_of_the_whole_subtree(api_client, user1, task1, task2, django_capture_on_commit_callbacks):
+    """Testa se a exclusão registra 'removida' para a tarefa e para as subtarefas excluídas junto."""
+    # Arrange
+    api_client.force_authenticate(user=user1)
+    api_client.post(reverse('tasks-mover', args=[task2.id]), {'pai': task1.id}, format='json')
+
+    # Act
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.delete(reverse('tasks-detail', args=[task1.id]))
+
+    # Assert
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    removed = TaskHistory.objects.filter(acao='removida').order_by('tarefa_id')
+    assert [(entry.tarefa_id, entry.autor_id) for entry in removed] == [(task1.id, user1.id), (task2.id, user1.id)]
+    assert removed[0].alteracoes == {'usuario': [user1.id, None], 'lista': [None, None]}
+
+
+@pytest.mark.django_db
+def test_idempotency_key_replays_stored_response(api_client, user1, user2):
+    """Testa se a repetição com a mesma Idempotency-Key devolve a resposta guardada sem criar outra tarefa."""
+    # Arrange
+    cache.clear()
+    api_client.force_authenticate(user=user1)
+    payload = {'usuario': user1.username, 'titulo': 'Uma vez só', 'prioridade': 'M'}
+    headers = {'HTTP_IDEMPOTENCY_KEY': 'abc-123'}
+
+    # Act
+    first = api_client.post(reverse('tasks-list'), payload, format='json', **headers)
+    retried = api_client.post(reverse('tasks-list'), payload, format='json', **headers)
+    changed = api_client.post(reverse('tasks-list'), {**payload, 'titulo': 'Outra'}, format='json', **headers)
+    api_client.force_authenticate(user=user2)
+    other_user = api_client.post(
+        reverse('tasks-list'), {**payload, 'usuario': user2.username}, format='json', **headers)
+    too_long = api_client.post(
+        reverse('tasks-list'), {**payload, 'usuario': user2.username}, format='json', HTTP_IDEMPOTENCY_KEY='x' * 256)
+
+    # Assert
+    assert first.status_code == retried.status_code == status.HTTP_201_CREATED
+    assert retried.json() == first.json()
+    assert retried['Idempotent-Replayed'] == 'true'
+    assert not first.has_header('Idempotent-Replayed')
+    assert changed.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert other_user.status_code == status.HTTP_201_CREATED
+    assert too_long.status_code == status.HTTP_400_BAD_REQUEST
+    assert Tasks.objects.filter(titulo='Uma vez só').count() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_idempotency_key_runs_once_for_concurrent_requests(user1, settings):
+    """Testa se 50 requisições simultâneas com a mesma Idempotency-Key criam uma única tarefa."""
+    # Arrange
+    cache.clear()
+    settings.TASK_HISTORY_ENABLED = False
+    payload = {'usuario': user1.username, 'titulo': 'Concorrente', 'prioridade': 'M'}
+    barrier = threading.Barrier(50)
+    responses = []
+
+    def post():
+        client = APIClient()
+        client.force_authenticate(user=user1)
+        try:
+            barrier.wait(10)
+            responses.append(client.post(
+                reverse('tasks-list'), payload, format='json', HTTP_IDEMPOTENCY_KEY='rajada'))
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=post) for _ in range(50)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert len(responses) == 50
+    created = [response for response in responses if response.status_code == status.HTTP_201_CREATED]
+    originals = [response for response in created if not response.has_header('Idempotent-Replayed')]
+    assert len(originals) == 1
+    assert all(response.json() == originals[0].json() for response in created)
+    assert all(response.status_code in (status.HTTP_201_CREATED, status.HTTP_409_CONFLICT) for response in responses)
+    assert Tasks.objects.filter(titulo='Concorrente').count() == 1
+    assert IdempotencyKeys.objects.count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_idempotency_key_rejects_duplicates_while_in_flight(user1, settings):
+    """Testa se a repetição com a original em andamento recebe 409 na hora e, depois que ela termina, a resposta guardada."""
+    # Arrange
+    cache.clear()
+    settings.TASK_HISTORY_ENABLED = False
+    payload = {'usuario': user1.username, 'titulo': 'Concorrente', 'prioridade': 'M'}
+    in_flight, finish = threading.Event(), threading.Event()
+    perform_create = TasksViewSet.perform_create
+    responses = []
+
+    def slow_create(self, serializer):
+        in_flight.set()
+        finish.wait(5)
+        perform_create(self, serializer)
+
+    def post():
+        try:
+            responses.append(client.post(
+                reverse('tasks-list'), payload, format='json', HTTP_IDEMPOTENCY_KEY='rede-instavel'))
+        finally:
+            connections.close_all()
+
+    client = APIClient()
+    client.force_authenticate(user=user1)
+
+    # Act
+    with mock.patch.object(TasksViewSet, 'perform_create', slow_create):
+        original = threading.Thread(target=post)
+        original.start()
+        in_flight.wait(5)
+        duplicate = client.post(reverse('tasks-list'), payload, format='json', HTTP_IDEMPOTENCY_KEY='rede-instavel')
+        finish.set()
+        original.join()
+    replayed = client.post(reverse('tasks-list'), payload, format='json', HTTP_IDEMPOTENCY_KEY='rede-instavel')
+
+    # Assert
+    assert duplicate.status_code == status.HTTP_409_CONFLICT
+    assert responses[0].status_code == status.HTTP_201_CREATED
+    assert replayed.has_header('Idempotent-Replayed')
+    assert replayed.json()['id'] == responses[0].json()['id']
+    assert Tasks.objects.filter(titulo='Concorrente').count() == 1
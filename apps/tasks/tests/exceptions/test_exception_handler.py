@@ -0,0 +1,94 @@
+import pytest
+from rest_framework import serializers
+from rest_framework.exceptions import NotAuthenticated, ValidationError
+from common.exceptions import custom_exception_handler, format_errors
+
+
+class ItemSerializer(serializers.Serializer):
+    titulo = serializers.CharField()
+    prioridade = serializers.ChoiceField(choices=['A', 'M', 'B'])
+
+
+class ImportSerializer(serializers.Serializer):
+    nome = serializers.CharField()
+    itens = ItemSerializer(many=True)
+    principal = ItemSerializer()
+
+
+def _validation_errors(serializer):
+    """Executa a validação e retorna a exceção gerada."""
+    with pytest.raises(ValidationError) as exc_info:
+        serializer.is_valid(raise_exception=True)
+    return exc_info.value
+
+
+def test_handler_general_error_returns_general_field():
+    """Testa se erros gerais (detail) são associados ao campo 'general'."""
+    # Act
+    response = custom_exception_handler(NotAuthenticated(), {})
+
+    # Assert
+    assert response.data['title'] == 'Erro'
+    assert response.data['errors'] == [{
+        'field': 'general',
+        'message': str(NotAuthenticated.default_detail),
+        'code': 'not_authenticated',
+    }]
+
+
+def test_handler_field_errors_include_code():
+    """Testa se erros de campo trazem mensagem e código estável."""
+    # Arrange
+    exc = _validation_errors(ItemSerializer(data={'prioridade': 'X'}))
+
+    # Act
+    response = custom_exception_handler(exc, {})
+
+    # Assert
+    errors = {error['field']: error for error in response.data['errors']}
+    assert errors['titulo']['code'] == 'required'
+    assert errors['prioridade']['code'] == 'invalid_choice'
+    assert all(isinstance(error['message'], str) for error in errors.values())
+
+
+def test_handler_nested_errors_use_dotted_paths():
+    """Testa se erros aninhados e de list serializers geram caminhos pontuados."""
+    # Arrange
+    data = {
+        'nome': '',
+        'itens': [{'titulo': 'ok', 'prioridade': 'A'}, {'prioridade': 'A'}],
+        'principal': {'titulo': 'ok'},
+    }
+    exc = _validation_errors(ImportSerializer(data=data))
+
+    # Act
+    response = custom_exception_handler(exc, {})
+
+    # Assert
+    fields = [error['field'] for error in response.data['errors']]
+    assert fields == ['nome', 'itens.1.titulo', 'principal.prioridade']
+
+
+def test_handler_list_serializer_root_errors_use_index():
+    """Testa se erros de um list serializer na raiz usam o índice como campo."""
+    # Arrange
+    exc = _validation_errors(ItemSerializer(data=[{'titulo': 'ok', 'prioridade': 'A'}, {}], many=True))
+
+    # Act
+    response = custom_exception_handler(exc, {})
+
+    # Assert
+    fields = [error['field'] for error in response.data['errors']]
+    assert fields == ['1.titulo', '1.prioridade']
+
+
+def test_format_errors_plain_values_use_default_code():
+    """Testa se listas e strings simples são associadas ao campo 'general'."""
+    # Act
+    errors = format_errors(['primeiro', 'segundo'])
+
+    # Assert
+    assert errors == [
+        {'field': 'general', 'message': 'primeiro', 'code': 'error'},
+        {'field': 'general', 'message': 'segundo', 'code': 'error'},
+    ]
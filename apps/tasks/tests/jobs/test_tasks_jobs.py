@@ -0,0 +1,70 @@
+import pytest
+from datetime import date
+from django.contrib.auth.models import User
+from apps.tasks.jobs import export_tasks_csv, notify_task_completed, send_due_reminders
+from apps.tasks.models.tasks import Tasks
+
+
+@pytest.fixture
+def user():
+    """Fixture para criar um usuário de teste."""
+    return User.objects.create_user(
+        username='usuario_teste',
+        email='teste@example.com',
+        password='senha123'
+    )
+
+
+@pytest.fixture
+def task(user):
+    """Fixture para criar uma tarefa concluída."""
+    return Tasks.objects.create(
+        usuario=user,
+        titulo='Tarefa Concluída',
+        descricao='Descrição',
+        prioridade='A',
+        prazo=date.today(),
+        status='C'
+    )
+
+
+@pytest.mark.django_db
+def test_notify_task_completed_sends_email(mailoutbox, task):
+    """Testa se a notificação de conclusão envia e-mail ao dono da tarefa."""
+    # Act
+    notify_task_completed.call(task.id)
+
+    # Assert
+    assert len(mailoutbox) == 1
+    assert mailoutbox[0].to == ['teste@example.com']
+    assert 'Tarefa Concluída' in mailoutbox[0].subject
+
+
+@pytest.mark.django_db
+def test_export_tasks_csv_sends_attachment(mailoutbox, task, user):
+    """Testa se a exportação envia o CSV das tarefas em anexo."""
+    # Act
+    export_tasks_csv.call(user.id)
+
+    # Assert
+    assert len(mailoutbox) == 1
+    filename, content, mimetype = mailoutbox[0].attachments[0]
+    assert filename.endswith('.csv')
+    assert mimetype == 'text/csv'
+    assert 'Tarefa Concluída' in content
+
+
+@pytest.mark.django_db
+def test_send_due_reminders_groups_tasks_in_one_email(mailoutbox, user):
+    """Testa se os lembretes do usuário são enviados em um único e-mail, ignorando concluídas."""
+    # Arrange
+    pendente = Tasks.objects.create(usuario=user, titulo='Pendente', prioridade='A', prazo=date.today())
+    concluida = Tasks.objects.create(usuario=user, titulo='Feita', prioridade='A', prazo=date.today(), status='C')
+
+    # Act
+    send_due_reminders.call(user.id, [pendente.id, concluida.id])
+
+    # Assert
+    assert len(mailoutbox) == 1
+    assert 'Pendente' in mailoutbox[0].body
+    assert 'Feita' not in mailoutbox[0].body
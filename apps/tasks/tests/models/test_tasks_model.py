@@ -1,5 +1,7 @@
 import pytest
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from apps.tasks.models.tasks import Tasks
 from datetime import date
 
@@ -126,4 +128,67 @@ def test_field_verbose_names_are_correctly_defined():
     assert Tasks._meta.get_field('prioridade').verbose_name == 'Prioridade'
     assert Tasks._meta.get_field('prazo').verbose_name == 'Prazo'
     assert Tasks._meta.get_field('status').verbose_name == 'Status'
-    assert Tasks._meta.get_field('criado_em').verbose_name == 'Criado em'
\ No newline at end of file
+    assert Tasks._meta.get_field('criado_em').verbose_name == 'Criado em'
+
+@pytest.mark.django_db
+def test_concluir_saves_only_changed_fields(task_pendente, django_assert_num_queries):
+    """Testa se concluir grava apenas status, concluido_em e atualizado_em."""
+    # Arrange
+    Tasks.objects.filter(pk=task_pendente.pk).update(titulo='Alterado por outro')
+
+    # Act
+    with django_assert_num_queries(1):
+        task_pendente.concluir()
+
+    # Assert
+    task_pendente.refresh_from_db()
+    assert task_pendente.status == 'C'
+    assert task_pendente.concluido_em is not None
+    # O título alterado em paralelo não é sobrescrito pelo valor antigo
+    assert task_pendente.titulo == 'Alterado por outro'
+
+
+@pytest.mark.django_db
+def test_apply_changes_returns_only_changed_fields(task_pendente, user):
+    """Testa se apply_changes altera e retorna apenas os campos com valor diferente."""
+    # Act
+    changed = task_pendente.apply_changes({
+        'titulo': 'Tarefa Pendente',
+        'status': 'EA',
+        'usuario': user,
+    })
+
+    # Assert
+    assert changed == ['status']
+    assert task_pendente.status == 'EA'
+
+
+@pytest.mark.django_db
+def test_partition_filter_is_empty_without_partitioning(task_pendente, settings):
+    """Testa se sem TASKS_PARTITIONING o UPDATE não recebe filtros extras."""
+    # Arrange
+    settings.TASKS_PARTITIONING = ''
+
+    # Act / Assert
+    assert task_pendente.partition_filter() == {}
+
+
+@pytest.mark.django_db
+def test_save_changes_filters_by_partition_key_read_before_change(task_pendente, user, settings):
+    """Testa se, com a tabela particionada, o UPDATE filtra pelo usuário lido antes da transferência."""
+    # Arrange
+    settings.TASKS_PARTITIONING = 'hash'
+    other = User.objects.create_user(username='outro_usuario', password='senha123')
+    task = Tasks.objects.get(pk=task_pendente.pk)
+    partition = task.partition_filter()
+    task.usuario = other
+
+    # Act
+    with CaptureQueriesContext(connection) as queries:
+        task.save_changes(['usuario'], partition)
+
+    # Assert
+    assert task.partition_filter() == {'usuario_id': other.id}
+    update = queries.captured_queries[0]['sql']
+    assert update.startswith('UPDATE') and f'"usuario_id" = {user.id}' in update
+    assert Tasks.objects.get(pk=task.pk).usuario_id == other.id
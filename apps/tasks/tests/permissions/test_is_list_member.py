@@ -0,0 +1,72 @@
+import pytest
+from django.contrib.auth.models import User
+from common.permissions.is_list_member import IsOwnerOrListMember
+from apps.tasks.models.tasks import Tasks
+
+
+class MockView:
+    """
+    Classe auxiliar para simular a view das tarefas, com os papéis já carregados.
+    """
+    def __init__(self, roles):
+        self.roles = roles
+        self.calls = 0
+
+    def get_list_roles(self):
+        self.calls += 1
+        return self.roles
+
+
+class MockRequest:
+    def __init__(self, user, method='GET'):
+        self.user = user
+        self.method = method
+
+
+@pytest.fixture
+def owner():
+    """Fixture para criar o dono da tarefa."""
+    return User.objects.create_user(username='dono', password='senha123')
+
+
+@pytest.fixture
+def member():
+    """Fixture para criar um membro da lista."""
+    return User.objects.create_user(username='membro', password='senha123')
+
+
+@pytest.fixture
+def task(owner):
+    """Fixture para criar uma tarefa em uma lista (sem carregar a lista)."""
+    return Tasks(usuario=owner, titulo='Compartilhada', prioridade='M', lista_id=7)
+
+
+@pytest.mark.django_db
+def test_owner_is_allowed_without_loading_roles(owner, task):
+    """Testa se o dono tem acesso sem consultar os papéis."""
+    # Arrange
+    view = MockView({})
+
+    # Act / Assert
+    assert IsOwnerOrListMember().has_object_permission(MockRequest(owner, 'DELETE'), view, task)
+    assert view.calls == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('role, method, allowed', [
+    ('L', 'GET', True),
+    ('L', 'PATCH', False),
+    ('E', 'PATCH', True),
+    ('A', 'DELETE', True),
+    (None, 'GET', False),
+])
+def test_member_access_depends_on_role(member, task, role, method, allowed):
+    """Testa se leitores só leem e editores e administradores também alteram."""
+    # Arrange
+    view = MockView({task.lista_id: role} if role else {})
+
+    # Act
+    result = IsOwnerOrListMember().has_object_permission(MockRequest(member, method), view, task)
+
+    # Assert
+    assert result is allowed
@@ -0,0 +1,77 @@
+import json
+import pytest
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from common.renderers import ColumnarJSONRenderer, MessagePackRenderer, compact_renderer_classes, to_columns
+
+
+@pytest.fixture
+def rows():
+    """Fixture com linhas no formato da listagem de tarefas."""
+    return [
+        {'id': 1, 'status_display': 'Pendente', 'titulo': 'Ação', 'tags': ['casa']},
+        {'id': 2, 'status_display': 'Concluída', 'titulo': 'Outra', 'tags': []},
+        {'id': 3, 'status_display': 'Pendente', 'titulo': None, 'tags': ['casa', 'rua']},
+    ]
+
+
+def test_to_columns_codifica_campos_por_dicionario(rows):
+    """Testa o layout colunar: um array por campo e índices no dicionário para os campos indicados."""
+    # Act
+    result = to_columns(rows, dictionary_fields=('status_display',))
+
+    # Assert
+    assert result == {
+        'linhas': 3,
+        'colunas': {
+            'id': [1, 2, 3],
+            'status_display': [0, 1, 0],
+            'titulo': ['Ação', 'Outra', None],
+            'tags': [['casa'], [], ['casa', 'rua']],
+        },
+        'dicionarios': {'status_display': ['Pendente', 'Concluída']},
+    }
+
+
+def test_columnar_renderer_usa_campos_da_view_e_paginacao(rows):
+    """Testa que só `results` da resposta paginada é convertido, com os campos de dicionário da view."""
+    # Arrange
+    context = {'view': SimpleNamespace(columnar_dictionary_fields=('status_display',))}
+    data = {'count': 3, 'next': None, 'previous': None, 'results': rows}
+
+    # Act
+    body = json.loads(ColumnarJSONRenderer().render(data, renderer_context=context))
+
+    # Assert
+    assert body['count'] == 3
+    assert body['results']['colunas']['status_display'] == [0, 1, 0]
+    assert body['results']['dicionarios'] == {'status_display': ['Pendente', 'Concluída']}
+
+
+def test_columnar_renderer_mantem_respostas_que_nao_sao_listas():
+    """Testa que erros e objetos saem exatamente como no JSON padrão."""
+    # Arrange
+    data = {'detail': 'Não encontrado.'}
+
+    # Act & Assert
+    assert ColumnarJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert json.loads(ColumnarJSONRenderer().render([])) == {'linhas': 0, 'colunas': {}, 'dicionarios': {}}
+
+
+def test_messagepack_renderer_preserva_o_conteudo_do_json(rows):
+    """Testa que o MessagePack decodificado é igual ao JSON, inclusive datas, Decimal e strings lazy."""
+    # Arrange
+    msgpack = pytest.importorskip('msgpack')
+    data = {'results': rows, 'prazo': date(2025, 6, 30), 'valor': Decimal('10.50'),
+            'rotulo': gettext_lazy('Pendente')}
+
+    # Act
+    body = MessagePackRenderer().render(data)
+
+    # Assert
+    assert msgpack.unpackb(body) == json.loads(JSONRenderer().render(data))
+    assert len(body) < len(JSONRenderer().render(data))
+    assert MessagePackRenderer in compact_renderer_classes()
@@ -0,0 +1,109 @@
+import pytest
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from common.parsers import ORJSONParser
+from common.renderers import ORJSONRenderer
+
+
+@pytest.fixture
+def payload():
+    """Fixture com os tipos que aparecem nas respostas da API."""
+    return {
+        'id': 1,
+        'titulo': 'Tarefa com acentuação e emoji 🚀',
+        'status_display': gettext_lazy('Pendente'),
+        'prazo': date(2025, 5, 18),
+        'criado_em': datetime(2025, 5, 18, 12, 30, 1, 123456, tzinfo=dt_timezone.utc),
+        'local': datetime(2025, 5, 18, 12, 30, tzinfo=dt_timezone(timedelta(hours=-3))),
+        'hora': time(8, 15),
+        'valor': Decimal('10.50'),
+        'duracao': timedelta(minutes=5),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'separadores': 'linha\u2028paragrafo\u2029fim',
+        'lista': [None, True, 1.5, (1, 2), {3}],
+        2: 'chave numérica',
+    }
+
+
+def test_orjson_renderer_output_matches_default_renderer(payload):
+    """Testa se o renderer orjson gera os mesmos bytes do renderer padrão (sem floats com expoente)."""
+    # Act & Assert
+    assert ORJSONRenderer().render(payload) == JSONRenderer().render(payload)
+
+
+@pytest.mark.parametrize('data', [
+    {'grande': 1e16, 'pequeno': 1e-7, 'comum': 0.1},
+    [1.5e300, -2.5e-10],
+    {'sem_expoente': 0.00001, 'lista': [None, 0.0001, 123456.789]},
+])
+def test_orjson_renderer_floats_match_default_renderer(data):
+    """Testa se floats que o orjson escreveria com outros bytes saem iguais aos do renderer padrão."""
+    # Act & Assert
+    assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+
+@pytest.mark.parametrize('value', [float('nan'), float('inf'), float('-inf')])
+def test_orjson_renderer_rejects_non_finite_floats_like_default_renderer(value):
+    """Testa se NaN e Infinity são recusados como no renderer padrão, em vez de virarem null."""
+    # Act & Assert
+    with pytest.raises(ValueError):
+        ORJSONRenderer().render({'lista': [{'valor': value}], 'vazio': None})
+    with pytest.raises(ValueError):
+        ORJSONRenderer().render(value)
+
+
+def test_orjson_renderer_large_integer_falls_back(payload):
+    """Testa se inteiros fora do alcance do orjson são renderizados pelo padrão."""
+    # Arrange
+    data = {'grande': 2 ** 70}
+
+    # Act & Assert
+    assert ORJSONRenderer().render(data) == b'{"grande":1180591620717411303424}'
+
+
+def test_orjson_renderer_indent_matches_default_renderer(payload):
+    """Testa se a renderização indentada continua igual à padrão."""
+    # Arrange
+    media_type = 'application/json; indent=4'
+
+    # Act & Assert
+    assert ORJSONRenderer().render(payload, media_type) == JSONRenderer().render(payload, media_type)
+
+
+def test_orjson_renderer_none_returns_empty_bytes():
+    """Testa se None gera corpo vazio, como no renderer padrão."""
+    # Act & Assert
+    assert ORJSONRenderer().render(None) == b''
+
+
+def test_orjson_parser_parses_body():
+    """Testa se o parser orjson interpreta o corpo como o parser padrão."""
+    # Arrange
+    body = '{"titulo": "Ação", "ids": [1, 2], "grande": 1180591620717411303424}'.encode()
+
+    # Act
+    parsed = ORJSONParser().parse(BytesIO(body))
+
+    # Assert
+    assert parsed == JSONParser().parse(BytesIO(body))
+
+
+def test_orjson_parser_invalid_body_raises_parse_error():
+    """Testa se um corpo inválido gera o mesmo ParseError do parser padrão."""
+    # Arrange
+    body = b'{"titulo": '
+
+    # Act
+    with pytest.raises(ParseError) as fast_error:
+        ORJSONParser().parse(BytesIO(body))
+    with pytest.raises(ParseError) as default_error:
+        JSONParser().parse(BytesIO(body))
+
+    # Assert
+    assert str(fast_error.value) == str(default_error.value)
@@ -0,0 +1,60 @@
+import pytest
+from datetime import date
+from django.contrib.auth.models import User
+from django.utils import timezone
+from apps.tasks.models.tasks import Tasks
+from apps.tasks.schemas.task_read_schema import READ_FIELDS, serialize_task_rows
+from apps.tasks.schemas.task_schema import TaskSerializer
+
+
+@pytest.fixture
+def user():
+    """Fixture para criar um usuário de teste."""
+    return User.objects.create_user(
+        username='usuario_teste',
+        email='teste@example.com',
+        password='senha123'
+    )
+
+
+@pytest.fixture
+def tasks(user):
+    """Fixture com tarefas cobrindo campos nulos, concluídas e status desconhecido."""
+    return [
+        Tasks.objects.create(usuario=user, titulo='Com prazo', descricao='Texto', prioridade='A',
+                             prazo=date(2025, 6, 30), status='P'),
+        Tasks.objects.create(usuario=user, titulo='Sem prazo', prioridade='B', status='EA'),
+        Tasks.objects.create(usuario=user, titulo='Concluída', prioridade='M', status='C',
+                             concluido_em=timezone.now()),
+        Tasks.objects.create(usuario=user, titulo='Status antigo', prioridade='X', status='Z'),
+    ]
+
+
+@pytest.mark.django_db
+def test_serialize_task_rows_matches_task_serializer(tasks):
+    """Testa se o caminho rápido gera exatamente a mesma saída do TaskSerializer."""
+    # Arrange
+    queryset = Tasks.objects.order_by('id')
+
+    # Act
+    fast = serialize_task_rows(queryset.values_list(*READ_FIELDS))
+    expected = TaskSerializer(queryset, many=True).data
+
+    # Assert
+    assert fast == [dict(item) for item in expected]
+    assert [list(item) for item in fast] == [list(item) for item in expected]
+
+
+@pytest.mark.django_db
+def test_serialize_task_rows_uses_utc_suffix_in_utc_timezone(tasks, settings):
+    """Testa se datas em UTC usam o sufixo 'Z', como no DRF."""
+    # Arrange
+    settings.TIME_ZONE = 'UTC'
+    queryset = Tasks.objects.order_by('id')
+
+    # Act
+    fast = serialize_task_rows(queryset.values_list(*READ_FIELDS))
+
+    # Assert
+    assert fast[0]['criado_em'].endswith('Z')
+    assert fast == [dict(item) for item in TaskSerializer(queryset, many=True).data]
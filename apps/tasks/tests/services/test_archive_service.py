@@ -0,0 +1,118 @@
+import pytest
+from datetime import timedelta
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+from apps.tasks.models.archived import ArchivedTasks
+from apps.tasks.models.tasks import Tasks
+from apps.tasks.models.tags import TaskTags
+from apps.tasks.services.archive_service import archive_completed_tasks
+from apps.tasks.services.tags_service import sync_task_tags
+from apps.tasks.services.tree_service import child_path
+
+
+@pytest.fixture
+def user():
+    """Fixture para criar um usuário de teste."""
+    return User.objects.create_user(username='arquivista', password='senha123')
+
+
+def create_task(user, status='C', days_ago=None, **kwargs):
+    task = Tasks.objects.create(usuario=user, titulo=kwargs.pop('titulo', 'Tarefa'), prioridade='M', status=status, **kwargs)
+    if days_ago is not None:
+        Tasks.objects.filter(pk=task.pk).update(concluido_em=timezone.now() - timedelta(days=days_ago))
+    return task
+
+
+@pytest.mark.django_db
+def test_archive_moves_only_old_completed_tasks(user):
+    """Testa se apenas tarefas concluídas há mais de N dias saem da tabela principal."""
+    # Arrange
+    old = create_task(user, days_ago=200, titulo='Antiga', descricao='detalhes')
+    recent = create_task(user, days_ago=10)
+    pending = create_task(user, status='P')
+
+    # Act
+    archived, batches = archive_completed_tasks(days=180)
+
+    # Assert
+    assert (archived, batches) == (1, 1)
+    assert set(Tasks.objects.values_list('id', flat=True)) == {recent.id, pending.id}
+    copy = ArchivedTasks.objects.get(pk=old.pk)
+    assert (copy.usuario_id, copy.titulo, copy.descricao, copy.status) == (user.id, 'Antiga', 'detalhes', 'C')
+    assert copy.criado_em == old.criado_em
+    assert copy.arquivado_em is not None
+
+
+@pytest.mark.django_db
+def test_archive_keeps_parents_until_their_subtasks_leave(user):
+    """Testa se a tarefa com subtarefas só é arquivada depois delas, sem deixar subtarefas órfãs."""
+    # Arrange
+    projeto = create_task(user, days_ago=300, titulo='Projeto')
+    fase = create_task(user, days_ago=250, titulo='Fase', pai=projeto, caminho=child_path(projeto))
+    etapa = create_task(user, days_ago=200, titulo='Etapa', pai=fase, caminho=child_path(fase))
+    ativo = create_task(user, days_ago=400, titulo='Projeto ativo')
+    create_task(user, status='P', titulo='Pendente', pai=ativo, caminho=child_path(ativo))
+
+    # Act
+    first, _ = archive_completed_tasks(days=180)
+    after_first = set(ArchivedTasks.objects.values_list('id', flat=True))
+    archive_completed_tasks(days=180)
+    archive_completed_tasks(days=180)
+
+    # Assert
+    assert first == 1 and after_first == {etapa.id}
+    assert set(ArchivedTasks.objects.values_list('id', flat=True)) == {projeto.id, fase.id, etapa.id}
+    assert Tasks.objects.filter(pk=ativo.pk).exists()
+    # Nenhuma tarefa que ficou aponta para um pai arquivado
+    parents = set(Tasks.objects.exclude(pai=None).values_list('pai_id', flat=True))
+    assert parents <= set(Tasks.objects.values_list('id', flat=True))
+
+
+@pytest.mark.django_db
+def test_archive_runs_in_batches_and_resumes(user):
+    """Testa se o arquivamento respeita o tamanho do lote e continua de onde parou."""
+    # Arrange
+    ids = [create_task(user, days_ago=400 - i).id for i in range(5)]
+
+    # Act
+    first = archive_completed_tasks(days=180, batch_size=2, max_batches=1)
+    after_first = set(ArchivedTasks.objects.values_list('id', flat=True))
+    rest = archive_completed_tasks(days=180, batch_size=2)
+
+    # Assert
+    assert first == (2, 1)
+    # Os mais antigos (menor concluido_em) saem primeiro
+    assert after_first == set(ids[:2])
+    assert rest == (3, 2)
+    assert set(ArchivedTasks.objects.values_list('id', flat=True)) == set(ids)
+    assert not Tasks.objects.exists()
+
+
+@pytest.mark.django_db
+def test_archive_tasks_command(user):
+    """Testa o comando archive_tasks."""
+    # Arrange
+    create_task(user, days_ago=40)
+
+    # Act
+    call_command('archive_tasks', '--days', '30', '--batch-size', '10')
+
+    # Assert
+    assert ArchivedTasks.objects.count() == 1
+    assert not Tasks.objects.exists()
+
+
+@pytest.mark.django_db
+def test_archive_keeps_tags_and_clears_tag_index(user):
+    """Testa se a tarefa arquivada mantém as etiquetas, mas sai do índice de filtros."""
+    # Arrange
+    old = create_task(user, days_ago=200, tags=['casa'])
+    sync_task_tags(old)
+
+    # Act
+    archive_completed_tasks(days=180)
+
+    # Assert
+    assert ArchivedTasks.objects.get(pk=old.pk).tags == ['casa']
+    assert not TaskTags.objects.exists()
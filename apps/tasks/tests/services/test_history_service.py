@@ -0,0 +1,109 @@
+import pytest
+from unittest import mock
+from django.contrib.auth.models import User
+from apps.tasks.models.history import TaskHistory
+from apps.tasks.models.tasks import Tasks
+from apps.tasks.services import history_service
+
+
+@pytest.fixture
+def user():
+    """Fixture para criar um usuário de teste."""
+    return User.objects.create_user(username='auditor', password='senha123')
+
+
+@pytest.fixture
+def task(user):
+    """Fixture para criar uma tarefa do usuário."""
+    return Tasks.objects.create(usuario=user, titulo='Original', prioridade='M')
+
+
+@pytest.mark.django_db
+def test_record_grava_apenas_depois_do_commit(user, task, django_capture_on_commit_callbacks):
+    """Testa que o histórico não é gravado antes do commit e que só os campos alterados entram."""
+    # Arrange
+    before = history_service.field_values(task, ['titulo', 'prioridade', 'usuario'])
+    task.titulo = 'Alterada'
+
+    # Act
+    with django_capture_on_commit_callbacks(execute=True):
+        history_service.record(history_service.ATUALIZADA, [
+            (task.pk, history_service.diff(before, task, ['titulo'])),
+        ], user.pk)
+        assert not TaskHistory.objects.exists()
+
+    # Assert
+    entry = TaskHistory.objects.get()
+    assert (entry.tarefa_id, entry.autor_id, entry.acao) == (task.pk, user.pk, 'atualizada')
+    assert entry.alteracoes == {'titulo': ['Original', 'Alterada']}
+    assert before['usuario'] == user.pk
+
+
+@pytest.mark.django_db
+def test_record_ignora_alteracoes_vazias_e_transacoes_desfeitas(user, task, django_capture_on_commit_callbacks):
+    """Testa que nada é registrado sem campos alterados nem quando o commit não acontece."""
+    # Act
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        history_service.record(history_service.ATUALIZADA, [(task.pk, {})], user.pk)
+        history_service.record(history_service.ATUALIZADA, [(task.pk, {'titulo': ['a', 'b']})], user.pk)
+
+    # Assert
+    assert len(callbacks) == 1
+    assert not TaskHistory.objects.exists()
+
+
+@pytest.mark.django_db
+def test_record_grava_a_transacao_em_um_insert(user, task, django_capture_on_commit_callbacks):
+    """Testa que as alterações de uma escrita são gravadas em um único INSERT, logo após o commit."""
+    # Arrange
+    other = Tasks.objects.create(usuario=user, titulo='Outra', prioridade='B')
+
+    # Act
+    with mock.patch.object(TaskHistory.objects, 'bulk_create', wraps=TaskHistory.objects.bulk_create) as bulk:
+        with django_capture_on_commit_callbacks(execute=True):
+            history_service.record(history_service.ATUALIZADA, [
+                (task.pk, {'status': ['P', 'C']}), (other.pk, {'status': ['P', 'C']}),
+            ], user.pk)
+
+    # Assert
+    bulk.assert_called_once()
+    assert sorted(TaskHistory.objects.values_list('tarefa_id', flat=True)) == sorted([task.pk, other.pk])
+
+
+@pytest.mark.django_db
+def test_falha_ao_gravar_nao_propaga(user, task, django_capture_on_commit_callbacks):
+    """Testa que uma falha na gravação do histórico é registrada no log e não chega a quem alterou a tarefa."""
+    # Arrange
+    failing = mock.patch.object(TaskHistory.objects, 'bulk_create', side_effect=RuntimeError('banco fora'))
+
+    # Act
+    with failing, mock.patch.object(history_service.logger, 'exception') as log:
+        with django_capture_on_commit_callbacks(execute=True):
+            history_service.record(history_service.ATUALIZADA, [(task.pk, {'titulo': ['a', 'b']})], user.pk)
+
+    # Assert
+    log.assert_called_once()
+    assert not TaskHistory.objects.exists()
+
+
+@pytest.mark.django_db
+def test_task_history_pagina_por_cursor(user, task, django_assert_num_queries):
+    """Testa a paginação do histórico da mais recente para a mais antiga, por cursor."""
+    # Arrange
+    TaskHistory.objects.bulk_create(
+        TaskHistory(tarefa_id=task.pk, autor=user, acao='atualizada', alteracoes={'titulo': [str(i), str(i + 1)]})
+        for i in range(5)
+    )
+    TaskHistory.objects.create(tarefa_id=task.pk + 1, acao='criada', alteracoes={'titulo': [None, 'Outra']})
+
+    # Act
+    with django_assert_num_queries(1):
+        first, cursor = history_service.task_history(task.pk, limit=3)
+    second, last_cursor = history_service.task_history(task.pk, before_id=cursor, limit=3)
+
+    # Assert
+    assert [row['alteracoes']['titulo'][1] for row in first] == ['5', '4', '3']
+    assert [row['alteracoes']['titulo'][1] for row in second] == ['2', '1']
+    assert first[0]['autor'] == 'auditor'
+    assert cursor == first[-1]['id']
+    assert last_cursor is None
@@ -0,0 +1,141 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.response import Response
+from apps.tasks.models.idempotency import IdempotencyKeys
+from apps.tasks.services import idempotency_service
+from apps.tasks.services.idempotency_service import KeyInUse, KeyMismatch, execute, purge_expired, scoped_key
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Fixture que limpa o cache, onde ficam as respostas guardadas."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def key():
+    return scoped_key(1, 'POST', '/api/v1/tasks/', 'chave-1')
+
+
+def created(data):
+    return lambda: Response(data, status=201, headers={'Location': '/api/v1/tasks/7/'})
+
+
+def test_scoped_key_separa_usuarios_e_caminhos():
+    """Testa que a mesma chave do cliente vale separadamente por usuário e por caminho."""
+    # Act
+    keys = {
+        scoped_key(1, 'POST', '/api/v1/tasks/', 'x'),
+        scoped_key(2, 'POST', '/api/v1/tasks/', 'x'),
+        scoped_key(1, 'POST', '/api/v1/tasks/concluir/', 'x'),
+    }
+
+    # Assert
+    assert len(keys) == 3
+
+
+@pytest.mark.django_db
+def test_execute_guarda_e_repete_a_resposta(key):
+    """Testa que a primeira execução é guardada e a repetição devolve a resposta sem executar de novo."""
+    # Arrange
+    calls = []
+
+    def call():
+        calls.append(1)
+        return created({'id': 7})()
+
+    # Act
+    first, _ = execute(key, 'corpo', call)
+    replayed, stored = execute(key, 'corpo', call)
+
+    # Assert
+    assert first.status_code == 201
+    assert replayed is None
+    assert stored == {'impressao': 'corpo', 'status': 201, 'dados': {'id': 7},
+                      'cabecalhos': {'Location': '/api/v1/tasks/7/'}}
+    assert len(calls) == 1
+
+
+@pytest.mark.django_db
+def test_execute_usa_a_tabela_quando_o_cache_perde_a_chave(key):
+    """Testa que, sem a resposta no cache, ela é lida da tabela (fallback) e volta para o cache."""
+    # Arrange
+    execute(key, 'corpo', created({'id': 7}))
+    cache.clear()
+
+    # Act
+    _, stored = execute(key, 'corpo', created({'id': 8}))
+
+    # Assert
+    assert stored['dados'] == {'id': 7}
+    assert cache.get(f'idempotencia:{key}') is not None
+
+
+@pytest.mark.django_db
+def test_execute_recusa_outro_corpo_e_libera_erros(key):
+    """Testa que a chave com outro corpo é recusada e que um 5xx ou exceção libera a chave."""
+    # Arrange
+    def failing():
+        raise RuntimeError('falhou')
+
+    # Act
+    with pytest.raises(RuntimeError):
+        execute(key, 'corpo', failing)
+    error, _ = execute(key, 'corpo', lambda: Response({'detail': 'indisponível'}, status=503))
+    retried, _ = execute(key, 'corpo', created({'id': 7}))
+
+    # Assert
+    assert error.status_code == 503
+    assert retried.status_code == 201
+    with pytest.raises(KeyMismatch):
+        execute(key, 'outro corpo', created({'id': 8}))
+
+
+@pytest.mark.django_db
+def test_execute_recusa_na_hora_a_chave_em_andamento(key):
+    """Testa que a repetição com a original em andamento recebe KeyInUse sem esperar, e que a chave abandonada é liberada."""
+    # Arrange
+    IdempotencyKeys.objects.create(chave=key, impressao='corpo', expira_em=timezone.now() + timedelta(minutes=1))
+
+    # Act & Assert
+    with pytest.raises(KeyInUse):
+        execute(key, 'corpo', created({'id': 7}))
+    IdempotencyKeys.objects.filter(chave=key).update(expira_em=timezone.now() - timedelta(seconds=1))
+    response, _ = execute(key, 'corpo', created({'id': 7}))
+    assert response.status_code == 201
+    assert IdempotencyKeys.objects.get(chave=key).status == 'C'
+
+
+@pytest.mark.django_db
+def test_purge_expired_apaga_apenas_chaves_vencidas(key):
+    """Testa a remoção das chaves expiradas da tabela."""
+    # Arrange
+    now = timezone.now()
+    IdempotencyKeys.objects.create(chave=key, impressao='a', status_code=201, expira_em=now - timedelta(seconds=1))
+    IdempotencyKeys.objects.create(chave='b' * 64, impressao='b', status_code=201, expira_em=now + timedelta(hours=1))
+
+    # Act
+    purged = purge_expired()
+
+    # Assert
+    assert purged == 1
+    assert list(IdempotencyKeys.objects.values_list('impressao', flat=True)) == ['b']
+
+
+@pytest.mark.django_db
+def test_purge_idempotency_keys_command(key):
+    """Testa o comando purge_idempotency_keys, separado do arquivamento."""
+    # Arrange
+    IdempotencyKeys.objects.create(chave=key, impressao='a', status_code=201, expira_em=timezone.now() - timedelta(seconds=1))
+
+    # Act
+    call_command('purge_idempotency_keys')
+
+    # Assert
+    assert not IdempotencyKeys.objects.exists()
@@ -0,0 +1,155 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from apps.tasks.models.lists import ListMembers
+from apps.tasks.models.tasks import Tasks
+from apps.tasks.models.tombstones import TaskTombstones
+from apps.tasks.services.lists_service import (
+    add_member, create_list, delete_list, list_roles, remove_member, task_viewers, union_all, visible_branches,
+    visible_filter,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Fixture que isola o cache dos papéis entre os testes."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def owner():
+    """Fixture para criar o dono da lista."""
+    return User.objects.create_user(username='dono', password='senha123')
+
+
+@pytest.fixture
+def member():
+    """Fixture para criar um membro da lista."""
+    return User.objects.create_user(username='membro', password='senha123')
+
+
+@pytest.fixture
+def task_list(owner):
+    """Fixture para criar uma lista compartilhada."""
+    return create_list(owner, 'Equipe')
+
+
+def create_task(user, titulo, lista=None):
+    return Tasks.objects.create(usuario=user, titulo=titulo, prioridade='M', lista=lista)
+
+
+@pytest.mark.django_db
+def test_create_list_makes_owner_admin(owner, task_list):
+    """Testa se o criador da lista entra como administrador."""
+    # Act / Assert
+    assert list_roles(owner.pk) == {task_list.pk: 'A'}
+
+
+@pytest.mark.django_db
+def test_list_roles_are_cached_and_invalidated(owner, member, task_list, django_assert_num_queries):
+    """Testa se os papéis são lidos do cache e recarregados após alterar os membros."""
+    # Arrange
+    list_roles(member.pk)
+
+    # Act / Assert
+    with django_assert_num_queries(0):
+        assert list_roles(member.pk) == {}
+
+    add_member(task_list, member, 'E')
+    with django_assert_num_queries(1):
+        assert list_roles(member.pk) == {task_list.pk: 'E'}
+
+    remove_member(task_list, member.pk)
+    assert list_roles(member.pk) == {}
+
+
+@pytest.mark.django_db
+def test_visible_filter_includes_shared_tasks(owner, member, task_list):
+    """Testa se o membro vê as próprias tarefas e as da lista, e edita só com o papel certo."""
+    # Arrange
+    own = create_task(member, 'Minha')
+    shared = create_task(owner, 'Compartilhada', task_list)
+    create_task(owner, 'Privada do dono')
+    add_member(task_list, member, 'L')
+    roles = list_roles(member.pk)
+
+    # Act
+    visible = Tasks.objects.filter(visible_filter(member.pk, roles))
+    writable = Tasks.objects.filter(visible_filter(member.pk, roles, writable=True))
+
+    # Assert
+    assert set(visible.values_list('id', flat=True)) == {own.id, shared.id}
+    assert list(writable.values_list('id', flat=True)) == [own.id]
+
+
+@pytest.mark.django_db
+def test_visible_branches_keep_the_user_predicate_apart(owner, member, task_list):
+    """Testa se as tarefas do usuário ficam em uma consulta só com usuario_id e as das listas não se repetem."""
+    # Arrange
+    own = create_task(member, 'Minha', task_list)
+    shared = create_task(owner, 'Compartilhada', task_list)
+    create_task(owner, 'Privada do dono')
+    alone = visible_branches(Tasks.objects.all(), member.pk, list_roles(member.pk))
+    add_member(task_list, member, 'L')
+
+    # Act
+    branches = visible_branches(Tasks.objects.all(), member.pk, list_roles(member.pk))
+    rows = union_all([branch.values_list('id', flat=True) for branch in branches]).order_by('id')
+
+    # Assert
+    assert len(alone) == 1
+    assert str(alone[0].order_by().query).split('WHERE')[1].strip() == f'"tasks_tasks"."usuario_id" = {member.pk}'
+    assert len(branches) == 2
+    assert list(rows) == [own.id, shared.id]
+
+
+@pytest.mark.django_db
+def test_task_viewers_groups_tasks_by_user(owner, member, task_list):
+    """Testa se cada tarefa é atribuída ao dono e aos membros da lista dela."""
+    # Arrange
+    add_member(task_list, member, 'L')
+
+    # Act
+    viewers = task_viewers([(1, owner.pk, task_list.pk), (2, owner.pk, None)])
+
+    # Assert
+    assert sorted(viewers[owner.pk]) == [1, 2]
+    assert viewers[member.pk] == [1]
+
+
+@pytest.mark.django_db
+def test_remove_member_records_tombstones(owner, member, task_list):
+    """Testa se quem sai da lista recebe as remoções das tarefas dos outros para a sincronização."""
+    # Arrange
+    shared = create_task(owner, 'Compartilhada', task_list)
+    mine = create_task(member, 'Minha na lista', task_list)
+    add_member(task_list, member, 'E')
+
+    # Act
+    removed = remove_member(task_list, member.pk)
+
+    # Assert
+    assert removed is True
+    assert list(TaskTombstones.objects.values_list('tarefa_id', 'usuario_id')) == [(shared.id, member.pk)]
+    assert Tasks.objects.filter(pk=mine.pk).exists()
+
+
+@pytest.mark.django_db
+def test_delete_list_keeps_tasks_with_owners(owner, member, task_list):
+    """Testa se excluir a lista mantém as tarefas, sem lista, e invalida o cache dos membros."""
+    # Arrange
+    shared = create_task(owner, 'Compartilhada', task_list)
+    add_member(task_list, member, 'L')
+    list_roles(member.pk)
+
+    # Act
+    delete_list(task_list)
+
+    # Assert
+    shared.refresh_from_db()
+    assert shared.lista_id is None
+    assert not ListMembers.objects.exists()
+    assert list_roles(member.pk) == {}
+    assert list(TaskTombstones.objects.values_list('tarefa_id', 'usuario_id')) == [(shared.id, member.pk)]
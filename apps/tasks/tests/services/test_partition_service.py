@@ -0,0 +1,118 @@
+import pytest
+from datetime import date
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from apps.tasks.services.partition_service import (
+    BACKFILL_SQL,
+    add_months,
+    create_sql,
+    index_sql,
+    month_partitions,
+    swap_sql,
+)
+
+INDEXES = [
+    ('tasks_prazo_pendentes_idx',
+     'CREATE INDEX tasks_prazo_pendentes_idx ON public.tasks_tasks USING btree (prazo, id) '
+     "WHERE ((status)::text <> 'C'::text)"),
+    ('tasks_tasks_usuario_id_9ed1a8b4', 'CREATE INDEX tasks_tasks_usuario_id_9ed1a8b4 ON public.tasks_tasks USING btree (usuario_id)'),
+]
+FOREIGN_KEYS = [
+    ('tasks_tasks_usuario_id_fk', 'FOREIGN KEY (usuario_id) REFERENCES auth_user(id) DEFERRABLE INITIALLY DEFERRED'),
+]
+
+
+def test_add_months_crosses_year():
+    """Testa se add_months retorna o primeiro dia do mês, virando o ano."""
+    # Act / Assert
+    assert add_months(date(2025, 11, 20), 0) == date(2025, 11, 1)
+    assert add_months(date(2025, 11, 20), 3) == date(2026, 2, 1)
+
+
+def test_month_partitions_cover_range():
+    """Testa se as partições mensais cobrem do primeiro ao último mês, sem buracos."""
+    # Act
+    partitions = month_partitions(date(2025, 11, 15), date(2026, 1, 1))
+
+    # Assert
+    assert partitions == [
+        ('tasks_tasks_y2025m11', date(2025, 11, 1), date(2025, 12, 1)),
+        ('tasks_tasks_y2025m12', date(2025, 12, 1), date(2026, 1, 1)),
+        ('tasks_tasks_y2026m01', date(2026, 1, 1), date(2026, 2, 1)),
+    ]
+
+
+def test_index_sql_targets_new_table_with_suffix():
+    """Testa se os índices são recriados na tabela nova com nomes temporários."""
+    # Act
+    statements = index_sql(INDEXES)
+
+    # Assert
+    assert statements[0] == (
+        'CREATE INDEX tasks_prazo_pendentes_idx_p ON tasks_tasks_part USING btree (prazo, id) '
+        "WHERE ((status)::text <> 'C'::text)"
+    )
+    assert statements[1].startswith('CREATE INDEX tasks_tasks_usuario_id_9ed1a8b4_p ON tasks_tasks_part ')
+
+
+def test_create_sql_hash_partitions_by_user():
+    """Testa se a estratégia hash usa usuario_id na partição e na chave primária."""
+    # Act
+    sql = '\n'.join(create_sql('hash', INDEXES, FOREIGN_KEYS, partitions=4))
+
+    # Assert
+    assert 'PARTITION BY HASH (usuario_id)' in sql
+    assert 'PRIMARY KEY (id, usuario_id)' in sql
+    assert sql.count('PARTITION OF tasks_tasks_part FOR VALUES WITH (MODULUS 4,') == 4
+    assert 'ADD CONSTRAINT tasks_tasks_usuario_id_fk_p FOREIGN KEY (usuario_id)' in sql
+    assert 'DELETE FROM tasks_tasks_part WHERE id = OLD.id AND usuario_id = OLD.usuario_id' in sql
+    assert 'AFTER INSERT OR UPDATE OR DELETE ON tasks_tasks ' in sql
+
+
+def test_create_sql_range_partitions_by_month():
+    """Testa se a estratégia range cria um mês por partição e a partição padrão."""
+    # Act
+    sql = '\n'.join(create_sql('range', [], [], first=date(2026, 1, 5), last=date(2026, 2, 1)))
+
+    # Assert
+    assert 'PARTITION BY RANGE (criado_em)' in sql
+    assert 'PRIMARY KEY (id, criado_em)' in sql
+    assert "tasks_tasks_y2026m01 PARTITION OF tasks_tasks_part FOR VALUES FROM ('2026-01-01') TO ('2026-02-01')" in sql
+    assert "tasks_tasks_y2026m02 PARTITION OF tasks_tasks_part FOR VALUES FROM ('2026-02-01') TO ('2026-03-01')" in sql
+    assert 'tasks_tasks_default PARTITION OF tasks_tasks_part DEFAULT' in sql
+
+
+def test_swap_sql_renames_tables_indexes_and_sequence():
+    """Testa se o swap troca os nomes e continua a sequência da tabela antiga."""
+    # Act
+    statements = swap_sql(['tasks_tasks_pkey', 'tasks_prazo_pendentes_idx'], ['tasks_tasks_usuario_id_fk'])
+
+    # Assert
+    assert statements[:3] == [
+        'DROP TRIGGER tasks_tasks_part_sync ON tasks_tasks',
+        'DROP FUNCTION tasks_tasks_part_sync()',
+        'ALTER TABLE tasks_tasks RENAME TO tasks_tasks_old',
+    ]
+    assert 'ALTER INDEX tasks_tasks_pkey RENAME TO tasks_tasks_pkey_old' in statements
+    assert 'ALTER TABLE tasks_tasks_part RENAME TO tasks_tasks' in statements
+    assert 'ALTER INDEX tasks_tasks_pkey_p RENAME TO tasks_tasks_pkey' in statements
+    assert 'ALTER TABLE tasks_tasks RENAME CONSTRAINT tasks_tasks_usuario_id_fk_p TO tasks_tasks_usuario_id_fk' in statements
+    # As tabelas antigas são renomeadas antes de as novas assumirem os nomes
+    assert statements.index('ALTER TABLE tasks_tasks RENAME TO tasks_tasks_old') < \
+        statements.index('ALTER TABLE tasks_tasks_part RENAME TO tasks_tasks')
+    assert "setval('tasks_tasks_part_id_seq'" in statements[-1]
+
+
+def test_backfill_locks_source_rows():
+    """Testa se o backfill trava as linhas copiadas e ignora as já replicadas pelo trigger."""
+    # Act / Assert
+    assert 'FOR SHARE' in BACKFILL_SQL
+    assert 'ON CONFLICT DO NOTHING' in BACKFILL_SQL
+
+
+@pytest.mark.django_db
+def test_command_requires_postgresql():
+    """Testa se o comando recusa bancos que não são PostgreSQL."""
+    # Act / Assert
+    with pytest.raises(CommandError, match='PostgreSQL'):
+        call_command('partition_tasks', 'prepare')
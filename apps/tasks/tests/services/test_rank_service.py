@@ -0,0 +1,196 @@
+import random
+
+import pytest
+from django.contrib.auth.models import User
+from apps.jobs.models import Jobs
+from apps.tasks.models.tasks import Tasks
+from apps.tasks.services.rank_service import (
+    InvalidPosition,
+    MAX_LENGTH,
+    REBALANCE_LENGTH,
+    last_rank,
+    move_task,
+    rank_after,
+    rank_between,
+    rank_sequence,
+    rebalance_ranks,
+)
+
+
+@pytest.fixture
+def user():
+    """Fixture para criar um usuário de teste."""
+    return User.objects.create_user(username='ordenador', password='senha123')
+
+
+@pytest.fixture
+def tasks(user):
+    """Fixture para criar cinco tarefas do usuário, já no fim da ordem manual."""
+    created = []
+    for i in range(5):
+        created.append(Tasks.objects.create(
+            usuario=user, titulo=f'Tarefa {i}', prioridade='M', posicao=last_rank(user.pk)))
+    return created
+
+
+def ordered_ids(user):
+    return list(Tasks.objects.filter(usuario=user).order_by('posicao', 'id').values_list('id', flat=True))
+
+
+def test_rank_between_fica_entre_as_chaves():
+    """Testa que a chave gerada fica estritamente entre as vizinhas, inclusive em dígitos vizinhos."""
+    # Arrange
+    pares = [('', None), ('', '1'), ('i', 'j'), ('az', 'b'), ('i', 'i01'), ('y', None), ('zz', None)]
+
+    for anterior, seguinte in pares:
+        # Act
+        chave = rank_between(anterior, seguinte)
+
+        # Assert
+        assert anterior < chave
+        assert seguinte is None or chave < seguinte
+        assert not chave.endswith('0')
+
+
+def test_rank_between_rejeita_vizinhos_fora_de_ordem():
+    """Testa que vizinhos iguais ou invertidos são rejeitados."""
+    # Act & Assert
+    with pytest.raises(InvalidPosition):
+        rank_between('j', 'i')
+    with pytest.raises(InvalidPosition):
+        rank_between('i', 'i')
+
+
+def test_insercoes_aleatorias_mantem_a_ordem():
+    """Testa que inserções em posições aleatórias mantêm a ordem das chaves."""
+    # Arrange
+    aleatorio = random.Random(7)
+    chaves = []
+
+    # Act
+    for _ in range(500):
+        posicao = aleatorio.randint(0, len(chaves))
+        anterior = chaves[posicao - 1] if posicao else ''
+        seguinte = chaves[posicao] if posicao < len(chaves) else None
+        chaves.insert(posicao, rank_between(anterior, seguinte))
+
+    # Assert
+    assert chaves == sorted(chaves)
+    assert len(set(chaves)) == len(chaves)
+
+
+def test_rank_after_nao_alonga_as_chaves():
+    """Testa que incluir tarefas no fim não aumenta o tamanho das chaves."""
+    # Arrange
+    chave = rank_between('', None)
+
+    # Act
+    chaves = [chave]
+    for _ in range(10000):
+        chaves.append(rank_after(chaves[-1]))
+
+    # Assert
+    assert chaves == sorted(chaves)
+    assert max(len(c) for c in chaves) <= 6
+
+
+def test_rank_sequence_distribui_chaves_crescentes():
+    """Testa que a redistribuição gera chaves crescentes, únicas e curtas."""
+    # Act
+    chaves = rank_sequence(5000)
+
+    # Assert
+    assert chaves == sorted(chaves)
+    assert len(set(chaves)) == 5000
+    assert max(len(c) for c in chaves) == 3
+
+
+@pytest.mark.django_db
+def test_move_task_atualiza_apenas_a_tarefa(user, tasks, django_assert_num_queries):
+    """Testa que mover entre dois vizinhos é uma leitura e um UPDATE da própria tarefa."""
+    # Arrange
+    primeira, segunda, terceira = tasks[:3]
+    posicoes = {t.pk: t.posicao for t in tasks}
+
+    # Act
+    with django_assert_num_queries(2):
+        move_task(tasks[4], after_id=primeira.pk, before_id=segunda.pk)
+
+    # Assert
+    assert ordered_ids(user) == [primeira.pk, tasks[4].pk, segunda.pk, terceira.pk, tasks[3].pk]
+    for task in Tasks.objects.exclude(pk=tasks[4].pk):
+        assert task.posicao == posicoes[task.pk]
+
+
+@pytest.mark.django_db
+def test_move_task_com_um_vizinho(user, tasks):
+    """Testa mover para o início (antes da primeira) e para o fim (depois da última)."""
+    # Act
+    move_task(tasks[2], before_id=tasks[0].pk)
+    move_task(tasks[0], after_id=tasks[4].pk)
+
+    # Assert
+    assert ordered_ids(user) == [tasks[2].pk, tasks[1].pk, tasks[3].pk, tasks[4].pk, tasks[0].pk]
+
+
+@pytest.mark.django_db
+def test_move_task_rejeita_vizinho_de_outro_dono(user, tasks):
+    """Testa que a ordem é por dono: vizinhos de outro usuário são rejeitados."""
+    # Arrange
+    outro = User.objects.create_user(username='outro', password='senha123')
+    alheia = Tasks.objects.create(usuario=outro, titulo='Alheia', prioridade='M', posicao='i')
+
+    # Act & Assert
+    with pytest.raises(InvalidPosition):
+        move_task(tasks[0], after_id=alheia.pk)
+    with pytest.raises(InvalidPosition):
+        move_task(tasks[0], after_id=tasks[3].pk, before_id=tasks[1].pk)
+
+
+@pytest.mark.django_db
+def test_move_task_desempata_tarefas_sem_posicao(user):
+    """Testa que tarefas anteriores à ordem manual (sem posição) seguem a ordem por id ao mover."""
+    # Arrange
+    antigas = [Tasks.objects.create(usuario=user, titulo=f'Antiga {i}', prioridade='M') for i in range(4)]
+
+    # Act
+    move_task(antigas[3], after_id=antigas[0].pk)
+
+    # Assert
+    assert ordered_ids(user) == [antigas[0].pk, antigas[3].pk, antigas[1].pk, antigas[2].pk]
+    assert all(Tasks.objects.values_list('posicao', flat=True))
+
+
+@pytest.mark.django_db
+def test_chave_longa_agenda_redistribuicao(user, tasks):
+    """Testa que inserções repetidas no mesmo ponto agendam a redistribuição e nunca passam do limite."""
+    # Arrange
+    primeira, a, b = tasks[0], tasks[2], tasks[3]
+    move_task(a, after_id=primeira.pk, before_id=tasks[1].pk)
+
+    # Act: alterna duas tarefas logo depois da primeira, alongando a chave a cada vez
+    for _ in range(MAX_LENGTH * 6):
+        move_task(b, after_id=primeira.pk, before_id=a.pk)
+        a, b = b, a
+
+    # Assert
+    assert Jobs.objects.filter(nome__endswith='rebalance_task_ranks', args=[user.pk]).exists()
+    assert max(len(p) for p in Tasks.objects.values_list('posicao', flat=True)) <= MAX_LENGTH
+    assert ordered_ids(user)[0] == primeira.pk
+
+
+@pytest.mark.django_db
+def test_rebalance_ranks_mantem_a_ordem(user, tasks):
+    """Testa que a redistribuição encurta as chaves sem alterar a ordem."""
+    # Arrange
+    move_task(tasks[4], before_id=tasks[1].pk)
+    ordem = ordered_ids(user)
+    Tasks.objects.filter(pk=tasks[4].pk).update(posicao=tasks[0].posicao + '0' * REBALANCE_LENGTH + '1')
+
+    # Act
+    total = rebalance_ranks(user.pk)
+
+    # Assert
+    assert total == 5
+    assert ordered_ids(user) == ordem
+    assert max(len(p) for p in Tasks.objects.values_list('posicao', flat=True)) == 1
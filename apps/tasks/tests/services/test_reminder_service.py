@@ -0,0 +1,156 @@
+import pytest
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.utils import timezone
+from apps.jobs.models.jobs import Jobs
+from apps.tasks.models.reminders import SentReminders
+from apps.tasks.models.tasks import Tasks
+from apps.tasks.services import reminder_service
+from apps.tasks.services.reminder_service import schedule_due_reminders
+
+
+@pytest.fixture
+def user1():
+    """Fixture para criar o primeiro usuário de teste."""
+    return User.objects.create_user(username='usuario_teste1', email='teste1@example.com', password='senha123')
+
+
+@pytest.fixture
+def user2():
+    """Fixture para criar o segundo usuário de teste."""
+    return User.objects.create_user(username='usuario_teste2', email='teste2@example.com', password='senha123')
+
+
+def create_task(user, dias, status='P'):
+    """Cria uma tarefa com prazo daqui a `dias` dias."""
+    return Tasks.objects.create(
+        usuario=user,
+        titulo=f'Tarefa {dias} dias',
+        prioridade='M',
+        prazo=timezone.localdate() + timedelta(days=dias),
+        status=status,
+    )
+
+
+@pytest.mark.django_db
+def test_schedule_enqueues_one_job_per_user_for_due_tasks(user1, user2):
+    """Testa se apenas tarefas não concluídas dentro da janela geram lembretes por usuário."""
+    # Arrange
+    t1 = create_task(user1, 1)
+    t2 = create_task(user1, 2, status='EA')
+    create_task(user1, 2, status='C')
+    create_task(user1, 10)
+    t3 = create_task(user2, 0)
+
+    # Act
+    processed, enqueued = schedule_due_reminders(days=3)
+
+    # Assert
+    assert processed == 3
+    assert enqueued == 2
+    jobs = {job.args[0]: job.args[1] for job in Jobs.objects.all()}
+    assert sorted(jobs[user1.id]) == [t1.id, t2.id]
+    assert jobs[user2.id] == [t3.id]
+
+
+@pytest.mark.django_db
+def test_schedule_second_run_only_processes_new_candidates(user1):
+    """Testa se os lembretes registrados evitam lembrar a mesma tarefa duas vezes."""
+    # Arrange
+    create_task(user1, 1)
+    schedule_due_reminders(days=3)
+    nova = create_task(user1, 3)
+
+    # Act
+    processed, _ = schedule_due_reminders(days=3)
+
+    # Assert
+    assert processed == 1
+    assert Jobs.objects.order_by('id').last().args == [user1.id, [nova.id]]
+
+
+@pytest.mark.django_db
+def test_schedule_walks_candidates_in_batches(user1):
+    """Testa se as candidatas são percorridas em lotes e cada lembrete fica registrado com o prazo."""
+    # Arrange
+    tasks = [create_task(user1, dias % 3) for dias in range(5)]
+
+    # Act
+    processed, enqueued = schedule_due_reminders(days=3, batch_size=2)
+
+    # Assert
+    assert processed == 5
+    assert enqueued == 3
+    assert set(SentReminders.objects.values_list('tarefa_id', 'prazo')) == {(task.id, task.prazo) for task in tasks}
+
+
+@pytest.mark.django_db
+def test_schedule_reminds_tasks_created_or_moved_inside_covered_window(user1):
+    """Testa se uma tarefa criada depois da execução, com prazo já coberto, ou com o prazo alterado é lembrada."""
+    # Arrange
+    create_task(user1, 3)
+    antiga = create_task(user1, 2)
+    schedule_due_reminders(days=3)
+    nova = create_task(user1, 1)
+    antiga.prazo = timezone.localdate()
+    antiga.save()
+
+    # Act
+    processed, _ = schedule_due_reminders(days=3)
+
+    # Assert
+    assert processed == 2
+    assert sorted(Jobs.objects.order_by('id').last().args[1]) == sorted([nova.id, antiga.id])
+    assert schedule_due_reminders(days=3) == (0, 0)
+
+
+@pytest.mark.django_db
+def test_schedule_forgets_reminders_of_past_due_dates(user1):
+    """Testa se os registros de prazos que já passaram são apagados."""
+    # Arrange
+    task = create_task(user1, 1)
+    SentReminders.objects.create(tarefa_id=task.id, prazo=timezone.localdate() - timedelta(days=1))
+
+    # Act
+    schedule_due_reminders(days=3)
+
+    # Assert
+    assert list(SentReminders.objects.values_list('tarefa_id', 'prazo')) == [(task.id, task.prazo)]
+
+
+@pytest.mark.django_db
+def test_schedule_skips_reminders_registered_by_a_concurrent_run(user1):
+    """Testa se um lembrete gravado por outra execução depois da leitura das candidatas não é enfileirado de novo."""
+    # Arrange
+    t1 = create_task(user1, 1)
+    t2 = create_task(user1, 2)
+    claim = reminder_service._claim_reminders
+
+    def concurrent_claim(batch, now):
+        # Outra execução registra o lembrete de t1 entre a leitura e o INSERT
+        SentReminders.objects.create(tarefa_id=t1.id, prazo=t1.prazo)
+        return claim(batch, now)
+
+    # Act
+    with mock.patch.object(reminder_service, '_claim_reminders', concurrent_claim):
+        processed, enqueued = schedule_due_reminders(days=3)
+
+    # Assert
+    assert (processed, enqueued) == (1, 1)
+    assert [job.args for job in Jobs.objects.all()] == [[user1.id, [t2.id]]]
+
+
+@pytest.mark.django_db
+def test_schedule_pages_by_due_date_and_id(user1):
+    """Testa se os lotes seguem o índice (prazo, id), com o cursor no último prazo e id."""
+    # Arrange
+    tasks = [create_task(user1, dias) for dias in (2, 0, 1, 0, 2)]
+    expected = [task.id for task in sorted(tasks, key=lambda task: (task.prazo, task.id))]
+
+    # Act
+    processed, enqueued = schedule_due_reminders(days=3, batch_size=2)
+
+    # Assert
+    assert (processed, enqueued) == (5, 3)
+    assert [task_id for job in Jobs.objects.order_by('id') for task_id in job.args[1]] == expected
@@ -0,0 +1,222 @@
+import pytest
+from datetime import timedelta
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.utils import timezone
+from apps.tasks.models.tasks import Tasks
+from apps.tasks.models.tombstones import TaskTombstones
+from apps.tasks.services.archive_service import archive_completed_tasks
+from apps.tasks.services.lists_service import add_member, create_list
+from apps.tasks.services.sync_service import (
+    InvalidSyncToken,
+    changes_since,
+    decode_token,
+    delete_tasks,
+    encode_token,
+    purge_tombstones,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_lag(settings):
+    """Entrega as alterações imediatamente (sem o atraso de segurança)."""
+    settings.SYNC_LAG_SECONDS = 0
+
+
+@pytest.fixture
+def user():
+    """Fixture para criar um usuário de teste."""
+    return User.objects.create_user(username='sincronizador', password='senha123')
+
+
+def create_tasks(user, count):
+    return [Tasks.objects.create(usuario=user, titulo=f'Tarefa {i}', prioridade='M') for i in range(count)]
+
+
+def sync(user, cursor=None, limit=500):
+    rows, removed, token, has_more = changes_since(
+        Tasks.objects.filter(usuario=user),
+        TaskTombstones.objects.filter(usuario=user),
+        cursor=cursor,
+        limit=limit,
+    )
+    return [row[0] for row in rows], removed, decode_token(token), has_more
+
+
+def test_token_round_trip():
+    """Testa se o token devolve o mesmo cursor que o gerou."""
+    # Arrange
+    now = timezone.now()
+
+    # Act / Assert
+    assert decode_token(encode_token(now, 7, 3)) == (now, 7, 3)
+    assert decode_token(encode_token(None, 0, 0)) == (None, 0, 0)
+
+
+def test_invalid_and_expired_tokens_are_rejected(settings):
+    """Testa se tokens malformados e mais antigos que a retenção são recusados."""
+    # Arrange
+    settings.SYNC_TOMBSTONE_DAYS = 30
+    with mock.patch('django.utils.timezone.now', return_value=timezone.now() - timedelta(days=31)):
+        old_token = encode_token(None, 0, 0)
+
+    # Act / Assert
+    with pytest.raises(InvalidSyncToken) as invalid:
+        decode_token('nao-e-um-token')
+    assert not invalid.value.expired
+    with pytest.raises(InvalidSyncToken) as expired:
+        decode_token(old_token)
+    assert expired.value.expired
+
+
+@pytest.mark.django_db
+def test_token_is_rejected_after_joining_a_shared_list(user):
+    """Testa se o token emitido antes de o usuário entrar na lista de outro dono é recusado como expirado."""
+    # Arrange
+    owner = User.objects.create_user(username='dono', password='senha123')
+    token = encode_token(None, 0, 0)
+    create_list(user, 'Própria')
+    own_token_still_valid = decode_token(token, user.pk)
+
+    # Act
+    add_member(create_list(owner, 'Equipe'), user, 'L')
+
+    # Assert
+    assert own_token_still_valid == (None, 0, 0)
+    with pytest.raises(InvalidSyncToken) as expired:
+        decode_token(token, user.pk)
+    assert expired.value.expired
+    assert decode_token(encode_token(None, 0, 0), user.pk) == (None, 0, 0)
+
+
+@pytest.mark.django_db
+def test_changes_since_returns_only_changes_after_cursor(user):
+    """Testa se a segunda sincronização traz só as tarefas alteradas depois do token."""
+    # Arrange
+    first, second, third = create_tasks(user, 3)
+    ids, _, cursor, _ = sync(user)
+
+    # Act
+    second.titulo = 'Alterada'
+    second.save()
+    changed, _, _, has_more = sync(user, cursor)
+
+    # Assert
+    assert ids == [first.id, second.id, third.id]
+    assert changed == [second.id]
+    assert has_more is False
+
+
+@pytest.mark.django_db
+def test_changes_since_pages_by_limit(user):
+    """Testa se o limite pagina as alterações sem repetir nem pular tarefas."""
+    # Arrange
+    tasks = create_tasks(user, 5)
+    # Mesmo atualizado_em: o id desempata
+    Tasks.objects.filter(usuario=user).update(atualizado_em=timezone.now() - timedelta(minutes=1))
+
+    # Act
+    page1, _, cursor, more1 = sync(user, limit=2)
+    page2, _, cursor, more2 = sync(user, cursor, limit=2)
+    page3, _, _, more3 = sync(user, cursor, limit=2)
+
+    # Assert
+    assert page1 + page2 + page3 == [task.id for task in tasks]
+    assert (more1, more2, more3) == (True, True, False)
+
+
+@pytest.mark.django_db
+def test_changes_since_holds_back_recent_changes(user, settings):
+    """Testa se as alterações dentro do atraso de segurança ficam para a próxima chamada."""
+    # Arrange
+    settings.SYNC_LAG_SECONDS = 60
+    create_tasks(user, 1)
+
+    # Act
+    ids, _, cursor, _ = sync(user)
+
+    # Assert
+    assert ids == []
+    assert cursor == (None, 0, 0)
+
+
+@pytest.mark.django_db
+def test_delete_tasks_records_tombstones(user):
+    """Testa se as exclusões aparecem como remoções na sincronização seguinte."""
+    # Arrange
+    first, second = create_tasks(user, 2)
+    other = User.objects.create_user(username='outro', password='senha123')
+    create_tasks(other, 1)
+    _, _, cursor, _ = sync(user)
+
+    # Act
+    deleted = delete_tasks(Tasks.objects.filter(usuario=user, pk=first.pk))
+    changed, removed, cursor, _ = sync(user, cursor)
+
+    # Assert
+    assert deleted == 1
+    assert changed == []
+    assert removed == [first.id]
+    assert sync(user, cursor)[1] == []
+    assert not TaskTombstones.objects.filter(usuario=other).exists()
+
+
+@pytest.mark.django_db
+def test_full_sync_skips_previous_tombstones(user):
+    """Testa se a sincronização sem token não devolve remoções antigas."""
+    # Arrange
+    task, = create_tasks(user, 1)
+    delete_tasks(Tasks.objects.filter(pk=task.pk))
+
+    # Act
+    _, removed, _, _ = sync(user)
+
+    # Assert
+    assert removed == []
+
+
+@pytest.mark.django_db
+def test_archived_tasks_are_reported_as_removed(user):
+    """Testa se as tarefas arquivadas saem da cópia local do cliente."""
+    # Arrange
+    task, = create_tasks(user, 1)
+    Tasks.objects.filter(pk=task.pk).update(status='C', concluido_em=timezone.now() - timedelta(days=200))
+    _, _, cursor, _ = sync(user)
+
+    # Act
+    archive_completed_tasks(days=180)
+
+    # Assert
+    assert sync(user, cursor)[1] == [task.id]
+
+
+@pytest.mark.django_db
+def test_purge_tombstones_removes_only_expired(user, settings):
+    """Testa se apenas os registros de remoção mais antigos que a retenção são apagados."""
+    # Arrange
+    settings.SYNC_TOMBSTONE_DAYS = 30
+    old = TaskTombstones.objects.create(usuario=user, tarefa_id=1, removido_em=timezone.now() - timedelta(days=31))
+    recent = TaskTombstones.objects.create(usuario=user, tarefa_id=2)
+
+    # Act
+    purged = purge_tombstones()
+
+    # Assert
+    assert purged == 1
+    assert list(TaskTombstones.objects.values_list('id', flat=True)) == [recent.id]
+    assert not TaskTombstones.objects.filter(pk=old.pk).exists()
+
+
+@pytest.mark.django_db
+def test_purge_tombstones_command(user):
+    """Testa o comando purge_tombstones, separado do arquivamento."""
+    # Arrange
+    TaskTombstones.objects.create(usuario=user, tarefa_id=1, removido_em=timezone.now() - timedelta(days=10))
+    recent = TaskTombstones.objects.create(usuario=user, tarefa_id=2)
+
+    # Act
+    call_command('purge_tombstones', '--days', '7')
+
+    # Assert
+    assert list(TaskTombstones.objects.values_list('id', flat=True)) == [recent.id]
@@ -0,0 +1,139 @@
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from apps.tasks.models.tags import TaskTags
+from apps.tasks.models.tasks import Tasks
+from apps.tasks.services.lists_service import add_member, create_list, delete_list, list_roles
+from apps.tasks.services.sync_service import delete_tasks
+from apps.tasks.services.tags_service import (
+    MAX_TAGS,
+    filter_by_tags,
+    normalize_tags,
+    sync_task_tags,
+    tag_counts,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Fixture que isola o cache das contagens entre os testes."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def user():
+    """Fixture para criar um usuário de teste."""
+    return User.objects.create_user(username='etiquetador', password='senha123')
+
+
+def create_task(user, titulo, tags, lista=None):
+    task = Tasks.objects.create(usuario=user, titulo=titulo, prioridade='M', tags=tags, lista=lista)
+    sync_task_tags(task)
+    return task
+
+
+def ids(queryset):
+    return sorted(queryset.values_list('id', flat=True))
+
+
+def test_normalize_tags():
+    """Testa se as etiquetas são aparadas, ficam em minúsculas e não se repetem."""
+    # Act / Assert
+    assert normalize_tags([' Casa', 'casa', 'URGENTE']) == ['casa', 'urgente']
+    with pytest.raises(ValueError):
+        normalize_tags([''])
+    with pytest.raises(ValueError):
+        normalize_tags(['x' * 51])
+    with pytest.raises(ValueError):
+        normalize_tags([f'tag{i}' for i in range(MAX_TAGS + 1)])
+
+
+@pytest.mark.django_db
+def test_filter_any_and_all_tags(user):
+    """Testa os filtros por qualquer uma e por todas as etiquetas."""
+    # Arrange
+    casa = create_task(user, 'Casa', ['casa'])
+    ambas = create_task(user, 'Ambas', ['casa', 'urgente'])
+    urgente = create_task(user, 'Urgente', ['urgente', 'trabalho'])
+    create_task(user, 'Sem', [])
+    other = User.objects.create_user(username='outro', password='senha123')
+    create_task(other, 'De outro', ['casa', 'urgente'])
+    queryset = Tasks.objects.filter(usuario=user)
+
+    # Act / Assert
+    assert ids(filter_by_tags(queryset, user.pk, {}, any_of=['casa', 'urgente'])) == sorted([casa.id, ambas.id, urgente.id])
+    assert ids(filter_by_tags(queryset, user.pk, {}, all_of=['casa', 'urgente'])) == [ambas.id]
+    assert ids(filter_by_tags(queryset, user.pk, {}, any_of=['trabalho'], all_of=['urgente'])) == [urgente.id]
+
+
+@pytest.mark.django_db
+def test_filter_includes_shared_list_tasks(user):
+    """Testa se o filtro encontra as tarefas de listas compartilhadas, que têm outro dono."""
+    # Arrange
+    owner = User.objects.create_user(username='dono', password='senha123')
+    task_list = create_list(owner, 'Equipe')
+    add_member(task_list, user, 'L')
+    shared = create_task(owner, 'Compartilhada', ['casa'], task_list)
+    create_task(owner, 'Privada', ['casa'])
+    roles = list_roles(user.pk)
+    queryset = Tasks.objects.filter(usuario=user) | Tasks.objects.filter(lista_id__in=list(roles))
+
+    # Act / Assert
+    assert ids(filter_by_tags(queryset, user.pk, roles, any_of=['casa'])) == [shared.id]
+
+
+@pytest.mark.django_db
+def test_filter_subquery_reads_only_own_and_list_tags(user):
+    """Testa se a subconsulta de etiquetas lê só as do usuário e as das listas dele, não as de todos."""
+    # Arrange
+    owner = User.objects.create_user(username='dono', password='senha123')
+    task_list = create_list(owner, 'Equipe')
+    add_member(task_list, user, 'L')
+    shared = create_task(owner, 'Compartilhada', ['casa'], task_list)
+    own = create_task(user, 'Minha', ['casa'])
+    create_task(owner, 'Privada', ['casa'])
+    roles = list_roles(user.pk)
+
+    # Act
+    filtered = filter_by_tags(Tasks.objects.all(), user.pk, roles, any_of=['casa'])
+
+    # Assert
+    assert ids(filtered) == sorted([shared.id, own.id])
+    assert set(TaskTags.objects.filter(tarefa_id=shared.id).values_list('lista_id', flat=True)) == {task_list.pk}
+
+
+@pytest.mark.django_db
+def test_list_tags_follow_list_changes(user):
+    """Testa se as etiquetas acompanham a lista da tarefa, também quando a lista é excluída."""
+    # Arrange
+    task_list = create_list(user, 'Equipe')
+    task = create_task(user, 'Casa', ['casa'], task_list)
+
+    # Act
+    delete_list(task_list)
+
+    # Assert
+    assert list(TaskTags.objects.filter(tarefa_id=task.pk).values_list('lista_id', flat=True)) == [None]
+
+
+@pytest.mark.django_db
+def test_tag_counts_are_cached_and_invalidated(user, django_assert_num_queries):
+    """Testa se as contagens vêm do cache e são recalculadas quando as etiquetas mudam."""
+    # Arrange
+    task = create_task(user, 'Casa', ['casa', 'urgente'])
+    create_task(user, 'Outra', ['casa'])
+    tag_counts(user.pk)
+
+    # Act / Assert
+    with django_assert_num_queries(0):
+        assert tag_counts(user.pk) == [{'nome': 'casa', 'total': 2}, {'nome': 'urgente', 'total': 1}]
+
+    task.tags = ['urgente']
+    sync_task_tags(task)
+    assert tag_counts(user.pk) == [{'nome': 'casa', 'total': 1}, {'nome': 'urgente', 'total': 1}]
+
+    delete_tasks(Tasks.objects.filter(pk=task.pk))
+    assert tag_counts(user.pk) == [{'nome': 'casa', 'total': 1}]
+    assert not TaskTags.objects.filter(tarefa_id=task.pk).exists()
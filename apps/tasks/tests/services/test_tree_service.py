@@ -0,0 +1,157 @@
+import pytest
+from django.contrib.auth.models import User
+from apps.tasks.models.tasks import Tasks
+from apps.tasks.services.tree_service import (
+    InvalidMove,
+    PATH_MAX_LENGTH,
+    child_path,
+    descendants_filter,
+    move_subtree,
+    progress,
+)
+
+
+@pytest.fixture
+def user():
+    """Fixture para criar um usuário de teste."""
+    return User.objects.create_user(username='gerente', password='senha123')
+
+
+def create_task(user, titulo, parent=None, status='P'):
+    return Tasks.objects.create(
+        usuario=user, titulo=titulo, prioridade='M', status=status, pai=parent, caminho=child_path(parent))
+
+
+@pytest.fixture
+def tree(user):
+    """
+    Fixture para criar a árvore:
+        projeto -> fase -> etapa -> detalhe
+                -> outra fase
+    """
+    projeto = create_task(user, 'Projeto')
+    fase = create_task(user, 'Fase', projeto, status='C')
+    etapa = create_task(user, 'Etapa', fase, status='EA')
+    detalhe = create_task(user, 'Detalhe', etapa)
+    outra = create_task(user, 'Outra fase', projeto, status='C')
+    return projeto, fase, etapa, detalhe, outra
+
+
+def ids(queryset):
+    return sorted(queryset.values_list('id', flat=True))
+
+
+@pytest.mark.django_db
+def test_child_path_lists_ancestors(tree):
+    """Testa se o caminho guarda os ids dos ancestrais, da raiz ao pai."""
+    # Arrange
+    projeto, fase, etapa, detalhe, _ = tree
+
+    # Act / Assert
+    assert projeto.caminho == ''
+    assert detalhe.caminho == f'{projeto.id}/{fase.id}/{etapa.id}/'
+
+
+@pytest.mark.django_db
+def test_descendants_filter_returns_whole_subtree(tree, django_assert_num_queries):
+    """Testa se os descendentes de qualquer profundidade vêm em uma consulta."""
+    # Arrange
+    projeto, fase, etapa, detalhe, outra = tree
+
+    # Act / Assert
+    with django_assert_num_queries(1):
+        assert ids(Tasks.objects.filter(descendants_filter(projeto))) == sorted([fase.id, etapa.id, detalhe.id, outra.id])
+    assert ids(Tasks.objects.filter(descendants_filter(fase))) == sorted([etapa.id, detalhe.id])
+    assert ids(Tasks.objects.filter(descendants_filter(detalhe))) == []
+
+
+@pytest.mark.django_db
+def test_progress_counts_descendants_by_status(tree, django_assert_num_queries):
+    """Testa se o progresso soma os descendentes por status em uma consulta."""
+    # Arrange
+    projeto = tree[0]
+
+    # Act
+    with django_assert_num_queries(1):
+        result = progress(Tasks.objects.all(), projeto)
+
+    # Assert
+    assert result == {'total': 4, 'pendentes': 1, 'em_andamento': 1, 'concluidas': 2, 'percentual': 50.0}
+
+
+@pytest.mark.django_db
+def test_move_subtree_rewrites_descendant_paths(tree, django_assert_max_num_queries):
+    """Testa se mover um ramo atualiza todos os descendentes com um número fixo de consultas."""
+    # Arrange
+    projeto, fase, etapa, detalhe, outra = tree
+
+    # Act
+    # Uma leitura e dois UPDATEs (mais o savepoint), qualquer que seja o tamanho do ramo
+    with django_assert_max_num_queries(5):
+        move_subtree(fase, outra)
+
+    # Assert
+    fase.refresh_from_db()
+    detalhe.refresh_from_db()
+    assert fase.pai_id == outra.id
+    assert detalhe.caminho == f'{projeto.id}/{outra.id}/{fase.id}/{etapa.id}/'
+    assert ids(Tasks.objects.filter(descendants_filter(outra))) == sorted([fase.id, etapa.id, detalhe.id])
+
+
+@pytest.mark.django_db
+def test_move_subtree_to_root(tree):
+    """Testa se um ramo movido para a raiz passa a ter caminho vazio."""
+    # Arrange
+    _, fase, etapa, detalhe, _ = tree
+
+    # Act
+    move_subtree(fase, None)
+
+    # Assert
+    detalhe.refresh_from_db()
+    assert Tasks.objects.get(pk=fase.pk).caminho == ''
+    assert detalhe.caminho == f'{fase.id}/{etapa.id}/'
+
+
+@pytest.mark.django_db
+def test_move_subtree_rejects_cycles(tree):
+    """Testa se uma tarefa não pode ser movida para dentro da própria subárvore."""
+    # Arrange
+    projeto, fase, _, detalhe, _ = tree
+
+    # Act / Assert
+    with pytest.raises(InvalidMove):
+        move_subtree(fase, detalhe)
+    with pytest.raises(InvalidMove):
+        move_subtree(projeto, projeto)
+
+
+@pytest.mark.django_db
+def test_subtree_stays_with_one_owner(user, tree):
+    """Testa se os filtros da subárvore são pelo dono e se o pai de outro usuário é recusado."""
+    # Arrange
+    projeto, fase = tree[:2]
+    other = create_task(User.objects.create_user(username='outro', password='senha123'), 'De outro')
+
+    # Act
+    condition = str(descendants_filter(projeto))
+
+    # Assert
+    assert f"('usuario_id', {user.id})" in condition
+    with pytest.raises(InvalidMove):
+        move_subtree(fase, other)
+    assert Tasks.objects.get(pk=fase.pk).pai_id == projeto.id
+
+
+@pytest.mark.django_db
+def test_move_subtree_rejects_paths_too_long(user, tree):
+    """Testa se o movimento é recusado quando algum caminho passaria do tamanho máximo."""
+    # Arrange
+    fase = tree[1]
+    deep = create_task(user, 'Funda')
+    deep.caminho = '9/' * ((PATH_MAX_LENGTH - 4) // 2)
+    deep.save(update_fields=['caminho'])
+
+    # Act / Assert
+    with pytest.raises(InvalidMove):
+        move_subtree(fase, deep)
@@ -0,0 +1,119 @@
+"""
+Benchmark do arquivamento de tarefas concluídas (archive_tasks).
+
+Gera um volume sintético de tarefas (80% concluídas, conclusões espalhadas
+pelos últimos 2 anos), mede o tamanho da tabela Tasks e dos seus índices e o
+tempo da listagem de um usuário, arquiva as concluídas há mais de 180 dias e
+mede tudo de novo.
+
+Uso:
+    python -m benchmarks.bench_archive
+    BENCH_ROWS=50000000 DJANGO_SETTINGS_MODULE=core.settings.production python -m benchmarks.bench_archive
+
+No PostgreSQL os tamanhos vêm de pg_relation_size/pg_indexes_size (após
+VACUUM); no SQLite, da tabela virtual dbstat.
+"""
+import os
+import time
+
+from benchmarks.utils import measure, report, setup_django, setup_test_database
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from apps.tasks.models.tasks import Tasks  # noqa: E402
+from apps.tasks.schemas.task_read_schema import READ_FIELDS  # noqa: E402
+from apps.tasks.services.archive_service import archive_completed_tasks  # noqa: E402
+
+ROWS = int(os.getenv('BENCH_ROWS', 200_000))
+USERS = int(os.getenv('BENCH_USERS', 1_000))
+BATCH_SIZE = int(os.getenv('BENCH_BATCH_SIZE', 5_000))
+
+
+def populate(first_user_id):
+    """Insere as tarefas direto no banco (generate_series / CTE recursiva)."""
+    table = Tasks._meta.db_table
+    if connection.vendor == 'postgresql':
+        sql = f"""
+            INSERT INTO {table} (usuario_id, titulo, descricao, prioridade, prazo, status,
+                                 criado_em, atualizado_em, concluido_em)
+            SELECT {first_user_id} + n % {USERS}, 'Tarefa ' || n, 'Descrição da tarefa ' || n, 'M',
+                   CURRENT_DATE + (n % 60), CASE WHEN n % 5 = 0 THEN 'P' ELSE 'C' END,
+                   NOW(), NOW(),
+                   CASE WHEN n % 5 = 0 THEN NULL ELSE NOW() - (n % 730) * INTERVAL '1 day' END
+            FROM generate_series(1, {ROWS}) AS n
+        """
+    else:
+        sql = f"""
+            WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < {ROWS})
+            INSERT INTO {table} (usuario_id, titulo, descricao, prioridade, prazo, status,
+                                 criado_em, atualizado_em, concluido_em)
+            SELECT {first_user_id} + n % {USERS}, 'Tarefa ' || n, 'Descrição da tarefa ' || n, 'M',
+                   date('now', '+' || (n % 60) || ' days'), CASE WHEN n % 5 = 0 THEN 'P' ELSE 'C' END,
+                   datetime('now'), datetime('now'),
+                   CASE WHEN n % 5 = 0 THEN NULL ELSE datetime('now', '-' || (n % 730) || ' days') END
+            FROM seq
+        """
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+
+
+def table_sizes():
+    """Retorna (bytes da tabela, bytes dos índices) da tabela Tasks."""
+    table = Tasks._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"VACUUM {table}")
+            cursor.execute("SELECT pg_relation_size(%s), pg_indexes_size(%s)", [table, table])
+            return cursor.fetchone()
+
+        cursor.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name")
+        sizes = dict(cursor.fetchall())
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = %s", [table])
+        indexes = [name for (name,) in cursor.fetchall()]
+        return sizes.get(table, 0), sum(sizes.get(name, 0) for name in indexes)
+
+
+def snapshot(label, user_id):
+    table_bytes, index_bytes = table_sizes()
+    listing = measure(
+        lambda: list(Tasks.objects.filter(usuario_id=user_id).values_list(*READ_FIELDS)),
+        repeat=5,
+    )
+    return (
+        label,
+        f"{Tasks.objects.count():>11,} linhas | tabela {table_bytes / 2**20:8.1f} MB"
+        f" | índices {index_bytes / 2**20:8.1f} MB | listagem de 1 usuário {listing * 1000:7.2f} ms",
+    )
+
+
+def main():
+    teardown = setup_test_database()
+    try:
+        users = User.objects.bulk_create(User(username=f'bench{i}') for i in range(USERS))
+        first_user_id = min(user.pk for user in users)
+
+        start = time.perf_counter()
+        populate(first_user_id)
+        populate_time = time.perf_counter() - start
+
+        rows = [("população", f"{ROWS:,} tarefas em {populate_time:.1f}s"), snapshot("antes", first_user_id)]
+
+        start = time.perf_counter()
+        archived, batches = archive_completed_tasks(days=180, batch_size=BATCH_SIZE)
+        elapsed = time.perf_counter() - start
+        rows.append((
+            "arquivamento",
+            f"{archived:,} tarefas em {batches} lotes, {elapsed:.1f}s ({archived / elapsed:,.0f} tarefas/s)",
+        ))
+        rows.append(snapshot("depois", first_user_id))
+
+        report(f"Arquivamento de tarefas concluídas há mais de 180 dias ({connection.vendor})", rows)
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
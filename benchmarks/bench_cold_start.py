@@ -0,0 +1,104 @@
+"""
+Benchmark do tempo de partida do container: da execução do start até a
+primeira requisição atendida pelo Gunicorn.
+
+Compara a sequência antiga do scripts/start.sh (um interpretador Python por
+etapa: migrate, shell -c do superusuário e generate_schema) com o comando
+único `bootstrap`. Mede o reinício "quente", o caso comum de um deploy sem
+migrações nem estáticos novos.
+
+Uso:
+    python -m benchmarks.bench_cold_start
+"""
+import http.client
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_gunicorn_workers import BASE_DIR, free_port
+from benchmarks.utils import report
+
+ROUNDS = int(os.getenv('BENCH_ROUNDS', 3))
+
+SUPERUSER = """
+import os
+from django.contrib.auth import get_user_model
+User = get_user_model()
+username = os.environ.get('DJANGO_SUPERUSER_USERNAME')
+if username and not User.objects.filter(username=username).exists():
+    User.objects.create_superuser(username=username, email=os.environ['DJANGO_SUPERUSER_EMAIL'],
+                                  password=os.environ['DJANGO_SUPERUSER_PASSWORD'])
+"""
+
+
+def first_request(port, timeout=60):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('GET', '/docs/openapi.json')
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.02)
+    raise RuntimeError("Gunicorn não respondeu")
+
+
+def start(steps, env, cwd):
+    """Executa as etapas de preparação e sobe o Gunicorn; retorna (preparo, total)."""
+    port = free_port()
+    begin = time.perf_counter()
+    for step in steps:
+        subprocess.run(step, env=env, cwd=cwd, check=True, capture_output=True)
+    prepared = time.perf_counter() - begin
+
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'python:core.gunicorn_conf'],
+        env={**env, 'PORT': str(port), 'WEB_CONCURRENCY': '1'},
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        first_request(port)
+        return prepared, time.perf_counter() - begin
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    manage = [sys.executable, str(BASE_DIR / 'manage.py')]
+    old_steps = [
+        [*manage, 'migrate', '--noinput'],
+        [*manage, 'shell', '-c', SUPERUSER],
+        [*manage, 'generate_schema'],
+    ]
+    new_steps = [[*manage, 'bootstrap']]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {
+            **os.environ,
+            'PYTHONPATH': str(BASE_DIR),
+            'DJANGO_SETTINGS_MODULE': 'core.settings.development',
+            'STATIC_ROOT': os.path.join(workdir, 'static'),
+            'DJANGO_SUPERUSER_USERNAME': 'admin',
+            'DJANGO_SUPERUSER_EMAIL': 'admin@example.com',
+            'DJANGO_SUPERUSER_PASSWORD': 'admin-bench-123',
+        }
+        # Primeira partida: aplica migrações, coleta estáticos e gera o schema
+        subprocess.run(new_steps[0], env=env, cwd=workdir, check=True, capture_output=True)
+
+        rows = []
+        for label, steps in (('start.sh antigo', old_steps), ('bootstrap', new_steps)):
+            results = [start(steps, env, workdir) for _ in range(ROUNDS)]
+            prepared, total = min(results, key=lambda result: result[1])
+            rows.append((label, f"preparo {prepared * 1000:7.0f} ms | até a 1ª resposta {total * 1000:7.0f} ms"))
+
+    report(f"Reinício do container (melhor de {ROUNDS})", rows)
+
+
+if __name__ == '__main__':
+    main()
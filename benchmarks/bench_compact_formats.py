@@ -0,0 +1,82 @@
+"""
+Benchmark dos formatos compactos da listagem: tamanho e tempo de codificação/decodificação.
+
+Compara, para listas de tarefas no formato do TaskSerializer (geradas pelo
+serialize_task_rows, que produz a mesma saída):
+    - JSON (ORJSONRenderer, o padrão da API)
+    - MessagePack (MessagePackRenderer), se o msgpack estiver instalado
+    - JSON colunar (ColumnarJSONRenderer), com status e prioridade por dicionário
+
+A decodificação do colunar inclui remontar as linhas, para comparar com o
+que o cliente recebe nos outros formatos. O tamanho com gzip indica o ganho
+quando a resposta já é comprimida pelo middleware.
+
+Uso:
+    python -m benchmarks.bench_compact_formats
+    BENCH_SIZES=1000,100000 python -m benchmarks.bench_compact_formats
+"""
+import gzip
+import json
+import os
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from benchmarks.utils import measure, report, setup_django
+
+setup_django()
+
+from apps.tasks.schemas.task_read_schema import serialize_task_rows  # noqa: E402
+from common.renderers import ColumnarJSONRenderer, MessagePackRenderer, ORJSONRenderer, msgpack, orjson  # noqa: E402
+
+SIZES = [int(size) for size in os.getenv('BENCH_SIZES', '1000,10000,100000').split(',')]
+CONTEXT = {'view': type('View', (), {'columnar_dictionary_fields': ('status_display', 'prioridade_display')})}
+loads = orjson.loads if orjson is not None else json.loads
+
+
+def build_payload(size):
+    created = datetime(2025, 5, 18, 15, 22, 1, 123456, tzinfo=dt_timezone.utc)
+    rows = [
+        (i, ('P', 'EA', 'C')[i % 3], ('B', 'M', 'A')[i % 3 - 1], f'Tarefa número {i}',
+         'Descrição da tarefa com alguns detalhes e acentuação.', date(2025, 6, 30) + timedelta(days=i % 30),
+         created, created + timedelta(seconds=i), created if i % 3 == 2 else None,
+         ['casa'] if i % 4 == 0 else [], i % 10 or None, None)
+        for i in range(size)
+    ]
+    return serialize_task_rows(rows)
+
+
+def columnar_to_rows(body):
+    data = loads(body)
+    columns, dictionaries = data['colunas'], data['dicionarios']
+    for name, values in dictionaries.items():
+        columns[name] = [values[code] for code in columns[name]]
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def main():
+    formats = {'json': (ORJSONRenderer(), loads)}
+    if msgpack is not None:
+        formats['msgpack'] = (MessagePackRenderer(), msgpack.unpackb)
+    formats['colunar'] = (ColumnarJSONRenderer(), columnar_to_rows)
+
+    rows = []
+    for size in SIZES:
+        payload = build_payload(size)
+        repeat = 5 if size < 100_000 else 3
+        baseline = None
+        for name, (renderer, decode) in formats.items():
+            body = renderer.render(payload, renderer_context=CONTEXT)
+            assert decode(body) == payload
+            encode_time = measure(lambda: renderer.render(payload, renderer_context=CONTEXT), repeat=repeat)
+            decode_time = measure(lambda: decode(body), repeat=repeat)
+            compressed = len(gzip.compress(body, compresslevel=6))
+            baseline = baseline or (len(body), compressed)
+            rows.append((f"{name:<8} {size:>7,} tarefas",
+                         f"{len(body) / 1024:9.1f} KiB ({len(body) / baseline[0]:4.0%}) | "
+                         f"gzip {compressed / 1024:8.1f} KiB ({compressed / baseline[1]:4.0%}) | "
+                         f"codifica {encode_time * 1000:7.2f} ms | decodifica {decode_time * 1000:7.2f} ms"))
+
+    report("Formatos da listagem: tamanho e tempo (tamanho relativo ao JSON)", rows)
+
+
+if __name__ == '__main__':
+    main()
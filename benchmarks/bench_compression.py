@@ -0,0 +1,59 @@
+"""
+Benchmark de compressão: CPU gasta x bytes economizados por codificação.
+
+Usa o corpo JSON de uma página de 1k tarefas e o CSV de exportação, em cada
+codificação/nível suportado pelo CompressionMiddleware.
+
+Uso:
+    python -m benchmarks.bench_compression
+"""
+from benchmarks.utils import measure, report, setup_django
+
+setup_django()
+
+from common.middleware.compression import COMPRESSORS  # noqa: E402
+from common.renderers import ORJSONRenderer  # noqa: E402
+from benchmarks.bench_json_renderer import build_payload  # noqa: E402
+
+LEVELS = {'gzip': (1, 6, 9), 'br': (1, 4, 6), 'zstd': (1, 3, 9)}
+
+
+def build_csv(size):
+    lines = ['id,titulo,descricao,status,prioridade,prazo,criado_em,atualizado_em,concluido_em']
+    for row in build_payload(size):
+        lines.append(','.join(str(row[key] or '') for key in (
+            'id', 'titulo', 'descricao', 'status_display', 'prioridade_display',
+            'prazo', 'criado_em', 'atualizado_em', 'concluido_em',
+        )))
+    return '\r\n'.join(lines).encode()
+
+
+def compress(encoding, level, body):
+    compressor = COMPRESSORS[encoding](level)
+    return compressor.compress(body) + compressor.finish()
+
+
+def main():
+    bodies = {
+        'json 1k': ORJSONRenderer().render(build_payload(1_000)),
+        'csv 10k': build_csv(10_000),
+    }
+
+    for label, body in bodies.items():
+        rows = [('sem compressão', f"{len(body):>9,} bytes")]
+        for encoding, levels in LEVELS.items():
+            if encoding not in COMPRESSORS:
+                rows.append((encoding, 'indisponível (pacote não instalado)'))
+                continue
+            for level in levels:
+                size = len(compress(encoding, level, body))
+                elapsed = measure(lambda: compress(encoding, level, body), repeat=5, number=3)
+                rows.append((
+                    f"{encoding:<4} nível {level}",
+                    f"{size:>9,} bytes ({size / len(body):5.1%}) | {elapsed * 1000:7.2f} ms",
+                ))
+        report(f"Compressão do corpo {label}", rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Microbenchmark do custom_exception_handler com conjuntos grandes de erros.
+
+Uso:
+    python -m benchmarks.bench_exception_handler
+"""
+from benchmarks.utils import measure, report, setup_django
+
+setup_django()
+
+from rest_framework.exceptions import ErrorDetail, ValidationError  # noqa: E402
+from common.exceptions import custom_exception_handler  # noqa: E402
+
+
+def build_flat_errors(fields):
+    """Erros de validação planos, como em um cadastro com muitos campos."""
+    return {
+        f"campo_{i}": [ErrorDetail("Este campo é obrigatório.", code="required")]
+        for i in range(fields)
+    }
+
+
+def build_bulk_errors(items):
+    """Erros de um list serializer aninhado, como em uma importação em lote."""
+    return {
+        "itens": [
+            {
+                "titulo": [ErrorDetail("Este campo é obrigatório.", code="required")],
+                "prioridade": [ErrorDetail('"X" não é um escolha válido.', code="invalid_choice")],
+                "prazo": {"data": [ErrorDetail("Formato inválido.", code="invalid")]},
+            } if i % 2 else {}
+            for i in range(items)
+        ]
+    }
+
+
+def run(detail):
+    def handle():
+        custom_exception_handler(ValidationError(detail), {})
+    return handle
+
+
+def main():
+    rows = []
+    for label, detail, total in [
+        ("planos (100 campos)", build_flat_errors(100), 100),
+        ("planos (1.000 campos)", build_flat_errors(1000), 1000),
+        ("lote (1.000 itens)", build_bulk_errors(1000), 1500),
+        ("lote (10.000 itens)", build_bulk_errors(10000), 15000),
+    ]:
+        elapsed = measure(run(detail), repeat=5, number=3)
+        rows.append((label, f"{elapsed * 1000:8.2f} ms  ({elapsed / total * 1e6:.2f} µs/erro)"))
+
+    report("custom_exception_handler", rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+"""
+Benchmark das classes de worker do Gunicorn (core/gunicorn_conf.py) com a API real.
+
+Sobe o Gunicorn em um banco SQLite temporário e dispara requisições
+concorrentes (conexões keep-alive) contra a listagem de tarefas, com parte
+delas indo para a exportação CSV (requisição lenta). Compara:
+
+    sync     1 worker, como o antigo `gunicorn core.wsgi:application`
+    gthread  padrão do gunicorn_conf (processos calculados pelas CPUs x 4 threads)
+    uvicorn  worker ASGI (se o pacote uvicorn-worker estiver instalado)
+
+Uso:
+    python -m benchmarks.bench_gunicorn_workers
+    BENCH_CLIENTS=32 BENCH_DURATION=20 python -m benchmarks.bench_gunicorn_workers
+
+O gerador de carga roda na mesma máquina; em máquinas com poucas CPUs ele
+disputa processador com os workers, então compare os modos entre si e não
+os números absolutos.
+"""
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from benchmarks.utils import report
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+CLIENTS = int(os.getenv('BENCH_CLIENTS', 16))
+DURATION = float(os.getenv('BENCH_DURATION', 10))
+TASKS = 200
+# A cada N requisições de um cliente, uma é a exportação CSV (lenta)
+SLOW_EVERY = 10
+
+MODES = [
+    ('sync (1 worker)', {'GUNICORN_WORKER_CLASS': 'sync', 'WEB_CONCURRENCY': '1'}),
+    ('gthread', {'GUNICORN_WORKER_CLASS': 'gthread'}),
+    ('uvicorn', {'GUNICORN_WORKER_CLASS': 'uvicorn'}),
+]
+
+SEED = f"""
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import RefreshToken
+from apps.tasks.models.tasks import Tasks
+user = User.objects.create_user(username='bench', password='bench')
+Tasks.objects.bulk_create(
+    Tasks(usuario=user, titulo=f'Tarefa {{i}}', descricao='Descrição ' * 20, prioridade='M')
+    for i in range({TASKS})
+)
+print(RefreshToken.for_user(user).access_token)
+"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Gunicorn não respondeu na porta {port}")
+
+
+def client_loop(port, token, stop, results):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    headers = {'Authorization': f'Bearer {token}'}
+    count = 0
+    while not stop.is_set():
+        count += 1
+        path = '/api/v1/tasks/export/' if count % SLOW_EVERY == 0 else '/api/v1/tasks/'
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            ok = False
+        results.append((path, time.perf_counter() - start, ok))
+    conn.close()
+
+
+def run_mode(env, token):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'python:core.gunicorn_conf'],
+        env={**env, 'PORT': str(port)},
+        cwd=env['BENCH_CWD'],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(port)
+        stop = threading.Event()
+        results = []
+        clients = [
+            threading.Thread(target=client_loop, args=(port, token, stop, results))
+            for _ in range(CLIENTS)
+        ]
+        for client in clients:
+            client.start()
+        time.sleep(DURATION)
+        stop.set()
+        for client in clients:
+            client.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return results
+
+
+def summarize(results):
+    fast = sorted(elapsed for path, elapsed, ok in results if ok and not path.endswith('export/'))
+    errors = sum(1 for _, _, ok in results if not ok)
+    if not fast:
+        return "sem respostas"
+    p99 = fast[min(len(fast) - 1, int(len(fast) * 0.99))]
+    return (
+        f"{len(results) / DURATION:7.1f} req/s | listagem p50 {statistics.median(fast) * 1000:7.1f} ms"
+        f" p99 {p99 * 1000:7.1f} ms | erros {errors}"
+    )
+
+
+def main():
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {
+            **os.environ,
+            'PYTHONPATH': str(BASE_DIR),
+            'DJANGO_SETTINGS_MODULE': 'core.settings.development',
+            'BENCH_CWD': workdir,
+        }
+        manage = [sys.executable, str(BASE_DIR / 'manage.py')]
+        # O banco SQLite (database.db) é criado no diretório temporário
+        subprocess.run([*manage, 'migrate', '--noinput', '-v', '0'], env=env, cwd=workdir, check=True)
+        token = subprocess.run(
+            [*manage, 'shell', '-c', SEED], env=env, cwd=workdir,
+            check=True, capture_output=True, text=True,
+        ).stdout.strip().splitlines()[-1]
+
+        rows = []
+        for label, mode_env in MODES:
+            results = run_mode({**env, **mode_env}, token)
+            rows.append((label, summarize(results)))
+
+    report(f"Gunicorn: {CLIENTS} clientes por {DURATION:.0f}s (1 em {SLOW_EVERY} é exportação CSV)", rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark de renderização/parsing JSON: JSONRenderer do DRF x ORJSONRenderer.
+
+Os payloads imitam a saída do TaskSerializer para listas de 1k, 10k e 100k tarefas.
+
+Uso:
+    python -m benchmarks.bench_json_renderer
+"""
+from io import BytesIO
+
+from benchmarks.utils import measure, report, setup_django
+
+setup_django()
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from common.parsers import ORJSONParser  # noqa: E402
+from common.renderers import ORJSONRenderer  # noqa: E402
+
+
+def build_payload(size):
+    return [
+        {
+            'id': i,
+            'status_display': 'Em Andamento',
+            'prioridade_display': 'Alta',
+            'titulo': f'Tarefa número {i}',
+            'descricao': 'Descrição da tarefa com alguns detalhes e acentuação. ' * 3,
+            'prazo': '2025-06-30',
+            'criado_em': '2025-05-18T15:22:01.123456-03:00',
+            'atualizado_em': '2025-05-19T09:10:11.654321-03:00',
+            'concluido_em': None,
+        }
+        for i in range(size)
+    ]
+
+
+def main():
+    rows = []
+    for size in (1_000, 10_000, 100_000):
+        payload = build_payload(size)
+        body = JSONRenderer().render(payload)
+        assert ORJSONRenderer().render(payload) == body
+
+        repeat = 5 if size < 100_000 else 3
+        default = measure(lambda: JSONRenderer().render(payload), repeat=repeat)
+        fast = measure(lambda: ORJSONRenderer().render(payload), repeat=repeat)
+        parse_default = measure(lambda: JSONParser().parse(BytesIO(body)), repeat=repeat)
+        parse_fast = measure(lambda: ORJSONParser().parse(BytesIO(body)), repeat=repeat)
+
+        rows.append((f"render {size:>7,} tarefas",
+                     f"json {default * 1000:8.2f} ms | orjson {fast * 1000:7.2f} ms | {default / fast:4.1f}x"))
+        rows.append((f"parse  {size:>7,} tarefas",
+                     f"json {parse_default * 1000:8.2f} ms | orjson {parse_fast * 1000:7.2f} ms | {parse_default / parse_fast:4.1f}x"))
+
+    report("JSONRenderer x ORJSONRenderer (saída idêntica)", rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark da ordem manual das tarefas (arrastar e soltar).
+
+Cria BENCH_TASKS tarefas para um usuário e mede, pela API, mover uma tarefa
+para o início, para o meio e para o fim da ordem com /posicao/ (índice
+fracionário: só a linha da tarefa é gravada). Para comparar, o mesmo
+movimento com posições inteiras, renumerando as tarefas entre a posição
+antiga e a nova em um UPDATE (posicao = posicao + 1). Também mede a listagem
+em ?ordering=posicao e a redistribuição completa das chaves (o job de fundo).
+
+Uso:
+    python -m benchmarks.bench_manual_order
+    BENCH_TASKS=200000 python -m benchmarks.bench_manual_order
+"""
+import os
+
+from benchmarks.utils import measure, report, setup_django, setup_test_database
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.db.models import F  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.tasks.models.tasks import Tasks  # noqa: E402
+from apps.tasks.services.rank_service import rank_sequence, rebalance_ranks  # noqa: E402
+
+TASKS = int(os.getenv('BENCH_TASKS', 50_000))
+
+
+def count_writes(func):
+    """Executa func contando as linhas gravadas por UPDATE."""
+    written = []
+
+    def counter(execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        if sql.startswith('UPDATE'):
+            written.append(context['cursor'].rowcount)
+        return result
+
+    with connection.execute_wrapper(counter):
+        func()
+    return sum(written)
+
+
+def move_by_renumbering(user, keys, old, new):
+    """
+    Move com posições inteiras: desloca em um as tarefas entre a posição antiga
+    e a nova (UPDATE por faixa no índice (usuario, posicao), como faria um
+    `posicao = posicao + 1`) e grava a posição da própria tarefa.
+    """
+    owned = Tasks.objects.filter(usuario=user)
+    low, high = sorted((old, new))
+    owned.filter(posicao__gte=keys[low], posicao__lte=keys[high]).exclude(posicao=keys[old]).update(
+        posicao=F('posicao'))
+    owned.filter(posicao=keys[old]).update(posicao=F('posicao'))
+
+
+def main():
+    teardown = setup_test_database()
+    try:
+        with override_settings(ALLOWED_HOSTS=['*'], REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK, 'DEFAULT_PAGINATION_CLASS': None,
+        }):
+            user = User.objects.create_user(username='bench', password='bench-123')
+            Tasks.objects.bulk_create(
+                (Tasks(usuario=user, titulo=f'Tarefa {i}', prioridade='M', posicao=key)
+                 for i, key in enumerate(rank_sequence(TASKS))), batch_size=5000)
+            ids, keys = zip(*Tasks.objects.filter(usuario=user).order_by('posicao').values_list('id', 'posicao'))
+            client = APIClient()
+            client.force_authenticate(user=user)
+
+            rows = []
+            last = len(ids) - 1
+            for name, target, data in (
+                ("início", 0, {'antes': ids[0]}),
+                ("meio", TASKS // 2, {'apos': ids[TASKS // 2], 'antes': ids[TASKS // 2 + 1]}),
+                ("fim", last, {'apos': ids[last]}),
+            ):
+                # Move a tarefa de um quarto da lista para o alvo e de volta
+                source = ids[TASKS // 4]
+                url = reverse('tasks-posicao', args=[source])
+                back_data = {'apos': ids[TASKS // 4 - 1], 'antes': ids[TASKS // 4 + 1]}
+                written = count_writes(lambda: client.post(url, data, format='json'))
+                elapsed = measure(lambda: (client.post(url, data, format='json'),
+                                           client.post(url, back_data, format='json')), repeat=5) / 2
+
+                renumbered = count_writes(lambda: move_by_renumbering(user, keys, TASKS // 4, target))
+                naive = measure(lambda: move_by_renumbering(user, keys, TASKS // 4, target), repeat=5)
+                rows.append((f"mover para o {name}", f"posicao {elapsed * 1000:8.2f} ms ({written} linha) | "
+                                                     f"renumerando {naive * 1000:8.2f} ms ({renumbered:,} linhas)"))
+
+            url = reverse('tasks-list')
+            elapsed = measure(lambda: client.get(url, {'ordering': 'posicao'}), repeat=3)
+            rows.append(("listar em ?ordering=posicao", f"{elapsed * 1000:9.2f} ms | {TASKS:,} tarefas"))
+            elapsed = measure(lambda: rebalance_ranks(user.pk), repeat=1)
+            rows.append(("redistribuir as chaves", f"{elapsed * 1000:9.2f} ms (job em segundo plano)"))
+
+        report(f"Ordem manual com {TASKS:,} tarefas ({settings.DATABASES['default']['ENGINE']})", rows)
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
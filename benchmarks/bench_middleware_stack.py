@@ -0,0 +1,87 @@
+"""
+Benchmark da pilha de middlewares em uma requisição da API.
+
+Mede o custo marginal de cada middleware (handler completo do Django em
+volta de uma view trivial, incluindo os hooks) e o custo total de uma requisição a /api/v1/...
+com a pilha antiga (todos os middlewares, CorsMiddleware duplicado) e com a
+atual (PathRoutedMiddleware pulando BROWSER_MIDDLEWARE nas rotas da API).
+
+Uso:
+    python -m benchmarks.bench_middleware_stack
+"""
+from benchmarks.utils import measure, report, setup_django
+
+setup_django()
+
+from django.core.handlers.base import BaseHandler  # noqa: E402
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory, override_settings  # noqa: E402
+from django.urls import path  # noqa: E402
+
+BODY = b'{"id":1,"titulo":"Tarefa"}'
+NUMBER = 2000
+
+OLD_STACK = [
+    'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'common.middleware.compression.CompressionMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+]
+
+
+def ping(request):
+    return HttpResponse(BODY, content_type='application/json')
+
+
+# URLconf do benchmark (ROOT_URLCONF aponta para este módulo)
+urlpatterns = [path('api/v1/ping/', ping)]
+
+factory = RequestFactory()
+
+
+def api_request():
+    return factory.get('/api/v1/ping/', HTTP_HOST='localhost', HTTP_ORIGIN='https://app.example.com')
+
+
+def stack_cost(stack):
+    with override_settings(MIDDLEWARE=stack, ROOT_URLCONF=__name__):
+        handler = BaseHandler()
+        handler.load_middleware()
+        return measure(lambda: handler.get_response(api_request()), number=NUMBER)
+
+
+def main():
+    from django.conf import settings
+
+    # Custo marginal de cada middleware: pilha até ele menos a pilha anterior
+    # (isolados, alguns não funcionam: a autenticação exige a sessão antes)
+    rows = []
+    previous = empty = stack_cost([])
+    for index, middleware_path in enumerate(OLD_STACK):
+        current = stack_cost(OLD_STACK[:index + 1])
+        skipped = ' (pulado na API)' if middleware_path in settings.BROWSER_MIDDLEWARE else ''
+        if middleware_path in OLD_STACK[:index]:
+            skipped = ' (duplicado, removido)'
+        rows.append((middleware_path.rsplit('.', 1)[-1], f"{max(current - previous, 0) * 1e6:7.1f} µs{skipped}"))
+        previous = current
+    report("Custo de cada middleware por requisição da API", rows)
+
+    old = previous
+    new = stack_cost(settings.MIDDLEWARE)
+    report("Requisição da API (handler completo, view trivial)", [
+        ("sem middlewares", f"{empty * 1e6:7.1f} µs"),
+        ("pilha antiga", f"{old * 1e6:7.1f} µs | middlewares {(old - empty) * 1e6:6.1f} µs"),
+        ("pilha atual", f"{new * 1e6:7.1f} µs | middlewares {(new - empty) * 1e6:6.1f} µs"),
+        ("economia", f"{(old - new) * 1e6:7.1f} µs por requisição ({(old - new) / (old - empty):.0%} dos middlewares)"),
+    ])
+
+
+if __name__ == '__main__':
+    main()
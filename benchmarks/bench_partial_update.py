@@ -0,0 +1,94 @@
+"""
+Benchmark de PATCH de status: gravação da linha inteira x apenas colunas alteradas.
+
+Mede requisições por segundo e, no PostgreSQL, o volume de WAL gerado
+(pg_current_wal_lsn antes e depois), que reflete os bytes escritos por linha.
+
+Uso:
+    python -m benchmarks.bench_partial_update
+    DJANGO_SETTINGS_MODULE=core.settings.production python -m benchmarks.bench_partial_update
+"""
+import json
+import time
+from unittest import mock
+
+from benchmarks.utils import report, setup_django, setup_test_database
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from rest_framework import serializers  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.tasks.models.tasks import Tasks  # noqa: E402
+from apps.tasks.schemas.task_schema import TaskSerializer  # noqa: E402
+
+TASKS = 200
+ROUNDS = 5
+DESCRICAO = "x" * 8000  # descrição grande, que não deveria ser regravada
+
+
+def wal_position():
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_current_wal_lsn()")
+        return cursor.fetchone()[0]
+
+
+def wal_bytes(start):
+    if start is None:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s)", [start])
+        return int(cursor.fetchone()[0])
+
+
+def run(client, ids):
+    statuses = ['EA', 'P']
+    start_wal = wal_position()
+    start = time.perf_counter()
+    requests = 0
+    for round_ in range(ROUNDS):
+        payload = json.dumps({'status': statuses[round_ % 2]})
+        for task_id in ids:
+            client.patch(f'/api/v1/tasks/{task_id}/', data=payload, content_type='application/json')
+            requests += 1
+    elapsed = time.perf_counter() - start
+    return requests / elapsed, wal_bytes(start_wal), requests
+
+
+def main():
+    teardown = setup_test_database()
+    try:
+        user = User.objects.create_user(username='bench', password='bench')
+        Tasks.objects.bulk_create(
+            Tasks(usuario=user, titulo=f'Tarefa {i}', descricao=DESCRICAO, prioridade='M')
+            for i in range(TASKS)
+        )
+        ids = list(Tasks.objects.values_list('id', flat=True))
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        # "Antes": update padrão do ModelSerializer, que grava todas as colunas
+        with mock.patch.object(TaskSerializer, 'update', serializers.ModelSerializer.update):
+            full_rps, full_wal, total = run(client, ids)
+        partial_rps, partial_wal, _ = run(client, ids)
+
+        rows = [
+            ("linha inteira", f"{full_rps:8.1f} req/s"),
+            ("colunas alteradas", f"{partial_rps:8.1f} req/s"),
+        ]
+        if full_wal is not None:
+            rows += [
+                ("WAL linha inteira", f"{full_wal / total:8.0f} bytes/PATCH"),
+                ("WAL colunas alteradas", f"{partial_wal / total:8.0f} bytes/PATCH"),
+            ]
+        report(f"PATCH status ({connection.vendor}, {total} requisições)", rows)
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
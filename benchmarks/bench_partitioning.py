@@ -0,0 +1,146 @@
+"""
+Benchmark da tabela de tarefas particionada (partition_tasks) no PostgreSQL.
+
+Gera um volume sintético de tarefas, mede a listagem de um usuário (como o
+TasksViewSet.list), a atualização e a exclusão de uma tarefa e a inserção
+em lote na tabela comum; converte a tabela com `partition_tasks all` e mede
+tudo de novo. Mostra também quantas partições o plano da listagem acessa.
+
+Na tabela particionada, mede ainda a listagem de um membro de uma lista
+compartilhada: com o filtro `usuario_id = X OR lista_id IN (...)` (o
+visible_filter, que não permite a poda) e com o visible_branches (UNION ALL
+das tarefas do usuário, só na partição dele, com as das listas).
+
+Uso:
+    DJANGO_SETTINGS_MODULE=core.settings.production python -m benchmarks.bench_partitioning
+    BENCH_ROWS=20000000 BENCH_STRATEGY=range DJANGO_SETTINGS_MODULE=core.settings.production \\
+        python -m benchmarks.bench_partitioning
+"""
+import os
+import time
+
+from benchmarks.utils import measure, report, setup_django, setup_test_database
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from apps.tasks.models.tasks import Tasks  # noqa: E402
+from apps.tasks.schemas.task_read_schema import READ_FIELDS  # noqa: E402
+from apps.tasks.services.lists_service import (  # noqa: E402
+    add_member, create_list, list_roles, union_all, visible_branches, visible_filter,
+)
+
+ROWS = int(os.getenv('BENCH_ROWS', 2_000_000))
+USERS = int(os.getenv('BENCH_USERS', 10_000))
+STRATEGY = os.getenv('BENCH_STRATEGY', 'hash')
+PARTITIONS = int(os.getenv('BENCH_PARTITIONS', 16))
+INSERT_BATCH = 500
+
+
+def populate(first_user_id):
+    """Insere as tarefas direto no banco, com criado_em espalhado pelos últimos 2 anos."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            INSERT INTO {Tasks._meta.db_table} (usuario_id, titulo, descricao, prioridade, prazo, status,
+                                               criado_em, atualizado_em, concluido_em)
+            SELECT {first_user_id} + n % {USERS}, 'Tarefa ' || n, 'Descrição da tarefa ' || n, 'M',
+                   CURRENT_DATE + (n % 60), CASE WHEN n % 5 = 0 THEN 'C' ELSE 'P' END,
+                   NOW() - (n % 730) * INTERVAL '1 day', NOW(), NULL
+            FROM generate_series(1, {ROWS}) AS n
+        """)
+        cursor.execute(f"VACUUM ANALYZE {Tasks._meta.db_table}")
+
+
+def partitions_scanned(queryset):
+    """Quantidade de leituras de tabelas (partições) no plano da consulta."""
+    plan = queryset.explain()
+    return sum(1 for line in plan.splitlines() if ' on tasks_tasks' in line and 'Bitmap Index Scan' not in line)
+
+
+def snapshot(label, user_id):
+    task = Tasks.objects.filter(usuario_id=user_id).first()
+
+    own = Tasks.objects.filter(usuario_id=user_id).values_list(*READ_FIELDS)
+    listing = measure(lambda: list(own), repeat=20)
+
+    def update():
+        task.titulo = 'Alterada'
+        task.save_changes(['titulo'])
+
+    updating = measure(update, repeat=20)
+
+    def insert():
+        Tasks.objects.bulk_create(
+            Tasks(usuario_id=user_id, titulo='Nova', prioridade='M') for _ in range(INSERT_BATCH)
+        )
+
+    inserting = measure(insert, repeat=5)
+
+    def delete():
+        Tasks.objects.for_task(task).delete()
+
+    deleting = measure(delete, repeat=1)
+    return (
+        label,
+        f"listagem {listing * 1000:7.2f} ms ({partitions_scanned(own)} tabela(s) no plano)"
+        f" | update {updating * 1000:6.2f} ms | delete {deleting * 1000:6.2f} ms"
+        f" | insert de {INSERT_BATCH} {inserting * 1000:7.1f} ms",
+    )
+
+
+def shared_listing(owner_id, member_id):
+    """Listagem de quem é membro da lista de outro usuário: OR x UNION ALL."""
+    task_list = create_list(User.objects.get(pk=owner_id), 'Bench')
+    add_member(task_list, User.objects.get(pk=member_id), 'L')
+    Tasks.objects.filter(usuario_id=owner_id).update(lista=task_list)
+    roles = list_roles(member_id)
+
+    with_or = Tasks.objects.filter(visible_filter(member_id, roles)).order_by('id').values_list(*READ_FIELDS)
+    branches = visible_branches(Tasks.objects.all(), member_id, roles)
+    with_union = union_all([branch.values_list(*READ_FIELDS) for branch in branches]).order_by('id')
+    assert list(with_or) == list(with_union)
+
+    rows = []
+    for label, queryset in (("membro de lista, OR", with_or), ("membro de lista, UNION ALL", with_union)):
+        elapsed = measure(lambda: list(queryset), repeat=20)
+        rows.append((label, f"listagem {elapsed * 1000:7.2f} ms ({partitions_scanned(queryset)} tabela(s) no plano)"))
+    return rows
+
+
+def main():
+    if connection.vendor != 'postgresql':
+        raise SystemExit("O benchmark exige o PostgreSQL (DJANGO_SETTINGS_MODULE=core.settings.production)")
+
+    teardown = setup_test_database()
+    try:
+        users = User.objects.bulk_create(User(username=f'bench{i}') for i in range(USERS))
+        first_user_id = min(user.pk for user in users)
+
+        start = time.perf_counter()
+        populate(first_user_id)
+        rows = [("população", f"{ROWS:,} tarefas, {USERS:,} usuários em {time.perf_counter() - start:.1f}s")]
+        settings.TASKS_PARTITIONING = ''
+        rows.append(snapshot("sem partições", first_user_id))
+
+        start = time.perf_counter()
+        call_command('partition_tasks', 'all', strategy=STRATEGY, partitions=PARTITIONS, batch_size=50_000,
+                     stdout=open(os.devnull, 'w'))
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Tasks._meta.db_table}")
+        rows.append(("conversão", f"{STRATEGY}, {time.perf_counter() - start:.1f}s"))
+
+        settings.TASKS_PARTITIONING = STRATEGY
+        rows.append(snapshot(f"particionada ({STRATEGY})", first_user_id + 1))
+        rows.extend(shared_listing(first_user_id + 2, first_user_id + 3))
+
+        report(f"Tabela de tarefas particionada ({ROWS:,} linhas)", rows)
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark da listagem de tarefas com listas compartilhadas.
+
+Compara a listagem de um usuário só com tarefas próprias com a de um usuário
+que vê o mesmo número de tarefas, metade delas vindas de BENCH_LISTS listas
+compartilhadas. As listas são de outros usuários, que também têm muitas
+tarefas privadas, para que o filtro de visibilidade precise ser seletivo.
+A meta é a listagem com listas ficar em até 2x a listagem pessoal.
+
+Uso:
+    python -m benchmarks.bench_shared_lists
+    BENCH_LISTS=100 BENCH_TASKS=2000 python -m benchmarks.bench_shared_lists
+"""
+import os
+
+from benchmarks.utils import measure, report, setup_django, setup_test_database
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.tasks.models.tasks import Tasks  # noqa: E402
+from apps.tasks.services.lists_service import add_member, create_list  # noqa: E402
+
+LISTS = int(os.getenv('BENCH_LISTS', 50))
+TASKS = int(os.getenv('BENCH_TASKS', 1000))
+PRIVATE = int(os.getenv('BENCH_PRIVATE', 500))
+
+
+def main():
+    teardown = setup_test_database()
+    try:
+        with override_settings(ALLOWED_HOSTS=['*']):
+            personal = User.objects.create_user(username='pessoal', password='bench-123')
+            member = User.objects.create_user(username='equipes', password='bench-123')
+            Tasks.objects.bulk_create(
+                Tasks(usuario=personal, titulo=f'Tarefa {i}', prioridade='M') for i in range(TASKS))
+            Tasks.objects.bulk_create(
+                Tasks(usuario=member, titulo=f'Tarefa {i}', prioridade='M') for i in range(TASKS // 2))
+
+            per_list = TASKS // 2 // LISTS
+            for index in range(LISTS):
+                owner = User.objects.create_user(username=f'dono{index}', password='bench-123')
+                task_list = create_list(owner, f'Equipe {index}')
+                add_member(task_list, member, 'E')
+                Tasks.objects.bulk_create(
+                    Tasks(usuario=owner, titulo=f'Compartilhada {i}', prioridade='M', lista=task_list)
+                    for i in range(per_list))
+                Tasks.objects.bulk_create(
+                    Tasks(usuario=owner, titulo=f'Privada {i}', prioridade='M') for i in range(PRIVATE))
+
+            results = []
+            for user in (personal, member):
+                client = APIClient()
+                client.force_authenticate(user=user)
+                url = reverse('tasks-list')
+                count = len(client.get(url).data)
+                results.append((measure(lambda: client.get(url), repeat=10), count))
+
+        (personal_time, personal_count), (member_time, member_count) = results
+        report(f"Listagem com {LISTS} listas compartilhadas ({settings.DATABASES['default']['ENGINE']})", [
+            ("só tarefas próprias", f"{personal_time * 1000:8.2f} ms | {personal_count:,} tarefas"),
+            (f"membro de {LISTS} listas", f"{member_time * 1000:8.2f} ms | {member_count:,} tarefas"),
+            ("razão", f"{member_time / personal_time:8.2f}x (meta: até 2x)"),
+        ])
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark do stream de eventos (SSE) com muitas conexões ociosas.
+
+Sobe um processo do Uvicorn com core.asgi (backend de eventos local), abre
+BENCH_CONNECTIONS conexões SSE do mesmo usuário, mede a memória do servidor
+com as conexões abertas e o tempo entre criar uma tarefa pela API e todas as
+conexões receberem o evento.
+
+Uso:
+    python -m benchmarks.bench_sse
+    BENCH_CONNECTIONS=2000 python -m benchmarks.bench_sse
+
+Cada conexão usa um descritor de arquivo no cliente e outro no servidor:
+confira o `ulimit -n`.
+"""
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_gunicorn_workers import BASE_DIR, free_port
+from benchmarks.utils import report
+
+CONNECTIONS = int(os.getenv('BENCH_CONNECTIONS', 10_000))
+USERNAME = 'bench'
+
+
+def rss_mb(pid):
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def open_stream(port, token, received):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(
+        f'GET /api/v1/tasks/events/ HTTP/1.1\r\nHost: localhost\r\n'
+        f'Authorization: Bearer {token}\r\nAccept: text/event-stream\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    status = await reader.readline()
+    if b' 200 ' not in status:
+        raise RuntimeError(status)
+    await reader.readuntil(b'\r\n\r\n')
+
+    async def wait_event():
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            if line.startswith(b'event: criada'):
+                received.append(time.perf_counter())
+                return
+
+    return writer, asyncio.ensure_future(wait_event())
+
+
+async def request(port, method, path, token, body=None):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    payload = json.dumps(body).encode() if body is not None else b''
+    writer.write(
+        f'{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n'
+        f'Authorization: Bearer {token}\r\nContent-Type: application/json\r\n'
+        f'Content-Length: {len(payload)}\r\n\r\n'.encode() + payload
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return response
+
+
+async def scenario(port, pid, token):
+    baseline = rss_mb(pid)
+    received = []
+    streams = []
+
+    start = time.perf_counter()
+    for offset in range(0, CONNECTIONS, 500):
+        streams += await asyncio.gather(
+            *(open_stream(port, token, received) for _ in range(min(500, CONNECTIONS - offset)))
+        )
+    connect_time = time.perf_counter() - start
+
+    await asyncio.sleep(1)
+    loaded = rss_mb(pid)
+
+    start = time.perf_counter()
+    response = await request(port, 'POST', '/api/v1/tasks/', token,
+                             {'usuario': USERNAME, 'titulo': 'Evento', 'prioridade': 'M'})
+    if b' 201 ' not in response.split(b'\r\n', 1)[0]:
+        raise RuntimeError(response[:300])
+    await asyncio.wait_for(asyncio.gather(*(waiter for _, waiter in streams)), 60)
+    fanout = [moment - start for moment in sorted(received)]
+
+    for writer, _ in streams:
+        writer.close()
+
+    return [
+        ("conexões", f"{CONNECTIONS:,} abertas em {connect_time:.1f}s"),
+        ("memória do servidor", f"{baseline:6.1f} MB ociosa -> {loaded:6.1f} MB "
+                                f"({(loaded - baseline) * 1024 / CONNECTIONS:.1f} KB por conexão)"),
+        ("evento recebido", f"{len(fanout):,} conexões | mediana {fanout[len(fanout) // 2] * 1000:.0f} ms"
+                            f" | última {fanout[-1] * 1000:.0f} ms após o POST"),
+    ]
+
+
+def main():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {
+            **os.environ,
+            'PYTHONPATH': str(BASE_DIR),
+            'DJANGO_SETTINGS_MODULE': 'core.settings.development',
+            'STATIC_ROOT': os.path.join(workdir, 'static'),
+            'EVENTS_BACKEND': 'local',
+            'EVENTS_HEARTBEAT_SECONDS': '30',
+        }
+        manage = [sys.executable, str(BASE_DIR / 'manage.py')]
+        subprocess.run([*manage, 'migrate', '--noinput'], env=env, cwd=workdir, check=True, capture_output=True)
+        user_id = subprocess.run(
+            [*manage, 'shell', '-c',
+             f"from django.contrib.auth.models import User; print(User.objects.create_user('{USERNAME}').pk)"],
+            env=env, cwd=workdir, check=True, capture_output=True, text=True,
+        ).stdout.strip().splitlines()[-1]
+
+        os.environ.update({'DJANGO_SETTINGS_MODULE': 'core.settings.development'})
+        import django
+        django.setup()
+        from rest_framework_simplejwt.tokens import AccessToken
+
+        token = AccessToken()
+        token['user_id'] = int(user_id)
+
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'uvicorn', 'core.asgi:application', '--port', str(port),
+             '--log-level', 'warning', '--backlog', '4096'],
+            env=env,
+            cwd=workdir,
+        )
+        try:
+            time.sleep(3)
+            rows = asyncio.run(scenario(port, server.pid, str(token)))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report(f"SSE: {CONNECTIONS:,} conexões ociosas em um processo", rows)
+
+
+if __name__ == '__main__':
+    main()
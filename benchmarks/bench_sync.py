@@ -0,0 +1,71 @@
+"""
+Benchmark da sincronização incremental (GET /tasks/changes/).
+
+Compara, para um usuário com muitas tarefas, o custo de atualizar a cópia
+local do cliente baixando a lista inteira (list) e pedindo só as
+alterações desde o último token, com poucas tarefas alteradas e removidas.
+
+Uso:
+    python -m benchmarks.bench_sync
+    BENCH_TASKS=50000 BENCH_CHANGED=50 python -m benchmarks.bench_sync
+"""
+import os
+
+from benchmarks.utils import measure, report, setup_django, setup_test_database
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.tasks.models.tasks import Tasks  # noqa: E402
+from apps.tasks.services.sync_service import delete_tasks  # noqa: E402
+
+TASKS = int(os.getenv('BENCH_TASKS', 10_000))
+CHANGED = int(os.getenv('BENCH_CHANGED', 20))
+
+
+def main():
+    teardown = setup_test_database()
+    try:
+        with override_settings(SYNC_LAG_SECONDS=0, ALLOWED_HOSTS=['*']):
+            user = User.objects.create_user(username='bench', password='bench-123')
+            Tasks.objects.bulk_create(
+                Tasks(usuario=user, titulo=f'Tarefa {i}', prioridade='M') for i in range(TASKS)
+            )
+            client = APIClient()
+            client.force_authenticate(user=user)
+            url = reverse('tasks-changes')
+
+            token = client.get(url, {'limite': 1000}).data['token']
+            while True:
+                response = client.get(url, {'token': token, 'limite': 1000})
+                token = response.data['token']
+                if not response.data['mais']:
+                    break
+
+            ids = list(Tasks.objects.filter(usuario=user).values_list('id', flat=True)[:CHANGED * 2])
+            for task in Tasks.objects.filter(pk__in=ids[:CHANGED]):
+                task.titulo = 'Alterada'
+                task.save(update_fields=['titulo', 'atualizado_em'])
+            delete_tasks(Tasks.objects.filter(pk__in=ids[CHANGED:]))
+
+            full = measure(lambda: client.get(reverse('tasks-list')), repeat=5)
+            delta = measure(lambda: client.get(url, {'token': token}), repeat=20)
+            response = client.get(url, {'token': token})
+
+        report(f"Atualização da cópia local ({TASKS:,} tarefas, {settings.DATABASES['default']['ENGINE']})", [
+            ("lista completa", f"{full * 1000:8.2f} ms | {TASKS - CHANGED:,} tarefas"),
+            ("changes", f"{delta * 1000:8.2f} ms | {len(response.data['tarefas'])} alteradas, "
+                        f"{len(response.data['removidas'])} removidas"),
+            ("ganho", f"{full / delta:8.1f}x"),
+        ])
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
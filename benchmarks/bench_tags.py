@@ -0,0 +1,88 @@
+"""
+Benchmark dos filtros por etiquetas.
+
+Cria BENCH_TASKS tarefas distribuídas entre BENCH_USERS usuários, com até
+três etiquetas cada (de um vocabulário de 10), e mede para um usuário o
+filtro por qualquer uma de 3 etiquetas e por todas elas (só a consulta e a
+listagem completa pela API) e as contagens por etiqueta, com e sem cache.
+
+Uso:
+    python -m benchmarks.bench_tags
+    BENCH_TASKS=100000 python -m benchmarks.bench_tags
+"""
+import os
+
+from benchmarks.utils import measure, report, setup_django, setup_test_database
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.tasks.models.tags import TaskTags  # noqa: E402
+from apps.tasks.models.tasks import Tasks  # noqa: E402
+from apps.tasks.services.tags_service import filter_by_tags, tag_counts  # noqa: E402
+
+TASKS = int(os.getenv('BENCH_TASKS', 1_000_000))
+USERS = int(os.getenv('BENCH_USERS', 1000))
+VOCABULARY = [f'etiqueta{i}' for i in range(10)]
+FILTER = VOCABULARY[:3]
+
+
+def populate():
+    users = User.objects.bulk_create(User(username=f'usuario{i}') for i in range(USERS))
+    per_user = TASKS // USERS
+    for user in users:
+        tasks = Tasks.objects.bulk_create(
+            Tasks(usuario=user, titulo=f'Tarefa {i}', prioridade='M',
+                  tags=list(dict.fromkeys(VOCABULARY[i // 10 ** digit % 10] for digit in range(3))))
+            for i in range(per_user)
+        )
+        TaskTags.objects.bulk_create(
+            TaskTags(usuario_id=user.pk, tarefa_id=task.pk, nome=nome) for task in tasks for nome in task.tags
+        )
+    return users[USERS // 2]
+
+
+def main():
+    teardown = setup_test_database()
+    try:
+        with override_settings(ALLOWED_HOSTS=['*']):
+            user = populate()
+            queryset = Tasks.objects.filter(usuario=user)
+            client = APIClient()
+            client.force_authenticate(user=user)
+            url = reverse('tasks-list')
+
+            rows = []
+            for name, params, kwargs in (("qualquer uma de 3", {'tags': ','.join(FILTER)}, {'any_of': FILTER}),
+                                         ("todas as 3", {'tags_todas': ','.join(FILTER)}, {'all_of': FILTER})):
+                def query():
+                    return list(filter_by_tags(queryset, user.pk, {}, **kwargs).values_list('id', flat=True))
+
+                found = len(query())
+                query_time = measure(query, repeat=20)
+                api_time = measure(lambda: client.get(url, params), repeat=10)
+                rows.append((name, f"consulta {query_time * 1000:7.2f} ms | API {api_time * 1000:7.2f} ms | "
+                                   f"{found:,} tarefas"))
+
+            def uncached():
+                cache.delete(f'tasks:etiquetas:{user.pk}')
+                return tag_counts(user.pk)
+
+            rows.append(("contagens sem cache", f"{measure(uncached, repeat=10) * 1000:7.2f} ms | "
+                                                f"{len(uncached())} etiquetas"))
+            rows.append(("contagens com cache", f"{measure(lambda: tag_counts(user.pk), repeat=10) * 1000:7.2f} ms"))
+
+        report(f"Filtros por etiquetas ({TASKS:,} tarefas, {USERS:,} usuários, "
+               f"{settings.DATABASES['default']['ENGINE']})", rows)
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
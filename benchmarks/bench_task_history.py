@@ -0,0 +1,102 @@
+"""
+Benchmark do histórico de alterações: custo no caminho de escrita das tarefas.
+
+Compara PATCHs de status e a conclusão em lote de BENCH_TASKS tarefas:
+    - sem histórico (TASK_HISTORY_ENABLED=False)
+    - histórico após o commit (padrão: um bulk_create por escrita)
+    - histórico síncrono (um INSERT por tarefa alterada, dentro da transação)
+
+A meta é que o histórico custe menos de 10% no PATCH.
+
+Uso:
+    python -m benchmarks.bench_task_history
+    BENCH_TASKS=2000 python -m benchmarks.bench_task_history
+"""
+import json
+import os
+import time
+from contextlib import nullcontext
+from unittest import mock
+
+from benchmarks.utils import report, setup_django, setup_test_database
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.db.models import Q  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.tasks.models.history import TaskHistory  # noqa: E402
+from apps.tasks.models.tasks import Tasks  # noqa: E402
+from apps.tasks.services import history_service  # noqa: E402
+
+TASKS = int(os.getenv('BENCH_TASKS', 500))
+ROUNDS = 2
+
+
+def record_synchronously(action, changes, author_id):
+    """O que o histórico após o commit evita: um INSERT por tarefa alterada, dentro da transação."""
+    for task_id, fields in changes:
+        if fields:
+            TaskHistory.objects.create(tarefa_id=task_id, autor_id=author_id, acao=action, alteracoes=fields)
+
+
+def run_patches(client, ids):
+    statuses = ['EA', 'P']
+    start = time.perf_counter()
+    requests = 0
+    for round_ in range(ROUNDS):
+        payload = json.dumps({'status': statuses[round_ % 2]})
+        for task_id in ids:
+            client.patch(f'/api/v1/tasks/{task_id}/', data=payload, content_type='application/json')
+            requests += 1
+    return requests / (time.perf_counter() - start)
+
+
+def run_bulk_complete(client, ids):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        client.post('/api/v1/tasks/concluir/', {'ids': ids}, format='json')
+        Tasks.objects.filter(pk__in=ids).update(status='P', concluido_em=None)
+    return (time.perf_counter() - start) / ROUNDS
+
+
+def main():
+    teardown = setup_test_database()
+    try:
+        user = User.objects.create_user(username='bench', password='bench')
+        Tasks.objects.bulk_create(Tasks(usuario=user, titulo=f'Tarefa {i}', prioridade='M') for i in range(TASKS))
+        ids = list(Tasks.objects.values_list('id', flat=True))
+        client = APIClient()
+        client.force_authenticate(user=user)
+        run_patches(client, ids[:50])  # aquecimento
+
+        modes = {
+            "sem histórico": lambda: override_settings(TASK_HISTORY_ENABLED=False),
+            "histórico após o commit": nullcontext,
+            "histórico síncrono": lambda: mock.patch.object(history_service, 'record', record_synchronously),
+        }
+        # Rodadas alternadas entre os modos, ficando com o melhor resultado de cada um
+        results = {name: (0, float('inf')) for name in modes}
+        for _ in range(3):
+            for name, context in modes.items():
+                with context():
+                    rps, bulk = run_patches(client, ids), run_bulk_complete(client, ids)
+                results[name] = (max(rps, results[name][0]), min(bulk, results[name][1]))
+
+        baseline_rps, baseline_bulk = results["sem histórico"]
+        rows = []
+        for name, (rps, bulk) in results.items():
+            overhead = (baseline_rps / rps - 1) * 100
+            rows.append((name, f"PATCH {rps:8.1f} req/s ({overhead:+5.1f}%) | "
+                               f"concluir {TASKS} tarefas {bulk * 1000:8.2f} ms"))
+        rows.append(("linhas no histórico", f"{TaskHistory.objects.filter(~Q(autor=None)).count():,}"))
+
+        report(f"Histórico de alterações ({TASKS} tarefas, {ROUNDS} rodadas)", rows)
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
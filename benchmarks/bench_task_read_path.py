@@ -0,0 +1,63 @@
+"""
+Benchmark do caminho de leitura de tarefas: TaskSerializer x serialize_task_rows.
+
+Mede o custo por linha apenas da serialização (dados já carregados) e o
+custo total com a consulta ao banco.
+
+Uso:
+    python -m benchmarks.bench_task_read_path
+"""
+from benchmarks.utils import measure, report, setup_django, setup_test_database
+
+setup_django()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from apps.tasks.models.tasks import Tasks  # noqa: E402
+from apps.tasks.schemas.task_read_schema import READ_FIELDS, serialize_task_rows  # noqa: E402
+from apps.tasks.schemas.task_schema import TaskSerializer  # noqa: E402
+
+ROWS = 10_000
+
+
+def main():
+    teardown = setup_test_database()
+    try:
+        user = User.objects.create_user(username='bench', password='bench')
+        statuses = ['P', 'EA', 'C']
+        Tasks.objects.bulk_create(
+            Tasks(
+                usuario=user,
+                titulo=f'Tarefa {i}',
+                descricao='Descrição da tarefa. ' * 5,
+                prioridade='AMB'[i % 3],
+                status=statuses[i % 3],
+                prazo=timezone.localdate(),
+                concluido_em=timezone.now() if i % 3 == 2 else None,
+            )
+            for i in range(ROWS)
+        )
+        queryset = Tasks.objects.filter(usuario=user)
+
+        instances = list(queryset)
+        rows = list(queryset.values_list(*READ_FIELDS))
+        assert serialize_task_rows(rows) == [dict(item) for item in TaskSerializer(instances, many=True).data]
+
+        serializer_only = measure(lambda: TaskSerializer(instances, many=True).data, repeat=3)
+        fast_only = measure(lambda: serialize_task_rows(rows), repeat=3)
+        serializer_total = measure(lambda: TaskSerializer(queryset.all(), many=True).data, repeat=3)
+        fast_total = measure(lambda: serialize_task_rows(queryset.values_list(*READ_FIELDS)), repeat=3)
+
+        report(f"Serialização de {ROWS:,} tarefas (por linha)", [
+            ("TaskSerializer", f"{serializer_only / ROWS * 1e6:7.2f} µs"),
+            ("serialize_task_rows", f"{fast_only / ROWS * 1e6:7.2f} µs  ({serializer_only / fast_only:.1f}x)"),
+            ("TaskSerializer + consulta", f"{serializer_total / ROWS * 1e6:7.2f} µs"),
+            ("values_list + consulta", f"{fast_total / ROWS * 1e6:7.2f} µs  ({serializer_total / fast_total:.1f}x)"),
+        ])
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
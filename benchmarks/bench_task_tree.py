@@ -0,0 +1,153 @@
+"""
+Benchmark da hierarquia de tarefas (subtarefas, progresso e mover um ramo).
+
+Monta uma árvore de BENCH_NODES tarefas com BENCH_DEPTH níveis e mede, pela
+API, a leitura de todas as subtarefas, o progresso por status e a mudança de
+pai de um ramo, na raiz e em um nó do meio da árvore. Para comparar, a mesma
+leitura é feita percorrendo a árvore pelo campo `pai`, uma consulta por
+nível (a melhor versão sem o caminho materializado) e uma por tarefa (N+1).
+
+Uso:
+    python -m benchmarks.bench_task_tree
+    BENCH_NODES=20000 BENCH_DEPTH=6 python -m benchmarks.bench_task_tree
+"""
+import os
+
+from benchmarks.utils import measure, report, setup_django, setup_test_database
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+
+from apps.tasks.models.tasks import Tasks  # noqa: E402
+from apps.tasks.services.tree_service import child_path, descendants_filter  # noqa: E402
+
+NODES = int(os.getenv('BENCH_NODES', 100_000))
+DEPTH = int(os.getenv('BENCH_DEPTH', 10))
+
+
+def build_tree(user):
+    """
+    Cria a árvore nível a nível: cada nó ganha filhos suficientes para que o
+    último nível complete NODES tarefas.
+
+    Returns:
+        list[list[Tasks]]: Tarefas de cada nível
+    """
+    branching = 2
+    while sum(branching ** level for level in range(DEPTH)) < NODES:
+        branching += 1
+
+    levels = [Tasks.objects.bulk_create([Tasks(usuario=user, titulo='Raiz', prioridade='M')])]
+    created = 1
+    for depth in range(1, DEPTH):
+        children = []
+        for parent in levels[-1]:
+            for index in range(branching):
+                if created + len(children) >= NODES:
+                    break
+                children.append(Tasks(
+                    usuario=user, titulo=f'Nível {depth}', prioridade='M', status='C' if index % 3 == 0 else 'P',
+                    pai=parent, caminho=child_path(parent),
+                ))
+        levels.append(Tasks.objects.bulk_create(children, batch_size=5000))
+        created += len(children)
+    return levels
+
+
+def walk_by_level(root):
+    """Descendentes pelo campo pai: uma consulta por nível."""
+    found, frontier = [], [root.pk]
+    while frontier:
+        frontier = list(Tasks.objects.filter(pai_id__in=frontier).values_list('id', flat=True))
+        found += frontier
+    return found
+
+
+def walk_by_node(root):
+    """Descendentes pelo campo pai: uma consulta por tarefa (N+1)."""
+    found = []
+    for child in Tasks.objects.filter(pai_id=root.pk).values_list('id', flat=True):
+        found += [child, *walk_by_node(Tasks(pk=child))]
+    return found
+
+
+def count_queries(func):
+    """
+    Executa func contando as consultas. O CaptureQueriesContext não serve aqui:
+    o sinal request_started do Django limpa o log de consultas a cada requisição.
+    """
+    executed = []
+
+    def counter(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(counter):
+        result = func()
+    return result, len(executed)
+
+
+def timed(client, method, url, data=None, repeat=3):
+    call = getattr(client, method)
+    response, queries = count_queries(lambda: call(url, data, format='json'))
+    elapsed = measure(lambda: call(url, data, format='json'), repeat=repeat)
+    return elapsed, response, queries
+
+
+def main():
+    teardown = setup_test_database()
+    try:
+        with override_settings(ALLOWED_HOSTS=['*'], REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK, 'DEFAULT_PAGINATION_CLASS': None,
+        }):
+            user = User.objects.create_user(username='bench', password='bench-123')
+            levels = build_tree(user)
+            client = APIClient()
+            client.force_authenticate(user=user)
+
+            rows = []
+            middle = levels[DEPTH // 2][0]
+            for name, node in (("raiz", levels[0][0]), (f"nível {DEPTH // 2}", middle)):
+                elapsed, response, queries = timed(client, 'get', reverse('tasks-subtarefas', args=[node.pk]))
+                rows.append((f"subtarefas ({name})", f"{elapsed * 1000:9.2f} ms | {len(response.data):,} tarefas | "
+                                                     f"{queries} consultas"))
+                elapsed, response, queries = timed(client, 'get', reverse('tasks-progresso', args=[node.pk]))
+                rows.append((f"progresso ({name})", f"{elapsed * 1000:9.2f} ms | "
+                                                    f"{response.data['percentual']}% concluído | {queries} consultas"))
+
+            # Só os ids, para comparar as formas de percorrer a árvore sem a serialização
+            root = levels[0][0]
+
+            def by_path():
+                return list(Tasks.objects.filter(descendants_filter(root)).values_list('id', flat=True))
+
+            for name, func in (("caminho (raiz)", by_path), ("pai, por nível (raiz)", lambda: walk_by_level(root)),
+                               (f"pai, N+1 (nível {DEPTH // 2})", lambda: walk_by_node(middle))):
+                found, queries = count_queries(func)
+                elapsed = measure(func, repeat=3)
+                rows.append((f"ids: {name}", f"{elapsed * 1000:9.2f} ms | {len(found):,} ids | {queries} consultas"))
+
+            # Move o primeiro ramo abaixo da raiz para debaixo do segundo e de volta
+            branch, first, second = levels[1][0], levels[0][0], levels[1][1]
+            url = reverse('tasks-mover', args=[branch.pk])
+            _, queries = count_queries(lambda: client.post(url, {'pai': second.pk}, format='json'))
+            elapsed = measure(lambda: (client.post(url, {'pai': first.pk}, format='json'),
+                                       client.post(url, {'pai': second.pk}, format='json')), repeat=3) / 2
+            branch.refresh_from_db()
+            size = Tasks.objects.filter(descendants_filter(branch)).count()
+            rows.append(("mover ramo", f"{elapsed * 1000:9.2f} ms | {size:,} descendentes | {queries} consultas"))
+
+        report(f"Hierarquia com {NODES:,} tarefas e {DEPTH} níveis "
+               f"({settings.DATABASES['default']['ENGINE']})", rows)
+    finally:
+        teardown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Utilitários compartilhados pelos benchmarks.
+
+Os benchmarks não fazem parte da suíte de testes; rode-os diretamente, por
+exemplo: python -m benchmarks.bench_exception_handler
+"""
+import os
+import time
+
+
+def setup_django(settings_module='core.settings.development'):
+    """Configura o Django para scripts executados fora do manage.py."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+    import django
+    django.setup()
+
+
+def measure(func, repeat=5, number=1):
+    """
+    Executa func `number` vezes por rodada e retorna o melhor tempo por chamada.
+
+    Returns:
+        float: Melhor tempo por chamada, em segundos
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def report(title, rows):
+    """Imprime uma tabela simples com (nome, valor) alinhados."""
+    print(f"\n{title}")
+    width = max(len(name) for name, _ in rows)
+    for name, value in rows:
+        print(f"  {name.ljust(width)}  {value}")
+
+
+def setup_test_database():
+    """
+    Cria um banco de testes isolado (como o pytest-django faz) para o benchmark
+    não gravar no banco de desenvolvimento.
+
+    Returns:
+        callable: Função que destrói o banco criado
+    """
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    def teardown():
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    return teardown
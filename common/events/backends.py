@@ -0,0 +1,108 @@
+"""
+Backends para distribuir os eventos entre processos e nós.
+
+Cada publicação vai para um canal compartilhado; cada processo ASGI escuta
+esse canal em uma thread própria e entrega as mensagens ao seu Broker. As
+publicações são feitas pelas views síncronas, depois do commit.
+
+Configuração em settings:
+    EVENTS_CHANNEL:    nome do canal (NOTIFY do PostgreSQL ou pub/sub do Redis)
+    EVENTS_REDIS_URL:  URL do Redis (backend redis)
+"""
+import abc
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Limite do payload do NOTIFY no PostgreSQL
+NOTIFY_MAX_BYTES = 8000
+
+
+class ListenerBackend(abc.ABC):
+    """Base dos backends que escutam o canal em uma thread daemon, reconectando após falhas."""
+
+    reconnect_delay = 1
+
+    def start(self, broker):
+        self.broker = broker
+        threading.Thread(target=self._run, name=f'{type(self).__name__}-listener', daemon=True).start()
+
+    def _run(self):
+        while True:
+            try:
+                self.listen(self.broker.receive)
+            except Exception:
+                logger.exception('Falha ao escutar o canal de eventos; reconectando')
+            time.sleep(self.reconnect_delay)
+
+    @abc.abstractmethod
+    def listen(self, callback):
+        """Escuta o canal e chama `callback` com cada mensagem, até a conexão cair."""
+
+
+class PostgresBackend(ListenerBackend):
+    """Distribui os eventos com LISTEN/NOTIFY no banco principal."""
+
+    def __init__(self):
+        self.channel = settings.EVENTS_CHANNEL
+
+    def publish(self, message):
+        if len(message.encode()) > NOTIFY_MAX_BYTES:
+            logger.warning('Evento maior que o limite do NOTIFY descartado')
+            return
+        with connections['default'].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [self.channel, message])
+
+    def listen(self, callback):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        params = connections['default'].get_connection_params()
+        connection = psycopg2.connect(**params)
+        try:
+            connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+            with connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            while True:
+                # Acorda periodicamente para detectar conexões perdidas
+                if select.select([connection], [], [], 30) == ([], [], []):
+                    with connection.cursor() as cursor:
+                        cursor.execute('SELECT 1')
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    callback(connection.notifies.pop(0).payload)
+        finally:
+            connection.close()
+
+
+class RedisBackend(ListenerBackend):
+    """Distribui os eventos pelo pub/sub do Redis (requer o pacote redis)."""
+
+    def __init__(self):
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured("EVENTS_BACKEND='redis' requer o pacote redis (pip install redis)")
+        self.channel = settings.EVENTS_CHANNEL
+        self.client = redis.Redis.from_url(settings.EVENTS_REDIS_URL)
+
+    def publish(self, message):
+        self.client.publish(self.channel, message)
+
+    def listen(self, callback):
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        try:
+            pubsub.subscribe(self.channel)
+            for item in pubsub.listen():
+                if item['type'] == 'message':
+                    callback(item['data'].decode())
+        finally:
+            pubsub.close()
@@ -0,0 +1,188 @@
+"""
+Distribuição de eventos em tempo real para as conexões abertas do processo.
+
+Cada processo ASGI tem um Broker. As conexões SSE (common.events.sse) se
+inscrevem pelo id do usuário e recebem os eventos em uma fila limitada. Os
+eventos chegam pelo backend configurado (common.events.backends): direto na
+memória (um único processo) ou via PostgreSQL LISTEN/NOTIFY ou Redis
+(vários processos/nós; cada publicação chega a todos os brokers).
+
+Configuração em settings:
+    EVENTS_BACKEND:     local, postgres ou redis
+    EVENTS_QUEUE_SIZE:  eventos pendentes por conexão antes de desconectá-la
+    EVENTS_HISTORY:     eventos guardados para a retomada com Last-Event-ID
+"""
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Marca colocada na fila de uma conexão que deve ser encerrada
+CLOSE = object()
+
+_counter = itertools.count(1)
+
+
+def new_event_id():
+    """Id único entre processos, crescente dentro de cada processo."""
+    return f'{time.time_ns() // 1000:x}-{os.getpid():x}-{next(_counter):x}'
+
+
+class Subscription:
+    """
+    Fila de eventos de uma conexão.
+
+    A fila é limitada: um cliente lento que acumula EVENTS_QUEUE_SIZE eventos
+    é marcado como `overflowed` e desconectado, em vez de fazer o processo
+    guardar eventos sem limite. Ao reconectar com Last-Event-ID ele recebe o
+    que perdeu (ou é orientado a usar a sincronização incremental).
+    """
+
+    def __init__(self, user_id, maxsize):
+        self.user_id = user_id
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+        self.closed = False
+
+    def push(self, event):
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            self.close()
+
+    def close(self):
+        """Encerra a conexão: descarta os eventos pendentes e acorda o leitor."""
+        if self.closed:
+            return
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(CLOSE)
+
+
+class Broker:
+    """
+    Inscrições por usuário e histórico recente dos eventos do processo.
+
+    O dispatch roda sempre no event loop do processo; publish() pode ser
+    chamado de qualquer thread (as views síncronas do Django rodam em threads).
+    """
+
+    def __init__(self, backend=None, queue_size=100, history=10000):
+        self.queue_size = queue_size
+        self.history = deque(maxlen=history)
+        self.subscriptions = {}
+        self.loop = None
+        self._lock = threading.Lock()
+        self.backend = backend or LocalBackend()
+
+    def start(self, loop=None):
+        """Associa o broker ao event loop atual e inicia o backend (uma vez)."""
+        with self._lock:
+            if self.loop is not None:
+                return
+            self.loop = loop or asyncio.get_running_loop()
+        self.backend.start(self)
+
+    def subscribe(self, user_id, last_event_id=None):
+        """
+        Inscreve uma conexão do usuário.
+
+        Returns:
+            tuple[Subscription, list | None]: A inscrição e os eventos perdidos
+            desde `last_event_id` (None se ele não está mais no histórico)
+        """
+        subscription = Subscription(user_id, self.queue_size)
+        self.subscriptions.setdefault(user_id, set()).add(subscription)
+        missed = self.replay(user_id, last_event_id) if last_event_id else []
+        return subscription, missed
+
+    def unsubscribe(self, subscription):
+        subscriptions = self.subscriptions.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.subscriptions[subscription.user_id]
+
+    def replay(self, user_id, last_event_id):
+        """Eventos do usuário posteriores a `last_event_id`, ou None se ele já saiu do histórico."""
+        missed = []
+        for event in reversed(self.history):
+            if event['id'] == last_event_id:
+                return missed[::-1]
+            if event['usuario'] == user_id:
+                missed.append(event)
+        return None
+
+    def publish(self, user_id, event_type, data):
+        """Publica um evento para as conexões do usuário em todos os processos."""
+        self.backend.publish(json.dumps({
+            'id': new_event_id(),
+            'usuario': user_id,
+            'tipo': event_type,
+            'dados': data,
+        }))
+
+    def receive(self, message):
+        """Entrega uma mensagem vinda do backend (de qualquer thread)."""
+        event = json.loads(message)
+        if self.loop is None:
+            self.dispatch(event)
+        else:
+            self.loop.call_soon_threadsafe(self.dispatch, event)
+
+    def dispatch(self, event):
+        self.history.append(event)
+        for subscription in tuple(self.subscriptions.get(event['usuario'], ())):
+            subscription.push(event)
+            if subscription.overflowed:
+                self.unsubscribe(subscription)
+
+    def connections(self):
+        return sum(len(subscriptions) for subscriptions in self.subscriptions.values())
+
+
+class LocalBackend:
+    """Entrega as publicações só ao próprio processo (desenvolvimento, um worker)."""
+
+    def start(self, broker):
+        self.broker = broker
+
+    def publish(self, message):
+        broker = getattr(self, 'broker', None)
+        if broker is not None:
+            broker.receive(message)
+
+
+BACKENDS = {
+    'local': 'common.events.broker.LocalBackend',
+    'postgres': 'common.events.backends.PostgresBackend',
+    'redis': 'common.events.backends.RedisBackend',
+}
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Broker do processo, criado na primeira chamada conforme settings."""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend = import_string(BACKENDS[settings.EVENTS_BACKEND])()
+                _broker = Broker(
+                    backend=backend,
+                    queue_size=settings.EVENTS_QUEUE_SIZE,
+                    history=settings.EVENTS_HISTORY,
+                )
+    return _broker
@@ -0,0 +1,176 @@
+"""
+Endpoint de Server-Sent Events servido direto pela aplicação ASGI.
+
+As conexões SSE ficam abertas por muito tempo e quase sempre ociosas, então
+não passam pelo Django: o SSEApplication atende settings.EVENTS_PATH antes
+do handler ASGI do Django e entrega as demais requisições a ele. Cada
+conexão ociosa custa uma inscrição no Broker e uma tarefa asyncio, sem
+threads nem conexões com o banco (o banco só é consultado para carregar o
+usuário ao conectar).
+
+Protocolo:
+    - autenticação pelo access token JWT, no cabeçalho Authorization
+      (Bearer) ou no parâmetro access_token (o EventSource do navegador não
+      envia cabeçalhos);
+    - cada evento tem `id`, `event` (o tipo) e `data` (JSON);
+    - um comentário `: ping` é enviado a cada EVENTS_HEARTBEAT_SECONDS sem
+      eventos, para manter proxies e balanceadores com a conexão aberta;
+    - ao reconectar com Last-Event-ID, os eventos perdidos são reenviados; se
+      o id não está mais no histórico, o evento `resync` indica que o cliente
+      deve usar a sincronização incremental (GET /tasks/changes/);
+    - a conexão é encerrada quando o token expira (evento `expirado`) ou
+      quando o cliente não acompanha os eventos (fila cheia); nos dois casos
+      o cliente reconecta com Last-Event-ID.
+"""
+import asyncio
+import json
+import time
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from common.events.broker import CLOSE, get_broker
+
+
+def format_event(event_type, data, event_id=None):
+    lines = f'id: {event_id}\n' if event_id else ''
+    return f'{lines}event: {event_type}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'.encode()
+
+
+def authenticate(headers, query_string):
+    """
+    Valida o access token JWT da conexão e carrega o usuário pelo
+    JWTAuthentication, como nas views: usuários excluídos ou inativos são
+    recusados. Faz uma consulta ao banco (chame com sync_to_async) e devolve a
+    conexão em seguida, como no fim de uma requisição do Django.
+
+    Returns:
+        tuple[int | str, float] | None: (id do usuário, expiração em epoch) ou None se inválido
+    """
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+    from rest_framework_simplejwt.settings import api_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    raw = None
+    authorization = headers.get(b'authorization', b'').decode('latin-1').split()
+    if len(authorization) == 2 and authorization[0] in api_settings.AUTH_HEADER_TYPES:
+        raw = authorization[1]
+    else:
+        raw = parse_qs(query_string.decode('latin-1')).get('access_token', [None])[0]
+    if not raw:
+        return None
+
+    try:
+        token = AccessToken(raw)
+        JWTAuthentication().get_user(token)
+    except (TokenError, InvalidToken, AuthenticationFailed):
+        return None
+    finally:
+        close_old_connections()
+    return token[api_settings.USER_ID_CLAIM], token['exp']
+
+
+def allowed_origin(origin):
+    if not origin:
+        return False
+    if getattr(settings, 'CORS_ALLOW_ALL_ORIGINS', False):
+        return True
+    allowed = getattr(settings, 'CORS_ALLOWED_ORIGINS', [])
+    return '*' in allowed or origin in allowed
+
+
+class SSEApplication:
+    """Atende o stream de eventos em settings.EVENTS_PATH e repassa o resto para `app`."""
+
+    def __init__(self, app, broker=None):
+        self.app = app
+        self.path = settings.EVENTS_PATH
+        self.heartbeat = settings.EVENTS_HEARTBEAT_SECONDS
+        self._broker = broker
+
+    @property
+    def broker(self):
+        return self._broker or get_broker()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] == self.path:
+            return await self.stream(scope, receive, send)
+        return await self.app(scope, receive, send)
+
+    async def error(self, send, status, message, code):
+        body = json.dumps({
+            'title': 'Erro',
+            'errors': [{'field': 'general', 'message': message, 'code': code}],
+        }).encode()
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def stream(self, scope, receive, send):
+        if scope['method'] != 'GET':
+            return await self.error(send, 405, 'Método não permitido.', 'method_not_allowed')
+
+        headers = dict(scope['headers'])
+        auth = await sync_to_async(authenticate)(headers, scope.get('query_string', b''))
+        if auth is None:
+            return await self.error(send, 401, 'Token de acesso ausente ou inválido.', 'not_authenticated')
+        user_id, expires_at = auth
+
+        response_headers = [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            # Impede que o nginx acumule o stream em buffer
+            (b'x-accel-buffering', b'no'),
+        ]
+        origin = headers.get(b'origin', b'').decode('latin-1')
+        if allowed_origin(origin):
+            response_headers += [(b'access-control-allow-origin', origin.encode()), (b'vary', b'origin')]
+
+        broker = self.broker
+        broker.start()
+        last_event_id = headers.get(b'last-event-id', b'').decode('latin-1') or None
+        subscription, missed = broker.subscribe(user_id, last_event_id)
+        watcher = asyncio.ensure_future(self.wait_disconnect(receive, subscription))
+
+        async def write(body):
+            await send({'type': 'http.response.body', 'body': body, 'more_body': True})
+
+        try:
+            await send({'type': 'http.response.start', 'status': 200, 'headers': response_headers})
+            if missed is None:
+                await write(format_event('resync', {}))
+            else:
+                for event in missed:
+                    await write(format_event(event['tipo'], event['dados'], event['id']))
+
+            while True:
+                remaining = expires_at - time.time()
+                if remaining <= 0:
+                    await write(format_event('expirado', {}))
+                    break
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), min(self.heartbeat, remaining))
+                except asyncio.TimeoutError:
+                    await write(b': ping\n\n')
+                    continue
+                if event is CLOSE:
+                    break
+                await write(format_event(event['tipo'], event['dados'], event['id']))
+        finally:
+            broker.unsubscribe(subscription)
+            watcher.cancel()
+
+        await send({'type': 'http.response.body', 'body': b'', 'more_body': False})
+
+    async def wait_disconnect(self, receive, subscription):
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                subscription.close()
+                return
@@ -1,5 +1,68 @@
 from rest_framework.views import exception_handler
 
+# Campo usado para erros que não pertencem a um campo específico
+GENERAL_FIELD = "general"
+
+# Código usado quando o erro não informa um código próprio (ex: string simples)
+DEFAULT_CODE = "error"
+
+
+def _error_item(field, error):
+    """
+    Monta um item de erro. ErrorDetail já é uma str, então só convertemos
+    quando necessário (ex: strings de tradução lazy).
+    """
+    return {
+        "field": field,
+        "message": error if isinstance(error, str) else str(error),
+        "code": getattr(error, "code", None) or DEFAULT_CODE,
+    }
+
+
+def format_errors(data, field=GENERAL_FIELD):
+    """
+    Achata erros aninhados do DRF em uma lista de itens {field, message, code}.
+
+    Percorre dicionários e listas uma única vez, usando uma pilha em vez de
+    recursão. Campos aninhados e itens de list serializers geram caminhos
+    pontuados, por exemplo "itens.1.titulo".
+
+    Args:
+        data: Estrutura de erros (dict, list ou valor simples)
+        field: Nome do campo raiz usado para valores que não são dicionários
+
+    Returns:
+        list: Itens de erro na ordem em que aparecem na estrutura original
+    """
+    errors = []
+    append = errors.append
+    # A pilha guarda (prefixo, valor); é consumida em ordem reversa para
+    # preservar a ordem original dos erros
+    stack = [(None, data)]
+    pop = stack.pop
+    push = stack.append
+
+    while stack:
+        prefix, value = pop()
+
+        if isinstance(value, dict):
+            for key, child in reversed(value.items()):
+                push((key if prefix is None else f"{prefix}.{key}", child))
+        elif isinstance(value, list):
+            # Listas de erros simples ficam no mesmo campo; listas de
+            # dicionários (list serializers) recebem o índice no caminho
+            for index in range(len(value) - 1, -1, -1):
+                child = value[index]
+                if isinstance(child, dict):
+                    if child:
+                        push((str(index) if prefix is None else f"{prefix}.{index}", child))
+                else:
+                    push((prefix, child))
+        else:
+            append(_error_item(field if prefix is None else prefix, value))
+
+    return errors
+
 
 def custom_exception_handler(exc, context):
     """
@@ -7,55 +70,23 @@ def custom_exception_handler(exc, context):
     """
     # Primeiro, obtém a resposta padrão
     response = exception_handler(exc, context)
-    
+
     # Se não houver resposta, deixa o DRF lidar com isso
     if response is None:
         return response
-    
-    # Inicializa a estrutura de resposta padronizada
-    error_response = {
-        "title": "Erro",
-        "errors": []
-    }
-    
-    # Processa os erros com base no tipo de dados da resposta
-    if isinstance(response.data, dict):
-        # Se for um dicionário com campos específicos
-        if "detail" in response.data:
-            # Erro geral (não associado a um campo específico)
-            error_response["errors"].append({
-                "field": "general",
-                "message": str(response.data["detail"])
-            })
-        else:
-            # Para erros de validação com múltiplos campos
-            for field, errors in response.data.items():
-                if isinstance(errors, list):
-                    for error in errors:
-                        error_response["errors"].append({
-                            "field": field,
-                            "message": str(error)
-                        })
-                else:
-                    error_response["errors"].append({
-                        "field": field,
-                        "message": str(errors)
-                    })
-    elif isinstance(response.data, list):
-        # Se for uma lista de erros
-        for item in response.data:
-            error_response["errors"].append({
-                "field": "general",
-                "message": str(item)
-            })
+
+    data = response.data
+
+    # Erro geral (não associado a um campo específico), ex: NotAuthenticated
+    if isinstance(data, dict) and "detail" in data:
+        errors = [_error_item(GENERAL_FIELD, data["detail"])]
     else:
-        # Caso seja uma string ou outro tipo
-        error_response["errors"].append({
-            "field": "general",
-            "message": str(response.data)
-        })
-    
+        errors = format_errors(data)
+
     # Substitui o conteúdo da resposta pelo formato padronizado
-    response.data = error_response
-    
-    return response
\ No newline at end of file
+    response.data = {
+        "title": "Erro",
+        "errors": errors,
+    }
+
+    return response
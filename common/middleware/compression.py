@@ -0,0 +1,252 @@
+"""
+Compressão negociada (zstd, brotli, gzip) das respostas da API.
+
+Semelhante ao GZipMiddleware do Django, mas escolhe a codificação pelo
+Accept-Encoding do cliente, só comprime respostas acima de um tamanho mínimo
+e de tipos textuais, e comprime respostas em streaming (ex: exportação CSV)
+pedaço a pedaço, sem acumular o corpo inteiro. O stream de eventos (SSE,
+common.events.sse) é servido pelo ASGI fora do Django e não passa por aqui.
+
+Proteção contra BREACH: páginas HTML fora da API (admin, docs) carregam o
+token CSRF e não são comprimidas, a menos que COMPRESS_HTML esteja ativo.
+Views que refletem dados do usuário junto com segredos podem desativar a
+compressão com @compression_exempt (ou `compression_exempt = True` na classe).
+
+Configuração em settings.API_COMPRESSION:
+    MIN_SIZE:  tamanho mínimo (bytes) para comprimir respostas comuns
+    ENCODINGS: codificações aceitas, em ordem de preferência do servidor
+    LEVELS:    nível de compressão por codificação
+    COMPRESS_HTML: comprime também text/html fora de API_PATH_PREFIXES
+"""
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import sync_and_async_middleware
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - dependência opcional
+    zstandard = None
+
+DEFAULTS = {
+    'MIN_SIZE': 1024,
+    'ENCODINGS': ['zstd', 'br', 'gzip'],
+    'LEVELS': {'zstd': 3, 'br': 4, 'gzip': 6},
+    'COMPRESS_HTML': False,
+}
+
+# Apenas conteúdo textual é comprimido; imagens e arquivos já compactados não
+COMPRESSIBLE_TYPES = (
+    'text/', 'application/json', 'application/openapi+json', 'application/yaml',
+    'application/javascript', 'application/xml', 'application/vnd.',
+)
+
+
+class _GzipCompressor:
+    def __init__(self, level):
+        # wbits=31: formato gzip (cabeçalho + CRC), não apenas deflate
+        self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._obj.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    def __init__(self, level):
+        self._obj = brotli.Compressor(quality=level)
+
+    def compress(self, data):
+        return self._obj.process(data)
+
+    def flush(self):
+        return self._obj.flush()
+
+    def finish(self):
+        return self._obj.finish()
+
+
+class _ZstdCompressor:
+    def __init__(self, level):
+        self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data):
+        return self._obj.compress(data)
+
+    def flush(self):
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self):
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+COMPRESSORS = {'gzip': _GzipCompressor}
+if brotli is not None:
+    COMPRESSORS['br'] = _BrotliCompressor
+if zstandard is not None:
+    COMPRESSORS['zstd'] = _ZstdCompressor
+
+
+def get_compression_setting(name):
+    return getattr(settings, 'API_COMPRESSION', {}).get(name, DEFAULTS[name])
+
+
+def choose_encoding(accept_encoding, preference):
+    """
+    Escolhe a codificação a partir do Accept-Encoding.
+
+    Usa o maior valor de q enviado pelo cliente; em caso de empate, vale a
+    ordem de preferência do servidor. Codificações com q=0 são recusadas.
+
+    Returns:
+        str | None: Codificação escolhida ou None para não comprimir
+    """
+    weights = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best, best_q = None, 0.0
+    for encoding in preference:
+        if encoding not in COMPRESSORS:
+            continue
+        q = weights.get(encoding, weights.get('*', 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compression_exempt(view_func):
+    """
+    Desativa a compressão para a view (proteção contra BREACH em respostas que
+    refletem dados do usuário junto com segredos). Para views baseadas em
+    classe, defina o atributo `compression_exempt = True`.
+    """
+    view_func.compression_exempt = True
+    return view_func
+
+
+def _is_exempt(view_func):
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    return getattr(view_func, 'compression_exempt', False) or getattr(view_class, 'compression_exempt', False)
+
+
+def _is_browser_html(request, response):
+    """Indica se a resposta é uma página HTML fora da API (admin, docs)."""
+    if not response.get('Content-Type', '').startswith('text/html'):
+        return False
+    prefixes = tuple(getattr(settings, 'API_PATH_PREFIXES', ()))
+    return not (prefixes and request.path_info.startswith(prefixes))
+
+
+def _compress_chunks(chunks, compressor):
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _acompress_chunks(chunks, compressor):
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+@sync_and_async_middleware
+class CompressionMiddleware:
+    """Comprime a resposta com a melhor codificação aceita pelo cliente."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if _is_exempt(view_func):
+            request._compression_exempt = True
+
+    def process_response(self, request, response):
+        if (
+            getattr(request, '_compression_exempt', False)
+            or getattr(response, 'compression_exempt', False)
+            or response.has_header('Content-Encoding')
+            or not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES)
+        ):
+            return response
+
+        if _is_browser_html(request, response) and not get_compression_setting('COMPRESS_HTML'):
+            return response
+
+        if not response.streaming and len(response.content) < get_compression_setting('MIN_SIZE'):
+            return response
+
+        # A resposta varia conforme o Accept-Encoding, comprimida ou não
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        encoding = choose_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''),
+            get_compression_setting('ENCODINGS'),
+        )
+        if encoding is None:
+            return response
+
+        level = get_compression_setting('LEVELS').get(encoding, DEFAULTS['LEVELS'].get(encoding))
+        compressor = COMPRESSORS[encoding](level)
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _acompress_chunks(response.streaming_content, compressor)
+            else:
+                response.streaming_content = _compress_chunks(response.streaming_content, compressor)
+            # O tamanho final não é conhecido antes do fim do streaming
+            del response.headers['Content-Length']
+        else:
+            compressed = compressor.compress(response.content) + compressor.finish()
+            # Só troca o corpo se a compressão realmente diminuir o tamanho
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # O corpo mudou, então o ETag forte deixa de valer (mesma regra do GZipMiddleware)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+
+        return response
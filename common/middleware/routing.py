@@ -0,0 +1,153 @@
+"""
+Middlewares aplicados conforme o caminho da requisição.
+
+As rotas da API (settings.API_PATH_PREFIXES) são autenticadas por JWT e não
+usam sessão, CSRF, mensagens nem X-Frame-Options. O PathRoutedMiddleware
+executa a lista settings.BROWSER_MIDDLEWARE apenas para as demais rotas
+(admin, docs), que continuam com a pilha completa.
+
+A lista interna é montada como o Django monta settings.MIDDLEWARE, inclusive
+os hooks process_view, process_template_response e process_exception, que
+são repassados na mesma ordem em que o Django os chamaria.
+
+As verificações admin.E408 a E410 procuram sessão, autenticação e mensagens
+só em settings.MIDDLEWARE. Com o admin ativo elas são silenciadas e
+substituídas por check_admin_middleware, que procura os mesmos middlewares
+também em BROWSER_MIDDLEWARE (registrada em core.apps).
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.apps import apps
+from django.conf import settings
+from django.core.checks import Error
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.decorators import sync_and_async_middleware
+from django.utils.module_loading import import_string
+
+# Middlewares exigidos pelo admin, com o código da verificação equivalente do Django
+ADMIN_MIDDLEWARE = {
+    'admin.E408': 'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'admin.E409': 'django.contrib.messages.middleware.MessageMiddleware',
+    'admin.E410': 'django.contrib.sessions.middleware.SessionMiddleware',
+}
+
+
+def _contains_subclass(class_path, candidate_paths):
+    """Se algum dos middlewares é a classe de class_path ou uma subclasse dela."""
+    expected = import_string(class_path)
+    for path in candidate_paths:
+        try:
+            candidate = import_string(path)
+        except ImportError:
+            continue
+        if isinstance(candidate, type) and issubclass(candidate, expected):
+            return True
+    return False
+
+
+def check_admin_middleware(app_configs=None, **kwargs):
+    """
+    admin.E408 a E410 considerando a pilha efetiva das rotas do admin:
+    MIDDLEWARE e, com o PathRoutedMiddleware nela, BROWSER_MIDDLEWARE.
+    """
+    if not apps.is_installed('django.contrib.admin'):
+        return []
+    stack = list(settings.MIDDLEWARE)
+    if any(path.endswith('.PathRoutedMiddleware') for path in stack):
+        stack += getattr(settings, 'BROWSER_MIDDLEWARE', [])
+    return [
+        Error(f"'{path}' precisa estar em MIDDLEWARE ou BROWSER_MIDDLEWARE para usar o admin.",
+              id=f"routing.{code.split('.')[1]}")
+        for code, path in ADMIN_MIDDLEWARE.items()
+        if not _contains_subclass(path, stack)
+    ]
+
+
+@sync_and_async_middleware
+class PathRoutedMiddleware:
+    """Executa settings.BROWSER_MIDDLEWARE somente fora dos prefixos da API."""
+
+    # Mesma adaptação sync/async usada pelo Django ao montar os middlewares
+    adapt_method_mode = BaseHandler.adapt_method_mode
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+        self.api_prefixes = tuple(getattr(settings, 'API_PATH_PREFIXES', ('/api/',)))
+        self._view_middleware = []
+        self._template_response_middleware = []
+        self._exception_middleware = []
+        self.browser_chain = self._load(getattr(settings, 'BROWSER_MIDDLEWARE', []))
+
+    def _load(self, middleware_paths):
+        """Monta a cadeia interna terminando em self.get_response (ver BaseHandler.load_middleware)."""
+        handler = self.get_response
+        handler_is_async = self.async_mode
+
+        for middleware_path in reversed(middleware_paths):
+            middleware = import_string(middleware_path)
+            middleware_can_sync = getattr(middleware, 'sync_capable', True)
+            middleware_can_async = getattr(middleware, 'async_capable', False)
+            if not handler_is_async and middleware_can_sync:
+                middleware_is_async = False
+            else:
+                middleware_is_async = middleware_can_async
+
+            try:
+                adapted_handler = self.adapt_method_mode(middleware_is_async, handler, handler_is_async)
+                mw_instance = middleware(adapted_handler)
+            except MiddlewareNotUsed:
+                continue
+            if mw_instance is None:
+                raise ImproperlyConfigured(f"Middleware factory {middleware_path} returned None.")
+
+            # Os hooks são chamados de forma síncrona pelos métodos abaixo
+            if hasattr(mw_instance, 'process_view'):
+                self._view_middleware.insert(0, self.adapt_method_mode(False, mw_instance.process_view))
+            if hasattr(mw_instance, 'process_template_response'):
+                self._template_response_middleware.append(
+                    self.adapt_method_mode(False, mw_instance.process_template_response)
+                )
+            if hasattr(mw_instance, 'process_exception'):
+                self._exception_middleware.append(self.adapt_method_mode(False, mw_instance.process_exception))
+
+            handler = convert_exception_to_response(mw_instance)
+            handler_is_async = middleware_is_async
+
+        return self.adapt_method_mode(self.async_mode, handler, handler_is_async)
+
+    def is_api(self, request):
+        return request.path_info.startswith(self.api_prefixes)
+
+    def __call__(self, request):
+        if self.is_api(request):
+            return self.get_response(request)
+        return self.browser_chain(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_api(request):
+            return None
+        for middleware_method in self._view_middleware:
+            response = middleware_method(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        if not self.is_api(request):
+            for middleware_method in self._template_response_middleware:
+                response = middleware_method(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        if self.is_api(request):
+            return None
+        for middleware_method in self._exception_middleware:
+            response = middleware_method(request, exception)
+            if response is not None:
+                return response
+        return None
@@ -0,0 +1,34 @@
+"""
+Parsers alternativos para a API.
+"""
+import codecs
+from io import BytesIO
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from common.renderers import ORJSONRenderer, orjson
+
+
+class ORJSONParser(JSONParser):
+    """
+    Parser JSON baseado em orjson.
+
+    Corpos inválidos (ou fora do que o orjson aceita, como inteiros maiores
+    que 64 bits) são repassados ao JSONParser padrão, que gera exatamente o
+    mesmo resultado ou a mesma mensagem de erro de antes.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(BytesIO(body), media_type, parser_context)
@@ -0,0 +1,27 @@
+from rest_framework.permissions import SAFE_METHODS
+
+from common.permissions.is_owner import IsOwner
+
+
+class IsOwnerOrListMember(IsOwner):
+    """
+    Permite o acesso ao dono do objeto e aos membros da lista a que ele pertence.
+
+    Os papéis vêm de `view.get_list_roles()` ({lista_id: papel}), já carregados
+    (e cacheados) para a requisição, então nenhuma consulta é feita por objeto.
+    Qualquer membro pode ler; alterar e excluir exigem um papel de `write_roles`.
+
+    Herda de:
+        IsOwner: Mesmas regras de autenticação e de criação
+    """
+
+    write_roles = ("E", "A")
+
+    def has_object_permission(self, request, view, obj) -> bool:
+        if obj.usuario_id == request.user.pk:
+            return True
+
+        role = view.get_list_roles().get(obj.lista_id)
+        if role is None:
+            return False
+        return request.method in SAFE_METHODS or role in self.write_roles
@@ -23,8 +23,8 @@ class IsOwner(BasePermission):
         if not request.user or not request.user.is_authenticated:
             raise NotAuthenticated("Você precisa estar autenticado para usar esta API.")
 
-        # Se for criação, valida payload
-        if request.method == 'POST':
+        # Se for criação, valida payload (outras ações POST, como export, não têm 'usuario')
+        if request.method == 'POST' and getattr(view, 'action', 'create') == 'create':
             user_id = request.data.get('usuario')
             if str(user_id) != str(request.user):
                 raise PermissionDenied("Você não pode criar tarefa para outro usuário.")
@@ -0,0 +1,179 @@
+"""
+Renderers alternativos para a API.
+
+O ORJSONRenderer produz os mesmos bytes que o JSONRenderer padrão do DRF
+(separadores compactos, UTF-8 sem escape, datas no formato do DRF), mas
+usando o orjson para a codificação. Onde o orjson escreveria outros bytes, a
+resposta é gerada pelo renderer padrão: floats com expoente (o orjson escreve
+1e16 e 0.00001, o padrão 1e+16 e 1e-05) e NaN/Infinity (o orjson escreve
+null, o padrão recusa o valor). O mesmo vale se o orjson não estiver
+instalado ou o dado não puder ser codificado por ele.
+
+Para listas grandes (clientes de sincronização e análise) há dois formatos
+compactos, escolhidos pelo cabeçalho Accept ou por ?format=:
+    - MessagePackRenderer: o mesmo conteúdo em MessagePack (binário)
+    - ColumnarJSONRenderer: JSON com um array por campo, sem repetir as chaves
+      a cada linha, e campos de poucos valores codificados por dicionário
+"""
+import re
+from decimal import Decimal
+from itertools import chain
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependência opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependência opcional
+    msgpack = None
+
+# U+2028 e U+2029 em UTF-8; a busca por regex é bem mais rápida que dois `in`
+_JS_SEPARATORS = re.compile(b'\xe2\x80[\xa8\xa9]')
+_JS_ESCAPES = {b'\xe2\x80\xa8': b'\\u2028', b'\xe2\x80\xa9': b'\\u2029'}
+
+_CONTAINERS = (dict, list, tuple, set, frozenset)
+
+
+def _needs_default_renderer(data):
+    """
+    Indica se o dado tem números que o orjson escreveria com outros bytes:
+    floats fora de [1e-4, 1e16) (com expoente no json da stdlib), NaN e
+    Infinity (float ou Decimal). Percorre um nível por vez, com o tipo de
+    cada valor lido por map() em vez de um laço por valor.
+    """
+    level = [data]
+    while level:
+        values = list(chain.from_iterable(
+            item.values() if isinstance(item, dict) else item for item in level))
+        kinds = set(map(type, values))
+        # NaN também falha a comparação, e inf fica fora do intervalo
+        if float in kinds and any(
+                value and not 1e-4 <= abs(value) < 1e16 for value in values if type(value) is float):
+            return True
+        if Decimal in kinds and any(not value.is_finite() for value in values if type(value) is Decimal):
+            return True
+        if not any(issubclass(kind, _CONTAINERS) for kind in kinds):
+            return False
+        level = [value for value in values if isinstance(value, _CONTAINERS)]
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renderer JSON baseado em orjson, com a mesma saída do JSONRenderer (ver o
+    início do módulo para os casos que ficam com o renderer padrão).
+
+    Datas, horários, Decimal e strings de tradução lazy são convertidos pelo
+    mesmo JSONEncoder do DRF (via `default`), para manter o formato atual.
+    """
+    if orjson is not None:
+        options = (
+            orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_NON_STR_KEYS
+        )
+    _default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        # Indentação, ASCII escapado e separadores longos ficam com o renderer padrão
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self._default, option=self.options)
+        except orjson.JSONEncodeError:
+            # Ex: inteiros maiores que 64 bits; o json da stdlib sabe lidar
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Floats escritos com outros bytes e NaN/Infinity (que viram null no
+        # orjson) ficam com o renderer padrão, que os escreve ou recusa como antes
+        if _needs_default_renderer((data,)):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Mesmo escape do DRF para \u2028 e \u2029 (JSON como subconjunto de JavaScript)
+        if _JS_SEPARATORS.search(ret):
+            ret = _JS_SEPARATORS.sub(lambda match: _JS_ESCAPES[match.group()], ret)
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Renderer MessagePack, com o mesmo conteúdo da resposta JSON.
+
+    Datas, Decimal e strings lazy passam pelo JSONEncoder do DRF, como no
+    JSON. Só é oferecido quando o msgpack está instalado (compact_renderer_classes).
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    _default = staticmethod(JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self._default)
+
+
+def to_columns(rows, dictionary_fields=()):
+    """
+    Converte uma lista de dicionários (linhas) no layout colunar.
+
+    Args:
+        rows: Lista de dicionários com as mesmas chaves
+        dictionary_fields: Campos codificados por dicionário: a coluna guarda o
+            índice do valor na lista `dicionarios[campo]`
+
+    Returns:
+        dict: {'linhas': n, 'colunas': {campo: [valores]}, 'dicionarios': {campo: [valores distintos]}}
+    """
+    columns = {}
+    dictionaries = {}
+    for name in (rows[0] if rows else ()):
+        values = [row.get(name) for row in rows]
+        if name in dictionary_fields:
+            codes = {}
+            values = [codes.setdefault(value, len(codes)) for value in values]
+            dictionaries[name] = list(codes)
+        columns[name] = values
+    return {'linhas': len(rows), 'colunas': columns, 'dicionarios': dictionaries}
+
+
+class ColumnarJSONRenderer(ORJSONRenderer):
+    """
+    Renderer JSON colunar para listas: um array por campo em vez de um objeto
+    por linha.
+
+    Os campos codificados por dicionário vêm de `columnar_dictionary_fields`
+    da view. Respostas paginadas têm só `results` convertido; respostas que
+    não são listas (ex: erros) saem como no JSON.
+    """
+    media_type = 'application/vnd.columnar+json'
+    format = 'colunar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        view = (renderer_context or {}).get('view')
+        dictionary_fields = getattr(view, 'columnar_dictionary_fields', ())
+        if isinstance(data, list):
+            data = to_columns(data, dictionary_fields)
+        elif isinstance(data, dict) and isinstance(data.get('results'), list):
+            data = {**data, 'results': to_columns(data['results'], dictionary_fields)}
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+def compact_renderer_classes():
+    """Renderers compactos disponíveis: o colunar sempre, o MessagePack se instalado."""
+    return [ColumnarJSONRenderer, *([MessagePackRenderer] if msgpack is not None else [])]
@@ -0,0 +1,78 @@
+"""
+Roteamento de leituras para réplicas do banco de dados.
+
+As leituras só vão para uma réplica quando a requisição pede isso
+explicitamente (ver common.views.read_replica.ReadReplicaMixin), por meio de
+uma ContextVar: vale para a thread/tarefa da requisição corrente e nunca
+vaza para outras. Escritas, migrações e leituras dentro de transações vão
+sempre para o banco principal.
+
+Configuração em settings:
+    DATABASE_REPLICAS:   aliases de DATABASES usados como réplicas
+    REPLICA_PIN_SECONDS: tempo em que um usuário que acabou de escrever lê do principal
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def route_reads_to_replica():
+    """
+    Passa a enviar as leituras do contexto atual para as réplicas.
+
+    Returns:
+        Token: Use em reset_replica_routing(token) ao final da requisição
+    """
+    return _use_replica.set(True)
+
+
+def reset_replica_routing(token):
+    _use_replica.reset(token)
+
+
+@contextmanager
+def read_from_replica():
+    """Gerenciador de contexto para ler de uma réplica fora de uma view."""
+    token = route_reads_to_replica()
+    try:
+        yield
+    finally:
+        reset_replica_routing(token)
+
+
+class ReplicaRouter:
+    """Envia leituras marcadas para uma réplica aleatória e todo o resto ao principal."""
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if not replicas or not _use_replica.get():
+            return None
+        # Dentro de uma transação a leitura precisa ver o que ela mesma escreveu
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplicas têm os mesmos dados do principal
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # O esquema chega às réplicas pela replicação
+        if db in get_replicas():
+            return False
+        return None
@@ -0,0 +1,18 @@
+from common.renderers import compact_renderer_classes
+
+
+class CompactFormatsMixin:
+    """
+    Mixin para ViewSets do DRF: oferece os formatos compactos (MessagePack e
+    JSON colunar) nas ações de `compact_format_actions`, além dos renderers
+    padrão. As demais ações continuam só com JSON.
+    """
+    compact_format_actions = ('list',)
+    # Campos de poucos valores distintos, codificados por dicionário no colunar
+    columnar_dictionary_fields = ()
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if getattr(self, 'action', None) in self.compact_format_actions:
+            renderers += [renderer() for renderer in compact_renderer_classes()]
+        return renderers
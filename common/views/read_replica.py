@@ -0,0 +1,70 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.permissions import SAFE_METHODS
+
+from common.routers.replica_router import get_replicas, reset_replica_routing, route_reads_to_replica
+
+PIN_COOKIE = 'primary_pin'
+
+
+def _pin_cache_key(user):
+    return f'replica:pin:{user.pk}'
+
+
+def is_pinned(request):
+    """
+    Verifica se o usuário escreveu há pouco e deve continuar lendo do principal.
+
+    Usa o cookie (clientes que o guardam) e o cache por usuário (clientes só com
+    JWT; com vários servidores, o cache precisa ser compartilhado, ex: Redis).
+    """
+    try:
+        if float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+
+    user = getattr(request, 'user', None)
+    return bool(user and user.is_authenticated and cache.get(_pin_cache_key(user)))
+
+
+def pin_to_primary(request, response):
+    """Fixa as leituras do usuário no principal pela janela de REPLICA_PIN_SECONDS."""
+    seconds = getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+    if seconds <= 0:
+        return
+    response.set_cookie(
+        PIN_COOKIE, str(time.time() + seconds), max_age=seconds, httponly=True, samesite='Lax',
+    )
+    user = getattr(request, 'user', None)
+    if user and user.is_authenticated:
+        cache.set(_pin_cache_key(user), True, seconds)
+
+
+class ReadReplicaMixin:
+    """
+    Mixin para views do DRF: requisições de leitura (GET/HEAD/OPTIONS) leem
+    das réplicas; escritas bem-sucedidas fixam o usuário no principal por
+    alguns segundos, para que ele veja o que acabou de gravar (read-your-writes).
+
+    A decisão é tomada em initial(), depois da autenticação, para que o pin
+    por usuário funcione também com JWT.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if get_replicas() and request.method in SAFE_METHODS and not is_pinned(request):
+            self._replica_token = route_reads_to_replica()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            reset_replica_routing(token)
+            self._replica_token = None
+
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request, response)
+        return response
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.core import checks
+
+
+class CoreConfig(AppConfig):
+    name = 'core'
+
+    def ready(self):
+        from common.middleware.routing import check_admin_middleware
+
+        # Substitui admin.E408 a E410 (silenciadas em settings com o admin ativo)
+        checks.register(check_admin_middleware, checks.Tags.admin)
@@ -1,5 +1,8 @@
 """
 ASGI config for task_collab_api project.
+
+O stream de eventos em tempo real (settings.EVENTS_PATH) é atendido pelo
+common.events.sse.SSEApplication; as demais requisições vão para o Django.
 """
 
 import os
@@ -8,4 +11,8 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings.development')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from common.events.sse import SSEApplication  # noqa: E402  (depois do django.setup())
+
+application = SSEApplication(django_application)
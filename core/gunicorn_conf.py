@@ -0,0 +1,131 @@
+"""
+Configuração do Gunicorn para produção, controlada por variáveis de ambiente.
+
+Uso:
+    gunicorn -c python:core.gunicorn_conf
+
+Variáveis:
+    PORT                        Porta de escuta (padrão: 8000)
+    WEB_CONCURRENCY             Número de processos (padrão: calculado pelas CPUs)
+    GUNICORN_MAX_WORKERS        Limite do valor calculado (padrão: 8)
+    GUNICORN_WORKER_CLASS       gthread (WSGI, padrão), uvicorn (ASGI) ou sync
+    GUNICORN_THREADS            Threads por processo no gthread (padrão: 4)
+    GUNICORN_TIMEOUT            Segundos até um worker travado ser reiniciado (padrão: 30)
+    GUNICORN_GRACEFUL_TIMEOUT   Segundos para terminar requisições no restart (padrão: 30)
+    GUNICORN_KEEPALIVE          Segundos mantendo conexões ociosas abertas (padrão: 5)
+    GUNICORN_MAX_REQUESTS       Requisições até reciclar o processo, 0 desativa (padrão: 1000)
+    GUNICORN_MAX_REQUESTS_JITTER  Variação aleatória do valor acima (padrão: 100)
+    GUNICORN_PRELOAD            Carrega o Django antes do fork (padrão: True)
+    GUNICORN_ACCESS_LOG         Caminho do log de acesso, '-' para stdout (padrão: desativado)
+"""
+import gc
+import logging
+import os
+import sys
+from importlib.util import find_spec
+
+logger = logging.getLogger('gunicorn.error')
+
+# Classe de worker -> (classe do Gunicorn, aplicação)
+WORKER_CLASSES = {
+    'sync': ('sync', 'core.wsgi:application'),
+    'gthread': ('gthread', 'core.wsgi:application'),
+    'uvicorn': ('uvicorn_worker.UvicornWorker', 'core.asgi:application'),
+}
+
+
+def _env_int(name, default):
+    value = os.getenv(name, '')
+    return int(value) if value.strip() else default
+
+
+def _env_bool(name, default):
+    value = os.getenv(name, '')
+    return value.strip().lower() in ('1', 'true', 'yes') if value.strip() else default
+
+
+def cpu_count():
+    """CPUs disponíveis para o processo (respeita affinity/limites do container)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - macOS/Windows
+        return os.cpu_count() or 1
+
+
+def select_worker_class(name):
+    """
+    Resolve o nome da classe de worker em (classe do Gunicorn, aplicação).
+
+    Se o pacote do worker uvicorn não estiver instalado, usa gthread para que
+    o servidor suba mesmo assim.
+    """
+    name = (name or 'gthread').strip().lower()
+    if name not in WORKER_CLASSES:
+        raise ValueError(
+            f"GUNICORN_WORKER_CLASS inválido: {name!r} (opções: {', '.join(WORKER_CLASSES)})"
+        )
+    if name == 'uvicorn' and find_spec('uvicorn_worker') is None:
+        logger.warning("uvicorn-worker não instalado; usando gthread")
+        name = 'gthread'
+    return name, *WORKER_CLASSES[name]
+
+
+def default_workers(cpus, limit):
+    """
+    Número de processos padrão: 2 * CPUs + 1, limitado por `limit`.
+
+    Com preload e gc.freeze a memória do código é compartilhada entre os
+    processos, então o custo de cada worker extra é basicamente o heap próprio.
+    """
+    return max(2, min(2 * cpus + 1, limit))
+
+
+worker_name, worker_class, wsgi_app = select_worker_class(os.getenv('GUNICORN_WORKER_CLASS'))
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+workers = _env_int('WEB_CONCURRENCY', 0) or default_workers(
+    cpu_count(), _env_int('GUNICORN_MAX_WORKERS', 8),
+)
+# Só o gthread usa threads; no uvicorn a concorrência vem do event loop
+threads = _env_int('GUNICORN_THREADS', 4) if worker_name == 'gthread' else 1
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+
+# Recicla processos periodicamente (contém vazamentos de memória); o jitter
+# evita que todos reiniciem ao mesmo tempo
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+preload_app = _env_bool('GUNICORN_PRELOAD', True)
+
+# Heartbeat dos workers em memória: /tmp em disco de container pode travar o worker
+if os.path.isdir('/dev/shm'):
+    worker_tmp_dir = '/dev/shm'
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+# O Render (e outros proxies) enviam X-Forwarded-*; a conexão vem sempre do proxy
+forwarded_allow_ips = os.getenv('FORWARDED_ALLOW_IPS', '*')
+
+
+def pre_fork(server, worker):
+    # Conexões abertas no master (ex: checks no carregamento) não podem ser
+    # herdadas pelos processos filhos
+    if 'django.db' in sys.modules:
+        from django.db import connections
+        connections.close_all()
+
+    # Move os objetos já carregados para a geração permanente: o GC dos filhos
+    # não os percorre (nem altera o cabeçalho deles), então as páginas de
+    # memória continuam compartilhadas com o master (copy-on-write)
+    gc.collect()
+    gc.freeze()
+
+
+def when_ready(server):
+    server.log.info(
+        "Gunicorn pronto: %s workers %s, %s threads, app %s",
+        workers, worker_name, threads, wsgi_app,
+    )
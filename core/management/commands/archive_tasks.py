@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.tasks.services.archive_service import archive_completed_tasks
+
+
+class Command(BaseCommand):
+    help = 'Move tarefas concluídas há mais de N dias para a tabela de arquivo, em lotes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=180, help='Dias desde a conclusão (padrão: 180)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Tarefas por lote (padrão: 1000)')
+        parser.add_argument('--max-batches', type=int, help='Limite de lotes nesta execução (padrão: sem limite)')
+        parser.add_argument(
+            '--pause',
+            type=float,
+            default=0,
+            help='Segundos de espera entre lotes, para não atrasar as réplicas (padrão: 0)'
+        )
+
+    def handle(self, **options):
+        start = time.perf_counter()
+        archived, batches = archive_completed_tasks(
+            days=options['days'],
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            pause=options['pause'],
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'{archived} tarefa(s) arquivada(s) em {batches} lote(s) em {elapsed:.2f}s'
+        ))
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import time
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.staticfiles.finders import get_finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.executor import MigrationExecutor
+
+STATIC_MANIFEST = '.bootstrap-manifest.json'
+
+
+def pending_migrations(database=DEFAULT_DB_ALIAS):
+    """
+    Migrações ainda não aplicadas, sem executar o comando migrate.
+
+    Returns:
+        list[str]: Nomes no formato 'app.migração'
+    """
+    executor = MigrationExecutor(connections[database])
+    targets = executor.loader.graph.leaf_nodes()
+    return [
+        f"{migration.app_label}.{migration.name}"
+        for migration, backwards in executor.migration_plan(targets)
+    ]
+
+
+def static_fingerprint():
+    """
+    Hash dos arquivos estáticos de origem (caminho, tamanho e data de modificação).
+
+    Ler só os metadados é bem mais barato que comparar o conteúdo, e basta
+    para saber se algum arquivo foi adicionado, removido ou alterado.
+    """
+    entries = []
+    for finder in get_finders():
+        for path, storage in finder.list([]):
+            prefix = getattr(storage, 'prefix', None) or ''
+            stat = os.stat(storage.path(path))
+            entries.append(f"{prefix}/{path}:{stat.st_size}:{stat.st_mtime_ns}")
+
+    digest = hashlib.sha256()
+    for entry in sorted(entries):
+        digest.update(entry.encode())
+    return digest.hexdigest(), len(entries)
+
+
+def read_static_manifest(static_root):
+    try:
+        return json.loads((Path(static_root) / STATIC_MANIFEST).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def write_static_manifest(static_root, fingerprint, total):
+    path = Path(static_root) / STATIC_MANIFEST
+    path.write_text(json.dumps({'fingerprint': fingerprint, 'files': total}))
+
+
+class Command(BaseCommand):
+    help = (
+        'Prepara a aplicação para subir em um único processo: migrações pendentes, '
+        'arquivos estáticos, superusuário e schema OpenAPI'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force-static',
+            action='store_true',
+            help='Executa o collectstatic mesmo que os arquivos não tenham mudado'
+        )
+        parser.add_argument(
+            '--skip-schema',
+            action='store_true',
+            help='Não gera o schema OpenAPI'
+        )
+
+    def handle(self, **options):
+        self.verbosity = options['verbosity']
+        timings = []
+        total_start = time.perf_counter()
+
+        steps = [
+            ('migrações', self.migrate),
+            ('estáticos', lambda: self.collect_static(options['force_static'])),
+            ('superusuário', self.ensure_superuser),
+        ]
+        # Nós sem documentação (DJANGO_NODE_ROLE=api) não servem o schema
+        if settings.ENABLE_DOCS and not options['skip_schema']:
+            steps.append(('schema', self.generate_schema))
+
+        for name, step in steps:
+            start = time.perf_counter()
+            message = step()
+            elapsed = time.perf_counter() - start
+            timings.append((name, elapsed))
+            self.stdout.write(f'{message} ({elapsed:.2f}s)')
+
+        total = time.perf_counter() - total_start
+        summary = ', '.join(f'{name} {elapsed:.2f}s' for name, elapsed in timings)
+        self.stdout.write(self.style.SUCCESS(f'✅ Bootstrap concluído em {total:.2f}s ({summary})'))
+
+    def migrate(self):
+        pending = pending_migrations()
+        if not pending:
+            return '✅ Nenhuma migração pendente.'
+
+        call_command('migrate', interactive=False, verbosity=self.verbosity)
+        return f'🔄 {len(pending)} migração(ões) aplicada(s).'
+
+    def collect_static(self, force=False):
+        if not settings.STATIC_ROOT:
+            return 'ℹ️ STATIC_ROOT não definido, pulando collectstatic.'
+
+        fingerprint, total = static_fingerprint()
+        if not force and read_static_manifest(settings.STATIC_ROOT).get('fingerprint') == fingerprint:
+            return f'✅ Arquivos estáticos já coletados ({total} arquivos), pulando collectstatic.'
+
+        call_command('collectstatic', interactive=False, verbosity=0)
+        write_static_manifest(settings.STATIC_ROOT, fingerprint, total)
+        return f'📦 {total} arquivos estáticos coletados.'
+
+    def ensure_superuser(self):
+        username = os.environ.get('DJANGO_SUPERUSER_USERNAME')
+        email = os.environ.get('DJANGO_SUPERUSER_EMAIL')
+        password = os.environ.get('DJANGO_SUPERUSER_PASSWORD')
+        if not (username and email and password):
+            return '⚠️ Variáveis de ambiente para superusuário não definidas.'
+
+        User = get_user_model()
+        if User.objects.filter(username=username).exists():
+            return f'ℹ️ Superusuário {username} já existe.'
+
+        User.objects.create_superuser(username=username, email=email, password=password)
+        return f'👤 Superusuário {username} criado com sucesso!'
+
+    def generate_schema(self):
+        # Reaproveita o comando (e sua mensagem), que só regera se o código mudou
+        output = StringIO()
+        call_command('generate_schema', stdout=output)
+        return output.getvalue().strip()
@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.schema import clear_schema_cache, code_version, generate_schema, read_schema, write_schema
+
+
+class Command(BaseCommand):
+    help = 'Gera o schema OpenAPI (JSON e YAML) e o grava em disco para ser servido em /docs/'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regera o schema mesmo que o salvo seja da versão atual do código'
+        )
+
+    def handle(self, **options):
+        version = code_version()
+
+        if not options['force'] and read_schema(version) is not None:
+            self.stdout.write(f'ℹ️ Schema já está atualizado (versão {version}).')
+            return
+
+        start = time.perf_counter()
+        documents = generate_schema()
+        write_schema(documents, version)
+        clear_schema_cache()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Schema gerado em {settings.OPENAPI_SCHEMA_DIR} '
+            f'(versão {version}, {time.perf_counter() - start:.2f}s)'
+        ))
@@ -0,0 +1,113 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+# Executado em um processo novo: carrega o Django como um worker do Gunicorn
+# (setup, middlewares e URLs) e informa o tempo total e a memória ao final
+BOOT_SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+import django
+django.setup()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+elapsed = time.perf_counter() - start
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({'boot': elapsed, 'rss_kb': rss, 'modules': len(sys.modules)}))
+"""
+
+
+def parse_importtime(output):
+    """
+    Interpreta a saída de `python -X importtime`.
+
+    Returns:
+        list[tuple[str, int, int]]: (módulo, tempo próprio em µs, tempo acumulado em µs)
+    """
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            self_us, cumulative_us, module = line[len('import time:'):].split('|', 2)
+            entries.append((module.strip(), int(self_us), int(cumulative_us)))
+        except ValueError:
+            continue
+    return entries
+
+
+def group_by_package(entries):
+    """
+    Soma o tempo próprio por pacote de topo (django, rest_framework, apps.tasks...).
+
+    Os apps do projeto (apps.*) são agrupados pelos dois primeiros níveis,
+    para que cada app apareça separado.
+
+    Returns:
+        list[tuple[str, int, int]]: (pacote, tempo próprio em µs, módulos), do mais caro ao mais barato
+    """
+    totals = defaultdict(lambda: [0, 0])
+    for module, self_us, _ in entries:
+        parts = module.split('.')
+        package = '.'.join(parts[:2]) if parts[0] == 'apps' else parts[0]
+        totals[package][0] += self_us
+        totals[package][1] += 1
+    return sorted(
+        ((package, total, count) for package, (total, count) in totals.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Mostra o custo de importação na inicialização por pacote/app '
+        '(python -X importtime), o tempo de boot e a memória de um worker'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--role',
+            choices=['full', 'api'],
+            help='Perfil do nó a medir (DJANGO_NODE_ROLE); padrão: o do ambiente atual'
+        )
+        parser.add_argument('--top', type=int, default=15, help='Quantidade de pacotes/módulos listados (padrão: 15)')
+
+    def handle(self, **options):
+        env = dict(os.environ)
+        if options['role']:
+            env['DJANGO_NODE_ROLE'] = options['role']
+
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT],
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            self.stderr.write(result.stderr[-2000:])
+            return
+
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        entries = parse_importtime(result.stderr)
+        top = options['top']
+        role = env.get('DJANGO_NODE_ROLE', 'full')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Perfil {role}: boot {stats['boot'] * 1000:.0f} ms, "
+            f"RSS {stats['rss_kb'] / 1024:.1f} MB, {stats['modules']} módulos carregados"
+        ))
+
+        self.stdout.write('\nTempo próprio de importação por pacote:')
+        for package, total, count in group_by_package(entries)[:top]:
+            self.stdout.write(f'  {package:<32} {total / 1000:8.1f} ms  ({count} módulos)')
+
+        self.stdout.write('\nMódulos mais caros (tempo acumulado):')
+        for module, _, cumulative in sorted(entries, key=lambda entry: entry[2], reverse=True)[:top]:
+            self.stdout.write(f'  {module:<48} {cumulative / 1000:8.1f} ms')
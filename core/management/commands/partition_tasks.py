@@ -0,0 +1,96 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.tasks.services import partition_service
+
+
+class Command(BaseCommand):
+    help = (
+        'Converte a tabela de tarefas em uma tabela particionada do PostgreSQL '
+        '(hash por usuário ou range por mês de criação), sem parar a aplicação'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'step',
+            choices=['prepare', 'backfill', 'swap', 'all', 'extend', 'drop-old'],
+            help=(
+                'prepare: cria a tabela particionada e o trigger; backfill: copia as linhas em lotes; '
+                'swap: troca as tabelas; all: as três etapas; extend: cria os próximos meses (range); '
+                'drop-old: remove a tabela antiga'
+            )
+        )
+        parser.add_argument(
+            '--strategy',
+            choices=partition_service.STRATEGIES,
+            default=settings.TASKS_PARTITIONING or 'hash',
+            help='Estratégia de particionamento (padrão: TASKS_PARTITIONING ou hash)'
+        )
+        parser.add_argument('--partitions', type=int, default=16, help='Partições da estratégia hash (padrão: 16)')
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Meses futuros criados pela estratégia range (padrão: 3)'
+        )
+        parser.add_argument('--batch-size', type=int, default=10000, help='Ids por lote do backfill (padrão: 10000)')
+        parser.add_argument('--start-id', type=int, default=0, help='Retoma o backfill após este id (padrão: 0)')
+        parser.add_argument('--pause', type=float, default=0, help='Segundos de espera entre lotes (padrão: 0)')
+
+    def handle(self, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('O particionamento só é suportado no PostgreSQL')
+
+        step = options['step']
+        strategy = options['strategy']
+        if step in ('prepare', 'all') and strategy != settings.TASKS_PARTITIONING:
+            self.stdout.write(self.style.WARNING(
+                f'TASKS_PARTITIONING={settings.TASKS_PARTITIONING!r}: defina TASKS_PARTITIONING={strategy} '
+                'antes do swap para que as escritas filtrem pela chave de partição'
+            ))
+
+        steps = ['prepare', 'backfill', 'swap'] if step == 'all' else [step]
+        try:
+            for name in steps:
+                start = time.perf_counter()
+                message = getattr(self, f"run_{name.replace('-', '_')}")(options)
+                self.stdout.write(f'  {name:<10} {message} ({time.perf_counter() - start:.2f}s)')
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS('Particionamento concluído'))
+
+    def run_prepare(self, options):
+        total = partition_service.prepare(
+            options['strategy'],
+            partitions=options['partitions'],
+            months_ahead=options['months_ahead'],
+        )
+        return f'{total} comando(s) executado(s) ({options["strategy"]})'
+
+    def run_backfill(self, options):
+        def progress(last_id, copied):
+            self.stdout.write(f'    até o id {last_id}: {copied} linha(s) copiada(s)')
+
+        copied = partition_service.backfill(
+            batch_size=options['batch_size'],
+            start_id=options['start_id'],
+            pause=options['pause'],
+            progress=progress,
+        )
+        return f'{copied} linha(s) copiada(s)'
+
+    def run_swap(self, options):
+        total = partition_service.swap()
+        return f'{total} linha(s); tabela antiga mantida como {partition_service.OLD_TABLE}'
+
+    def run_extend(self, options):
+        total = partition_service.extend(months_ahead=options['months_ahead'])
+        return f'{total} partição(ões) mensal(is) garantida(s)'
+
+    def run_drop_old(self, options):
+        partition_service.drop_old()
+        return f'{partition_service.OLD_TABLE} removida'
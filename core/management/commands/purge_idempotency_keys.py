@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.tasks.services.idempotency_service import purge_expired
+
+
+class Command(BaseCommand):
+    help = 'Apaga da tabela as chaves de idempotência expiradas (no cache, elas expiram sozinhas)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=int,
+            help='Se informado, repete a limpeza a cada N segundos em vez de executar uma vez'
+        )
+
+    def handle(self, **options):
+        while True:
+            start = time.perf_counter()
+            purged = purge_expired()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(self.style.SUCCESS(
+                f'{purged} chave(s) de idempotência expirada(s) apagada(s) em {elapsed:.2f}s'
+            ))
+
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.tasks.services.sync_service import purge_tombstones
+
+
+class Command(BaseCommand):
+    help = 'Apaga os registros de remoção mais antigos que a validade dos tokens de sincronização'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Dias de retenção (padrão: settings.SYNC_TOMBSTONE_DAYS)'
+        )
+        parser.add_argument(
+            '--interval',
+            type=int,
+            help='Se informado, repete a limpeza a cada N segundos em vez de executar uma vez'
+        )
+
+    def handle(self, **options):
+        while True:
+            start = time.perf_counter()
+            purged = purge_tombstones(days=options['days'])
+            elapsed = time.perf_counter() - start
+            self.stdout.write(self.style.SUCCESS(
+                f'{purged} registro(s) de remoção expirado(s) apagado(s) em {elapsed:.2f}s'
+            ))
+
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
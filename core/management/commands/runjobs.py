@@ -0,0 +1,45 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = 'Inicia o worker que executa os jobs em segundo plano gravados no banco'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--queue',
+            action='append',
+            dest='queues',
+            help='Fila a consumir (pode ser repetido). Padrão: todas as filas de settings.JOBS'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Número máximo de jobs executando ao mesmo tempo neste processo'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Executa os jobs prontos e encerra, em vez de ficar aguardando novos jobs'
+        )
+
+    def handle(self, **options):
+        worker = Worker(queues=options['queues'], concurrency=options['concurrency'])
+
+        if options['once']:
+            processed = worker.run_once()
+            self.stdout.write(self.style.SUCCESS(f'{processed} job(s) processado(s).'))
+            return
+
+        # Encerra de forma graciosa: termina os jobs em andamento antes de sair
+        signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+        signal.signal(signal.SIGINT, lambda *_: worker.stop())
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Worker {worker.name} consumindo as filas: {", ".join(worker.queues)}'
+        ))
+        worker.run()
+        self.stdout.write('Worker encerrado.')
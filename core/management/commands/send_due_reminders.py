@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.tasks.services.reminder_service import schedule_due_reminders
+
+
+class Command(BaseCommand):
+    help = 'Enfileira lembretes para tarefas não concluídas com prazo nos próximos dias'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=3, help='Janela de prazo em dias (padrão: 3)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Tarefas lidas por lote (padrão: 1000)')
+        parser.add_argument(
+            '--interval',
+            type=int,
+            help='Se informado, repete a varredura a cada N segundos em vez de executar uma vez'
+        )
+
+    def handle(self, **options):
+        while True:
+            start = time.perf_counter()
+            processed, enqueued = schedule_due_reminders(
+                days=options['days'],
+                batch_size=options['batch_size'],
+            )
+            elapsed = time.perf_counter() - start
+            self.stdout.write(self.style.SUCCESS(
+                f'{processed} tarefa(s) processada(s), {enqueued} lembrete(s) enfileirado(s) em {elapsed:.2f}s'
+            ))
+
+            if not options['interval']:
+                return
+            time.sleep(options['interval'])
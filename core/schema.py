@@ -0,0 +1,163 @@
+"""
+Schema OpenAPI pré-gerado e servido a partir de cache.
+
+Gerar o schema percorre todas as views e serializers, o que é caro. Aqui ele
+é gerado uma vez por versão do código (pelo comando generate_schema ou na
+primeira requisição), gravado em disco e mantido em memória com um ETag
+baseado no hash do conteúdo.
+"""
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.translation import gettext_lazy as _
+from drf_yasg import openapi
+from drf_yasg.app_settings import swagger_settings
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+
+API_INFO = openapi.Info(
+    title=_("task_collab_api API"),
+    default_version='v1',
+    description=_("API para gerenciamento de tarefas colaborativas"),
+)
+
+# formato -> (arquivo, content type)
+SCHEMA_FORMATS = {
+    'openapi': ('openapi.json', 'application/openapi+json'),
+    'json': ('openapi.json', 'application/json'),
+    'yaml': ('openapi.yaml', 'application/yaml'),
+}
+
+META_FILE = 'openapi.meta.json'
+
+_lock = threading.Lock()
+_documents = {}
+
+
+@lru_cache(maxsize=1)
+def code_version():
+    """
+    Versão do código usada para invalidar o schema salvo.
+
+    Usa CODE_VERSION (ex: hash do commit no deploy); sem ela, calcula um hash
+    dos arquivos .py do projeto (caminho, tamanho e data de modificação).
+    """
+    if settings.CODE_VERSION:
+        return settings.CODE_VERSION
+
+    digest = hashlib.sha256()
+    for folder in ('apps', 'common', 'core'):
+        for path in sorted(Path(settings.BASE_DIR, folder).rglob('*.py')):
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:16]
+
+
+def generate_schema():
+    """
+    Gera o schema completo (JSON e YAML) a partir das rotas atuais.
+
+    Returns:
+        dict: {nome do arquivo: conteúdo em bytes}
+    """
+    generator = swagger_settings.DEFAULT_GENERATOR_CLASS(API_INFO, version='')
+    schema = generator.get_schema(request=None, public=True)
+    return {
+        'openapi.json': OpenAPICodecJson([]).encode(schema),
+        'openapi.yaml': OpenAPICodecYaml([]).encode(schema),
+    }
+
+
+def write_schema(documents, version, directory=None):
+    """Grava os documentos e a versão do código no diretório do schema."""
+    directory = Path(directory or settings.OPENAPI_SCHEMA_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for filename, content in documents.items():
+        # Grava em arquivo temporário e renomeia para que leitores nunca vejam
+        # um arquivo pela metade
+        tmp = directory / f"{filename}.tmp"
+        tmp.write_bytes(content)
+        os.replace(tmp, directory / filename)
+
+    (directory / META_FILE).write_text(json.dumps({'version': version}))
+
+
+def read_schema(version, directory=None):
+    """
+    Lê os documentos salvos, se forem da versão informada.
+
+    Returns:
+        dict | None: {nome do arquivo: conteúdo} ou None se ausente/desatualizado
+    """
+    directory = Path(directory or settings.OPENAPI_SCHEMA_DIR)
+    try:
+        meta = json.loads((directory / META_FILE).read_text())
+        if meta.get('version') != version:
+            return None
+        return {
+            filename: (directory / filename).read_bytes()
+            for filename in ('openapi.json', 'openapi.yaml')
+        }
+    except (OSError, ValueError):
+        return None
+
+
+def get_schema_document(filename):
+    """
+    Retorna (conteúdo, etag) de um documento do schema, gerando-o no máximo
+    uma vez por processo e versão do código.
+    """
+    version = code_version()
+    cached = _documents.get(version)
+
+    if cached is None:
+        with _lock:
+            cached = _documents.get(version)
+            if cached is None:
+                documents = read_schema(version)
+                if documents is None:
+                    documents = generate_schema()
+                    try:
+                        write_schema(documents, version)
+                    except OSError:
+                        # Sem permissão de escrita: o cache em memória já resolve
+                        pass
+                cached = {
+                    name: (content, f'"{hashlib.sha256(content).hexdigest()[:32]}"')
+                    for name, content in documents.items()
+                }
+                _documents.clear()
+                _documents[version] = cached
+
+    return cached[filename]
+
+
+def clear_schema_cache():
+    """Descarta o schema mantido em memória (usado após regenerar)."""
+    _documents.clear()
+
+
+def schema_response(request, fmt):
+    """Resposta HTTP com o schema no formato pedido, respeitando If-None-Match."""
+    filename, content_type = SCHEMA_FORMATS[fmt]
+    content, etag = get_schema_document(filename)
+
+    # Comparação fraca: o middleware de compressão transforma o ETag em W/"..."
+    client_etags = [
+        tag.strip().removeprefix('W/')
+        for tag in request.headers.get('If-None-Match', '').split(',')
+    ]
+    if etag in client_etags:
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type=content_type)
+    response['ETag'] = etag
+    # O navegador pode guardar, mas deve revalidar (barato: 304 pelo ETag)
+    response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+    return response
@@ -2,6 +2,7 @@
 Base settings for task_collab_api project.
 """
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -16,19 +17,27 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv('DJANGO_SECRET_KEY', 'django-insecure-change-this-in-production')
 
+# Perfil do nó: 'full' (padrão) ou 'api'. Nós 'api' não carregam o admin,
+# a documentação nem a API navegável (e os apps de sessão/mensagens usados
+# só por eles), o que reduz o tempo de boot e a memória de cada worker.
+# Cada parte pode ser ligada/desligada individualmente pelas variáveis abaixo.
+NODE_ROLE = os.getenv('DJANGO_NODE_ROLE', 'full')
+ENABLE_ADMIN = os.getenv('DJANGO_ENABLE_ADMIN', str(NODE_ROLE != 'api')) == 'True'
+ENABLE_DOCS = os.getenv('DJANGO_ENABLE_DOCS', str(NODE_ROLE != 'api')) == 'True'
+ENABLE_BROWSABLE_API = os.getenv('DJANGO_ENABLE_BROWSABLE_API', str(NODE_ROLE != 'api')) == 'True'
+
 # Application definition
 INSTALLED_APPS = [
-    'jazzmin',
-    'django.contrib.admin',
+    *(['jazzmin', 'django.contrib.admin'] if ENABLE_ADMIN else []),
     'django.contrib.auth',
     'django.contrib.contenttypes',
-    'django.contrib.sessions',
-    'django.contrib.messages',
+    *(['django.contrib.sessions', 'django.contrib.messages'] if ENABLE_ADMIN else []),
     'django.contrib.staticfiles',
     'rest_framework',
     'rest_framework_simplejwt',
-    'drf_yasg',
+    *(['drf_yasg'] if ENABLE_DOCS else []),
     'apps.tasks',
+    'apps.jobs',
     'corsheaders',
     'core'
 ]
@@ -85,16 +94,44 @@ JAZZMIN_UI_TWEAKS = {
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'common.middleware.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
+    # Executa BROWSER_MIDDLEWARE apenas fora de API_PATH_PREFIXES
+    'common.middleware.routing.PathRoutedMiddleware',
+]
+
+# Rotas da API: autenticadas por JWT, sem sessão, CSRF, mensagens nem X-Frame-Options
+API_PATH_PREFIXES = ['/api/']
+
+# Pilha completa das páginas do navegador (admin, docs, API navegável)
+BROWSER_MIDDLEWARE = [
+    *([
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+    ] if ENABLE_ADMIN else []),
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'corsheaders.middleware.CorsMiddleware'
 ]
 
+# O admin exige sessão, autenticação e mensagens em MIDDLEWARE; aqui eles
+# estão em BROWSER_MIDDLEWARE, que cobre todas as rotas do admin. Só com o
+# admin ativo as verificações do Django são trocadas pela de
+# common.middleware.routing, que procura os middlewares nas duas listas
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410'] if ENABLE_ADMIN else []
+
+# Compressão das respostas (common.middleware.compression)
+API_COMPRESSION = {
+    'MIN_SIZE': int(os.getenv('API_COMPRESSION_MIN_SIZE', 1024)),
+    'ENCODINGS': ['zstd', 'br', 'gzip'],
+    'LEVELS': {
+        'zstd': int(os.getenv('API_COMPRESSION_ZSTD_LEVEL', 3)),
+        'br': int(os.getenv('API_COMPRESSION_BR_LEVEL', 4)),
+        'gzip': int(os.getenv('API_COMPRESSION_GZIP_LEVEL', 6)),
+    },
+}
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
@@ -131,11 +168,67 @@ DATABASES = {
     }
 }
 
+# Réplicas de leitura (aliases de DATABASES); definidas em production.py/development.py
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['common.routers.replica_router.ReplicaRouter']
+# Segundos em que um usuário que acabou de escrever continua lendo do principal
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
+# Particionamento da tabela de tarefas no PostgreSQL (comando partition_tasks):
+# '' (sem partições), 'hash' (por usuario_id) ou 'range' (por mês de criado_em)
+TASKS_PARTITIONING = os.getenv('TASKS_PARTITIONING', '')
+
+# Sincronização incremental (GET /tasks/changes/): atraso das alterações
+# entregues, em segundos, e dias de retenção das remoções (validade do token)
+SYNC_LAG_SECONDS = int(os.getenv('SYNC_LAG_SECONDS', 2))
+SYNC_TOMBSTONE_DAYS = int(os.getenv('SYNC_TOMBSTONE_DAYS', 30))
+
+# Listas compartilhadas: segundos em cache dos papéis de cada usuário nas listas
+# (invalidados a cada alteração de membros; use um cache compartilhado com vários processos)
+TASK_LISTS_CACHE_SECONDS = int(os.getenv('TASK_LISTS_CACHE_SECONDS', 300))
+
+# Contagens de etiquetas por usuário (GET /tasks/tags/): segundos em cache
+TASK_TAGS_CACHE_SECONDS = int(os.getenv('TASK_TAGS_CACHE_SECONDS', 300))
+
+# Histórico de alterações das tarefas (GET /tasks/{id}/historico/): gravado com
+# um INSERT em lote depois do commit de cada escrita
+TASK_HISTORY_ENABLED = os.getenv('TASK_HISTORY_ENABLED', 'True') == 'True'
+
+# POSTs com o cabeçalho Idempotency-Key: segundos em que a resposta é repetida
+# para a mesma chave e segundos depois dos quais uma execução em andamento é
+# considerada abandonada (processo que morreu) e a chave é liberada
+IDEMPOTENCY_KEY_TTL_SECONDS = int(os.getenv('IDEMPOTENCY_KEY_TTL_SECONDS', 86400))
+IDEMPOTENCY_LOCK_SECONDS = int(os.getenv('IDEMPOTENCY_LOCK_SECONDS', 30))
+
+# Eventos em tempo real (SSE, servido pelo core.asgi): backend local (um processo),
+# postgres (LISTEN/NOTIFY) ou redis (pub/sub) para vários processos/nós
+EVENTS_BACKEND = os.getenv('EVENTS_BACKEND', 'local')
+EVENTS_CHANNEL = os.getenv('EVENTS_CHANNEL', 'task_events')
+EVENTS_REDIS_URL = os.getenv('EVENTS_REDIS_URL', 'redis://localhost:6379/0')
+EVENTS_PATH = '/api/v1/tasks/events/'
+EVENTS_HEARTBEAT_SECONDS = int(os.getenv('EVENTS_HEARTBEAT_SECONDS', 15))
+# Eventos pendentes por conexão antes de desconectar um cliente lento
+EVENTS_QUEUE_SIZE = int(os.getenv('EVENTS_QUEUE_SIZE', 100))
+# Eventos recentes guardados por processo para a retomada com Last-Event-ID
+EVENTS_HISTORY = int(os.getenv('EVENTS_HISTORY', 10000))
+
+# JSON rápido (orjson) para respostas e requisições; desative com API_FAST_JSON=False
+API_FAST_JSON = os.getenv('API_FAST_JSON', 'True') == 'True' and find_spec('orjson') is not None
+
 # Rest Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'common.renderers.ORJSONRenderer' if API_FAST_JSON else 'rest_framework.renderers.JSONRenderer',
+        *(['rest_framework.renderers.BrowsableAPIRenderer'] if ENABLE_BROWSABLE_API else []),
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'common.parsers.ORJSONParser' if API_FAST_JSON else 'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
@@ -147,8 +240,14 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 }
 
+# Versão do código (ex: hash do commit); o schema OpenAPI salvo é regerado quando ela muda
+CODE_VERSION = os.getenv('CODE_VERSION') or os.getenv('RENDER_GIT_COMMIT', '')
+
+# Onde o schema OpenAPI pré-gerado é gravado (python manage.py generate_schema)
+OPENAPI_SCHEMA_DIR = BASE_DIR / 'var' / 'openapi'
+
 STATIC_URL = 'static/'
-STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+STATIC_ROOT = os.getenv('STATIC_ROOT') or os.path.join(BASE_DIR, 'staticfiles')
 
 LANGUAGE_CODE = 'pt-br'
 TIME_ZONE = 'America/Sao_Paulo'
@@ -168,4 +267,24 @@ EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
 EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
 EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
-EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
\ No newline at end of file
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER or 'webmaster@localhost')
+
+# Jobs em segundo plano (apps.jobs), executados por: python manage.py runjobs
+JOBS = {
+    # Executa os jobs no momento do enfileiramento, sem worker (útil em testes)
+    'IMMEDIATE': os.getenv('JOBS_IMMEDIATE', 'False') == 'True',
+    'POLL_INTERVAL': float(os.getenv('JOBS_POLL_INTERVAL', 1.0)),
+    # Jobs executando há mais tempo que isso (segundos) voltam para a fila,
+    # verificado por cada worker a cada REQUEUE_INTERVAL segundos
+    'STALE_AFTER': 600,
+    'REQUEUE_INTERVAL': 60,
+    'BACKOFF_BASE': 5,
+    'BACKOFF_MAX': 3600,
+    # Limite de jobs simultâneos por fila, somando todos os workers
+    'QUEUES': {
+        'default': {'concurrency': 4},
+        'emails': {'concurrency': 2},
+        'exports': {'concurrency': 1},
+    },
+}
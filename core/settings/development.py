@@ -1,8 +1,25 @@
 from .base import *  # noqa: F403
+import os
 
 DEBUG = True
 
 DB = DATABASES["default"]  # noqa: F405
+# Os testes usam um arquivo SQLite, não o banco em memória compartilhado (que
+# falha com "database table is locked" em escritas de várias threads): com o
+# timeout e as transações IMMEDIATE, as escritas concorrentes esperam a vez
+DB["TEST"] = {"NAME": "test_database.db"}
+DB["OPTIONS"] = {"timeout": 30, "transaction_mode": "IMMEDIATE"}
+
+# Réplica local para testar o roteamento de leituras: outro arquivo SQLite
+# (copie o database.db para simular o atraso da replicação). Ative com
+# DB_LOCAL_REPLICA=True; nos testes ela espelha o banco padrão.
+DATABASES["replica"] = {  # noqa: F405
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': 'database_replica.db',
+    'TEST': {'MIRROR': 'default'},
+}
+if os.getenv('DB_LOCAL_REPLICA', 'False') == 'True':
+    DATABASE_REPLICAS = ['replica']
 
 # Email - Override to use console backend in development
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
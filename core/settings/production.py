@@ -6,6 +6,12 @@ DEBUG = False
 
 DATABASES["default"] = DATABASES["production"]
 
+# Réplicas de leitura: hosts separados por vírgula, com as credenciais do principal
+for index, host in enumerate(filter(None, os.getenv('DB_REPLICA_HOSTS', '').split(',')), start=1):
+    alias = f"replica_{index}"
+    DATABASES[alias] = {**DATABASES["production"], 'HOST': host.strip(), 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)  # noqa: F405
+
 # Security settings
 SECURE_SSL_REDIRECT = True
 SESSION_COOKIE_SECURE = True
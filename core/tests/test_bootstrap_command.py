@@ -0,0 +1,68 @@
+import pytest
+from io import StringIO
+from unittest import mock
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from core.management.commands import bootstrap
+
+
+@pytest.fixture
+def static_root(settings, tmp_path):
+    """Fixture que direciona o collectstatic para um diretório temporário."""
+    settings.STATIC_ROOT = str(tmp_path / 'static')
+    return tmp_path / 'static'
+
+
+def run_bootstrap(*args):
+    out = StringIO()
+    call_command('bootstrap', '--skip-schema', *args, stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+def test_bootstrap_skips_migrate_when_nothing_is_pending(static_root):
+    """Testa se o migrate não é executado quando não há migrações pendentes."""
+    # Arrange
+    with mock.patch.object(bootstrap, 'call_command', wraps=call_command) as command:
+        # Act
+        output = run_bootstrap()
+
+    # Assert
+    assert bootstrap.pending_migrations() == []
+    assert 'Nenhuma migração pendente' in output
+    assert 'migrate' not in [call.args[0] for call in command.call_args_list]
+    assert 'Bootstrap concluído' in output
+
+
+@pytest.mark.django_db
+def test_bootstrap_collects_static_only_when_files_change(static_root):
+    """Testa se o collectstatic roda na primeira vez e é pulado enquanto o manifesto bater."""
+    # Act
+    first = run_bootstrap()
+    second = run_bootstrap()
+    with mock.patch.object(bootstrap, 'static_fingerprint', return_value=('outro', 1)):
+        third = run_bootstrap()
+
+    # Assert
+    assert 'arquivos estáticos coletados' in first
+    assert (static_root / 'admin' / 'css' / 'base.css').exists()
+    assert 'pulando collectstatic' in second
+    assert 'arquivos estáticos coletados' in third
+
+
+@pytest.mark.django_db
+def test_bootstrap_creates_superuser_once(static_root, monkeypatch):
+    """Testa se o superusuário é criado a partir das variáveis de ambiente apenas uma vez."""
+    # Arrange
+    monkeypatch.setenv('DJANGO_SUPERUSER_USERNAME', 'admin')
+    monkeypatch.setenv('DJANGO_SUPERUSER_EMAIL', 'admin@example.com')
+    monkeypatch.setenv('DJANGO_SUPERUSER_PASSWORD', 'senha-forte-123')
+
+    # Act
+    first = run_bootstrap()
+    second = run_bootstrap()
+
+    # Assert
+    assert 'criado com sucesso' in first
+    assert 'já existe' in second
+    assert User.objects.get(username='admin').is_superuser
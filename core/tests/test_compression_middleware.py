@@ -0,0 +1,170 @@
+import gzip
+import pytest
+import brotli
+import zstandard
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from common.middleware.compression import CompressionMiddleware, choose_encoding, compression_exempt
+
+BODY = b'{"titulo":"Tarefa","descricao":"' + b'texto repetido ' * 200 + b'"}'
+
+
+@pytest.fixture
+def rf():
+    """Fixture para criar requisições de teste."""
+    return RequestFactory()
+
+
+def run_middleware(request, response, view=None):
+    """Executa o middleware como o Django faria (process_view e depois a resposta)."""
+    middleware = CompressionMiddleware(lambda req: response)
+    if view is not None:
+        middleware.process_view(request, view, (), {})
+    return middleware(request)
+
+
+@pytest.mark.parametrize('header, expected', [
+    ('gzip', 'gzip'),
+    ('gzip, br', 'br'),
+    ('gzip, br, zstd', 'zstd'),
+    ('br;q=0.5, gzip;q=0.9', 'gzip'),
+    ('zstd;q=0, br;q=0, gzip', 'gzip'),
+    ('*', 'zstd'),
+    ('identity', None),
+    ('', None),
+])
+def test_choose_encoding_respects_q_values_and_preference(header, expected):
+    """Testa a negociação pelo Accept-Encoding (q do cliente, depois a preferência do servidor)."""
+    # Act & Assert
+    assert choose_encoding(header, ['zstd', 'br', 'gzip']) == expected
+
+
+@pytest.mark.parametrize('encoding, decompress', [
+    ('gzip', gzip.decompress),
+    ('br', brotli.decompress),
+    ('zstd', lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data)),
+])
+def test_middleware_compresses_large_json_response(rf, encoding, decompress):
+    """Testa se respostas JSON grandes são comprimidas com a codificação negociada."""
+    # Arrange
+    request = rf.get('/api/v1/tasks/', HTTP_ACCEPT_ENCODING=encoding)
+    response = HttpResponse(BODY, content_type='application/json')
+    response['ETag'] = '"abc"'
+
+    # Act
+    response = run_middleware(request, response)
+
+    # Assert
+    assert response['Content-Encoding'] == encoding
+    assert int(response['Content-Length']) == len(response.content) < len(BODY)
+    assert decompress(response.content) == BODY
+    assert 'Accept-Encoding' in response['Vary']
+    assert response['ETag'] == 'W/"abc"'
+
+
+def test_middleware_skips_small_responses(rf, settings):
+    """Testa se respostas abaixo do tamanho mínimo não são comprimidas."""
+    # Arrange
+    settings.API_COMPRESSION = {**settings.API_COMPRESSION, 'MIN_SIZE': 10_000}
+    request = rf.get('/', HTTP_ACCEPT_ENCODING='gzip')
+
+    # Act
+    response = run_middleware(request, HttpResponse(BODY, content_type='application/json'))
+
+    # Assert
+    assert not response.has_header('Content-Encoding')
+    assert response.content == BODY
+
+
+def test_middleware_skips_non_text_content(rf):
+    """Testa se conteúdos não textuais (ex: imagens) não são comprimidos."""
+    # Arrange
+    request = rf.get('/', HTTP_ACCEPT_ENCODING='gzip')
+
+    # Act
+    response = run_middleware(request, HttpResponse(BODY, content_type='image/png'))
+
+    # Assert
+    assert not response.has_header('Content-Encoding')
+
+
+def test_middleware_respects_exempt_views(rf):
+    """Testa se views marcadas com compression_exempt não são comprimidas (BREACH)."""
+    # Arrange
+    request = rf.get('/', HTTP_ACCEPT_ENCODING='gzip')
+    view = compression_exempt(lambda req: None)
+
+    # Act
+    response = run_middleware(request, HttpResponse(BODY, content_type='application/json'), view)
+
+    # Assert
+    assert not response.has_header('Content-Encoding')
+
+
+def test_middleware_skips_browser_html_by_default(rf):
+    """Testa se páginas HTML fora da API (com token CSRF) não são comprimidas (BREACH)."""
+    # Arrange
+    request = rf.get('/admin/', HTTP_ACCEPT_ENCODING='gzip')
+
+    # Act
+    response = run_middleware(request, HttpResponse(BODY, content_type='text/html; charset=utf-8'))
+
+    # Assert
+    assert not response.has_header('Content-Encoding')
+    assert response.content == BODY
+
+
+def test_middleware_compresses_browser_html_when_enabled(rf, settings):
+    """Testa se COMPRESS_HTML reativa a compressão das páginas HTML."""
+    # Arrange
+    settings.API_COMPRESSION = {**settings.API_COMPRESSION, 'COMPRESS_HTML': True}
+    request = rf.get('/admin/', HTTP_ACCEPT_ENCODING='gzip')
+
+    # Act
+    response = run_middleware(request, HttpResponse(BODY, content_type='text/html; charset=utf-8'))
+
+    # Assert
+    assert response['Content-Encoding'] == 'gzip'
+
+
+def test_middleware_compresses_streaming_incrementally(rf):
+    """Testa se respostas em streaming são comprimidas pedaço a pedaço."""
+    # Arrange
+    request = rf.get('/', HTTP_ACCEPT_ENCODING='gzip')
+    consumed = []
+
+    def chunks():
+        for i in range(3):
+            consumed.append(i)
+            yield f'linha {i},'.encode() * 100
+
+    response = StreamingHttpResponse(chunks(), content_type='text/csv')
+
+    # Act
+    response = run_middleware(request, response)
+    iterator = iter(response.streaming_content)
+    first = next(iterator)
+
+    # Assert
+    assert consumed == [0]
+    assert first
+    body = first + b''.join(iterator)
+    assert gzip.decompress(body) == b''.join(f'linha {i},'.encode() * 100 for i in range(3))
+    assert not response.has_header('Content-Length')
+
+
+@pytest.mark.django_db
+def test_export_endpoint_is_streamed_compressed(client, django_user_model):
+    """Testa se a exportação CSV chega comprimida ao cliente."""
+    # Arrange
+    from rest_framework.test import APIClient
+    user = django_user_model.objects.create_user(username='u', password='p')
+    api_client = APIClient()
+    api_client.force_authenticate(user=user)
+
+    # Act
+    response = api_client.get('/api/v1/tasks/export/', HTTP_ACCEPT_ENCODING='gzip')
+
+    # Assert
+    assert response['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(b''.join(response.streaming_content)).startswith(b'id,titulo')
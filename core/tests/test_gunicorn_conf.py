@@ -0,0 +1,90 @@
+import importlib
+import pytest
+from unittest import mock
+from core import gunicorn_conf
+
+
+@pytest.fixture
+def load_conf(monkeypatch):
+    """Fixture que recarrega o módulo de configuração com variáveis de ambiente."""
+    def load(**env):
+        for name in ('WEB_CONCURRENCY', 'GUNICORN_WORKER_CLASS', 'GUNICORN_THREADS', 'PORT'):
+            monkeypatch.delenv(name, raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        return importlib.reload(gunicorn_conf)
+
+    yield load
+    monkeypatch.undo()
+    importlib.reload(gunicorn_conf)
+
+
+@pytest.mark.parametrize('cpus, limit, expected', [
+    (1, 8, 3),
+    (2, 8, 5),
+    (8, 8, 8),
+    (1, 1, 2),
+])
+def test_default_workers_scales_with_cpus(cpus, limit, expected):
+    """Testa se o número de processos é 2 * CPUs + 1, com limite e mínimo de 2."""
+    # Act & Assert
+    assert gunicorn_conf.default_workers(cpus, limit) == expected
+
+
+def test_defaults_use_gthread_with_preload(load_conf):
+    """Testa a configuração padrão: gthread, app WSGI e preload ativado."""
+    # Act
+    conf = load_conf(PORT='9000')
+
+    # Assert
+    assert conf.worker_class == 'gthread'
+    assert conf.wsgi_app == 'core.wsgi:application'
+    assert conf.threads == 4
+    assert conf.preload_app is True
+    assert conf.bind == '0.0.0.0:9000'
+    assert conf.max_requests > 0 and conf.max_requests_jitter > 0
+
+
+def test_uvicorn_worker_uses_asgi_application(load_conf):
+    """Testa se o worker uvicorn serve a aplicação ASGI, sem threads."""
+    # Arrange
+    with mock.patch('importlib.util.find_spec', return_value=object()):
+        # Act
+        conf = load_conf(GUNICORN_WORKER_CLASS='uvicorn', WEB_CONCURRENCY='3')
+
+    # Assert
+    assert conf.worker_class == 'uvicorn_worker.UvicornWorker'
+    assert conf.wsgi_app == 'core.asgi:application'
+    assert conf.workers == 3
+    assert conf.threads == 1
+
+
+def test_uvicorn_falls_back_to_gthread_when_not_installed():
+    """Testa se, sem o pacote uvicorn-worker, o servidor sobe com gthread."""
+    # Arrange
+    with mock.patch.object(gunicorn_conf, 'find_spec', return_value=None):
+        # Act
+        name, worker_class, app = gunicorn_conf.select_worker_class('uvicorn')
+
+    # Assert
+    assert (name, worker_class, app) == ('gthread', 'gthread', 'core.wsgi:application')
+
+
+def test_invalid_worker_class_raises():
+    """Testa se uma classe de worker desconhecida gera erro claro."""
+    # Act & Assert
+    with pytest.raises(ValueError):
+        gunicorn_conf.select_worker_class('eventlet')
+
+
+def test_pre_fork_freezes_gc_and_closes_connections():
+    """Testa se o pre_fork fecha as conexões herdáveis e congela o GC."""
+    # Arrange
+    with mock.patch('django.db.connections.close_all') as close_all, \
+            mock.patch.object(gunicorn_conf.gc, 'freeze') as freeze:
+        # Act
+        gunicorn_conf.pre_fork(server=None, worker=None)
+
+    # Assert
+    close_all.assert_called_once()
+    freeze.assert_called_once()
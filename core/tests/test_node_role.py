@@ -0,0 +1,97 @@
+import json
+import os
+import subprocess
+import sys
+from django.conf import settings
+from core.management.commands.importtime import group_by_package, parse_importtime
+
+# Sobe o Django em um processo novo (as settings são lidas uma única vez) e
+# informa quais módulos foram carregados e como as rotas responderam
+CHECK_SCRIPT = """
+import json, sys
+import django
+django.setup()
+from django.conf import settings
+from django.test import Client
+client = Client(HTTP_HOST='localhost')
+print(json.dumps({
+    'apps': settings.INSTALLED_APPS,
+    'middleware': settings.MIDDLEWARE + settings.BROWSER_MIDDLEWARE,
+    'renderers': settings.REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'],
+    'loaded': [m for m in ('jazzmin', 'drf_yasg') if m in sys.modules],
+    'tasks': client.get('/api/v1/tasks/').status_code,
+    'docs': client.get('/docs/openapi.json').status_code,
+    'admin': client.get('/admin/').status_code,
+}))
+"""
+
+
+def boot(**env):
+    result = subprocess.run(
+        [sys.executable, '-c', CHECK_SCRIPT],
+        env={**os.environ, 'DJANGO_SETTINGS_MODULE': 'core.settings.development', **env},
+        cwd=settings.BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_api_role_leaves_admin_and_docs_out():
+    """Testa se o perfil 'api' não carrega admin, documentação nem API navegável."""
+    # Act
+    state = boot(DJANGO_NODE_ROLE='api')
+
+    # Assert
+    assert 'jazzmin' not in state['apps']
+    assert 'django.contrib.admin' not in state['apps']
+    assert 'django.contrib.sessions' not in state['apps']
+    assert 'drf_yasg' not in state['apps']
+    assert not any('sessions' in name or 'messages' in name for name in state['middleware'])
+    assert state['renderers'] == ['common.renderers.ORJSONRenderer']
+    assert state['loaded'] == []
+    assert state['tasks'] == 401
+    assert state['docs'] == 404
+    assert state['admin'] == 404
+
+
+def test_flags_override_node_role():
+    """Testa se as variáveis individuais têm prioridade sobre o perfil do nó."""
+    # Act
+    state = boot(DJANGO_NODE_ROLE='api', DJANGO_ENABLE_DOCS='True')
+
+    # Assert
+    assert 'drf_yasg' in state['apps']
+    assert 'django.contrib.admin' not in state['apps']
+    assert state['docs'] == 200
+
+
+def test_full_role_is_the_default():
+    """Testa se, sem configuração, o nó serve admin e documentação."""
+    # Assert
+    assert settings.NODE_ROLE == 'full'
+    assert settings.ENABLE_ADMIN and settings.ENABLE_DOCS and settings.ENABLE_BROWSABLE_API
+    assert 'django.contrib.admin' in settings.INSTALLED_APPS
+
+
+def test_parse_importtime_groups_self_time_by_package():
+    """Testa a leitura da saída do -X importtime e o agrupamento por pacote/app."""
+    # Arrange
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       100 |        100 |     django.utils",
+        "import time:       300 |        400 |   django",
+        "import time:        50 |         50 |     apps.tasks.models",
+        "import time:        70 |        120 |   apps.tasks",
+        "import time:        40 |         40 |   apps.jobs.worker",
+        "Traceback: linha que não é do importtime",
+    ])
+
+    # Act
+    entries = parse_importtime(output)
+    packages = group_by_package(entries)
+
+    # Assert
+    assert entries[1] == ('django', 300, 400)
+    assert packages == [('django', 400, 2), ('apps.tasks', 120, 2), ('apps.jobs', 40, 1)]
@@ -0,0 +1,144 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.http import HttpResponse
+from django.test import RequestFactory
+from common.middleware.routing import PathRoutedMiddleware, check_admin_middleware
+
+CALLS = []
+
+
+class RecordingMiddleware:
+    """Middleware de teste que registra as chamadas de cada hook."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        CALLS.append('call')
+        request.recorded = True
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        CALLS.append('view')
+
+    def process_exception(self, request, exception):
+        CALLS.append('exception')
+        return HttpResponse('tratado', status=500)
+
+
+@pytest.fixture
+def routed(settings):
+    """Fixture que monta o middleware com uma pilha interna de teste."""
+    CALLS.clear()
+    settings.API_PATH_PREFIXES = ['/api/']
+    settings.BROWSER_MIDDLEWARE = ['core.tests.test_path_routed_middleware.RecordingMiddleware']
+    return PathRoutedMiddleware(lambda request: HttpResponse('ok'))
+
+
+def test_api_paths_skip_browser_middleware(routed):
+    """Testa se rotas da API não passam pela pilha do navegador (nem pelos hooks)."""
+    # Arrange
+    request = RequestFactory().get('/api/v1/tasks/')
+
+    # Act
+    response = routed(request)
+    routed.process_view(request, None, (), {})
+    handled = routed.process_exception(request, ValueError())
+
+    # Assert
+    assert response.content == b'ok'
+    assert not hasattr(request, 'recorded')
+    assert handled is None
+    assert CALLS == []
+
+
+def test_other_paths_run_browser_middleware_and_hooks(routed):
+    """Testa se as demais rotas passam pela pilha completa, inclusive os hooks."""
+    # Arrange
+    request = RequestFactory().get('/admin/')
+
+    # Act
+    response = routed(request)
+    routed.process_view(request, None, (), {})
+    handled = routed.process_exception(request, ValueError())
+
+    # Assert
+    assert response.content == b'ok'
+    assert request.recorded
+    assert handled.content == b'tratado'
+    assert CALLS == ['call', 'view', 'exception']
+
+
+def test_async_chain(settings):
+    """Testa se o middleware funciona em uma pilha assíncrona (ASGI)."""
+    # Arrange
+    CALLS.clear()
+    settings.BROWSER_MIDDLEWARE = ['core.tests.test_path_routed_middleware.RecordingMiddleware']
+
+    async def get_response(request):
+        return HttpResponse('async')
+
+    middleware = PathRoutedMiddleware(get_response)
+
+    # Act
+    api = async_to_sync(middleware)(RequestFactory().get('/api/v1/tasks/'))
+    admin = async_to_sync(middleware)(RequestFactory().get('/admin/'))
+
+    # Assert
+    assert api.content == admin.content == b'async'
+    assert CALLS == ['call']
+
+
+@pytest.mark.django_db
+def test_api_response_has_no_session_or_frame_headers(client):
+    """Testa se as respostas da API não recebem cabeçalhos da pilha do navegador."""
+    # Act
+    response = client.get('/api/v1/tasks/')
+
+    # Assert
+    assert response.status_code == 401
+    assert 'X-Frame-Options' not in response
+    assert 'Vary' not in response or 'Cookie' not in response['Vary']
+
+
+@pytest.mark.django_db
+def test_admin_keeps_full_stack(client):
+    """Testa se o admin continua com sessão, CSRF e X-Frame-Options."""
+    # Act
+    page = client.get('/admin/login/')
+
+    # Assert
+    assert page.status_code == 200
+    assert page['X-Frame-Options'] == 'DENY'
+    assert 'csrftoken' in page.cookies
+    assert hasattr(page.wsgi_request, 'session')
+
+
+@pytest.mark.django_db
+def test_admin_post_without_csrf_token_is_rejected():
+    """Testa se o CSRF (hook process_view) continua valendo para o admin."""
+    # Arrange
+    from django.test import Client
+    client = Client(enforce_csrf_checks=True)
+
+    # Act
+    response = client.post('/admin/login/', {'username': 'x', 'password': 'y'})
+
+    # Assert
+    assert response.status_code == 403
+
+
+def test_admin_middleware_check_reads_browser_middleware(settings):
+    """Testa se a verificação do admin aceita os middlewares em BROWSER_MIDDLEWARE e aponta os que faltam."""
+    # Arrange
+    complete = check_admin_middleware()
+    settings.BROWSER_MIDDLEWARE = [
+        path for path in settings.BROWSER_MIDDLEWARE if not path.endswith('.SessionMiddleware')
+    ]
+
+    # Act
+    errors = check_admin_middleware()
+
+    # Assert
+    assert complete == []
+    assert [error.id for error in errors] == ['routing.E410']
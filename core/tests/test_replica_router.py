@@ -0,0 +1,128 @@
+import pytest
+from datetime import date
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from apps.tasks.models.tasks import Tasks
+from common.routers.replica_router import ReplicaRouter, read_from_replica
+from common.views.read_replica import PIN_COOKIE
+
+
+@pytest.fixture
+def replicas(settings):
+    """Fixture que ativa a réplica local (espelho do banco padrão nos testes)."""
+    settings.DATABASE_REPLICAS = ['replica']
+    settings.REPLICA_PIN_SECONDS = 5
+    cache.clear()
+    yield settings
+    cache.clear()
+
+
+@pytest.fixture
+def user():
+    """Fixture para criar um usuário de teste."""
+    return User.objects.create_user(username='leitor', password='senha123')
+
+
+@pytest.fixture
+def api_client(user):
+    """Fixture para criar um cliente API autenticado."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def query_count(alias, func):
+    with CaptureQueriesContext(connections[alias]) as queries:
+        response = func()
+    return response, len(queries)
+
+
+def test_router_uses_primary_unless_reads_are_marked(replicas):
+    """Testa se só leituras marcadas vão para a réplica; escritas vão ao principal."""
+    # Arrange
+    router = ReplicaRouter()
+
+    # Act
+    unmarked = router.db_for_read(Tasks)
+    with read_from_replica():
+        marked = router.db_for_read(Tasks)
+        write = router.db_for_write(Tasks)
+
+    # Assert
+    assert unmarked is None
+    assert marked == 'replica'
+    assert write == 'default'
+    assert router.allow_migrate('replica', 'tasks') is False
+    assert router.allow_migrate('default', 'tasks') is None
+
+
+def test_router_ignores_marks_without_replicas(settings):
+    """Testa se, sem réplicas configuradas, tudo continua no banco principal."""
+    # Arrange
+    settings.DATABASE_REPLICAS = []
+
+    # Act
+    with read_from_replica():
+        alias = ReplicaRouter().db_for_read(Tasks)
+
+    # Assert
+    assert alias is None
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+def test_reads_inside_transaction_stay_on_primary(replicas):
+    """Testa se leituras dentro de uma transação no principal não vão para a réplica."""
+    # Act
+    with read_from_replica(), transaction.atomic():
+        alias = ReplicaRouter().db_for_read(Tasks)
+
+    # Assert
+    assert alias == 'default'
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+def test_safe_requests_read_from_replica(replicas, api_client, user):
+    """Testa se a listagem e as estatísticas leem da réplica."""
+    # Arrange
+    Tasks.objects.create(usuario=user, titulo='Tarefa', prioridade='A', prazo=date.today())
+
+    # Act
+    response, replica_queries = query_count('replica', lambda: api_client.get('/api/v1/tasks/'))
+    stats, stats_queries = query_count('replica', lambda: api_client.get('/api/v1/tasks/estatisticas/'))
+
+    # Assert
+    assert response.status_code == 200
+    assert response.json()[0]['titulo'] == 'Tarefa'
+    assert replica_queries >= 1
+    assert stats.json()['total'] == 1
+    assert stats_queries == 1
+
+
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+def test_writer_is_pinned_to_primary(replicas, api_client, user):
+    """Testa se quem acabou de escrever lê do principal durante a janela configurada."""
+    # Arrange
+    payload = {'usuario': user.username, 'titulo': 'Nova', 'prioridade': 'A', 'status': 'P'}
+
+    # Act
+    created = api_client.post('/api/v1/tasks/', payload, format='json')
+    _, replica_queries = query_count('replica', lambda: api_client.get('/api/v1/tasks/'))
+
+    # Cliente sem cookie (só JWT): o pin por usuário no cache ainda vale
+    other_client = APIClient()
+    other_client.force_authenticate(user=user)
+    _, replica_queries_without_cookie = query_count('replica', lambda: other_client.get('/api/v1/tasks/'))
+
+    # Depois da janela o usuário volta a ler da réplica
+    cache.clear()
+    _, replica_queries_after = query_count('replica', lambda: other_client.get('/api/v1/tasks/'))
+
+    # Assert
+    assert created.status_code == 201
+    assert PIN_COOKIE in created.cookies
+    assert replica_queries == 0
+    assert replica_queries_without_cookie == 0
+    assert replica_queries_after >= 1
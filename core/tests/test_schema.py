@@ -0,0 +1,98 @@
+import json
+import pytest
+from unittest import mock
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from core import schema
+
+
+@pytest.fixture(autouse=True)
+def schema_settings(settings, tmp_path):
+    """Fixture que isola o diretório e a versão do schema em cada teste."""
+    settings.OPENAPI_SCHEMA_DIR = tmp_path / 'openapi'
+    settings.CODE_VERSION = 'versao-1'
+    schema.code_version.cache_clear()
+    schema.clear_schema_cache()
+    yield settings
+    schema.code_version.cache_clear()
+    schema.clear_schema_cache()
+
+
+@pytest.fixture
+def api_client():
+    """Fixture para criar um cliente API."""
+    return APIClient()
+
+
+@pytest.mark.django_db
+def test_schema_is_generated_once_and_served_with_etag(api_client):
+    """Testa se o schema é gerado uma única vez e servido do cache com ETag."""
+    # Act
+    with mock.patch.object(schema, 'generate_schema', wraps=schema.generate_schema) as generate:
+        first = api_client.get('/docs/?format=openapi')
+        second = api_client.get('/docs/openapi.json')
+
+    # Assert
+    assert generate.call_count == 1
+    assert first.status_code == 200
+    assert first['Content-Type'] == 'application/openapi+json'
+    assert '/tasks/' in json.loads(first.content)['paths']
+    assert first['ETag'] == second['ETag']
+
+
+@pytest.mark.django_db
+def test_schema_if_none_match_returns_304(api_client):
+    """Testa se uma requisição com o ETag atual recebe 304 sem corpo."""
+    # Arrange
+    etag = api_client.get('/docs/openapi.json')['ETag']
+
+    # Act
+    response = api_client.get('/docs/openapi.json', HTTP_IF_NONE_MATCH=etag)
+
+    # Assert
+    assert response.status_code == 304
+    assert response.content == b''
+
+
+@pytest.mark.django_db
+def test_generate_schema_command_writes_files_for_current_version(schema_settings):
+    """Testa se o comando grava o schema e não o regera se a versão não mudou."""
+    # Act
+    call_command('generate_schema')
+    with mock.patch.object(schema, 'generate_schema') as generate:
+        call_command('generate_schema')
+
+    # Assert
+    generate.assert_not_called()
+    assert (schema_settings.OPENAPI_SCHEMA_DIR / 'openapi.json').exists()
+    assert (schema_settings.OPENAPI_SCHEMA_DIR / 'openapi.yaml').exists()
+    assert schema.read_schema('versao-1') is not None
+    assert schema.read_schema('versao-2') is None
+
+
+@pytest.mark.django_db
+def test_schema_is_loaded_from_disk_without_generating(api_client):
+    """Testa se um schema já gravado é servido sem gerar de novo."""
+    # Arrange
+    call_command('generate_schema')
+    schema.clear_schema_cache()
+
+    # Act
+    with mock.patch.object(schema, 'generate_schema') as generate:
+        response = api_client.get('/docs/openapi.yaml')
+
+    # Assert
+    generate.assert_not_called()
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'application/yaml'
+
+
+@pytest.mark.django_db
+def test_docs_ui_page_is_rendered(api_client):
+    """Testa se a página do Swagger continua disponível em /docs/."""
+    # Act
+    response = api_client.get('/docs/', HTTP_ACCEPT='text/html')
+
+    # Assert
+    assert response.status_code == 200
+    assert b'swagger' in response.content.lower()
@@ -0,0 +1,213 @@
+import asyncio
+import json
+import pytest
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from common.events.broker import Broker, Subscription
+from common.events.sse import SSEApplication
+
+
+@pytest.fixture
+def broker():
+    """Broker isolado, com fila pequena para testar clientes lentos."""
+    return Broker(queue_size=3, history=10)
+
+
+@pytest.fixture
+def user(transactional_db):
+    """Usuário do token; o banco é consultado em outra thread (sync_to_async)."""
+    return User.objects.create_user(username='ouvinte', password='senha123')
+
+
+def access_token(user_id):
+    token = AccessToken()
+    token['user_id'] = user_id
+    return str(token)
+
+
+async def connected(broker, count=1):
+    """Espera as conexões se inscreverem no broker (depois de carregar o usuário)."""
+    while broker.connections() < count:
+        await asyncio.sleep(0.005)
+
+
+async def fallback_app(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 204, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+class Client:
+    """Cliente ASGI mínimo: guarda o que foi enviado e simula a desconexão."""
+
+    def __init__(self, app, path='/api/v1/tasks/events/', headers=(), query=b''):
+        self.app = app
+        self.scope = {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'headers': [(name.encode(), value.encode()) for name, value in headers],
+            'query_string': query,
+        }
+        self.messages = []
+        self.disconnected = asyncio.Event()
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        self.messages.append(message)
+
+    def start(self):
+        return asyncio.ensure_future(self.app(self.scope, self.receive, self.send))
+
+    @property
+    def status(self):
+        return self.messages[0]['status']
+
+    @property
+    def body(self):
+        return b''.join(message.get('body', b'') for message in self.messages[1:]).decode()
+
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 5))
+
+
+def test_broker_replays_only_user_events_after_last_id(broker):
+    """Testa se a retomada devolve só os eventos do usuário depois do último recebido."""
+    # Arrange
+    for user_id, event_id in ((1, 'a'), (2, 'b'), (1, 'c'), (1, 'd')):
+        broker.dispatch({'id': event_id, 'usuario': user_id, 'tipo': 'criada', 'dados': {}})
+
+    # Act
+    missed = broker.replay(1, 'a')
+    unknown = broker.replay(1, 'zzz')
+
+    # Assert
+    assert [event['id'] for event in missed] == ['c', 'd']
+    assert unknown is None
+
+
+def test_slow_subscription_is_closed_when_queue_is_full(broker):
+    """Testa se um cliente que não consome os eventos é desconectado em vez de acumular."""
+    async def scenario():
+        subscription, _ = broker.subscribe(1)
+        for index in range(4):
+            broker.dispatch({'id': str(index), 'usuario': 1, 'tipo': 'criada', 'dados': {}})
+        return subscription
+
+    # Act
+    subscription = run(scenario())
+
+    # Assert
+    assert subscription.overflowed and subscription.closed
+    assert subscription.queue.qsize() == 1
+    assert broker.connections() == 0
+
+
+def test_subscription_close_is_idempotent():
+    """Testa se fechar duas vezes não enfileira duas marcas de encerramento."""
+    async def scenario():
+        subscription = Subscription(1, 2)
+        subscription.close()
+        subscription.close()
+        return subscription.queue.qsize()
+
+    # Act / Assert
+    assert run(scenario()) == 1
+
+
+def test_stream_requires_valid_token(broker, user):
+    """Testa se a conexão sem token, com token inválido, de usuário excluído ou inativo recebe 401."""
+    # Arrange
+    inactive = User.objects.create_user(username='inativo', password='senha123', is_active=False)
+
+    async def scenario():
+        app = SSEApplication(fallback_app, broker=broker)
+        clients = [
+            Client(app),
+            Client(app, headers=[('authorization', 'Bearer invalido')]),
+            Client(app, headers=[('authorization', f'Bearer {access_token(user.pk + 100)}')]),
+            Client(app, headers=[('authorization', f'Bearer {access_token(inactive.pk)}')]),
+        ]
+        for client in clients:
+            await client.start()
+        return clients
+
+    # Act
+    clients = run(scenario())
+    missing = clients[0]
+
+    # Assert
+    assert [client.status for client in clients] == [401, 401, 401, 401]
+    assert json.loads(missing.body)['errors'][0]['code'] == 'not_authenticated'
+
+
+def test_other_paths_go_to_django(broker):
+    """Testa se as demais rotas são repassadas para a aplicação do Django."""
+    async def scenario():
+        client = Client(SSEApplication(fallback_app, broker=broker), path='/api/v1/tasks/')
+        await client.start()
+        return client
+
+    # Act / Assert
+    assert run(scenario()).status == 204
+
+
+def test_stream_delivers_user_events_and_heartbeats(broker, user):
+    """Testa se o stream envia os eventos do usuário, os pings e termina na desconexão."""
+    async def scenario():
+        app = SSEApplication(fallback_app, broker=broker)
+        app.heartbeat = 0.05
+        client = Client(app, headers=[('authorization', f'Bearer {access_token(user.pk)}')])
+        task = client.start()
+        await connected(broker)
+        broker.publish(user.pk, 'criada', {'ids': [10]})
+        broker.publish(user.pk + 1, 'criada', {'ids': [20]})
+        while ': ping' not in client.body:
+            await asyncio.sleep(0.01)
+        client.disconnected.set()
+        await task
+        return client
+
+    # Act
+    client = run(scenario())
+
+    # Assert
+    assert client.status == 200
+    assert (b'content-type', b'text/event-stream') in client.messages[0]['headers']
+    assert 'event: criada\ndata: {"ids":[10]}\n\n' in client.body
+    assert '20' not in client.body
+    assert ': ping\n\n' in client.body
+    assert client.messages[-1] == {'type': 'http.response.body', 'body': b'', 'more_body': False}
+    assert broker.connections() == 0
+
+
+def test_stream_resumes_from_last_event_id(broker, user):
+    """Testa se a reconexão com Last-Event-ID recebe os eventos perdidos ou o pedido de resync."""
+    async def scenario():
+        broker.start()
+        for ids in ([1], [2], [3]):
+            broker.publish(user.pk, 'atualizada', {'ids': ids})
+        await asyncio.sleep(0)
+        first = broker.history[0]['id']
+
+        app = SSEApplication(fallback_app, broker=broker)
+        token = access_token(user.pk)
+        resumed = Client(app, query=f'access_token={token}'.encode(), headers=[('last-event-id', first)])
+        unknown = Client(app, query=f'access_token={token}'.encode(), headers=[('last-event-id', 'antigo')])
+        tasks = [resumed.start(), unknown.start()]
+        await connected(broker, 2)
+        resumed.disconnected.set()
+        unknown.disconnected.set()
+        await asyncio.gather(*tasks)
+        return resumed, unknown
+
+    # Act
+    resumed, unknown = run(scenario())
+
+    # Assert
+    assert '{"ids":[1]}' not in resumed.body
+    assert resumed.body.index('{"ids":[2]}') < resumed.body.index('{"ids":[3]}')
+    assert unknown.body.startswith('event: resync\n')
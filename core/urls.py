@@ -1,25 +1,33 @@
-from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import permissions
-from django.utils.translation import gettext_lazy as _
-
-schema_view = get_schema_view(
-   openapi.Info(
-      title=_("task_collab_api API"),
-      default_version='v1',
-      description=_("API para gerenciamento de tarefas colaborativas"),
-   ),
-   public=True,
-   permission_classes=(permissions.AllowAny,),
-)
 
 
 urlpatterns = [
-   path('admin/', admin.site.urls),
    path('api/v1/tasks/', include('apps.tasks.urls')),
    path('api/v1/accounts/', include('apps.accounts.urls')),
-   
-   path('docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
 ]
+
+# Admin e documentação só são importados nos nós que os servem (NODE_ROLE)
+if settings.ENABLE_ADMIN:
+   from django.contrib import admin
+
+   urlpatterns.append(path('admin/', admin.site.urls))
+
+if settings.ENABLE_DOCS:
+   from drf_yasg.views import get_schema_view
+   from rest_framework import permissions
+   from core.schema import API_INFO
+   from core.views import cached_docs_view, schema_json_view, schema_yaml_view
+
+   schema_view = get_schema_view(
+      API_INFO,
+      public=True,
+      permission_classes=(permissions.AllowAny,),
+   )
+
+   urlpatterns += [
+      # O schema é servido do cache (gerado por: python manage.py generate_schema)
+      path('docs/', cached_docs_view(schema_view.with_ui('swagger', cache_timeout=0)), name='schema-swagger-ui'),
+      path('docs/openapi.json', schema_json_view, name='schema-json'),
+      path('docs/openapi.yaml', schema_yaml_view, name='schema-yaml'),
+   ]
@@ -0,0 +1,29 @@
+from django.views.decorators.http import require_safe
+
+from core.schema import SCHEMA_FORMATS, schema_response
+
+
+def cached_docs_view(ui_view):
+    """
+    Envolve a view de UI do drf_yasg: a página do Swagger continua sendo
+    renderizada por ela (barato), mas o schema (?format=openapi, usado pela
+    própria página) vem do cache em vez de ser gerado a cada requisição.
+    """
+    @require_safe
+    def view(request, *args, **kwargs):
+        fmt = request.GET.get('format')
+        if fmt in SCHEMA_FORMATS:
+            return schema_response(request, fmt)
+        return ui_view(request, *args, **kwargs)
+
+    return view
+
+
+@require_safe
+def schema_json_view(request):
+    return schema_response(request, 'json')
+
+
+@require_safe
+def schema_yaml_view(request):
+    return schema_response(request, 'yaml')